@@ -6,6 +6,9 @@ from datetime import datetime
 
 import requests
 
+# One pooled session, so every API call reuses the same keep-alive connection
+session = requests.Session()
+
 
 def main():
     print("Initiating process...")
@@ -80,7 +83,7 @@ def main():
                 # Get issue details
                 issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
                 print(f"Fetching issue details from {issue_url}")
-                issue_response = requests.get(issue_url, headers=headers)
+                issue_response = session.get(issue_url, headers=headers)
                 print(f"Issue details response status: {issue_response.status_code}")
                 issue_data = issue_response.json()
                 print("Issue details fetched.")
@@ -93,14 +96,14 @@ def main():
                     # Remove assignee
                     assignees_url = f"{issue_url}/assignees"
                     print(f"Removing assignee {user_login} via {assignees_url}")
-                    requests.delete(assignees_url, headers=headers, json={"assignees": [user_login]})
+                    session.delete(assignees_url, headers=headers, json={"assignees": [user_login]})
                     print("Assignee removed.")
 
                     # Remove "assigned" label
                     try:
                         label_url = f"{issue_url}/labels/assigned"
                         print(f"Removing 'assigned' label via {label_url}")
-                        requests.delete(label_url, headers=headers)
+                        session.delete(label_url, headers=headers)
                         print("'assigned' label removed.")
                     except Exception:
                         print("Label missing or already deleted.")
@@ -108,7 +111,7 @@ def main():
                     # Check for existing unassign comments
                     comments_url = f"{issue_url}/comments"
                     print(f"Fetching comments from {comments_url}")
-                    comments_response = requests.get(comments_url, headers=headers)
+                    comments_response = session.get(comments_url, headers=headers)
                     comments_data = comments_response.json()
                     print("Comments fetched.")
 
@@ -125,7 +128,7 @@ def main():
                             "Type /assign if you'd like to take it again."
                         )
                         print("Posting unassign comment.")
-                        requests.post(comments_url, headers=headers, json={"body": unassign_msg})
+                        session.post(comments_url, headers=headers, json={"body": unassign_msg})
                         print("Unassign comment posted.")
                 else:
                     print(f"Issue #{issue_number} lacks 'assigned' label, skipping unassignment.")
@@ -145,7 +148,7 @@ def main():
 
                 # Get issue details to check if already assigned
                 print(f"Fetching issue details from {issue_url}")
-                issue_response = requests.get(issue_url, headers=headers)
+                issue_response = session.get(issue_url, headers=headers)
                 print(f"Issue details response status: {issue_response.status_code}")
                 issue_data = issue_response.json()
 
@@ -162,7 +165,7 @@ def main():
                             f"Please wait until it becomes available or choose a different issue."
                         )
                         print(f"Rejecting assignment request from {user_login}")
-                        requests.post(f"{issue_url}/comments", headers=headers, json={"body": comment_body})
+                        session.post(f"{issue_url}/comments", headers=headers, json={"body": comment_body})
                         return
                     else:
                         print(f"User {user_login} is already assigned to this issue. No action needed.")
@@ -180,7 +183,7 @@ def main():
                     search_query = f"type:pr repo:{owner}/{repo} author:{user_login}"
                     search_params = {"q": search_query}
                     print(f"Searching PRs created by user with query: {search_query}")
-                    search_response = requests.get(search_url, headers=headers, params=search_params)
+                    search_response = session.get(search_url, headers=headers, params=search_params)
                     print(f"Search response status: {search_response.status_code}")
                     search_data = search_response.json()
 
@@ -195,14 +198,14 @@ def main():
                             f"please choose a different issue to work on."
                         )
                         print(f"Rejecting 'good first issue' assignment for user with existing PRs: {user_login}")
-                        requests.post(f"{issue_url}/comments", headers=headers, json={"body": comment_body})
+                        session.post(f"{issue_url}/comments", headers=headers, json={"body": comment_body})
                         return
 
                 # Get user's open issues
                 issues_url = f"https://api.github.com/repos/{owner}/{repo}/issues"
                 params = {"state": "open", "assignee": user_login}
                 print(f"Fetching open issues for user {user_login} from {issues_url} with params {params}")
-                issues_response = requests.get(issues_url, headers=headers, params=params)
+                issues_response = session.get(issues_url, headers=headers, params=params)
                 print(f"Response status for open issues: {issues_response.status_code}")
                 assigned_issues = issues_response.json()
                 print(f"User {user_login} has {len(assigned_issues)} open assigned issues.")
@@ -219,7 +222,7 @@ def main():
                     search_query = f"type:pr state:open repo:{owner}/{repo} {assigned_issue.get('number')} in:body"
                     search_params = {"q": search_query}
                     print(f"Searching PRs with query: {search_query}")
-                    search_response = requests.get(search_url, headers=headers, params=search_params)
+                    search_response = session.get(search_url, headers=headers, params=search_params)
                     print(f"Search response status: {search_response.status_code}")
                     search_data = search_response.json()
 
@@ -235,13 +238,13 @@ def main():
                         f"#{issues_list}. Please complete them before requesting another."
                     )
                     print(f"User {user_login} blocked due to uncompleted issues: {issues_list}")
-                    requests.post(f"{issue_url}/comments", headers=headers, json={"body": comment_body})
+                    session.post(f"{issue_url}/comments", headers=headers, json={"body": comment_body})
                     return
 
                 # Assign the issue
                 assignees_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/assignees"
                 print(f"Assigning issue via {assignees_url}")
-                assign_response = requests.post(assignees_url, headers=headers, json={"assignees": [user_login]})
+                assign_response = session.post(assignees_url, headers=headers, json={"assignees": [user_login]})
                 if assign_response.status_code >= 400:
                     print(f"Error assigning issue: {assign_response.status_code} - {assign_response.text}")
                     return
@@ -251,7 +254,7 @@ def main():
                 # Add "assigned" label
                 labels_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/labels"
                 print(f"Adding 'assigned' label via {labels_url}")
-                label_response = requests.post(labels_url, headers=headers, json={"labels": ["assigned"]})
+                label_response = session.post(labels_url, headers=headers, json={"labels": ["assigned"]})
                 if label_response.status_code >= 400:
                     print(f"Error adding label: {label_response.status_code} - {label_response.text}")
                 else:
@@ -262,7 +265,7 @@ def main():
                     f"Hey @{user_login}! You're now assigned to this issue. " f"Please finish your PR within 1 day."
                 )
                 print("Posting assignment comment.")
-                comment_response = requests.post(
+                comment_response = session.post(
                     f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments",
                     headers=headers,
                     json={"body": assignment_msg},
@@ -283,7 +286,7 @@ def main():
         issues_url = f"https://api.github.com/repos/{owner}/{repo}/issues"
         print(f"Fetching open issues with assignees from {issues_url}")
         params = {"state": "open", "assignee": "*"}  # * means any assignee
-        issues_response = requests.get(issues_url, headers=headers, params=params)
+        issues_response = session.get(issues_url, headers=headers, params=params)
         print(f"Issues response status: {issues_response.status_code}")
         assigned_issues = issues_response.json()
         print(f"Found {len(assigned_issues)} open issues with assignees.")
@@ -304,7 +307,7 @@ def main():
             timeline_headers = headers.copy()
             timeline_headers["Accept"] = "application/vnd.github.mockingbird-preview+json"
             print(f"Fetching timeline from {timeline_url}")
-            timeline_response = requests.get(timeline_url, headers=timeline_headers)
+            timeline_response = session.get(timeline_url, headers=timeline_headers)
             print(f"Timeline response status: {timeline_response.status_code}")
             timeline_events = timeline_response.json()
 
@@ -363,7 +366,7 @@ def main():
                     variables = {"owner": owner, "repo": repo, "issue_number": issue_number}
 
                     print(f"Checking for linked PRs via GraphQL for issue #{issue_number}")
-                    graphql_response = requests.post(
+                    graphql_response = session.post(
                         graphql_url, headers=graphql_headers, json={"query": query, "variables": variables}
                     )
 
@@ -395,7 +398,7 @@ def main():
                         search_query = f"type:pr state:open repo:{owner}/{repo} {issue_number} in:body"
                         search_params = {"q": search_query}
                         print(f"Searching PRs with REST API query: {search_query}")
-                        search_response = requests.get(search_url, headers=headers, params=search_params)
+                        search_response = session.get(search_url, headers=headers, params=search_params)
                         search_data = search_response.json()
 
                         if search_data.get("total_count", 0) > 0:
@@ -422,13 +425,13 @@ def main():
                     # Remove assignee
                     assignees_url = f"{issue_url}/assignees"
                     print(f"Removing assignee {assignee} via {assignees_url}")
-                    requests.delete(assignees_url, headers=headers, json={"assignees": [assignee]})
+                    session.delete(assignees_url, headers=headers, json={"assignees": [assignee]})
                     print("Assignee removed.")
 
                     # Remove "assigned" label
                     label_url = f"{issue_url}/labels/assigned"
                     print(f"Removing 'assigned' label via {label_url}")
-                    requests.delete(label_url, headers=headers)
+                    session.delete(label_url, headers=headers)
                     print("'assigned' label removed.")
 
                     # Add unassign comment
@@ -440,7 +443,7 @@ def main():
                         f"This task is now available for reassignment."
                     )
 
-                    requests.post(
+                    session.post(
                         comments_url,
                         headers=headers,
                         json={"body": unassign_message},
@@ -8,12 +8,15 @@ from datetime import datetime
 
 import requests
 
+# One pooled session, so every API call reuses the same keep-alive connection
+session = requests.Session()
+
 
 def create_label_if_not_exists(owner, repo, label_name, headers):
     """Create a label if it doesn't already exist."""
     # Check if label exists
     labels_url = f"https://api.github.com/repos/{owner}/{repo}/labels/{label_name}"
-    response = requests.get(labels_url, headers=headers)
+    response = session.get(labels_url, headers=headers)
 
     if response.status_code == 404:
         # Label doesn't exist, create it
@@ -42,7 +45,7 @@ def create_label_if_not_exists(owner, repo, label_name, headers):
             "color": color,
             "description": f"Issues created in {label_name}",
         }
-        response = requests.post(create_url, headers=headers, json=payload)
+        response = session.post(create_url, headers=headers, json=payload)
         if response.status_code == 201:
             print(f"Created label: {label_name}")
             return True
@@ -67,7 +70,7 @@ def label_issue_by_date(owner, repo, issue_number, created_at, headers):
 
     # Get current labels for the issue
     issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-    response = requests.get(issue_url, headers=headers)
+    response = session.get(issue_url, headers=headers)
 
     if response.status_code != 200:
         print(f"Failed to get issue #{issue_number}: {response.status_code}")
@@ -93,7 +96,7 @@ def label_issue_by_date(owner, repo, issue_number, created_at, headers):
     # Add the label to the issue
     labels_url = f"{issue_url}/labels"
     payload = {"labels": [date_label]}
-    response = requests.post(labels_url, headers=headers, json=payload)
+    response = session.post(labels_url, headers=headers, json=payload)
 
     if response.status_code in [200, 201]:
         print(f"Added label {date_label} to issue #{issue_number}")
@@ -137,7 +140,7 @@ def main():
         params = {"state": "all", "page": page, "per_page": per_page}
 
         print(f"Fetching page {page} of issues...")
-        response = requests.get(issues_url, headers=headers, params=params)
+        response = session.get(issues_url, headers=headers, params=params)
 
         if response.status_code != 200:
             print(f"Failed to fetch issues: {response.status_code} - {response.text}")
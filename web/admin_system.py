@@ -4,13 +4,14 @@ import logging
 from datetime import datetime
 from io import StringIO
 
-import psutil
 from django.contrib.auth.decorators import user_passes_test
 from django.core.management import call_command, find_commands
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.http import require_http_methods
 
+from .services.system_metrics import get_metrics_snapshot
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,82 +21,13 @@ def is_superuser(user):
 
 
 def get_system_metrics():
-    """Get current system metrics."""
-    try:
-        # CPU metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
-
-        # Memory metrics
-        memory = psutil.virtual_memory()
-        swap = psutil.swap_memory()
-
-        # Disk metrics
-        disk = psutil.disk_usage("/")
-
-        # Process info
-        process = psutil.Process()
-        proc_memory = process.memory_info()
-
-        # Get top processes by memory usage
-        top_processes = []
-        try:
-            for proc in psutil.process_iter(["pid", "name", "memory_percent"]):
-                try:
-                    if proc.memory_percent() > 0.1:  # Only include processes using > 0.1% RAM
-                        mem_info = proc.memory_info()
-                        top_processes.append(
-                            {
-                                "pid": proc.pid,
-                                "name": proc.name(),
-                                "memory_percent": round(proc.memory_percent(), 2),
-                                "memory_bytes": mem_info.rss,
-                            }
-                        )
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-
-            # Sort by memory usage and list all above threshold
-            top_processes.sort(key=lambda x: x["memory_percent"], reverse=True)
-        except Exception as e:
-            logger.warning(f"Error getting process list: {e}")
-            top_processes = []
-
-        return {
-            "cpu": {
-                "percent": cpu_percent,
-                "count": cpu_count,
-                "frequency": psutil.cpu_freq().current if psutil.cpu_freq() else 0,
-            },
-            "memory": {
-                "total": memory.total,
-                "available": memory.available,
-                "percent": memory.percent,
-                "used": memory.used,
-                "free": memory.free,
-            },
-            "swap": {
-                "total": swap.total,
-                "used": swap.used,
-                "free": swap.free,
-                "percent": swap.percent,
-            },
-            "disk": {
-                "total": disk.total,
-                "used": disk.used,
-                "free": disk.free,
-                "percent": disk.percent,
-            },
-            "process": {
-                "rss": proc_memory.rss,
-                "vms": proc_memory.vms,
-            },
-            "top_processes": top_processes,
-            "timestamp": datetime.now().isoformat(),
-        }
-    except Exception as e:
-        logger.error(f"Error getting system metrics: {e}")
-        return None
+    """
+    Return the latest system metrics sample with its recent history and request percentiles.
+
+    Sampling happens on a background thread (see web.services.system_metrics), so this never
+    waits on cpu_percent or a process scan.
+    """
+    return get_metrics_snapshot()
 
 
 def get_available_commands():
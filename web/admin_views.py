@@ -1,7 +1,6 @@
 import logging
 from datetime import timedelta
 
-from django.apps import apps
 from django.contrib import admin
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import user_passes_test
@@ -9,7 +8,6 @@ from django.db.models import Case, Count, F, FloatField, Sum, When
 from django.db.models.functions import TruncDate
 from django.http import JsonResponse
 from django.shortcuts import render
-from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
@@ -19,6 +17,8 @@ from .admin_system import (
     run_management_command_worker,
 )
 from .models import Goods, OrderItem, Storefront
+from .services.daily_jobs import daily_job_stats
+from .services.model_counts import get_model_count_stats
 
 logger = logging.getLogger(__name__)
 
@@ -36,67 +36,8 @@ def admin_dashboard(request):
     end_date = timezone.now()
     start_date = end_date - timedelta(days=30)
 
-    # Function to get historical data for a model
-    def get_model_history(model):
-        date_field = next(
-            (f.name for f in model._meta.fields if f.name in ["created_at", "date_joined"]),
-            None,
-        )
-        if not date_field:
-            return []
-
-        filter_kwargs = {f"{date_field}__range": (start_date, end_date)}
-        return (
-            model.objects.filter(**filter_kwargs)
-            .annotate(date=TruncDate(date_field))
-            .values("date")
-            .annotate(count=Count("id"))
-            .order_by("date")
-        )
-
-    # Get all registered models
-    models_to_track = []
-    for app_config in apps.get_app_configs():
-        for model in app_config.get_models():
-            # Skip models without creation date fields
-            if any(f.name in ["created_at", "date_joined"] for f in model._meta.fields):
-                # Get admin URL if model is registered in admin
-                admin_url = None
-                if admin.site.is_registered(model):
-                    admin_url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
-
-                models_to_track.append(
-                    {"model": model, "title": model._meta.verbose_name_plural.title(), "admin_url": admin_url}
-                )
-
-    stats = []
-    for model_info in models_to_track:
-        model = model_info["model"]
-        current_count = model.objects.count()
-
-        # Get historical data
-        history_data = get_model_history(model)
-        history_list = [0] * 30  # Initialize with zeros
-
-        # Fill in actual counts
-        for entry in history_data:
-            days_ago = (end_date.date() - entry["date"]).days
-            if 0 <= days_ago < 30:
-                history_list[days_ago] = entry["count"]
-
-        stats.append(
-            {
-                "title": model_info["title"],
-                "count": current_count,
-                "history": list(reversed(history_list)),  # Reverse to show oldest to newest
-                "admin_url": model_info["admin_url"],
-            }
-        )
-
-    # Sort stats by total count descending
-    stats.sort(key=lambda x: x["count"], reverse=True)
-
-    context["stats"] = stats
+    # Model counts come from the snapshot table written by the snapshot_model_counts command
+    context["stats"] = get_model_count_stats()
 
     # Merchandise-specific analytics
     # Sales data with proper price handling (discounts vs regular)
@@ -195,7 +136,6 @@ def admin_dashboard(request):
 
     context.update(
         {
-            "stats": stats,
             "merchandise_sales": sales_data,
             "top_products": top_products,
             "top_storefronts": top_storefronts,
@@ -226,6 +166,7 @@ def system_dashboard(request):
         "admin/system_dashboard.html",
         {
             "metrics": metrics,
+            "daily_jobs": daily_job_stats(),
             "commands": commands,
             "title": "System Dashboard",
         },
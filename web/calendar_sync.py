@@ -1,5 +1,6 @@
 import logging
 import os
+import threading
 from datetime import datetime, timedelta
 
 from django.conf import settings
@@ -17,6 +18,9 @@ logger = logging.getLogger(__name__)
 # If modifying these scopes, delete the file token.json.
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Prefix of the event ids we assign to session events (base32hex: a-v and 0-9 only)
+EVENT_ID_PREFIX = "aolsession"
+
 
 def generate_ical_feed(user):
     """
@@ -141,89 +145,117 @@ def generate_outlook_calendar_link(session):
     return f"{base_url}?{query_string}"
 
 
+_service_lock = threading.Lock()
+_service = None
+_credentials = None
+
+
+def _save_credentials(creds):
+    with open(os.path.join(settings.BASE_DIR, "token.json"), "w") as token:
+        token.write(creds.to_json())
+
+
 def google_calendar_api():
     """
     Get Google Calendar API service.
 
+    The service is built once per process and reused; expired credentials are refreshed in
+    place instead of re-reading token.json and rebuilding the client on every call.
+
     Returns:
         googleapiclient.discovery.Resource: The Calendar API service
         or None if credentials are not available.
     """
-    creds = None
-    credentials_path = os.environ.get("SERVICE_ACCOUNT_FILE", "google_credentials.json")
-    token_path = os.path.join(settings.BASE_DIR, "token.json")
-
-    # Load credentials from token.json if it exists
-    if os.path.exists(token_path):
-        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-
-    # If there are no (valid) credentials available, let the user log in.
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists(credentials_path):
-                return None
-
-            flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
-            creds = flow.run_local_server(port=0)
-
-        # Save the credentials for the next run
-        with open(token_path, "w") as token:
-            token.write(creds.to_json())
-
-    try:
-        service = build("calendar", "v3", credentials=creds)
-        return service
-    except Exception as e:
-        logger.error(f"Failed to build calendar service: {str(e)}")
-        return None
-
-
-def create_calendar_event(session):
-    """Create a Google Calendar event for a session."""
-    service = google_calendar_api()
-    if not service:
-        return None
-
-    try:
-        event = {
-            "summary": f"{session.course.title} - {session.title}",
-            "description": session.description,
-            "start": {
-                "dateTime": session.start_time.isoformat(),
-                "timeZone": settings.TIME_ZONE,
-            },
-            "end": {
-                "dateTime": session.end_time.isoformat(),
-                "timeZone": settings.TIME_ZONE,
-            },
-        }
+    global _service, _credentials
+
+    with _service_lock:
+        if _service is not None:
+            if not _credentials.valid and _credentials.refresh_token:
+                try:
+                    _credentials.refresh(Request())
+                    _save_credentials(_credentials)
+                except Exception as e:
+                    logger.error(f"Failed to refresh calendar credentials: {str(e)}")
+            if _credentials.valid:
+                return _service
+            _service = _credentials = None
+
+        creds = None
+        credentials_path = os.environ.get("SERVICE_ACCOUNT_FILE", "google_credentials.json")
+        token_path = os.path.join(settings.BASE_DIR, "token.json")
+
+        # Load credentials from token.json if it exists
+        if os.path.exists(token_path):
+            creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+
+        # If there are no (valid) credentials available, let the user log in.
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                if not os.path.exists(credentials_path):
+                    return None
+
+                flow = InstalledAppFlow.from_client_secrets_file(credentials_path, SCOPES)
+                creds = flow.run_local_server(port=0)
+
+            # Save the credentials for the next run
+            _save_credentials(creds)
+
+        try:
+            _service = build("calendar", "v3", credentials=creds)
+            _credentials = creds
+            return _service
+        except Exception as e:
+            logger.error(f"Failed to build calendar service: {str(e)}")
+            return None
+
+
+def reset_calendar_service():
+    """Drop the cached service, e.g. after credentials were replaced."""
+    global _service, _credentials
+
+    with _service_lock:
+        _service = _credentials = None
+
+
+def calendar_event_id(session_id):
+    """
+    Deterministic Google Calendar event id for a session.
 
-        if session.is_virtual:
-            event["conferenceData"] = {
-                "createRequest": {
-                    "requestId": f"event-{session.id}",
-                    "conferenceSolutionKey": {"type": "hangoutsMeet"},
-                }
+    Event ids may only use the characters a-v and 0-9, so retried inserts of the same session
+    collide with the existing event instead of creating a duplicate.
+    """
+    return f"{EVENT_ID_PREFIX}{session_id}"
+
+
+def session_event_body(session, event_id=None):
+    """Build the Calendar API event resource for a session."""
+    event = {
+        "summary": f"{session.course.title} - {session.title}",
+        "description": session.description,
+        "start": {
+            "dateTime": session.start_time.isoformat(),
+            "timeZone": settings.TIME_ZONE,
+        },
+        "end": {
+            "dateTime": session.end_time.isoformat(),
+            "timeZone": settings.TIME_ZONE,
+        },
+    }
+    if event_id:
+        event["id"] = event_id
+
+    if session.is_virtual:
+        event["conferenceData"] = {
+            "createRequest": {
+                "requestId": f"event-{session.id}",
+                "conferenceSolutionKey": {"type": "hangoutsMeet"},
             }
-        else:
-            event["location"] = session.location
-
-        event = (
-            service.events()
-            .insert(
-                calendarId="primary",
-                body=event,
-                conferenceDataVersion=1 if session.is_virtual else 0,
-            )
-            .execute()
-        )
-
-        return event.get("id")
-    except Exception as e:
-        logger.error(f"Failed to create calendar event: {str(e)}")
-        return None
+        }
+    else:
+        event["location"] = session.location
+    return event
 
 
 def get_user_calendar_events(user, start_date=None, end_date=None):
@@ -271,59 +303,3 @@ def get_user_calendar_events(user, start_date=None, end_date=None):
     except Exception as e:
         logger.error(f"Failed to get calendar events: {str(e)}")
         return []
-
-
-def update_calendar_event(session):
-    """Update a Google Calendar event."""
-    service = google_calendar_api()
-    if not service:
-        return False
-
-    try:
-        event = {
-            "summary": f"{session.course.title} - {session.title}",
-            "description": session.description,
-            "start": {
-                "dateTime": session.start_time.isoformat(),
-                "timeZone": settings.TIME_ZONE,
-            },
-            "end": {
-                "dateTime": session.end_time.isoformat(),
-                "timeZone": settings.TIME_ZONE,
-            },
-        }
-
-        if session.is_virtual:
-            event["conferenceData"] = {
-                "createRequest": {
-                    "requestId": f"event-{session.id}",
-                    "conferenceSolutionKey": {"type": "hangoutsMeet"},
-                }
-            }
-        else:
-            event["location"] = session.location
-
-        service.events().update(
-            calendarId="primary",
-            eventId=session.meeting_id,
-            body=event,
-            conferenceDataVersion=1 if session.is_virtual else 0,
-        ).execute()
-        return True
-    except Exception as e:
-        logger.error(f"Failed to update calendar event: {str(e)}")
-        return False
-
-
-def delete_calendar_event(session):
-    """Delete a Google Calendar event."""
-    service = google_calendar_api()
-    if not service:
-        return False
-
-    try:
-        service.events().delete(calendarId="primary", eventId=session.meeting_id).execute()
-        return True
-    except Exception as e:
-        logger.error(f"Failed to delete calendar event: {str(e)}")
-        return False
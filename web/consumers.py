@@ -5,9 +5,10 @@ from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.utils import timezone
 
-from .models import VirtualClassroom, VirtualClassroomParticipant, VirtualClassroomWhiteboard
+from .models import Profile, VirtualClassroom, VirtualClassroomParticipant, VirtualClassroomWhiteboard
 from .utils import can_access_classroom
 
 logger = logging.getLogger(__name__)
@@ -16,10 +17,11 @@ User = get_user_model()
 
 class VirtualClassroomConsumer(AsyncWebsocketConsumer):
     def _get_avatar_url_sync(self) -> str | None:
-        """Return the current user's avatar URL, if available."""
-        profile = getattr(self.user, "profile", None)
-        avatar = getattr(profile, "avatar", None)
-        return avatar.url if avatar else None
+        """Return the current user's avatar URL, if available, looked up once per connection."""
+        if not hasattr(self, "_avatar_url"):
+            name = Profile.objects.filter(user_id=self.user.id).values_list("avatar", flat=True).first()
+            self._avatar_url = default_storage.url(name) if name else None
+        return self._avatar_url
 
     @database_sync_to_async
     def get_avatar_url(self) -> str | None:
@@ -2,6 +2,9 @@ import os
 from datetime import datetime
 
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .services.header_summary import get_header_summary
 
 
 def last_modified(request):
@@ -16,8 +19,6 @@ def last_modified(request):
     return {"last_modified": last_modified_time}
 
 
-def invitation_notifications(request):
-    if request.user.is_authenticated:
-        pending_invites = request.user.received_group_invites.filter(status="pending").count()
-        return {"pending_invites_count": pending_invites}
-    return {}
+def header_summary(request):
+    """Add the cart, invitation and notification badge counts used by the site header."""
+    return {"header_summary": SimpleLazyObject(lambda: get_header_summary(request))}
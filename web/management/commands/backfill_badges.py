@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from web.services.badge_rules import BATCH_SIZE, RULES, backfill
+
+
+class Command(BaseCommand):
+    help = "Grant badges and achievements that existing users already qualify for"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            choices=sorted({rule.event for rule in RULES}),
+            help="Only run the rules for this event (repeatable); all rules by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Objects evaluated per batch")
+
+    def handle(self, *args, **options):
+        rules = [rule for rule in RULES if not options["event"] or rule.event in options["event"]]
+        results = backfill(rules, batch_size=max(options["batch_size"], 1))
+        for rule_name, (badges, achievements) in results.items():
+            self.stdout.write(f"{rule_name}: {badges} badges, {achievements} achievements")
+        total_badges = sum(badges for badges, _ in results.values())
+        total_achievements = sum(achievements for _, achievements in results.values())
+        self.stdout.write(self.style.SUCCESS(f"Awarded {total_badges} badges and {total_achievements} achievements"))
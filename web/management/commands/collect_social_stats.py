@@ -0,0 +1,42 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from web.services.social_stats import collect_x_stats, prune_snapshots
+
+
+class Command(BaseCommand):
+    help = "Record social media profile stats for the content dashboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep collecting, sleeping between runs")
+        parser.add_argument("--interval", type=int, default=3600, help="Seconds to sleep between runs with --loop")
+        parser.add_argument(
+            "--keep-days",
+            type=int,
+            default=0,
+            help="Delete snapshots older than this many days (0 keeps everything)",
+        )
+
+    def handle(self, *args, **options):
+        username = getattr(settings, "TWITTER_USERNAME", None)
+        if not username:
+            self.stdout.write("TWITTER_USERNAME is not set; nothing to collect")
+            return
+
+        while True:
+            snapshot = collect_x_stats(username)
+            if snapshot:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"X @{username}: {snapshot.followers} followers, {snapshot.posts} posts from {snapshot.source}"
+                    )
+                )
+            else:
+                self.stdout.write(self.style.WARNING(f"X @{username}: no Nitter instance answered"))
+            if options["keep_days"]:
+                self.stdout.write(f"Pruned {prune_snapshots(options['keep_days'])} old snapshots")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from web.models import CalendarSyncJob
+from web.services.calendar_outbox import process_calendar_queue
+
+
+class Command(BaseCommand):
+    help = "Send queued session changes to Google Calendar in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=200, help="Maximum jobs to process per run")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining the queue, sleeping between empty batches",
+        )
+        parser.add_argument("--interval", type=int, default=30, help="Seconds to sleep between batches with --loop")
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue failed jobs before processing")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            requeued = CalendarSyncJob.objects.filter(status="failed").update(status="pending", attempts=0)
+            self.stdout.write(f"Requeued {requeued} failed calendar sync jobs")
+
+        while True:
+            stats = process_calendar_queue(limit=options["limit"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Calendar sync: {stats['synced']} synced, {stats['retried']} retrying, "
+                    f"{stats['failed']} failed, {stats['skipped']} waiting for credentials"
+                )
+            )
+            if not options["loop"]:
+                break
+            if not (stats["synced"] or stats["retried"] or stats["failed"]):
+                time.sleep(options["interval"])
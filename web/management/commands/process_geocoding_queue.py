@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from web.models import GeocodeJob
+from web.services.geocoding import enqueue_missing_sessions, nominatim_limiter, process_queue
+
+
+class Command(BaseCommand):
+    help = "Geocode queued session locations, respecting the shared Nominatim rate limit"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=100, help="Maximum jobs to process per batch")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining the queue, sleeping between empty batches",
+        )
+        parser.add_argument("--interval", type=int, default=30, help="Seconds to sleep between batches with --loop")
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue failed jobs before processing")
+        parser.add_argument(
+            "--enqueue-missing",
+            action="store_true",
+            help="Queue existing in-person sessions that have no coordinates yet",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            requeued = GeocodeJob.objects.filter(status="failed").update(status="pending", attempts=0)
+            self.stdout.write(f"Requeued {requeued} failed geocoding jobs")
+        if options["enqueue_missing"]:
+            self.stdout.write(f"Queued {enqueue_missing_sessions()} sessions without coordinates")
+
+        limiter = nominatim_limiter()
+        while True:
+            stats = process_queue(limit=options["limit"], limiter=limiter)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Geocoding batch: {stats['resolved']} resolved, {stats['not_found']} not found, "
+                    f"{stats['retried']} retrying, {stats['failed']} failed"
+                )
+            )
+            if not options["loop"]:
+                break
+            if not any(stats.values()):
+                time.sleep(options["interval"])
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from web.models import ImageProcessingJob
+from web.services.image_variants import VARIANT_SPECS, enqueue_missing_variants, process_image_queue
+
+
+class Command(BaseCommand):
+    help = "Generate responsive variants for uploaded course and badge images"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=50, help="Maximum jobs to process per run")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining the queue, sleeping between empty batches",
+        )
+        parser.add_argument("--interval", type=int, default=10, help="Seconds to sleep between batches with --loop")
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue failed jobs before processing")
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Queue every image that has no variants yet before processing",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            requeued = ImageProcessingJob.objects.filter(status="failed").update(status="pending", attempts=0)
+            self.stdout.write(f"Requeued {requeued} failed image jobs")
+        if options["backfill"]:
+            for model in VARIANT_SPECS:
+                self.stdout.write(f"Queued {enqueue_missing_variants(model)} {model._meta.verbose_name_plural}")
+
+        while True:
+            stats = process_image_queue(limit=options["limit"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Images: {stats['processed']} processed, {stats['skipped']} skipped, "
+                    f"{stats['retried']} retrying, {stats['failed']} failed"
+                )
+            )
+            if not options["loop"]:
+                break
+            if not (stats["processed"] or stats["skipped"] or stats["retried"] or stats["failed"]):
+                time.sleep(options["interval"])
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from web.services.stripe_events import process_stripe_events
+
+
+class Command(BaseCommand):
+    help = "Process Stripe webhook events from the inbox, once each and in order per Stripe object"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=100, help="Maximum events to process per batch")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining the inbox, sleeping between empty batches",
+        )
+        parser.add_argument("--interval", type=int, default=5, help="Seconds to sleep between batches with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            stats = process_stripe_events(limit=options["limit"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Stripe events: {stats['processed']} processed, {stats['retried']} retrying, "
+                    f"{stats['failed']} failed, {stats['deferred']} deferred"
+                )
+            )
+            if not options["loop"]:
+                break
+            if not (stats["processed"] or stats["failed"]):
+                time.sleep(options["interval"])
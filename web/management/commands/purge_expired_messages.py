@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from web.secure_messaging import purge_expired_messages
+
+
+class Command(BaseCommand):
+    help = "Delete unstarred secure messages that are past their 7-day expiry"
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_messages()
+        self.stdout.write(self.style.SUCCESS(f"Successfully purged {deleted} expired messages"))
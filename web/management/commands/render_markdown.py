@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from web.services.markdown_render import BATCH_SIZE, MARKDOWN_FIELDS, backfill_rendered_markdown
+
+
+class Command(BaseCommand):
+    help = "Fill the pre-rendered HTML columns of markdown fields"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=sorted(model._meta.model_name for model in MARKDOWN_FIELDS),
+            help="Only render this model (repeatable); all markdown models by default",
+        )
+        parser.add_argument("--force", action="store_true", help="Re-render rows that already have HTML")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows rendered per batch")
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in MARKDOWN_FIELDS:
+            if options["model"] and model._meta.model_name not in options["model"]:
+                continue
+            updated = backfill_rendered_markdown(
+                model, force=options["force"], batch_size=max(options["batch_size"], 1)
+            )
+            self.stdout.write(f"{model.__name__}: {updated} rows rendered")
+            total += updated
+        self.stdout.write(self.style.SUCCESS(f"Rendered markdown for {total} rows"))
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from web.models import StripeEvent
+from web.services.stripe_events import backfill_stripe_events, process_stripe_events, requeue_stripe_events
+
+
+class Command(BaseCommand):
+    help = "Replay stored Stripe events or backfill missed ones from the Stripe API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            default=[],
+            help="Event id to replay (repeatable); replaying a processed event runs its handlers again",
+        )
+        parser.add_argument("--failed", action="store_true", help="Replay every event that exhausted its retries")
+        parser.add_argument(
+            "--since",
+            help="Fetch events created since this date (YYYY-MM-DD) from Stripe and store any that are missing",
+        )
+        parser.add_argument("--type", action="append", default=[], help="Only backfill these event types")
+        parser.add_argument("--process", action="store_true", help="Process the inbox after requeueing")
+
+    def handle(self, *args, **options):
+        if options["event"]:
+            count = requeue_stripe_events(StripeEvent.objects.filter(event_id__in=options["event"]))
+            self.stdout.write(f"Requeued {count} stored events")
+        if options["failed"]:
+            count = requeue_stripe_events(StripeEvent.objects.filter(status="failed"))
+            self.stdout.write(f"Requeued {count} failed events")
+        if options["since"]:
+            try:
+                since = timezone.make_aware(datetime.strptime(options["since"], "%Y-%m-%d"))
+            except ValueError:
+                raise CommandError("--since must be a date in YYYY-MM-DD format")
+            seen, added = backfill_stripe_events(since, types=options["type"] or None)
+            self.stdout.write(f"Fetched {seen} events from Stripe, {added} were missing from the inbox")
+
+        if options["process"]:
+            stats = process_stripe_events(limit=1000)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Stripe events: {stats['processed']} processed, {stats['retried']} retrying, "
+                    f"{stats['failed']} failed, {stats['deferred']} deferred"
+                )
+            )
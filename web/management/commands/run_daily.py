@@ -1,37 +1,45 @@
-from django.core.management import call_command
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
+from web.services.daily_jobs import DAILY_JOBS, run_daily_jobs, select_jobs
+
 
 class Command(BaseCommand):
     help = "Run daily maintenance tasks"
 
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Jobs to run at once (1 runs them in-process)")
+        parser.add_argument(
+            "--job",
+            action="append",
+            help="Run only this job (repeatable); dependencies outside the selection are not run",
+        )
+        parser.add_argument("--list", action="store_true", help="List the daily jobs and their dependencies")
+
     def handle(self, *args, **options):
-        self.stdout.write(f"Starting daily tasks at {timezone.now()}")
+        if options["list"]:
+            for job in DAILY_JOBS:
+                after = f" (after {', '.join(job.after)})" if job.after else ""
+                self.stdout.write(f"{job.name}{after}")
+            return
 
         try:
-            # Roll forward sessions
-            self.stdout.write("Running roll_forward_sessions...")
-            call_command("roll_forward_sessions")
-            self.stdout.write(self.style.SUCCESS("Successfully completed roll_forward_sessions"))
-
-            # Send session reminders
-            self.stdout.write("Running send_session_reminders...")
-            call_command("send_session_reminders")
-            self.stdout.write(self.style.SUCCESS("Successfully completed send_session_reminders"))
-
-            # Send verification reminders
-            self.stdout.write("Running send_verification_reminders...")
-            call_command("send_verification_reminders")
-            self.stdout.write(self.style.SUCCESS("Successfully completed send_verification_reminders"))
-
-            # Clean up abandoned drafts
-            self.stdout.write("Running cleanup_abandoned_drafts...")
-            call_command("cleanup_abandoned_drafts")
-            self.stdout.write(self.style.SUCCESS("Successfully completed cleanup_abandoned_drafts"))
-
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error running daily tasks: {str(e)}"))
-            raise e
+            jobs = select_jobs(options["job"]) if options["job"] else DAILY_JOBS
+        except ValueError as e:
+            raise CommandError(str(e))
 
+        self.stdout.write(f"Starting daily tasks at {timezone.now()}")
+        statuses = run_daily_jobs(jobs, workers=options["workers"], on_finish=self.report)
+
+        failed = [name for name, status in statuses.items() if status == "failed"]
+        if failed:
+            raise CommandError(f"Daily tasks failed: {', '.join(failed)}")
         self.stdout.write(self.style.SUCCESS(f"Completed all daily tasks at {timezone.now()}"))
+
+    def report(self, job, status):
+        if status == "succeeded":
+            self.stdout.write(self.style.SUCCESS(f"Successfully completed {job.name}"))
+        elif status == "skipped":
+            self.stdout.write(self.style.WARNING(f"Skipped {job.name}"))
+        else:
+            self.stdout.write(self.style.ERROR(f"Error running {job.name}; see its run history for details"))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from web.models import EmailJob
+from web.notifications import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Send queued transactional emails such as enrollment confirmations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=100, help="Maximum emails to send per batch")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep draining the queue, sleeping between empty batches",
+        )
+        parser.add_argument("--interval", type=int, default=10, help="Seconds to sleep between batches with --loop")
+        parser.add_argument("--retry-failed", action="store_true", help="Requeue failed emails before sending")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            requeued = EmailJob.objects.filter(status="failed").update(status="pending", attempts=0)
+            self.stdout.write(f"Requeued {requeued} failed emails")
+
+        while True:
+            stats = send_queued_emails(limit=options["limit"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Email batch: {stats['sent']} sent, {stats['retried']} retrying, {stats['failed']} failed"
+                )
+            )
+            if not options["loop"]:
+                break
+            if not any(stats.values()):
+                time.sleep(options["interval"])
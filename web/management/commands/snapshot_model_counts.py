@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from web.services.model_counts import HISTORY_DAYS, snapshot_model_counts
+
+
+class Command(BaseCommand):
+    help = "Record daily row counts per model for the admin dashboard"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=2,
+            help="Number of recent days to (re)compute; yesterday is included to pick up late rows",
+        )
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help=f"Recompute the full {HISTORY_DAYS}-day dashboard window",
+        )
+
+    def handle(self, *args, **options):
+        days = HISTORY_DAYS if options["backfill"] else max(options["days"], 1)
+        written = snapshot_model_counts(days=days)
+        self.stdout.write(self.style.SUCCESS(f"Recorded {written} daily model counts over {days} days"))
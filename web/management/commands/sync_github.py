@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from web.services.github_sync import github_session, stale_contributors, sync_contributors, sync_pull_requests
+
+
+class Command(BaseCommand):
+    help = "Mirror GitHub pull requests and contributor details into the local tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--skip-pulls", action="store_true", help="Do not refresh the pull request listings")
+        parser.add_argument(
+            "--contributors",
+            type=int,
+            default=20,
+            help="Maximum contributors whose details are refreshed per run",
+        )
+        parser.add_argument(
+            "--max-age-hours",
+            type=int,
+            default=24,
+            help="Refresh contributor details older than this many hours",
+        )
+        parser.add_argument(
+            "--user",
+            action="append",
+            help="Refresh this contributor regardless of age (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        session = github_session()
+        try:
+            if not options["skip_pulls"]:
+                for state in ("closed", "open"):
+                    stats = sync_pull_requests(session, state)
+                    self.stdout.write(
+                        f"{state.title()} pull requests: {stats['fetched']} pages fetched, "
+                        f"{stats['not_modified']} unchanged, {stats['pulls']} stored, {stats['errors']} errors"
+                    )
+
+            logins = options["user"] or stale_contributors(
+                max_age=timedelta(hours=options["max_age_hours"]), limit=options["contributors"]
+            )
+            synced = sync_contributors(session, logins)
+        finally:
+            session.close()
+        self.stdout.write(self.style.SUCCESS(f"Synced GitHub details for {synced} of {len(logins)} contributors"))
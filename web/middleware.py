@@ -1,12 +1,15 @@
 import logging
+import time
 import traceback
 
 import sentry_sdk
+from django.db import connection
 from django.http import Http404
 from django.shortcuts import render
 from django.urls import Resolver404, resolve
 
 from .models import Course, WebRequest
+from .services.system_metrics import request_stats
 from .views import send_slack_message
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,30 @@ class HostnameRewriteMiddleware:
         return response
 
 
+class RequestMetricsMiddleware:
+    """Record each request's latency and database query count for the admin system dashboard."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.path.startswith("/static/"):
+            return self.get_response(request)
+
+        query_count = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            response = self.get_response(request)
+        request_stats.record((time.perf_counter() - start) * 1000, query_count)
+        return response
+
+
 class GlobalExceptionMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0064_geocodecache_geocodejob"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(fields=["latitude", "longitude"], name="session_lat_lng_idx"),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0065_session_lat_lng_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("enrollment_confirmation", "Enrollment confirmation"),
+                            ("teacher_new_enrollment", "New enrollment (teacher)"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("failed", "Failed")], default="pending", max_length=10
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="payment_intent_id",
+            field=models.CharField(blank=True, default="", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="stripe_payment_intent_id",
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name="order",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("payment_intent_id", ""), _negated=True),
+                fields=("payment_intent_id",),
+                name="order_payment_intent_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="payment",
+            constraint=models.UniqueConstraint(
+                fields=("enrollment", "stripe_payment_intent_id"), name="payment_enrollment_intent_unique"
+            ),
+        ),
+        migrations.AddField(
+            model_name="emailjob",
+            name="enrollment",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, related_name="email_jobs", to="web.enrollment"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="emailjob",
+            index=models.Index(fields=["status", "run_after"], name="web_emailjo_status_bf0ffe_idx"),
+        ),
+    ]
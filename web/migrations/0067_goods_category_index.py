@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0066_checkout_fulfilment"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="goods",
+            name="category",
+            field=models.CharField(
+                blank=True, db_index=True, help_text="e.g., 'Books', 'Course Materials'", max_length=100
+            ),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0067_goods_category_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100)),
+                (
+                    "key",
+                    models.CharField(help_text="Lowercased, whitespace-collapsed name", max_length=100, unique=True),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="CourseTag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="course_tags", to="web.course"
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="course_tags", to="web.tag"
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="BlogPostTag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="post_tags", to="web.blogpost"
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="post_tags", to="web.tag"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="tag_set",
+            field=models.ManyToManyField(
+                blank=True, related_name="blog_posts", through="web.BlogPostTag", to="web.tag"
+            ),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="tag_set",
+            field=models.ManyToManyField(blank=True, related_name="courses", through="web.CourseTag", to="web.tag"),
+        ),
+        migrations.CreateModel(
+            name="WaitingRoomTopic",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="room_topics", to="web.tag"
+                    ),
+                ),
+                (
+                    "waiting_room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="room_topics", to="web.waitingroom"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="waitingroom",
+            name="topic_set",
+            field=models.ManyToManyField(
+                blank=True, related_name="waiting_rooms", through="web.WaitingRoomTopic", to="web.tag"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="coursetag",
+            index=models.Index(fields=["tag", "course"], name="web_courset_tag_id_7f47a0_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="coursetag",
+            unique_together={("course", "tag")},
+        ),
+        migrations.AddIndex(
+            model_name="blogposttag",
+            index=models.Index(fields=["tag", "post"], name="web_blogpos_tag_id_e557a4_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="blogposttag",
+            unique_together={("post", "tag")},
+        ),
+        migrations.AddIndex(
+            model_name="waitingroomtopic",
+            index=models.Index(fields=["tag", "waiting_room"], name="web_waiting_tag_id_be0823_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="waitingroomtopic",
+            unique_together={("waiting_room", "tag")},
+        ),
+    ]
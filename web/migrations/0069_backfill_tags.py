@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+def tag_key(name):
+    return " ".join(name.lower().split())[:100]
+
+
+def parse_tags(value):
+    names = {}
+    for name in (value or "").split(","):
+        name = " ".join(name.split())[:100]
+        if name:
+            names.setdefault(tag_key(name), name)
+    return names
+
+
+def backfill_tags(apps, schema_editor):
+    """Create Tag rows and through-table links from the existing comma-separated strings."""
+    Tag = apps.get_model("web", "Tag")
+    sources = [
+        (apps.get_model("web", "Course"), "tags", apps.get_model("web", "CourseTag"), "course_id"),
+        (apps.get_model("web", "BlogPost"), "tags", apps.get_model("web", "BlogPostTag"), "post_id"),
+        (apps.get_model("web", "WaitingRoom"), "topics", apps.get_model("web", "WaitingRoomTopic"), "waiting_room_id"),
+    ]
+
+    parsed = []
+    all_names = {}
+    for model, field, through, owner_field in sources:
+        for owner_id, value in model.objects.exclude(**{field: ""}).values_list("id", field).iterator():
+            names = parse_tags(value)
+            for key, name in names.items():
+                all_names.setdefault(key, name)
+            parsed.append((through, owner_field, owner_id, names))
+
+    Tag.objects.bulk_create(
+        [Tag(key=key, name=name) for key, name in all_names.items()], batch_size=500, ignore_conflicts=True
+    )
+    tag_ids = dict(Tag.objects.values_list("key", "id"))
+
+    links = {}
+    for through, owner_field, owner_id, names in parsed:
+        links.setdefault(through, []).extend(
+            through(**{owner_field: owner_id, "tag_id": tag_ids[key]}) for key in names
+        )
+    for through, rows in links.items():
+        through.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0068_tags"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
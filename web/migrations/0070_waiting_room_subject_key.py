@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+def backfill_subject_keys(apps, schema_editor):
+    """Populate subject_key from the free-text subject of existing waiting rooms."""
+    WaitingRoom = apps.get_model("web", "WaitingRoom")
+    rooms = []
+    for room in WaitingRoom.objects.exclude(subject="").only("id", "subject").iterator():
+        room.subject_key = " ".join(room.subject.lower().split())[:100]
+        rooms.append(room)
+    WaitingRoom.objects.bulk_update(rooms, ["subject_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0069_backfill_tags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="waitingroom",
+            name="subject_key",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_subject_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="waitingroom",
+            index=models.Index(fields=["status", "subject_key"], name="waitingroom_status_subject_idx"),
+        ),
+    ]
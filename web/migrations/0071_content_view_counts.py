@@ -0,0 +1,46 @@
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_view_counts(apps, schema_editor):
+    """Seed view_count from the WebRequest rows the detail pages used to aggregate on every hit."""
+    WebRequest = apps.get_model("web", "WebRequest")
+    sources = [
+        (apps.get_model("web", "BlogPost"), "/blog/"),
+        (apps.get_model("web", "SuccessStory"), "/success-stories/"),
+    ]
+    for model, prefix in sources:
+        views = Counter()
+        rows = WebRequest.objects.filter(path__contains=prefix).values("path").annotate(total=Sum("count"))
+        for row in rows:
+            # Paths look like /<language>/blog/<slug>/; anything deeper is not a detail page
+            slug = row["path"].split(prefix, 1)[1].strip("/")
+            if slug and "/" not in slug:
+                views[slug] += row["total"] or 0
+        entries = list(model.objects.filter(slug__in=list(views)).only("id", "slug"))
+        for entry in entries:
+            entry.view_count = views[entry.slug]
+        model.objects.bulk_update(entries, ["view_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0070_waiting_room_subject_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="successstory",
+            name="view_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_view_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0071_content_view_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModelDailyCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model_label", models.CharField(max_length=100)),
+                ("date", models.DateField()),
+                ("created", models.PositiveIntegerField(default=0, help_text="Rows created on this date")),
+                (
+                    "total",
+                    models.PositiveBigIntegerField(default=0, help_text="Rows in the table at the end of this date"),
+                ),
+                ("recorded_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["date", "model_label"], name="web_modelda_date_5b7c6e_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("model_label", "date"), name="model_daily_count_unique")
+                ],
+            },
+        ),
+    ]
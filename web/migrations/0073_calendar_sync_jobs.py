@@ -0,0 +1,42 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0072_model_daily_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarSyncJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("session_id", models.PositiveIntegerField(unique=True)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("create", "Create"), ("update", "Update"), ("delete", "Delete")], max_length=10
+                    ),
+                ),
+                ("event_id", models.CharField(blank=True, help_text="Calendar event to delete", max_length=1024)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("failed", "Failed")], default="pending", max_length=10
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["status", "run_after"], name="web_calenda_status_82bd9d_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0073_calendar_sync_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StripeEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("event_id", models.CharField(max_length=255)),
+                (
+                    "endpoint",
+                    models.CharField(
+                        choices=[
+                            ("payments", "Course and cart payments"),
+                            ("donations", "Donations and subscriptions"),
+                            ("connect", "Stripe Connect"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("event_type", models.CharField(max_length=100)),
+                (
+                    "object_id",
+                    models.CharField(
+                        blank=True, help_text="Id of the Stripe object the event is about", max_length=255
+                    ),
+                ),
+                ("stripe_created", models.DateTimeField(help_text="When Stripe created the event")),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("processed", "Processed"), ("failed", "Failed")],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["status", "stripe_created"], name="web_stripee_status_ea11db_idx"),
+                    models.Index(fields=["object_id", "stripe_created"], name="web_stripee_object__3d98ec_idx"),
+                ],
+                "constraints": [models.UniqueConstraint(fields=("event_id", "endpoint"), name="stripe_event_unique")],
+            },
+        ),
+    ]
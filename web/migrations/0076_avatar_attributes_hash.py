@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0075_prerendered_markdown"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="avatar",
+            name="attributes_hash",
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.15 on 2026-10-19 11:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0076_avatar_attributes_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="badge",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="course",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.CreateModel(
+            name="ImageProcessingJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("model_label", models.CharField(max_length=100)),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "source_name",
+                    models.CharField(blank=True, help_text="Image the variants are generated from", max_length=255),
+                ),
+                (
+                    "stale_variants",
+                    models.JSONField(blank=True, default=list, help_text="Variant files of replaced images"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("pending", "Pending"), ("failed", "Failed")], default="pending", max_length=10
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("run_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["status", "run_after"], name="web_imagepr_status_7db000_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("model_label", "object_id"), name="image_processing_job_unique")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0077_image_processing_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GitHubContributor",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("login", models.CharField(max_length=100, unique=True)),
+                ("profile", models.JSONField(blank=True, default=dict, help_text="GitHub user payload")),
+                ("prs_created", models.PositiveIntegerField(default=0)),
+                ("prs_merged", models.PositiveIntegerField(default=0)),
+                ("issues_created", models.PositiveIntegerField(default=0)),
+                ("pr_reviews", models.PositiveIntegerField(default=0)),
+                ("pr_comments", models.PositiveIntegerField(default=0)),
+                ("issue_comments", models.PositiveIntegerField(default=0)),
+                ("issue_assignments", models.PositiveIntegerField(default=0)),
+                ("lines_added", models.PositiveIntegerField(default=0)),
+                ("lines_deleted", models.PositiveIntegerField(default=0)),
+                ("first_contribution_at", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="GitHubETag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("url", models.CharField(max_length=500, unique=True)),
+                ("etag", models.CharField(max_length=255)),
+                (
+                    "item_count",
+                    models.PositiveIntegerField(default=0, help_text="Items in the response the ETag belongs to"),
+                ),
+                ("fetched_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="GitHubPullRequest",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("number", models.PositiveIntegerField(unique=True)),
+                ("title", models.CharField(blank=True, max_length=500)),
+                ("state", models.CharField(choices=[("open", "Open"), ("closed", "Closed")], max_length=10)),
+                ("author_login", models.CharField(max_length=100)),
+                ("author_avatar_url", models.URLField(blank=True)),
+                ("author_profile_url", models.URLField(blank=True)),
+                ("opened_at", models.DateTimeField(blank=True, null=True)),
+                ("merged_at", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["author_login", "state"], name="web_githubp_author__6db588_idx")],
+            },
+        ),
+    ]
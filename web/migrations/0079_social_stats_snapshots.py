@@ -0,0 +1,53 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0078_github_sync_tables"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NitterInstanceHealth",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("url", models.URLField(unique=True)),
+                ("consecutive_failures", models.PositiveIntegerField(default=0)),
+                ("retry_after", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_checked_at", models.DateTimeField(blank=True, null=True)),
+                ("last_ok_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SocialStatsSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("platform", models.CharField(choices=[("x", "X")], max_length=20)),
+                ("account", models.CharField(max_length=100)),
+                ("followers", models.PositiveIntegerField(default=0)),
+                ("following", models.PositiveIntegerField(default=0)),
+                ("posts", models.PositiveIntegerField(default=0)),
+                ("engagement", models.FloatField(default=0)),
+                ("last_post_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "profile",
+                    models.JSONField(blank=True, default=dict, help_text="Name, bio, location, website and join date"),
+                ),
+                (
+                    "source",
+                    models.CharField(blank=True, help_text="Instance the profile was read from", max_length=255),
+                ),
+                ("collected_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["platform", "account", "collected_at"], name="web_socials_platfor_b72691_idx")
+                ],
+            },
+        ),
+    ]
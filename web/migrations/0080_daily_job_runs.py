@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:18
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0079_social_stats_snapshots"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyJobRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("job", models.CharField(max_length=100)),
+                ("batch", models.CharField(help_text="Identifies the run_daily invocation", max_length=32)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                            ("skipped", "Skipped"),
+                        ],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("duration", models.FloatField(blank=True, help_text="Seconds", null=True)),
+                ("rows_touched", models.PositiveIntegerField(default=0, help_text="Rows inserted, updated or deleted")),
+                ("output", models.TextField(blank=True)),
+                ("error", models.TextField(blank=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["job", "started_at"], name="web_dailyjo_job_8bd407_idx"),
+                    models.Index(fields=["batch"], name="web_dailyjo_batch_3ce2e4_idx"),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "running")), fields=("job",), name="daily_job_run_single_running"
+                    )
+                ],
+            },
+        ),
+    ]
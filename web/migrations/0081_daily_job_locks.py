@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:37
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0080_daily_job_runs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyJobLock",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("job", models.CharField(max_length=100, unique=True)),
+                ("batch", models.CharField(help_text="run_daily invocation holding the lock", max_length=32)),
+                ("acquired_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RemoveConstraint(
+            model_name="dailyjobrun",
+            name="daily_job_run_single_running",
+        ),
+    ]
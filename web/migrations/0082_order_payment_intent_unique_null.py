@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+def blank_to_null(apps, schema_editor):
+    Order = apps.get_model("web", "Order")
+    Order.objects.filter(payment_intent_id="").update(payment_intent_id=None)
+
+
+def null_to_blank(apps, schema_editor):
+    Order = apps.get_model("web", "Order")
+    Order.objects.filter(payment_intent_id__isnull=True).update(payment_intent_id="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0081_daily_job_locks"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="order",
+            name="order_payment_intent_unique",
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="payment_intent_id",
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(blank_to_null, null_to_blank),
+        migrations.AlterField(
+            model_name="order",
+            name="payment_intent_id",
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+    ]
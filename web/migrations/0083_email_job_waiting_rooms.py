@@ -0,0 +1,72 @@
+# Generated by Django 5.1.15 on 2026-10-19 12:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0082_order_payment_intent_unique_null"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="emailjob",
+            name="course",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="email_jobs",
+                to="web.course",
+            ),
+        ),
+        migrations.AddField(
+            model_name="emailjob",
+            name="user",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="email_jobs",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="emailjob",
+            name="waiting_room",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="email_jobs",
+                to="web.waitingroom",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailjob",
+            name="enrollment",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="email_jobs",
+                to="web.enrollment",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="emailjob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("enrollment_confirmation", "Enrollment confirmation"),
+                    ("teacher_new_enrollment", "New enrollment (teacher)"),
+                    ("waiting_room_fulfilled", "Waiting room fulfilled"),
+                ],
+                max_length=30,
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-19 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0083_email_job_waiting_rooms"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="emailjob",
+            name="status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("sending", "Sending"), ("failed", "Failed")],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+    ]
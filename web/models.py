@@ -4,14 +4,12 @@ import string
 import time
 import uuid
 from datetime import datetime, timedelta
-from io import BytesIO
 from urllib.parse import parse_qs, urlparse
 
 from allauth.account.signals import user_signed_up
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
 from django.core.mail import send_mail
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
@@ -23,7 +21,6 @@ from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from markdownx.models import MarkdownxField
-from PIL import Image
 
 from web.utils import calculate_and_update_user_streak
 
@@ -151,6 +148,7 @@ class Avatar(models.Model):
     clothing = models.CharField(max_length=50, default="hoodie")
     clothing_color = models.CharField(max_length=7, default="#0000FF")
     svg = models.TextField(blank=True, help_text="Stored SVG string of the custom avatar")
+    attributes_hash = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -158,43 +156,19 @@ class Avatar(models.Model):
         return f"Avatar for {self.profile.user.username if hasattr(self, 'profile') and self.profile else 'No Profile'}"
 
     def save(self, *args, **kwargs):
-        from python_avatars import (
-            AccessoryType,
-        )
-        from python_avatars import Avatar as PythonAvatar
-        from python_avatars import (
-            AvatarStyle,
-            ClothingType,
-            EyebrowType,
-            EyeType,
-            FacialHairType,
-            HairType,
-            MouthType,
-            NoseType,
-            SkinColor,
-        )
-
-        # Create avatar using python_avatars
-        avatar = PythonAvatar(
-            style=getattr(AvatarStyle, self.style.upper(), AvatarStyle.CIRCLE),
-            background_color=self.background_color,
-            top=getattr(HairType, self.top.upper(), HairType.SHORT_FLAT),
-            eyebrows=getattr(EyebrowType, self.eyebrows.upper(), EyebrowType.DEFAULT),
-            eyes=getattr(EyeType, self.eyes.upper(), EyeType.DEFAULT),
-            nose=getattr(NoseType, self.nose.upper(), NoseType.DEFAULT),
-            mouth=getattr(MouthType, self.mouth.upper(), MouthType.DEFAULT),
-            facial_hair=getattr(FacialHairType, self.facial_hair.upper(), FacialHairType.NONE),
-            skin_color=getattr(SkinColor, self.skin_color.upper(), SkinColor.LIGHT),
-            hair_color=self.hair_color,
-            accessory=getattr(AccessoryType, self.accessory.upper(), AccessoryType.NONE),
-            clothing=getattr(ClothingType, self.clothing.upper(), ClothingType.HOODIE),
-            clothing_color=self.clothing_color,
-        )
+        from web.services.avatars import avatar_attributes, avatar_key, render_avatar
 
-        # Save SVG string
-        self.svg = avatar.render()
+        attributes = avatar_attributes(self)
+        if not self.svg or self.attributes_hash != avatar_key(attributes):
+            self.attributes_hash, self.svg = render_avatar(attributes)
         super().save(*args, **kwargs)
 
+    @property
+    def image_url(self):
+        from web.services.avatars import avatar_image_url
+
+        return avatar_image_url(self.attributes_hash) if self.attributes_hash else ""
+
 
 class Subject(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -232,6 +206,75 @@ class WebRequest(models.Model):
         return f"{self.path} - {self.count} views"
 
 
+class Tag(models.Model):
+    """Normalized tag shared by courses, blog posts and waiting room topics."""
+
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True, help_text="Lowercased, whitespace-collapsed name")
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class CourseTag(models.Model):
+    course = models.ForeignKey("Course", on_delete=models.CASCADE, related_name="course_tags")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="course_tags")
+
+    class Meta:
+        unique_together = ["course", "tag"]
+        indexes = [models.Index(fields=["tag", "course"])]
+
+
+class BlogPostTag(models.Model):
+    post = models.ForeignKey("BlogPost", on_delete=models.CASCADE, related_name="post_tags")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="post_tags")
+
+    class Meta:
+        unique_together = ["post", "tag"]
+        indexes = [models.Index(fields=["tag", "post"])]
+
+
+class WaitingRoomTopic(models.Model):
+    waiting_room = models.ForeignKey("WaitingRoom", on_delete=models.CASCADE, related_name="room_topics")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="room_topics")
+
+    class Meta:
+        unique_together = ["waiting_room", "tag"]
+        indexes = [models.Index(fields=["tag", "waiting_room"])]
+
+
+def loaded_image_name(instance):
+    value = instance.__dict__.get("image")
+    return getattr(value, "name", value) or ""
+
+
+def save_with_image_processing(instance, save, *args, **kwargs):
+    """
+    Save a model with responsive image variants, queueing variant generation only when its
+    ``image`` changed instead of re-encoding the upload on every save.
+    """
+    image_changed = "image" not in instance.get_deferred_fields() and (
+        (instance.image.name or "") != instance._loaded_image
+        or (bool(instance.image) and not instance.image._committed)
+    )
+    stale_variants = []
+    if image_changed and instance.image_variants:
+        from web.services.image_variants import variant_names
+
+        stale_variants = variant_names(instance.image_variants)
+        instance.image_variants = {}
+    save(*args, **kwargs)
+    if image_changed and (instance.image or stale_variants):
+        from web.services.image_variants import enqueue_image_processing
+
+        enqueue_image_processing(instance, stale_variants)
+    if image_changed:
+        instance._loaded_image = instance.image.name or ""
+
+
 class Course(models.Model):
     STATUS_CHOICES = [
         ("draft", "Draft"),
@@ -244,10 +287,14 @@ class Course(models.Model):
     image = models.ImageField(
         upload_to="course_images", help_text="Course image (will be resized to 300x300 pixels)", blank=True
     )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name="courses_teaching")
     description = MarkdownxField()
     learning_objectives = MarkdownxField()
     prerequisites = MarkdownxField(blank=True)
+    description_html = models.TextField(blank=True, editable=False)
+    learning_objectives_html = models.TextField(blank=True, editable=False)
+    prerequisites_html = models.TextField(blank=True, editable=False)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     allow_individual_sessions = models.BooleanField(
         default=False, help_text="Allow students to register for individual sessions"
@@ -276,8 +323,18 @@ class Course(models.Model):
         default="beginner",
     )
     tags = models.CharField(max_length=200, blank=True, help_text="Comma-separated tags")
+    tag_set = models.ManyToManyField(Tag, through=CourseTag, related_name="courses", blank=True)
     is_featured = models.BooleanField(default=False)
 
+    # Image name as last read from or written to the database; "" for unsaved courses
+    _loaded_image = ""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = loaded_image_name(instance)
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(self.title)
@@ -288,34 +345,19 @@ class Course(models.Model):
                 counter += 1
             self.slug = slug
 
-        # Handle image resizing
-        if self.image:
-            img = Image.open(self.image)
-            # Convert to RGB if necessary
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            # Crop image to a square format
-            width, height = img.size
-            min_dim = min(width, height)
-            left = (width - min_dim) / 2
-            top = (height - min_dim) / 2
-            right = (width + min_dim) / 2
-            bottom = (height + min_dim) / 2
-            img = img.crop((left, top, right, bottom))
-            # Resize the image to 300x300 pixels
-            img = img.resize((500, 500), Image.Resampling.LANCZOS)
-            # Save the resized image
-            buffer = BytesIO()
-            img.save(buffer, format="JPEG", quality=90)
-            # Update the ImageField
-            file_name = self.image.name
-            self.image.delete(save=False)  # Delete old image
-            self.image.save(file_name, ContentFile(buffer.getvalue()), save=False)
+        from web.services.markdown_render import render_markdown_fields
 
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        rendered = render_markdown_fields(self, update_fields)
+        if update_fields is not None and rendered:
+            kwargs["update_fields"] = [*update_fields, *rendered]
+        save_with_image_processing(self, super().save, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
+        from web.services.image_variants import delete_variant_files, variant_names
+
         if self.image:
+            delete_variant_files(self.image.storage, variant_names(self.image_variants or {}))
             self.image.delete(save=False)
         super().delete(*args, **kwargs)
 
@@ -402,16 +444,22 @@ class Session(models.Model):
 
     class Meta:
         ordering = ["start_time"]
+        indexes = [models.Index(fields=["latitude", "longitude"], name="session_lat_lng_idx")]
 
     def __str__(self):
         return f"{self.course.title} - {self.title}"
 
     def save(self, *args, **kwargs):
         # Store original times when first created
-        # calculate the lat and longitiude dynamically
+        # Coordinates come from the persistent geocode cache; misses are queued for the
+        # process_geocoding_queue worker so saving never waits on Nominatim.
+        needs_coordinates = bool(self.location) and (self.latitude is None or self.longitude is None)
+        if needs_coordinates:
+            from web.services.geocoding import get_cached_coordinates
 
-        if self.location and (self.latitude is None or self.longitude is None):
-            self.fetch_coordinates()
+            coordinates = get_cached_coordinates(self.location)
+            if coordinates:
+                self.latitude, self.longitude = coordinates
 
         if not self.pk and not self.original_start_time and not self.original_end_time:
             self.original_start_time = self.start_time
@@ -424,21 +472,24 @@ class Session(models.Model):
         # First save to get the ID
         super().save(*args, **kwargs)
 
+        if needs_coordinates and (self.latitude is None or self.longitude is None):
+            from web.services.geocoding import enqueue_session
+
+            enqueue_session(self)
+
+        # Calendar changes go through the CalendarSyncJob outbox; process_calendar_sync sends them
+        # in batches and writes the event id back to meeting_id.
         if self.is_virtual:
-            from .calendar_sync import create_calendar_event, update_calendar_event
+            from web.services.calendar_outbox import enqueue_calendar_sync
 
             if is_new:
-                event_id = create_calendar_event(self)
-                if event_id:
-                    self.meeting_id = event_id
-                    # Update without triggering save() again
-                    Session.objects.filter(pk=self.pk).update(meeting_id=event_id)
+                enqueue_calendar_sync(self, "create")
             elif old_instance and (
                 old_instance.start_time != self.start_time
                 or old_instance.end_time != self.end_time
                 or old_instance.title != self.title
             ):
-                update_calendar_event(self)
+                enqueue_calendar_sync(self, "update")
 
     def roll_forward(self):
         """Roll the session forward based on the rollover pattern."""
@@ -470,35 +521,13 @@ class Session(models.Model):
         return True
 
     def delete(self, *args, **kwargs):
-        # Delete associated calendar event if exists
-        if self.is_virtual and self.meeting_id:
-            from .calendar_sync import delete_calendar_event
+        # Queue deletion of the associated calendar event, if one exists or is about to be created
+        if self.is_virtual:
+            from web.services.calendar_outbox import enqueue_calendar_sync
 
-            delete_calendar_event(self)
+            enqueue_calendar_sync(self, "delete")
         super().delete(*args, **kwargs)
 
-    def fetch_coordinates(self):
-        """Fetch latitude and longitude using OpenStreetMap's Nominatim API."""
-        from .utils import geocode_address
-
-        if not self.location:
-            return
-        try:
-            coordinates = geocode_address(self.location)
-            if coordinates:
-                self.latitude, self.longitude = coordinates
-                print("location store:", self.latitude, self.longitude)
-            else:
-                print(
-                    f"Skipping session {self.id} due to invalid coordinates:",
-                    f"lat={self.latitude}, \n lng={self.longitude}",
-                )
-        except Exception as e:
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.error("Error geocoding session %s location '%s': %s", self.id, self.location, str(e))
-
     def is_live(self):
         """Returns True if the session is live right now."""
         now = timezone.now()
@@ -508,6 +537,351 @@ class Session(models.Model):
         return reverse("course_detail", kwargs={"slug": self.course.slug})
 
 
+class GeocodeCache(models.Model):
+    """Persistent geocoding results keyed by a stable hash of the normalized address."""
+
+    address_key = models.CharField(max_length=64, unique=True)
+    address = models.CharField(max_length=255)
+    latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    longitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    found = models.BooleanField(default=True, help_text="False when the geocoder returned no match")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.address
+
+
+class GeocodeJob(models.Model):
+    """Pending background geocoding for a session location."""
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("failed", "Failed"),
+    ]
+
+    session = models.OneToOneField(Session, on_delete=models.CASCADE, related_name="geocode_job")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"Geocode {self.session_id} ({self.status})"
+
+
+class EmailJob(models.Model):
+    """Queued transactional email, sent by the send_queued_emails command instead of inline."""
+
+    KIND_CHOICES = [
+        ("enrollment_confirmation", "Enrollment confirmation"),
+        ("teacher_new_enrollment", "New enrollment (teacher)"),
+        ("waiting_room_fulfilled", "Waiting room fulfilled"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    # Enrollment emails are about an enrollment; waiting room emails go to a user about a room and course
+    enrollment = models.ForeignKey(
+        "Enrollment", on_delete=models.CASCADE, related_name="email_jobs", null=True, blank=True
+    )
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="email_jobs", null=True, blank=True)
+    waiting_room = models.ForeignKey(
+        "WaitingRoom", on_delete=models.CASCADE, related_name="email_jobs", null=True, blank=True
+    )
+    course = models.ForeignKey("Course", on_delete=models.CASCADE, related_name="email_jobs", null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        if self.enrollment_id:
+            return f"{self.get_kind_display()} for enrollment {self.enrollment_id} ({self.status})"
+        return f"{self.get_kind_display()} for user {self.user_id} ({self.status})"
+
+
+class CalendarSyncJob(models.Model):
+    """
+    Pending Google Calendar change for a session, drained in batches by process_calendar_sync.
+
+    Keyed by session id rather than a foreign key so a delete can still be sent after the
+    session row is gone; later changes to the same session collapse into the one job.
+    """
+
+    ACTION_CHOICES = [
+        ("create", "Create"),
+        ("update", "Update"),
+        ("delete", "Delete"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("failed", "Failed"),
+    ]
+
+    session_id = models.PositiveIntegerField(unique=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    event_id = models.CharField(max_length=1024, blank=True, help_text="Calendar event to delete")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"Calendar {self.action} for session {self.session_id} ({self.status})"
+
+
+class ImageProcessingJob(models.Model):
+    """
+    Pending responsive-variant generation for an uploaded image, drained by process_images.
+
+    Keyed by model label and object id so the variant files of a deleted object can still be
+    cleaned up; a later upload to the same object replaces the pending job.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("failed", "Failed"),
+    ]
+
+    model_label = models.CharField(max_length=100)
+    object_id = models.PositiveIntegerField()
+    source_name = models.CharField(max_length=255, blank=True, help_text="Image the variants are generated from")
+    stale_variants = models.JSONField(default=list, blank=True, help_text="Variant files of replaced images")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["model_label", "object_id"], name="image_processing_job_unique"),
+        ]
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"Image processing for {self.model_label} {self.object_id} ({self.status})"
+
+
+class GitHubPullRequest(models.Model):
+    """Pull request on the project repository, mirrored by the sync_github command."""
+
+    STATE_CHOICES = [
+        ("open", "Open"),
+        ("closed", "Closed"),
+    ]
+
+    number = models.PositiveIntegerField(unique=True)
+    title = models.CharField(max_length=500, blank=True)
+    state = models.CharField(max_length=10, choices=STATE_CHOICES)
+    author_login = models.CharField(max_length=100)
+    author_avatar_url = models.URLField(blank=True)
+    author_profile_url = models.URLField(blank=True)
+    opened_at = models.DateTimeField(null=True, blank=True)
+    merged_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["author_login", "state"])]
+
+    def __str__(self):
+        return f"#{self.number} by {self.author_login} ({self.state})"
+
+
+class GitHubContributor(models.Model):
+    """Per-contributor GitHub profile and activity counts, refreshed by the sync_github command."""
+
+    login = models.CharField(max_length=100, unique=True)
+    profile = models.JSONField(default=dict, blank=True, help_text="GitHub user payload")
+    prs_created = models.PositiveIntegerField(default=0)
+    prs_merged = models.PositiveIntegerField(default=0)
+    issues_created = models.PositiveIntegerField(default=0)
+    pr_reviews = models.PositiveIntegerField(default=0)
+    pr_comments = models.PositiveIntegerField(default=0)
+    issue_comments = models.PositiveIntegerField(default=0)
+    issue_assignments = models.PositiveIntegerField(default=0)
+    lines_added = models.PositiveIntegerField(default=0)
+    lines_deleted = models.PositiveIntegerField(default=0)
+    first_contribution_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.login
+
+
+class GitHubETag(models.Model):
+    """ETag of the last GitHub API response for a URL, sent back as If-None-Match."""
+
+    url = models.CharField(max_length=500, unique=True)
+    etag = models.CharField(max_length=255)
+    item_count = models.PositiveIntegerField(default=0, help_text="Items in the response the ETag belongs to")
+    fetched_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.url
+
+
+class SocialStatsSnapshot(models.Model):
+    """Profile counts of a social media account, recorded by the collect_social_stats command."""
+
+    PLATFORM_CHOICES = [
+        ("x", "X"),
+    ]
+
+    platform = models.CharField(max_length=20, choices=PLATFORM_CHOICES)
+    account = models.CharField(max_length=100)
+    followers = models.PositiveIntegerField(default=0)
+    following = models.PositiveIntegerField(default=0)
+    posts = models.PositiveIntegerField(default=0)
+    engagement = models.FloatField(default=0)
+    last_post_at = models.DateTimeField(null=True, blank=True)
+    profile = models.JSONField(default=dict, blank=True, help_text="Name, bio, location, website and join date")
+    source = models.CharField(max_length=255, blank=True, help_text="Instance the profile was read from")
+    collected_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["platform", "account", "collected_at"])]
+
+    def __str__(self):
+        return f"{self.get_platform_display()} @{self.account} at {self.collected_at}: {self.followers} followers"
+
+
+class NitterInstanceHealth(models.Model):
+    """Outcome of the last probes of a Nitter instance; failing instances are skipped until retry_after."""
+
+    url = models.URLField(unique=True)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    retry_after = models.DateTimeField(default=timezone.now)
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    last_ok_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return f"{self.url} ({self.consecutive_failures} failures)"
+
+
+class StripeEvent(models.Model):
+    """
+    Inbox of verified Stripe webhook deliveries, processed by process_stripe_events.
+
+    Each event is stored once per endpoint it was delivered to, so retried deliveries are
+    acknowledged without repeating work.
+    """
+
+    ENDPOINT_CHOICES = [
+        ("payments", "Course and cart payments"),
+        ("donations", "Donations and subscriptions"),
+        ("connect", "Stripe Connect"),
+    ]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processed", "Processed"),
+        ("failed", "Failed"),
+    ]
+
+    event_id = models.CharField(max_length=255)
+    endpoint = models.CharField(max_length=20, choices=ENDPOINT_CHOICES)
+    event_type = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=255, blank=True, help_text="Id of the Stripe object the event is about")
+    stripe_created = models.DateTimeField(help_text="When Stripe created the event")
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["event_id", "endpoint"], name="stripe_event_unique")]
+        indexes = [
+            models.Index(fields=["status", "stripe_created"]),
+            models.Index(fields=["object_id", "stripe_created"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} ({self.status})"
+
+
+class ModelDailyCount(models.Model):
+    """Per-model daily creation counts and running totals, written by snapshot_model_counts for the admin dashboard."""
+
+    model_label = models.CharField(max_length=100)
+    date = models.DateField()
+    created = models.PositiveIntegerField(default=0, help_text="Rows created on this date")
+    total = models.PositiveBigIntegerField(default=0, help_text="Rows in the table at the end of this date")
+    recorded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["model_label", "date"], name="model_daily_count_unique")]
+        indexes = [models.Index(fields=["date", "model_label"])]
+
+    def __str__(self):
+        return f"{self.model_label} on {self.date}: +{self.created} ({self.total})"
+
+
+class DailyJobRun(models.Model):
+    """One run of a run_daily job, with its timing and outcome."""
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+        ("skipped", "Skipped"),
+    ]
+
+    job = models.CharField(max_length=100)
+    batch = models.CharField(max_length=32, help_text="Identifies the run_daily invocation")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="running")
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    rows_touched = models.PositiveIntegerField(default=0, help_text="Rows inserted, updated or deleted")
+    output = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["job", "started_at"]), models.Index(fields=["batch"])]
+
+    def __str__(self):
+        return f"{self.job} at {self.started_at} ({self.status})"
+
+
+class DailyJobLock(models.Model):
+    """
+    Held while a run_daily job runs. The unique job column makes inserting the row the lock,
+    across worker processes and overlapping run_daily invocations, on every database backend.
+    """
+
+    job = models.CharField(max_length=100, unique=True)
+    batch = models.CharField(max_length=32, help_text="run_daily invocation holding the lock")
+    acquired_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.job} locked by {self.batch}"
+
+
 class CourseMaterial(models.Model):
     MATERIAL_TYPES = [
         ("video", "Video"),
@@ -605,6 +979,15 @@ class Enrollment(models.Model):
     class Meta:
         unique_together = ["student", "course"]
 
+    # Status as last read from or written to the database; None for unsaved enrollments
+    _loaded_status = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
     def __str__(self):
         return f"{self.student.username} - {self.course.title}"
 
@@ -796,11 +1179,19 @@ class Payment(models.Model):
     )
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     currency = models.CharField(max_length=3, default="USD")
-    stripe_payment_intent_id = models.CharField(max_length=100, unique=True)
+    stripe_payment_intent_id = models.CharField(max_length=100, db_index=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            # A cart checkout pays for several enrollments with a single payment intent
+            models.UniqueConstraint(
+                fields=["enrollment", "stripe_payment_intent_id"], name="payment_enrollment_intent_unique"
+            )
+        ]
+
     def __str__(self):
         if self.session:
             return f"Payment for {self.enrollment} - {self.session.title}"
@@ -982,8 +1373,19 @@ class StudyGroup(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def member_total(self):
+        """Member count, using the ``member_count`` annotation from the study group query layer when present."""
+        if hasattr(self, "member_count"):
+            return self.member_count
+        return self.members.count()
+
+    @property
+    def open_seats(self):
+        return max(self.max_members - self.member_total, 0)
+
     def can_add_member(self):
-        return self.members.count() < self.max_members
+        return self.member_total < self.max_members
 
     def add_member(self, user):
         if self.can_add_member():
@@ -992,7 +1394,7 @@ class StudyGroup(models.Model):
         return False
 
     def is_full(self):
-        return self.members.count() >= self.max_members
+        return self.member_total >= self.max_members
 
 
 class StudyGroupInvite(models.Model):
@@ -1062,6 +1464,7 @@ class BlogPost(models.Model):
     slug = models.SlugField(unique=True, max_length=200)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="blog_posts")
     content = MarkdownxField()
+    content_html = models.TextField(blank=True, editable=False)
     excerpt = models.TextField(blank=True)
     featured_image = models.ImageField(
         upload_to="blog/images/", blank=True, help_text="Featured image for the blog post"
@@ -1070,6 +1473,8 @@ class BlogPost(models.Model):
     tags = models.CharField(
         max_length=200, blank=True, help_text="Comma-separated tags (e.g., 'python, django, web development')"
     )
+    tag_set = models.ManyToManyField(Tag, through=BlogPostTag, related_name="blog_posts", blank=True)
+    view_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
@@ -1085,6 +1490,12 @@ class BlogPost(models.Model):
             self.slug = slugify(self.title)
         if self.status == "published" and not self.published_at:
             self.published_at = timezone.now()
+        from web.services.markdown_render import render_markdown_fields
+
+        update_fields = kwargs.get("update_fields")
+        rendered = render_markdown_fields(self, update_fields)
+        if update_fields is not None and rendered:
+            kwargs["update_fields"] = [*update_fields, *rendered]
         super().save(*args, **kwargs)
 
     @property
@@ -1126,6 +1537,7 @@ class SuccessStory(models.Model):
         upload_to="success_stories/images/", blank=True, help_text="Featured image for the success story"
     )
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="published")
+    view_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
@@ -1196,7 +1608,9 @@ class Cart(models.Model):
 
     @property
     def total(self):
-        return sum(item.final_price for item in self.items.all())
+        from web.services.cart_pricing import price_cart
+
+        return price_cart(self).total
 
     def __str__(self):
         if self.user:
@@ -1251,7 +1665,9 @@ class Goods(models.Model):
     stock = models.PositiveIntegerField(blank=True, null=True, help_text="Leave blank for digital products")
     product_type = models.CharField(max_length=10, choices=PRODUCT_TYPE_CHOICES, default="physical")
     file = models.FileField(upload_to="digital_goods/", blank=True, help_text="Required for digital products")
-    category = models.CharField(max_length=100, blank=True, help_text="e.g., 'Books', 'Course Materials'")
+    category = models.CharField(
+        max_length=100, blank=True, db_index=True, help_text="e.g., 'Books', 'Course Materials'"
+    )
     images = models.ManyToManyField("ProductImage", related_name="goods_images", blank=True)
     storefront = models.ForeignKey(Storefront, on_delete=models.CASCADE, related_name="goods")
     is_available = models.BooleanField(default=True, help_text="Show/hide product from store")
@@ -1270,8 +1686,7 @@ class Goods(models.Model):
     @property
     def image_url(self):
         """Return the URL of the first product image, or a default image if none exists."""
-        # Get images using the related name "goods_images" from ProductImage model
-        first_image = self.goods_images.first()
+        first_image = self.first_image
         if first_image and first_image.image:
             return first_image.image.url
         # Return a default placeholder image
@@ -1279,11 +1694,15 @@ class Goods(models.Model):
 
     @property
     def image(self):
-        first_image = self.goods_images.first()
-        if first_image and first_image.image:
-            return first_image.image.url
-        # Return a default placeholder image
-        return "/static/images/placeholder.png"
+        return self.image_url
+
+    @property
+    def first_image(self):
+        """First ProductImage, read from a ``first_images`` prefetch when the queryset has one."""
+        if hasattr(self, "first_images"):
+            return self.first_images[0] if self.first_images else None
+        # Get images using the related name "goods_images" from ProductImage model
+        return self.goods_images.first()
 
     def clean(self):
         # Validate discount logic
@@ -1622,6 +2041,8 @@ class Order(models.Model):
     shipping_address = models.JSONField(blank=True, null=True, help_text="Structured shipping details")
     tracking_number = models.CharField(max_length=100, blank=True)
     terms_accepted = models.BooleanField(default=False, help_text="User accepted terms during checkout")
+    # NULL for free carts; unique otherwise, so one payment can only ever create one order
+    payment_intent_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -1884,6 +2305,7 @@ class Badge(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
     image = models.ImageField(upload_to="badges/")
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     badge_type = models.CharField(max_length=20, choices=BADGE_TYPES)
     course = models.ForeignKey(Course, on_delete=models.CASCADE, null=True, blank=True, related_name="badges")
     challenge = models.ForeignKey(Challenge, on_delete=models.CASCADE, null=True, blank=True, related_name="badges")
@@ -1896,18 +2318,17 @@ class Badge(models.Model):
     def __str__(self):
         return self.name
 
+    # Image name as last read from or written to the database; "" for unsaved badges
+    _loaded_image = ""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_image = loaded_image_name(instance)
+        return instance
+
     def save(self, *args, **kwargs):
-        if self.image:
-            img = Image.open(self.image)
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            img = img.resize((200, 200), Image.Resampling.LANCZOS)
-            buffer = BytesIO()
-            img.save(buffer, format="PNG", quality=90)
-            file_name = self.image.name
-            self.image.delete(save=False)
-            self.image.save(file_name, ContentFile(buffer.getvalue()), save=False)
-        super().save(*args, **kwargs)
+        save_with_image_processing(self, super().save, *args, **kwargs)
 
     class Meta:
         ordering = ["badge_type", "name"]
@@ -1946,35 +2367,19 @@ class UserBadge(models.Model):
 @receiver(post_save, sender=ChallengeSubmission)
 def award_challenge_badge(sender, instance, created, **kwargs):
     if created:
-        challenge_badges = Badge.objects.filter(challenge=instance.challenge, badge_type="challenge", is_active=True)
-        for badge in challenge_badges:
-            if not UserBadge.objects.filter(user=instance.user, badge=badge).exists():
-                UserBadge.objects.create(
-                    user=instance.user, badge=badge, award_method="challenge_completion", challenge_submission=instance
-                )
-                Notification.objects.create(
-                    user=instance.user,
-                    title=f"New Badge: {badge.name}",
-                    message=f"Congrats! You've earned {badge.name} for completing {instance.challenge.title}",
-                    notification_type="success",
-                )
+        from web.services.badge_rules import run_rules
+
+        run_rules("challenge_submitted", [instance.pk])
 
 
 @receiver(post_save, sender=Enrollment)
 def award_course_completion_badge(sender, instance, **kwargs):
-    if instance.status == "completed":
-        course_badges = Badge.objects.filter(course=instance.course, badge_type="course", is_active=True)
-        for badge in course_badges:
-            if not UserBadge.objects.filter(user=instance.student, badge=badge).exists():
-                UserBadge.objects.create(
-                    user=instance.student, badge=badge, award_method="course_completion", course_enrollment=instance
-                )
-                Notification.objects.create(
-                    user=instance.student,
-                    title=f"New Badge: {badge.name}",
-                    message=f"Congrats! You've earned {badge.name} for completing {instance.course.title}",
-                    notification_type="success",
-                )
+    # Only when the status becomes "completed", not on every later save of a completed enrollment
+    if instance.status == "completed" and instance._loaded_status != "completed":
+        from web.services.badge_rules import run_rules
+
+        run_rules("enrollment_completed", [instance.pk])
+    instance._loaded_status = instance.status
 
 
 def award_badge_to_student(badge_id, student_id, teacher_id, message=""):
@@ -2352,7 +2757,10 @@ class WaitingRoom(models.Model):
     title = models.CharField(max_length=200, blank=True)
     description = models.TextField(blank=True)
     subject = models.CharField(max_length=100, blank=True)
+    # Normalized copy of subject, so open rooms can be matched to a published course by index
+    subject_key = models.CharField(max_length=100, blank=True, editable=False)
     topics = models.TextField(help_text="Comma-separated list of topics", blank=True)
+    topic_set = models.ManyToManyField(Tag, through=WaitingRoomTopic, related_name="waiting_rooms", blank=True)
     creator = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="created_waiting_rooms", null=True, blank=True
     )
@@ -2378,12 +2786,22 @@ class WaitingRoom(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "subject_key"], name="waitingroom_status_subject_idx")]
 
     def __str__(self):
         if self.course:
             return f"Waiting room for next session of {self.course.title}"
         return self.title or "Untitled Waiting Room"
 
+    def save(self, *args, **kwargs):
+        from .services.tags import tag_key
+
+        self.subject_key = tag_key(self.subject)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "subject" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "subject_key"}
+        super().save(*args, **kwargs)
+
     def participant_count(self):
         """Return the number of participants in the waiting room."""
         return self.participants.count()
@@ -9,11 +9,15 @@ from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 
-from .models import CourseMaterial, Enrollment, Notification, NotificationPreference, Session
+from .models import CourseMaterial, EmailJob, Enrollment, Notification, NotificationPreference, Session
+from .services.header_summary import invalidate_header_summary
 from .slack import send_slack_notification
 
 logger = logging.getLogger(__name__)
 
+MAX_EMAIL_ATTEMPTS = 5
+EMAIL_RETRY_BACKOFF = timedelta(minutes=5)
+
 
 def send_notification(user, notification_data):
     """Send a notification to a user and store it in the database."""
@@ -42,7 +46,9 @@ def get_user_notifications(user, mark_as_read=False):
     """Get all notifications for a user."""
     notifications = Notification.objects.filter(user=user).order_by("-created_at")
     if mark_as_read:
-        notifications.filter(read=False).update(read=True)
+        # Bulk updates skip post_save, so the header badge has to be refreshed here
+        if notifications.filter(read=False).update(read=True):
+            invalidate_header_summary(user_id=user.id)
     return notifications
 
 
@@ -78,6 +84,79 @@ def notify_teacher_new_enrollment(enrollment):
     )
 
 
+def queue_enrollment_emails(enrollments):
+    """Queue the student confirmation and teacher notice for each enrollment instead of sending them inline."""
+    jobs = [
+        EmailJob(kind=kind, enrollment=enrollment)
+        for enrollment in enrollments
+        for kind in ("enrollment_confirmation", "teacher_new_enrollment")
+    ]
+    EmailJob.objects.bulk_create(jobs)
+    return len(jobs)
+
+
+def send_waiting_room_fulfilled_email(user, waiting_room, course):
+    """Email ``user`` that ``course`` now covers ``waiting_room``."""
+    site_url = getattr(settings, "SITE_URL", "")
+    html_message = render_to_string(
+        "emails/waiting_room_fulfilled.html",
+        {"user": user, "waiting_room": waiting_room, "course": course, "site_url": site_url},
+    )
+    send_mail(
+        f"New Course Created: {course.title}",
+        "",
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+        html_message=html_message,
+    )
+
+
+EMAIL_JOB_SENDERS = {
+    "enrollment_confirmation": lambda job: send_enrollment_confirmation(job.enrollment),
+    "teacher_new_enrollment": lambda job: notify_teacher_new_enrollment(job.enrollment),
+    "waiting_room_fulfilled": lambda job: send_waiting_room_fulfilled_email(job.user, job.waiting_room, job.course),
+}
+
+
+def send_queued_emails(limit=100):
+    """
+    Send up to ``limit`` due queued emails. Each job is claimed (marked "sending") before it is
+    sent, so concurrent runners never send the same job and a crash after sending leaves it
+    claimed rather than sending it again. Sent jobs are deleted; failures are retried with
+    backoff and marked failed after MAX_EMAIL_ATTEMPTS. Returns a dict of counts keyed by outcome.
+    """
+    stats = {"sent": 0, "retried": 0, "failed": 0}
+    jobs = (
+        EmailJob.objects.filter(status="pending", run_after__lte=timezone.now())
+        .select_related("enrollment__student", "enrollment__course__teacher", "user", "waiting_room", "course")
+        .order_by("run_after", "id")[:limit]
+    )
+    for job in jobs:
+        job.attempts += 1
+        claimed = EmailJob.objects.filter(pk=job.pk, status="pending").update(
+            status="sending", attempts=job.attempts, updated_at=timezone.now()
+        )
+        if not claimed:
+            continue
+        try:
+            EMAIL_JOB_SENDERS[job.kind](job)
+        except Exception as e:
+            logger.error(f"Failed to send queued email {job}: {e}")
+            job.last_error = str(e)[:500]
+            if job.attempts >= MAX_EMAIL_ATTEMPTS:
+                job.status = "failed"
+                stats["failed"] += 1
+            else:
+                job.status = "pending"
+                job.run_after = timezone.now() + EMAIL_RETRY_BACKOFF * job.attempts
+                stats["retried"] += 1
+            job.save(update_fields=["attempts", "last_error", "status", "run_after", "updated_at"])
+            continue
+        job.delete()
+        stats["sent"] += 1
+    return stats
+
+
 def notify_session_reminder(session):
     """Send reminder email to enrolled students about upcoming session."""
     subject = f"Reminder: Upcoming Session - {session.title}"
@@ -158,48 +237,50 @@ def notify_waiting_room_fulfilled(waiting_room, course):
         waiting_room (WaitingRoom): The waiting room that was fulfilled
         course (Course): The course that was created from the waiting room
     """
-    subject = f"New Course Created: {course.title}"
-
-    # Notify all participants
-    for participant in waiting_room.participants.all():
-        notification_data = {
-            "title": subject,
-            "message": f"A new course has been created based on a waiting room you joined: '{waiting_room.title}'. "
-            f"The course '{course.title}' is now available for enrollment.",
-            "notification_type": "success",
-        }
+    notify_waiting_rooms_fulfilled([waiting_room], course)
 
-        # Send notification
-        send_notification(participant, notification_data)
 
-        # Send email with more details
-        html_message = render_to_string(
-            "emails/waiting_room_fulfilled.html",
-            {
-                "user": participant,
-                "waiting_room": waiting_room,
-                "course": course,
-                "site_url": settings.SITE_URL,
-            },
-        )
+def notify_waiting_rooms_fulfilled(waiting_rooms, course):
+    """
+    Notify everyone waiting in any of ``waiting_rooms`` that ``course`` now covers their request.
 
-        send_mail(
-            subject,
-            "",  # Plain text version - we're only sending HTML
-            settings.DEFAULT_FROM_EMAIL,
-            [participant.email],
-            html_message=html_message,
+    Each participant or creator gets one notification and one queued email, even when they were
+    waiting in several of the rooms. Notifications and EmailJob rows are bulk-created; the emails
+    are sent by send_queued_emails. Rooms should be fetched with their participants and creator
+    prefetched. Returns the number of users notified.
+    """
+    subject = f"New Course Created: {course.title}"
+    recipients = {}
+    for waiting_room in waiting_rooms:
+        for participant in waiting_room.participants.all():
+            recipients.setdefault(participant.id, (participant, waiting_room, False))
+        if waiting_room.creator_id:
+            recipients.setdefault(waiting_room.creator_id, (waiting_room.creator, waiting_room, True))
+
+    notifications = []
+    email_jobs = []
+    for user, waiting_room, is_creator in recipients.values():
+        joined = "your waiting room" if is_creator else "a waiting room you joined"
+        notifications.append(
+            Notification(
+                user=user,
+                title=subject,
+                message=f"A new course has been created based on {joined}: '{waiting_room.title}'. "
+                f"The course '{course.title}' is now available for enrollment.",
+                notification_type="success",
+            )
         )
+        if user.email:
+            email_jobs.append(
+                EmailJob(kind="waiting_room_fulfilled", user=user, waiting_room=waiting_room, course=course)
+            )
 
-    # Also notify the creator if they're not already a participant
-    if waiting_room.creator not in waiting_room.participants.all():
-        notification_data = {
-            "title": subject,
-            "message": f"A new course has been created based on your waiting room: '{waiting_room.title}'. "
-            f"The course '{course.title}' is now available.",
-            "notification_type": "success",
-        }
-        send_notification(waiting_room.creator, notification_data)
+    Notification.objects.bulk_create(notifications)
+    EmailJob.objects.bulk_create(email_jobs)
+    # bulk_create skips post_save, so refresh the header badges here
+    for user_id in recipients:
+        invalidate_header_summary(user_id=user_id)
+    return len(recipients)
 
 
 def notify_teacher_waiting_room_join(waiting_room, participant):
@@ -1,6 +1,7 @@
 from django.db.models import Avg, Count, Q
 
-from .models import Course
+from .models import Course, Tag
+from .services.tags import courses_with_tag_keys, tagged_course_ids
 
 
 def get_course_recommendations(user, limit=6):
@@ -19,10 +20,7 @@ def get_course_recommendations(user, limit=6):
 
     # Get subjects and tags from user's enrolled courses
     subjects = enrolled_courses.values_list("subject", flat=True).distinct()
-    tags = []
-    for course in enrolled_courses:
-        tags.extend([tag.strip() for tag in course.tags.split(",") if tag.strip()])
-    tags = list(set(tags))  # Remove duplicates
+    tags = list(Tag.objects.filter(course_tags__course__enrollments__student=user).values_list("id", flat=True))
 
     # Base queryset excluding enrolled courses
     recommendations = (
@@ -34,20 +32,16 @@ def get_course_recommendations(user, limit=6):
     # If user has enrolled courses, prioritize similar courses
     if subjects or tags:
         subject_matches = Q(subject__in=subjects) if subjects else Q()
-        tag_matches = Q()
-        for tag in tags:
-            tag_matches |= Q(tags__icontains=tag)
+        tag_matches = Q(id__in=tagged_course_ids(tags)) if tags else Q()
 
         recommendations = recommendations.filter(subject_matches | tag_matches)
 
     # Consider user's profile interests if available
     if hasattr(user, "profile") and user.profile.expertise:
         expertise_keywords = [kw.strip() for kw in user.profile.expertise.lower().split(",")]
-        expertise_matches = Q()
+        expertise_matches = Q(id__in=courses_with_tag_keys(expertise_keywords))
         for keyword in expertise_keywords:
-            expertise_matches |= (
-                Q(title__icontains=keyword) | Q(description__icontains=keyword) | Q(tags__icontains=keyword)
-            )
+            expertise_matches |= Q(title__icontains=keyword) | Q(description__icontains=keyword)
         recommendations = recommendations.filter(expertise_matches)
 
     # Order by a combination of factors
@@ -69,11 +63,8 @@ def get_similar_courses(course, limit=3):
     """Get courses similar to a given course."""
     similar_courses = Course.objects.filter(status="published").exclude(id=course.id)
 
-    # Match by subject and tags
-    tags = [tag.strip() for tag in course.tags.split(",") if tag.strip()]
-    tag_matches = Q()
-    for tag in tags:
-        tag_matches |= Q(tags__icontains=tag)
+    # Match by subject and shared tags
+    tag_matches = Q(id__in=tagged_course_ids(course.course_tags.values("tag_id")))
 
     similar_courses = (
         similar_courses.filter(Q(subject=course.subject) | tag_matches)
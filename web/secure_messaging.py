@@ -4,10 +4,12 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.mail import send_mail
+from django.db.models import Q
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.functional import cached_property
 
 from .models import PeerMessage
 
@@ -62,6 +64,100 @@ def send_secure_teacher_message(email_to: str, message: str):
     send_mail(subject, message_body, settings.DEFAULT_FROM_EMAIL, [email_to])
 
 
+# --- Inbox Helpers ---
+
+MESSAGE_TTL = timezone.timedelta(days=7)
+INBOX_PAGE_SIZE = 20
+
+
+class MessageDecryptor:
+    """
+    Decrypts envelope-encrypted messages, caching unwrapped data keys for the lifetime of the
+    instance (one request), so a message rendered or downloaded twice is only unwrapped once.
+    """
+
+    def __init__(self):
+        self._data_keys = {}
+
+    def decrypt(self, encrypted_message: str, encrypted_random_key: str) -> str:
+        f_random = self._data_keys.get(encrypted_random_key)
+        if f_random is None:
+            f_random = Fernet(master_fernet.decrypt(encrypted_random_key.encode("utf-8")))
+            self._data_keys[encrypted_random_key] = f_random
+        return f_random.decrypt(encrypted_message.encode("utf-8")).decode("utf-8")
+
+
+class InboxMessage:
+    """A message row for templates; the content is only decrypted when it is rendered."""
+
+    def __init__(self, msg, decryptor, now):
+        self._msg = msg
+        self._decryptor = decryptor
+        self.id = msg.id
+        self.sender = msg.sender.username
+        self.sent_at = msg.created_at
+        self.starred = msg.starred
+        self.is_read = msg.is_read
+        time_remaining = msg.created_at + MESSAGE_TTL - now
+        hours, remainder = divmod(time_remaining.seconds, 3600)
+        minutes, _ = divmod(remainder, 60)
+        self.expires_in = f"{time_remaining.days}d {hours}h {minutes}m"
+
+    @cached_property
+    def content(self):
+        try:
+            return self._decryptor.decrypt(self._msg.content, self._msg.encrypted_key)
+        except Exception:
+            return "[Error decrypting message]"
+
+
+def unexpired_messages(user, now=None):
+    """Messages for a receiver that have not expired; starred messages are kept indefinitely."""
+    cutoff = (now or timezone.now()) - MESSAGE_TTL
+    return PeerMessage.objects.filter(receiver=user).filter(Q(created_at__gte=cutoff) | Q(starred=True))
+
+
+def purge_expired_messages(now=None):
+    """Delete unstarred messages older than MESSAGE_TTL. Returns the number of messages deleted."""
+    cutoff = (now or timezone.now()) - MESSAGE_TTL
+    deleted, _ = PeerMessage.objects.filter(created_at__lt=cutoff, starred=False).delete()
+    return deleted
+
+
+def get_inbox_page(request):
+    """
+    Return one newest-first page of the user's inbox using an id cursor (``?before=<id>``).
+    Only the page's messages are marked read (in a single UPDATE) and later decrypted.
+    """
+    now = timezone.now()
+    messages_qs = (
+        unexpired_messages(request.user, now)
+        .select_related("sender")
+        .only("id", "content", "encrypted_key", "is_read", "starred", "created_at", "sender__username")
+        .order_by("-id")
+    )
+    before = request.GET.get("before")
+    if before and before.isdigit():
+        messages_qs = messages_qs.filter(id__lt=int(before))
+
+    page = list(messages_qs[: INBOX_PAGE_SIZE + 1])
+    has_more = len(page) > INBOX_PAGE_SIZE
+    page = page[:INBOX_PAGE_SIZE]
+
+    unread_ids = [msg.id for msg in page if not msg.is_read]
+    if unread_ids:
+        PeerMessage.objects.filter(id__in=unread_ids).update(is_read=True, read_at=now)
+        for msg in page:
+            msg.is_read = True
+
+    decryptor = MessageDecryptor()
+    return {
+        "messages": [InboxMessage(msg, decryptor, now) for msg in page],
+        "next_cursor": page[-1].id if has_more else None,
+        "is_first_page": not before,
+    }
+
+
 # --- Secure Messaging Views Using Envelope Encryption ---
 
 
@@ -69,42 +165,11 @@ def send_secure_teacher_message(email_to: str, message: str):
 def messaging_dashboard(request):
     """
     Renders a messaging dashboard that doubles as the inbox.
-    It immediately displays all messages (decrypted) for the logged-in user,
-    marks them as read, and computes an expiration countdown (messages expire 7 days after creation).
+    Shows one page of the user's unexpired messages (decrypted on render), marks them as read,
+    and computes an expiration countdown (messages expire 7 days after creation).
     """
-    messages_qs = PeerMessage.objects.filter(receiver=request.user).order_by("created_at")
-    message_list = []
-    now = timezone.now()
-    for msg in messages_qs:
-        # Mark message as read and update read receipt
-        if not msg.is_read:
-            msg.is_read = True
-            msg.read_at = now
-            msg.save(update_fields=["is_read", "read_at"])
-        try:
-            decrypted_message = decrypt_message_with_random_key(msg.content, msg.encrypted_key)
-        except Exception:
-            decrypted_message = "[Error decrypting message]"
-        expires_at = msg.created_at + timezone.timedelta(days=7)
-        time_remaining = expires_at - now
-        days = time_remaining.days
-        hours, remainder = divmod(time_remaining.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
-        expiration_str = f"{days}d {hours}h {minutes}m"
-        message_list.append(
-            {
-                "id": msg.id,
-                "sender": msg.sender.username,
-                "content": decrypted_message,
-                "sent_at": msg.created_at,
-                "expires_in": expiration_str,
-                "starred": msg.starred,
-            }
-        )
-    context = {
-        "messages": message_list,
-        "inbox_count": len(message_list),
-    }
+    context = get_inbox_page(request)
+    context["inbox_count"] = unexpired_messages(request.user).count()
     return render(request, "web/messaging/dashboard.html", context)
 
 
@@ -168,40 +233,10 @@ def send_encrypted_message(request):
 @login_required
 def inbox(request):
     """
-    Renders an inbox page displaying decrypted messages for the logged-in user.
+    Renders an inbox page displaying decrypted messages for the logged-in user, one page at a time.
     Also computes an expiration countdown (messages expire 7 days after creation).
     """
-    messages_qs = PeerMessage.objects.filter(receiver=request.user).order_by("created_at")
-    message_list = []
-    now = timezone.now()
-    for msg in messages_qs:
-        # Mark message as read and update read receipt
-        if not msg.is_read:
-            msg.is_read = True
-            msg.read_at = now
-            msg.save(update_fields=["is_read", "read_at"])
-        try:
-            decrypted_message = decrypt_message_with_random_key(msg.content, msg.encrypted_key)
-        except Exception:
-            decrypted_message = "[Error decrypting message]"
-        expires_at = msg.created_at + timezone.timedelta(days=7)
-        time_remaining = expires_at - now
-        days = time_remaining.days
-        hours, remainder = divmod(time_remaining.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
-        expiration_str = f"{days}d {hours}h {minutes}m"
-        message_list.append(
-            {
-                "id": msg.id,
-                "sender": msg.sender.username,
-                "content": decrypted_message,
-                "sent_at": msg.created_at.isoformat(),
-                "expires_in": expiration_str,
-                "starred": msg.starred,
-                "is_read": msg.is_read,
-            }
-        )
-    return render(request, "web/peer/inbox.html", {"messages": message_list})
+    return render(request, "web/peer/inbox.html", get_inbox_page(request))
 
 
 @login_required
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+from django.db import connection
+from django.utils import timezone
+
+from web.models import Enrollment, Session, SessionAttendance, VirtualClassroomParticipant
+from web.signals import invalidate_progress_caches
+
+ATTENDANCE_STATUSES = {value for value, _ in SessionAttendance.STATUS_CHOICES}
+
+
+def todays_session(classroom, create=True):
+    """
+    Return the classroom's session for today, creating "Class on YYYY-MM-DD" when there is
+    none and ``create`` is set.
+    """
+    today = timezone.now().date()
+    today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    today_end = timezone.make_aware(datetime.combine(today, datetime.max.time()))
+    title = f"Class on {today.strftime('%Y-%m-%d')}"
+
+    if classroom.course:
+        session = Session.objects.filter(course=classroom.course, start_time__range=(today_start, today_end)).first()
+    else:
+        session = Session.objects.filter(
+            title=title, start_time__range=(today_start, today_end), course__isnull=True
+        ).first()
+    if session is None and create:
+        session = Session.objects.create(
+            course=classroom.course, title=title, start_time=today_start, end_time=today_end
+        )
+    return session
+
+
+def enrolled_student_ids(classroom, student_ids):
+    """Return which of ``student_ids`` may have attendance taken in the classroom, in one query."""
+    if classroom.course:
+        enrolled = Enrollment.objects.filter(course=classroom.course, status="approved", student_id__in=student_ids)
+        return set(enrolled.values_list("student_id", flat=True))
+    participants = VirtualClassroomParticipant.objects.filter(classroom=classroom, user_id__in=student_ids)
+    return set(participants.values_list("user_id", flat=True))
+
+
+def bulk_mark_attendance(session, entries):
+    """
+    Upsert attendance for many students of one session.
+
+    ``entries`` maps student id to ``(status, notes)``; notes of None keep what is stored.
+    Rows are written with one upsert per group, which bypasses the
+    SessionAttendance signals, so the students' progress caches are cleared here in one call.
+    Returns the number of students written.
+    """
+    with_notes = [
+        SessionAttendance(session=session, student_id=student_id, status=status, notes=notes)
+        for student_id, (status, notes) in entries.items()
+        if notes is not None
+    ]
+    without_notes = [
+        SessionAttendance(session=session, student_id=student_id, status=status)
+        for student_id, (status, notes) in entries.items()
+        if notes is None
+    ]
+    # MySQL's ON DUPLICATE KEY UPDATE matches on the (session, student) unique key by itself and
+    # rejects an explicit conflict target
+    unique_fields = ["session", "student"] if connection.features.supports_update_conflicts_with_target else None
+    for rows, update_fields in (
+        (with_notes, ["status", "notes", "updated_at"]),
+        (without_notes, ["status", "updated_at"]),
+    ):
+        if rows:
+            SessionAttendance.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=unique_fields, update_fields=update_fields
+            )
+    invalidate_progress_caches(entries)
+    return len(entries)
@@ -0,0 +1,129 @@
+"""
+Content-addressed avatar rendering.
+
+An avatar is fully described by its attribute tuple, so the rendered SVG is stored under a
+hash of that tuple: identical configurations, whether previewed while customizing or saved
+on a profile, are rendered by python_avatars once. The avatar_image endpoint serves the
+rendering by hash with immutable cache headers.
+"""
+
+import hashlib
+import json
+import re
+
+from django.core.cache import cache
+from django.urls import reverse
+from python_avatars import (
+    AccessoryType,
+)
+from python_avatars import Avatar as PythonAvatar
+from python_avatars import (
+    AvatarStyle,
+    ClothingType,
+    EyebrowType,
+    EyeType,
+    FacialHairType,
+    HairType,
+    MouthType,
+    NoseType,
+    SkinColor,
+)
+
+from web.models import Avatar
+
+try:
+    import cairosvg
+except ImportError:  # PNG output is only offered where cairosvg is installed
+    cairosvg = None
+
+# (attribute, python_avatars enum or None for a colour, default)
+AVATAR_ATTRIBUTES = [
+    ("style", AvatarStyle, AvatarStyle.CIRCLE),
+    ("background_color", None, "#FFFFFF"),
+    ("top", HairType, HairType.SHORT_FLAT),
+    ("eyebrows", EyebrowType, EyebrowType.DEFAULT),
+    ("eyes", EyeType, EyeType.DEFAULT),
+    ("nose", NoseType, NoseType.DEFAULT),
+    ("mouth", MouthType, MouthType.DEFAULT),
+    ("facial_hair", FacialHairType, FacialHairType.NONE),
+    ("skin_color", SkinColor, SkinColor.LIGHT),
+    ("hair_color", None, "#000000"),
+    ("accessory", AccessoryType, AccessoryType.NONE),
+    ("clothing", ClothingType, ClothingType.HOODIE),
+    ("clothing_color", None, "#0000FF"),
+]
+AVATAR_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+AVATAR_KEY_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def avatar_attributes(values):
+    """
+    Normalize ``values`` (a mapping or an Avatar model) to the attribute tuple that is hashed.
+
+    Unknown enum names fall back to the default, as python_avatars would, so they share the
+    default's rendering.
+    """
+    get = values.get if hasattr(values, "get") else lambda name, default: getattr(values, name, default)
+    attributes = []
+    for name, enum, default in AVATAR_ATTRIBUTES:
+        value = get(name, None) or (default.name if enum else default)
+        if enum:
+            value = enum.__members__.get(str(value).upper(), default).name.lower()
+        attributes.append(str(value))
+    return tuple(attributes)
+
+
+def avatar_key(attributes):
+    return hashlib.sha256(json.dumps(attributes).encode()).hexdigest()[:32]
+
+
+def avatar_image_url(key, fmt="svg"):
+    url = reverse("avatar_image", args=[key])
+    return f"{url}?format=png" if fmt == "png" else url
+
+
+def minify_svg(svg):
+    svg = re.sub(r"<!--.*?-->", "", svg, flags=re.S)
+    return re.sub(r">\s+<", "><", svg).strip()
+
+
+def _cache_key(key, fmt="svg"):
+    return f"avatar_{fmt}_{key}"
+
+
+def render_avatar(attributes):
+    """Return (key, minified SVG) for ``attributes``, rendering only on a cache miss."""
+    key = avatar_key(attributes)
+    svg = cache.get(_cache_key(key))
+    if svg is None:
+        kwargs = {}
+        for (name, enum, _), value in zip(AVATAR_ATTRIBUTES, attributes):
+            kwargs[name] = enum.__members__[value.upper()] if enum else value
+        svg = minify_svg(PythonAvatar(**kwargs).render())
+        cache.set(_cache_key(key), svg, AVATAR_CACHE_TIMEOUT)
+    return key, svg
+
+
+def cached_avatar_svg(key):
+    """The SVG for ``key``, falling back to a saved avatar once the cache has evicted it."""
+    svg = cache.get(_cache_key(key))
+    if svg is None:
+        svg = Avatar.objects.filter(attributes_hash=key).exclude(svg="").values_list("svg", flat=True).first()
+        if svg is None:
+            return None
+        cache.set(_cache_key(key), svg, AVATAR_CACHE_TIMEOUT)
+    return svg
+
+
+def cached_avatar_png(key):
+    """PNG rendering of ``key``, or None when the avatar is unknown or cairosvg is missing."""
+    if cairosvg is None:
+        return None
+    png = cache.get(_cache_key(key, "png"))
+    if png is None:
+        svg = cached_avatar_svg(key)
+        if svg is None:
+            return None
+        png = cairosvg.svg2png(bytestring=svg.encode("utf-8"))
+        cache.set(_cache_key(key, "png"), png, AVATAR_CACHE_TIMEOUT)
+    return png
@@ -0,0 +1,349 @@
+"""
+Declarative badge and achievement rules, evaluated over sets of objects.
+
+Each rule names the event that triggers it and the model whose rows it looks at. Given a
+batch of those rows it returns the grants they qualify for using a fixed number of queries;
+apply_grants then drops grants users already have and bulk-creates the rest together with
+their notifications. Signals run the rules for the one object that changed and the
+backfill_badges command runs them over every object in batches.
+"""
+
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from web.models import (
+    Achievement,
+    Badge,
+    ChallengeSubmission,
+    Enrollment,
+    LearningStreak,
+    Notification,
+    UserBadge,
+    UserQuiz,
+)
+from web.services.header_summary import header_summary_cache_key
+
+BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class BadgeGrant:
+    user_id: int
+    badge_id: int
+    badge_name: str
+    award_method: str
+    message: str
+    challenge_submission_id: int | None = None
+    course_enrollment_id: int | None = None
+
+
+@dataclass(frozen=True)
+class AchievementGrant:
+    student_id: int
+    course_id: int | None
+    achievement_type: str
+    title: str
+    description: str
+    badge_icon: str
+    criteria_threshold: int | None = None
+
+
+class Rule:
+    """A badge rule: ``evaluate(ids)`` returns the grants earned by those ``model`` rows."""
+
+    event = None
+    model = None
+    subject_filter = Q()
+
+    def subjects(self):
+        return self.model.objects.filter(self.subject_filter)
+
+    def evaluate(self, ids):
+        raise NotImplementedError
+
+
+class ChallengeBadgeRule(Rule):
+    """Active challenge badges for everyone who submitted to the challenge."""
+
+    event = "challenge_submitted"
+    model = ChallengeSubmission
+
+    def evaluate(self, ids):
+        submissions = list(
+            ChallengeSubmission.objects.filter(pk__in=ids).values_list(
+                "id", "user_id", "challenge_id", "challenge__title"
+            )
+        )
+        badges = {}
+        for badge_id, challenge_id, name in Badge.objects.filter(
+            badge_type="challenge", is_active=True, challenge_id__in={s[2] for s in submissions}
+        ).values_list("id", "challenge_id", "name"):
+            badges.setdefault(challenge_id, []).append((badge_id, name))
+        return [
+            BadgeGrant(
+                user_id=user_id,
+                badge_id=badge_id,
+                badge_name=name,
+                award_method="challenge_completion",
+                message=f"Congrats! You've earned {name} for completing {challenge_title}",
+                challenge_submission_id=submission_id,
+            )
+            for submission_id, user_id, challenge_id, challenge_title in submissions
+            for badge_id, name in badges.get(challenge_id, ())
+        ]
+
+
+class CourseBadgeRule(Rule):
+    """Active course badges for students whose enrollment is completed."""
+
+    event = "enrollment_completed"
+    model = Enrollment
+    subject_filter = Q(status="completed")
+
+    def evaluate(self, ids):
+        enrollments = list(
+            Enrollment.objects.filter(self.subject_filter, pk__in=ids).values_list(
+                "id", "student_id", "course_id", "course__title"
+            )
+        )
+        badges = {}
+        for badge_id, course_id, name in Badge.objects.filter(
+            badge_type="course", is_active=True, course_id__in={e[2] for e in enrollments}
+        ).values_list("id", "course_id", "name"):
+            badges.setdefault(course_id, []).append((badge_id, name))
+        return [
+            BadgeGrant(
+                user_id=student_id,
+                badge_id=badge_id,
+                badge_name=name,
+                award_method="course_completion",
+                message=f"Congrats! You've earned {name} for completing {course_title}",
+                course_enrollment_id=enrollment_id,
+            )
+            for enrollment_id, student_id, course_id, course_title in enrollments
+            for badge_id, name in badges.get(course_id, ())
+        ]
+
+
+class CourseCompletionAchievementRule(Rule):
+    """'Course Completed!' once every session of a course is in the student's progress."""
+
+    event = "course_progress"
+    model = Enrollment
+    subject_filter = Q(progress__isnull=False)
+
+    def evaluate(self, ids):
+        completed = (
+            Enrollment.objects.filter(pk__in=ids)
+            .annotate(
+                total_sessions=Count("course__sessions", distinct=True),
+                done_sessions=Count("progress__completed_sessions", distinct=True),
+            )
+            .filter(total_sessions__gt=0, done_sessions__gte=F("total_sessions"))
+            .values_list("student_id", "course_id", "course__title")
+        )
+        return [
+            AchievementGrant(
+                student_id=student_id,
+                course_id=course_id,
+                achievement_type="completion",
+                title="Course Completed!",
+                description=f"Congratulations! You have completed the course '{course_title}'.",
+                badge_icon="fas fa-graduation-cap",
+                criteria_threshold=100,
+            )
+            for student_id, course_id, course_title in completed
+        ]
+
+
+class StreakAchievementRule(Rule):
+    """The highest learning streak tier a user's current streak has reached."""
+
+    event = "streak_updated"
+    model = LearningStreak
+    subject_filter = Q(current_streak__gte=7)
+    tiers = [
+        (30, "30-Day Learning Streak", "Amazing! You've maintained a 30-day learning streak."),
+        (7, "7-Day Learning Streak", "Great work! You've maintained a 7-day learning streak."),
+    ]
+
+    def evaluate(self, ids):
+        grants = []
+        for user_id, current_streak in LearningStreak.objects.filter(pk__in=ids).values_list(
+            "user_id", "current_streak"
+        ):
+            for threshold, title, description in self.tiers:
+                if current_streak >= threshold:
+                    grants.append(
+                        AchievementGrant(
+                            student_id=user_id,
+                            course_id=None,
+                            achievement_type="streak",
+                            title=title,
+                            description=description,
+                            badge_icon="fas fa-fire",
+                            criteria_threshold=threshold,
+                        )
+                    )
+                    break
+        return grants
+
+
+class QuizScoreAchievementRule(Rule):
+    """'High Quiz Score!' for a completed quiz attempt scoring at least 90%."""
+
+    event = "quiz_completed"
+    model = UserQuiz
+    threshold = 90
+    subject_filter = Q(completed=True, user__isnull=False, max_score__gt=0)
+
+    def evaluate(self, ids):
+        attempts = (
+            UserQuiz.objects.filter(self.subject_filter, pk__in=ids)
+            .alias(score_percent=F("score") * 100)
+            .filter(score_percent__gte=F("max_score") * self.threshold)
+            .order_by("user_id", "-score")
+            .values_list("user_id", "score", "max_score", "quiz__title")
+        )
+        grants = {}
+        for user_id, score, max_score, quiz_title in attempts:
+            grants.setdefault(user_id, high_quiz_score_grant(user_id, quiz_title, round(score * 100 / max_score)))
+        return list(grants.values())
+
+
+def high_quiz_score_grant(user_id, quiz_title, score):
+    return AchievementGrant(
+        student_id=user_id,
+        course_id=None,
+        achievement_type="quiz",
+        title="High Quiz Score!",
+        description=f"You scored {score}% on the quiz '{quiz_title}'. Great job!",
+        badge_icon="fas fa-medal",
+        criteria_threshold=QuizScoreAchievementRule.threshold,
+    )
+
+
+RULES = [
+    ChallengeBadgeRule(),
+    CourseBadgeRule(),
+    CourseCompletionAchievementRule(),
+    StreakAchievementRule(),
+    QuizScoreAchievementRule(),
+]
+
+
+def rules_for(event):
+    return [rule for rule in RULES if rule.event == event]
+
+
+def apply_grants(grants):
+    """
+    Create the badges and achievements in ``grants`` that users do not already have.
+
+    Existing awards are found with one query per kind, new rows and their notifications are
+    bulk-created, and the affected users' header summaries are cleared in one call.
+    Returns (badges awarded, achievements awarded).
+    """
+    badge_grants = [g for g in grants if isinstance(g, BadgeGrant)]
+    achievement_grants = [g for g in grants if isinstance(g, AchievementGrant)]
+
+    new_badges = {}
+    if badge_grants:
+        existing = set(
+            UserBadge.objects.filter(
+                user_id__in={g.user_id for g in badge_grants}, badge_id__in={g.badge_id for g in badge_grants}
+            ).values_list("user_id", "badge_id")
+        )
+        for grant in badge_grants:
+            key = (grant.user_id, grant.badge_id)
+            if key not in existing:
+                new_badges.setdefault(key, grant)
+
+    new_achievements = {}
+    if achievement_grants:
+        existing = set(
+            Achievement.objects.filter(
+                student_id__in={g.student_id for g in achievement_grants},
+                achievement_type__in={g.achievement_type for g in achievement_grants},
+            ).values_list("student_id", "course_id", "achievement_type", "title")
+        )
+        for grant in achievement_grants:
+            key = (grant.student_id, grant.course_id, grant.achievement_type, grant.title)
+            if key not in existing:
+                new_achievements.setdefault(key, grant)
+
+    UserBadge.objects.bulk_create(
+        [
+            UserBadge(
+                user_id=grant.user_id,
+                badge_id=grant.badge_id,
+                award_method=grant.award_method,
+                challenge_submission_id=grant.challenge_submission_id,
+                course_enrollment_id=grant.course_enrollment_id,
+            )
+            for grant in new_badges.values()
+        ],
+        ignore_conflicts=True,
+    )
+    Achievement.objects.bulk_create(
+        [
+            Achievement(
+                student_id=grant.student_id,
+                course_id=grant.course_id,
+                achievement_type=grant.achievement_type,
+                title=grant.title,
+                description=grant.description,
+                badge_icon=grant.badge_icon,
+                criteria_threshold=grant.criteria_threshold,
+            )
+            for grant in new_achievements.values()
+        ]
+    )
+    Notification.objects.bulk_create(
+        [
+            Notification(
+                user_id=grant.user_id,
+                title=f"New Badge: {grant.badge_name}",
+                message=grant.message,
+                notification_type="success",
+            )
+            for grant in new_badges.values()
+        ]
+    )
+    if new_badges:
+        # bulk_create skips post_save, so refresh the header badges here
+        cache.delete_many([header_summary_cache_key(user_id=user_id) for user_id, _ in new_badges])
+    return len(new_badges), len(new_achievements)
+
+
+def run_rules(event, ids):
+    """Evaluate every rule for ``event`` over the given object ids and apply the grants."""
+    grants = []
+    for rule in rules_for(event):
+        grants.extend(rule.evaluate(ids))
+    return apply_grants(grants) if grants else (0, 0)
+
+
+def backfill(rules=None, batch_size=BATCH_SIZE):
+    """
+    Evaluate ``rules`` (default: all) over every matching object, paging through ids in
+    batches of ``batch_size``.
+    Returns {rule class name: (badges awarded, achievements awarded)}.
+    """
+    results = {}
+    for rule in rules or RULES:
+        badges = achievements = 0
+        last_id = 0
+        while batch := list(
+            rule.subjects().filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+        ):
+            last_id = batch[-1]
+            grants = rule.evaluate(batch)
+            if grants:
+                awarded = apply_grants(grants)
+                badges += awarded[0]
+                achievements += awarded[1]
+        results[type(rule).__name__] = (badges, achievements)
+    return results
@@ -0,0 +1,190 @@
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+from googleapiclient.errors import HttpError
+
+from web.calendar_sync import calendar_event_id, google_calendar_api, session_event_body
+from web.models import CalendarSyncJob, Session
+
+logger = logging.getLogger(__name__)
+
+# Google recommends at most 50 calls per Calendar batch request
+BATCH_SIZE = 50
+MAX_JOB_ATTEMPTS = 5
+RETRY_BACKOFF = timedelta(minutes=5)
+
+
+def enqueue_calendar_sync(session, action):
+    """
+    Record that a session's calendar event needs creating, updating or deleting.
+
+    One job is kept per session: an update while a create is still pending stays a create, and a
+    delete replaces anything pending. Deleting a session that never got an event, and has no
+    create queued, is a no-op.
+    """
+    job = CalendarSyncJob.objects.filter(session_id=session.pk).first()
+    pending_action = job.action if job and job.status == "pending" else None
+    event_id = ""
+
+    if action == "update" and (pending_action == "create" or not session.meeting_id):
+        action = "create"
+    elif action == "delete":
+        event_id = session.meeting_id or (calendar_event_id(session.pk) if pending_action == "create" else "")
+        if not event_id:
+            if job:
+                job.delete()
+            return
+
+    CalendarSyncJob.objects.update_or_create(
+        session_id=session.pk,
+        defaults={
+            "action": action,
+            "event_id": event_id,
+            "status": "pending",
+            "attempts": 0,
+            "last_error": "",
+            "run_after": timezone.now(),
+        },
+    )
+
+
+def pending_jobs():
+    return CalendarSyncJob.objects.filter(status="pending", run_after__lte=timezone.now()).order_by("run_after")
+
+
+def _build_request(service, job, session):
+    events = service.events()
+    if job.action == "delete":
+        return events.delete(calendarId="primary", eventId=job.event_id)
+    conference_version = 1 if session.is_virtual else 0
+    if job.action == "create":
+        return events.insert(
+            calendarId="primary",
+            body=session_event_body(session, event_id=calendar_event_id(session.pk)),
+            conferenceDataVersion=conference_version,
+        )
+    return events.update(
+        calendarId="primary",
+        eventId=session.meeting_id,
+        body=session_event_body(session),
+        conferenceDataVersion=conference_version,
+    )
+
+
+def _finish(job):
+    """Remove a completed job unless the session was changed again while the batch was in flight."""
+    CalendarSyncJob.objects.filter(pk=job.pk, updated_at=job.updated_at).delete()
+
+
+def _requeue(job, action, reason):
+    """
+    Switch a job to ``action`` and run it again straight away. The switch counts as an attempt,
+    so an event that keeps bouncing between create and update ends up failed instead of looping.
+    Returns the job's new status.
+    """
+    attempts = job.attempts + 1
+    status = "failed" if attempts >= MAX_JOB_ATTEMPTS else "pending"
+    CalendarSyncJob.objects.filter(pk=job.pk, updated_at=job.updated_at).update(
+        action=action,
+        attempts=attempts,
+        status=status,
+        last_error=reason,
+        run_after=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    return status
+
+
+def _record_failure(job, error, stats):
+    job.attempts += 1
+    job.last_error = str(error)[:500]
+    if job.attempts >= MAX_JOB_ATTEMPTS:
+        job.status = "failed"
+        stats["failed"] += 1
+    else:
+        job.run_after = timezone.now() + RETRY_BACKOFF * job.attempts
+        stats["retried"] += 1
+    job.save(update_fields=["attempts", "last_error", "status", "run_after", "updated_at"])
+
+
+def _handle_result(job, response, exception, stats):
+    status = exception.resp.status if isinstance(exception, HttpError) else None
+
+    if exception is None or (job.action == "create" and status == 409):
+        # A 409 means an earlier attempt already inserted the event under its deterministic id
+        if job.action == "create":
+            event_id = (response or {}).get("id") or calendar_event_id(job.session_id)
+            Session.objects.filter(pk=job.session_id).update(meeting_id=event_id)
+            if status == 409:
+                # The existing event may predate later edits, so push the current details too
+                if _requeue(job, "update", "Event already existed; updating it") == "failed":
+                    stats["failed"] += 1
+                else:
+                    stats["synced"] += 1
+                return
+        _finish(job)
+        stats["synced"] += 1
+    elif job.action == "delete" and status in (404, 410):
+        _finish(job)
+        stats["synced"] += 1
+    elif job.action == "update" and status in (404, 410):
+        # The event was removed on the calendar side; create it again
+        Session.objects.filter(pk=job.session_id).update(meeting_id="")
+        if _requeue(job, "create", "Event was missing; creating it again") == "failed":
+            stats["failed"] += 1
+        else:
+            stats["retried"] += 1
+    else:
+        logger.error(f"Calendar {job.action} failed for session {job.session_id}: {exception}")
+        _record_failure(job, exception, stats)
+
+
+def process_calendar_queue(limit=200, service=None):
+    """
+    Send up to ``limit`` pending calendar jobs through the Calendar batch endpoint, BATCH_SIZE
+    calls per HTTP request. Event ids are derived from session ids, so a retried insert is
+    idempotent. Returns a dict of counts keyed by outcome; nothing is sent when calendar
+    credentials are not configured.
+    """
+    stats = {"synced": 0, "retried": 0, "failed": 0, "skipped": 0}
+    jobs = list(pending_jobs()[:limit])
+    if not jobs:
+        return stats
+
+    service = service or google_calendar_api()
+    if not service:
+        logger.warning("Google Calendar is not configured; leaving calendar sync jobs queued")
+        stats["skipped"] = len(jobs)
+        return stats
+
+    sessions = Session.objects.select_related("course").in_bulk([job.session_id for job in jobs])
+    for start in range(0, len(jobs), BATCH_SIZE):
+        chunk = {}
+        results = {}
+        batch = service.new_batch_http_request(
+            callback=lambda request_id, response, exception: results.__setitem__(request_id, (response, exception))
+        )
+        for job in jobs[start : start + BATCH_SIZE]:
+            session = sessions.get(job.session_id)
+            if job.action != "delete" and session is None:
+                job.delete()
+                continue
+            chunk[str(job.pk)] = job
+            batch.add(_build_request(service, job, session), request_id=str(job.pk))
+        if not chunk:
+            continue
+
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.error(f"Calendar batch request failed: {e}")
+            for job in chunk.values():
+                _record_failure(job, e, stats)
+            continue
+
+        for request_id, job in chunk.items():
+            response, exception = results.get(request_id, (None, RuntimeError("No response in batch")))
+            _handle_result(job, response, exception, stats)
+
+    return stats
@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+ZERO = Decimal("0.00")
+
+
+@dataclass(frozen=True)
+class PricedLine:
+    """A cart item with its list price and the goods discount applied to it."""
+
+    item: object
+    price: Decimal
+    discount: Decimal
+
+    @property
+    def final_price(self):
+        return self.price - self.discount
+
+    @property
+    def kind(self):
+        if self.item.course_id:
+            return "course"
+        if self.item.session_id:
+            return "session"
+        return "goods"
+
+
+@dataclass(frozen=True)
+class CartPricing:
+    """Immutable priced view of a cart, built from a single query over its items."""
+
+    lines: tuple
+    subtotal: Decimal
+    discount_total: Decimal
+    total: Decimal
+    has_goods: bool
+
+    @property
+    def items(self):
+        return tuple(line.item for line in self.lines)
+
+    @property
+    def item_count(self):
+        return len(self.lines)
+
+    @property
+    def is_empty(self):
+        return not self.lines
+
+    @property
+    def amount_cents(self):
+        return int(self.total * 100)
+
+
+def price_item(item):
+    """Price one cart item whose course, session or goods are already loaded."""
+    if item.course_id:
+        price = item.course.price
+    elif item.session_id:
+        price = item.session.price or ZERO
+    elif item.goods_id:
+        price = item.goods.price
+    else:
+        price = ZERO
+    discount = ZERO
+    if item.goods_id and item.goods.discount_price:
+        discount = item.goods.price - item.goods.discount_price
+    return PricedLine(item=item, price=Decimal(price), discount=Decimal(discount))
+
+
+def price_cart(cart):
+    """Load the cart's items with everything needed to price and display them, and return a CartPricing."""
+    items = cart.items.select_related(
+        "course__teacher",
+        "session__course__teacher",
+        "goods__storefront",
+    ).order_by("id")
+    lines = tuple(price_item(item) for item in items)
+    subtotal = sum((line.price for line in lines), ZERO)
+    discount_total = sum((line.discount for line in lines), ZERO)
+    return CartPricing(
+        lines=lines,
+        subtotal=subtotal,
+        discount_total=discount_total,
+        total=subtotal - discount_total,
+        has_goods=any(line.item.goods_id for line in lines),
+    )
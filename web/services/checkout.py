@@ -0,0 +1,263 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from web.models import (
+    CourseProgress,
+    Discount,
+    Enrollment,
+    Goods,
+    Order,
+    OrderItem,
+    Payment,
+    SessionEnrollment,
+)
+from web.notifications import queue_enrollment_emails
+from web.services.cart_pricing import price_cart
+from web.signals import invalidate_progress_cache
+
+ZERO = Decimal("0.00")
+
+
+class InsufficientStockError(Exception):
+    """Raised when a cart contains goods that are out of stock; nothing is fulfilled."""
+
+    def __init__(self, goods):
+        self.goods = goods
+        names = ", ".join(item.name for item in goods)
+        super().__init__(f"Out of stock: {names}")
+
+
+@dataclass(frozen=True)
+class Fulfilment:
+    """The order and records created for one checkout, as shown on the receipt."""
+
+    order: Order
+    enrollments: list
+    session_enrollments: list
+    goods_items: list
+    total: Decimal
+    created: bool
+
+
+def get_fulfilment(payment_intent_id):
+    """Return the Fulfilment already recorded for a payment intent, or None."""
+    if not payment_intent_id:
+        return None
+    order = Order.objects.select_related("user").filter(payment_intent_id=payment_intent_id).first()
+    if order is None:
+        return None
+    return Fulfilment(
+        order=order,
+        enrollments=list(
+            Enrollment.objects.filter(student=order.user, payment_intent_id=payment_intent_id).select_related(
+                "course__teacher"
+            )
+        ),
+        session_enrollments=list(
+            SessionEnrollment.objects.filter(student=order.user, payment_intent_id=payment_intent_id).select_related(
+                "session__course"
+            )
+        ),
+        goods_items=list(order.items.select_related("goods")),
+        total=order.total_price,
+        created=False,
+    )
+
+
+def shipping_address_from_intent(payment_intent):
+    """The structured shipping address collected by Stripe for a PaymentIntent, or None."""
+    shipping_data = getattr(payment_intent, "shipping", None)
+    if not shipping_data:
+        return None
+    return {
+        "line1": shipping_data.address.line1,
+        "line2": shipping_data.address.line2 or "",
+        "city": shipping_data.address.city,
+        "state": shipping_data.address.state,
+        "postal_code": shipping_data.address.postal_code,
+        "country": shipping_data.address.country,
+    }
+
+
+def fulfil_cart(cart, user, payment_intent_id="", shipping_address=None):
+    """
+    Turn a paid (or free) cart into an order, enrollments and order items, then empty it.
+
+    Everything is written in one transaction with bulk inserts, so the number of queries does
+    not grow with the cart. Fulfilment is idempotent per payment intent: the checkout redirect
+    and the Stripe webhook can both call this and only the first one creates records.
+    Returns a Fulfilment, or None when the cart is empty and nothing was fulfilled before.
+    """
+    existing = get_fulfilment(payment_intent_id)
+    if existing is not None:
+        return existing
+
+    try:
+        with transaction.atomic():
+            return _fulfil(cart, user, payment_intent_id, shipping_address)
+    except IntegrityError:
+        # A concurrent call for the same payment intent won the race
+        existing = get_fulfilment(payment_intent_id)
+        if existing is None:
+            raise
+        return existing
+
+
+def _fulfil(cart, user, payment_intent_id, shipping_address):
+    pricing = price_cart(cart)
+    if pricing.is_empty:
+        return None
+    now = timezone.now()
+
+    course_lines = [line for line in pricing.lines if line.kind == "course"]
+    session_lines = [line for line in pricing.lines if line.kind == "session"]
+    goods_lines = [line for line in pricing.lines if line.kind == "goods"]
+
+    # Lock tracked stock for every goods line in one query before writing anything
+    stocked = {
+        goods.id: goods
+        for goods in Goods.objects.select_for_update()
+        .filter(id__in=[line.item.goods_id for line in goods_lines], stock__isnull=False)
+        .only("id", "name", "stock")
+    }
+    sold_out = [goods for goods in stocked.values() if goods.stock < 1]
+    if sold_out:
+        raise InsufficientStockError(sold_out)
+
+    # Course coupons are applied at fulfilment, as before
+    discounts = {}
+    for discount in Discount.objects.filter(
+        user=user,
+        course_id__in=[line.item.course_id for line in course_lines],
+        used=False,
+        valid_until__gte=now,
+    ).order_by("id"):
+        discounts.setdefault(discount.course_id, discount)
+    course_prices = {}
+    for line in course_lines:
+        discount = discounts.get(line.item.course_id)
+        price = line.final_price
+        if discount:
+            price -= discount.discount_percentage / 100 * price
+        course_prices[line.item.course_id] = price
+
+    total = sum(course_prices.values(), ZERO) + sum((line.final_price for line in session_lines + goods_lines), ZERO)
+    storefront_id = goods_lines[0].item.goods.storefront_id if goods_lines else None
+    order = Order.objects.create(
+        user=user,
+        storefront_id=storefront_id,
+        total_price=total,
+        status="completed",
+        shipping_address=shipping_address,
+        terms_accepted=True,
+        payment_intent_id=payment_intent_id or None,
+    )
+
+    enrollments, new_enrollments = _enroll_in_courses(user, course_lines, payment_intent_id)
+    session_enrollments = _enroll_in_sessions(user, session_lines, payment_intent_id)
+
+    CourseProgress.objects.bulk_create(
+        [CourseProgress(enrollment=enrollment) for enrollment in new_enrollments], ignore_conflicts=True
+    )
+    if payment_intent_id:
+        Payment.objects.bulk_create(
+            [
+                Payment(
+                    enrollment=enrollment,
+                    amount=course_prices[enrollment.course_id],
+                    currency="USD",
+                    stripe_payment_intent_id=payment_intent_id,
+                    status="completed",
+                )
+                for enrollment in enrollments
+            ]
+        )
+    if discounts:
+        Discount.objects.filter(id__in=[discount.id for discount in discounts.values()]).update(used=True)
+
+    goods_items = OrderItem.objects.bulk_create(
+        [
+            OrderItem(
+                order=order,
+                goods=line.item.goods,
+                quantity=1,
+                price_at_purchase=line.item.goods.price,
+                discounted_price_at_purchase=line.item.goods.discount_price,
+            )
+            for line in goods_lines
+        ]
+    )
+    if stocked:
+        Goods.objects.filter(id__in=stocked).update(stock=F("stock") - 1)
+
+    queue_enrollment_emails(enrollments)
+    cart.items.all().delete()
+
+    # Bulk writes skip post_save, so refresh the student's cached progress here
+    invalidate_progress_cache(user)
+
+    return Fulfilment(
+        order=order,
+        enrollments=enrollments,
+        session_enrollments=session_enrollments,
+        goods_items=goods_items,
+        total=total,
+        created=True,
+    )
+
+
+def _enroll_in_courses(user, lines, payment_intent_id):
+    """Approve existing enrollments and bulk-create the missing ones. Returns (all, new)."""
+    courses = {line.item.course_id: line.item.course for line in lines}
+    existing = {
+        enrollment.course_id: enrollment
+        for enrollment in Enrollment.objects.filter(student=user, course_id__in=courses)
+    }
+    Enrollment.objects.filter(id__in=[e.id for e in existing.values()]).exclude(status="completed").update(
+        status="approved", payment_intent_id=payment_intent_id
+    )
+    new = Enrollment.objects.bulk_create(
+        [
+            Enrollment(student=user, course_id=course_id, status="approved", payment_intent_id=payment_intent_id)
+            for course_id in courses
+            if course_id not in existing
+        ]
+    )
+    enrollments = list(existing.values()) + new
+    for enrollment in enrollments:
+        enrollment.course = courses[enrollment.course_id]
+        if enrollment.status != "completed":
+            enrollment.status = "approved"
+            enrollment.payment_intent_id = payment_intent_id
+    return enrollments, new
+
+
+def _enroll_in_sessions(user, lines, payment_intent_id):
+    """Approve existing session enrollments and bulk-create the missing ones."""
+    sessions = {line.item.session_id: line.item.session for line in lines}
+    existing = {
+        enrollment.session_id: enrollment
+        for enrollment in SessionEnrollment.objects.filter(student=user, session_id__in=sessions)
+    }
+    SessionEnrollment.objects.filter(id__in=[e.id for e in existing.values()]).update(
+        status="approved", payment_intent_id=payment_intent_id
+    )
+    new = SessionEnrollment.objects.bulk_create(
+        [
+            SessionEnrollment(
+                student=user, session_id=session_id, status="approved", payment_intent_id=payment_intent_id
+            )
+            for session_id in sessions
+            if session_id not in existing
+        ]
+    )
+    enrollments = list(existing.values()) + new
+    for enrollment in enrollments:
+        enrollment.session = sessions[enrollment.session_id]
+        enrollment.status = "approved"
+        enrollment.payment_intent_id = payment_intent_id
+    return enrollments
@@ -0,0 +1,223 @@
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.utils import timezone
+
+from web.models import BlogComment, BlogPost, BlogPostTag
+from web.services.view_counts import view_counter
+
+CONTENT_CACHE_TIMEOUT = 60 * 60 * 24
+CONTENT_PAGE_SIZE = 9
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    id: int
+    slug: str
+    updated_at: datetime
+    tag_keys: tuple = ()
+
+
+@dataclass(frozen=True)
+class ContentIndex:
+    """Newest-first published entries of one model, rebuilt whenever any of its rows changes."""
+
+    entries: tuple
+    built_at: datetime
+    version: str
+    slugs: dict = field(default_factory=dict)
+
+    def get(self, slug):
+        entry = self.slugs.get(slug)
+        if entry is None:
+            raise Http404("No published entry matches the given slug.")
+        return entry
+
+
+@dataclass(frozen=True)
+class CommentThread:
+    comments: list
+    built_at: datetime
+
+
+def index_cache_key(model):
+    return f"content_index:{model._meta.model_name}"
+
+
+def object_cache_key(model, entry):
+    # Keyed by updated_at, so an edit simply stops reading the old copy instead of invalidating it
+    return f"content_object:{model._meta.model_name}:{entry.id}:{entry.updated_at.timestamp():.6f}"
+
+
+def comments_cache_key(post_id):
+    return f"content_comments:{post_id}"
+
+
+def get_content_index(model):
+    """Return the cached ContentIndex of a BlogPost or SuccessStory model's published rows."""
+    index = cache.get(index_cache_key(model))
+    if index is None:
+        rows = list(
+            model.objects.filter(status="published")
+            .order_by("-published_at", "-created_at")
+            .values_list("id", "slug", "updated_at")
+        )
+        tag_keys = defaultdict(list)
+        if model is BlogPost:
+            for post_id, key in BlogPostTag.objects.filter(post__status="published").values_list("post_id", "tag__key"):
+                tag_keys[post_id].append(key)
+        entries = tuple(IndexEntry(id, slug, updated_at, tuple(tag_keys[id])) for id, slug, updated_at in rows)
+        version = hashlib.md5(
+            "|".join(f"{e.id}:{e.updated_at.timestamp()}" for e in entries).encode(), usedforsecurity=False
+        ).hexdigest()
+        index = ContentIndex(
+            entries=entries,
+            built_at=timezone.now().replace(microsecond=0),
+            version=version,
+            slugs={entry.slug: entry for entry in entries},
+        )
+        cache.set(index_cache_key(model), index, CONTENT_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_content_index(model):
+    cache.delete(index_cache_key(model))
+
+
+def get_content_objects(model, entries):
+    """Return model instances (author selected) for index entries, in order, from the per-object cache."""
+    keys = {object_cache_key(model, entry): entry for entry in entries}
+    found = cache.get_many(keys)
+    missing = {entry.id: key for key, entry in keys.items() if key not in found}
+    if missing:
+        fetched = model.objects.select_related("author").in_bulk(missing)
+        fresh = {missing[pk]: obj for pk, obj in fetched.items()}
+        cache.set_many(fresh, CONTENT_CACHE_TIMEOUT)
+        found.update(fresh)
+    return [found[key] for key in keys if key in found]
+
+
+def get_content_object(model, slug):
+    """Return the published instance with ``slug`` from the per-object cache, or raise Http404."""
+    objects = get_content_objects(model, [get_content_index(model).get(slug)])
+    if not objects:
+        raise Http404("No published entry matches the given slug.")
+    return objects[0]
+
+
+def get_content_page(model, page_number, tag=None):
+    """Paginate the cached index (optionally by blog tag key) and load only the page's objects."""
+    entries = get_content_index(model).entries
+    if tag is not None:
+        entries = [entry for entry in entries if tag in entry.tag_keys]
+    page = Paginator(entries, CONTENT_PAGE_SIZE).get_page(page_number)
+    page.object_list = get_content_objects(model, page.object_list)
+    return page
+
+
+def get_approved_comments(post_id):
+    """Return the cached CommentThread of approved comments on a blog post."""
+    thread = cache.get(comments_cache_key(post_id))
+    if thread is None:
+        thread = CommentThread(
+            comments=list(
+                BlogComment.objects.filter(post_id=post_id, is_approved=True)
+                .select_related("author")
+                .order_by("created_at")
+            ),
+            built_at=timezone.now().replace(microsecond=0),
+        )
+        cache.set(comments_cache_key(post_id), thread, CONTENT_CACHE_TIMEOUT)
+    return thread
+
+
+def invalidate_comments(post_id):
+    cache.delete(comments_cache_key(post_id))
+
+
+def make_etag(*parts):
+    return hashlib.md5(":".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+
+
+# Conditional-response hooks for django.views.decorators.http.condition. Pages carry the
+# per-visitor header and CSRF token, so only requests with no user, session or CSRF cookie
+# get validators; everyone else always receives a fresh 200.
+
+
+def can_revalidate(request):
+    return not (
+        request.user.is_authenticated or request.session.session_key or settings.CSRF_COOKIE_NAME in request.COOKIES
+    )
+
+
+def content_list_etag(model):
+    def etag(request, tag=None):
+        if not can_revalidate(request):
+            return None
+        return make_etag(get_content_index(model).version, tag, request.GET.get("page", 1))
+
+    return etag
+
+
+def content_list_last_modified(model):
+    def last_modified(request, tag=None):
+        if not can_revalidate(request):
+            return None
+        return get_content_index(model).built_at
+
+    return last_modified
+
+
+def content_detail_etag(model):
+    def etag(request, slug):
+        if not can_revalidate(request):
+            return None
+        index = get_content_index(model)
+        entry = index.slugs.get(slug)
+        if entry is None:
+            return None
+        if model is BlogPost:
+            comments = get_approved_comments(entry.id).comments
+            return make_etag(entry.id, entry.updated_at.timestamp(), len(comments), comments[-1].id if comments else 0)
+        # Success stories also list related stories, so any published change refreshes them
+        return make_etag(entry.id, index.version)
+
+    return etag
+
+
+def content_detail_last_modified(model):
+    def last_modified(request, slug):
+        if not can_revalidate(request):
+            return None
+        index = get_content_index(model)
+        entry = index.slugs.get(slug)
+        if entry is None:
+            return None
+        if model is BlogPost:
+            return max(index.built_at, get_approved_comments(entry.id).built_at)
+        return index.built_at
+
+    return last_modified
+
+
+def count_not_modified_views(model):
+    """Count a view of a detail page that its conditional decorator answered with 304 Not Modified."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, slug, *args, **kwargs):
+            response = view(request, slug, *args, **kwargs)
+            if response.status_code == 304:
+                view_counter.record(get_content_object(model, slug))
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,281 @@
+"""
+The jobs run_daily runs, their dependencies, and the history of their runs.
+
+Jobs are management commands. A job starts once every job it runs ``after`` has succeeded,
+and jobs that are ready at the same time run side by side in a process pool. A failed job
+only takes down the jobs that depend on it. Each run is stored as a DailyJobRun with its
+duration, the rows it inserted, updated or deleted, its output and any error. A job runs
+while holding its DailyJobLock row, so a job that is still running from an overlapping
+invocation is skipped rather than started twice.
+"""
+
+import logging
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import timedelta
+from io import StringIO
+
+import django
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+
+from web.models import DailyJobLock, DailyJobRun
+
+logger = logging.getLogger(__name__)
+
+HISTORY_RUNS = 14
+MAX_OUTPUT = 10000
+
+
+@dataclass(frozen=True)
+class DailyJob:
+    name: str
+    after: tuple = ()
+    # A lock older than this is taken to be from a crashed worker and no longer blocks the job
+    timeout: timedelta = timedelta(hours=1)
+    options: dict = field(default_factory=dict)
+
+
+# Queues with an education-website-worker@ --loop unit (see ansible/playbook.yml) are drained
+# there and not here, so two runners never pick up the same rows.
+DAILY_JOBS = [
+    DailyJob("roll_forward_sessions"),
+    DailyJob("send_session_reminders", after=("roll_forward_sessions",)),
+    DailyJob("send_verification_reminders"),
+    DailyJob("cleanup_abandoned_drafts"),
+    DailyJob("purge_expired_messages"),
+    DailyJob("sync_github", timeout=timedelta(hours=2)),
+    DailyJob("collect_social_stats"),
+    DailyJob(
+        "snapshot_model_counts", after=("roll_forward_sessions", "cleanup_abandoned_drafts", "purge_expired_messages")
+    ),
+]
+
+
+def validate_jobs(jobs):
+    """Raise ValueError for duplicate names, unknown dependencies or dependency cycles."""
+    by_name = {job.name: job for job in jobs}
+    if len(by_name) != len(jobs):
+        raise ValueError("Daily job names must be unique")
+    for job in jobs:
+        unknown = set(job.after) - set(by_name)
+        if unknown:
+            raise ValueError(f"{job.name} runs after unknown jobs: {', '.join(sorted(unknown))}")
+
+    done = set()
+    remaining = list(jobs)
+    while remaining:
+        ready = [job for job in remaining if set(job.after) <= done]
+        if not ready:
+            raise ValueError(f"Daily jobs have a dependency cycle: {', '.join(job.name for job in remaining)}")
+        done.update(job.name for job in ready)
+        remaining = [job for job in remaining if job.name not in done]
+
+
+class RowCounter:
+    """Database execute wrapper that adds up the rows touched by INSERT, UPDATE and DELETE statements."""
+
+    def __init__(self):
+        self._rows = 0
+        self._returning = None
+
+    def _settle(self):
+        # Some backends only know a RETURNING statement's row count once its rows are fetched
+        if self._returning is not None:
+            self._rows += max(self._returning.rowcount, 0)
+            self._returning = None
+
+    @property
+    def rows(self):
+        self._settle()
+        return self._rows
+
+    def __call__(self, execute, sql, params, many, context):
+        self._settle()
+        result = execute(sql, params, many, context)
+        if sql.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE"):
+            if " RETURNING " in sql.upper():
+                self._returning = context["cursor"]
+            else:
+                self._rows += max(context["cursor"].rowcount, 0)
+        return result
+
+
+def release_abandoned_lock(job):
+    """Drop a lock that has outlived the job's timeout and fail its run, so the job can run again."""
+    cutoff = timezone.now() - job.timeout
+    DailyJobLock.objects.filter(job=job.name, acquired_at__lt=cutoff).delete()
+    return DailyJobRun.objects.filter(job=job.name, status="running", started_at__lt=cutoff).update(
+        status="failed", finished_at=timezone.now(), error="Abandoned: still running after the job timeout"
+    )
+
+
+def acquire_lock(job, batch):
+    """Insert the job's lock row; returns False when another invocation holds it."""
+    try:
+        with transaction.atomic():
+            DailyJobLock.objects.create(job=job.name, batch=batch)
+    except IntegrityError:
+        return False
+    return True
+
+
+def record_skip(job, batch, reason):
+    DailyJobRun.objects.create(job=job.name, batch=batch, status="skipped", finished_at=timezone.now(), error=reason)
+    return "skipped"
+
+
+def run_job(job, batch):
+    """Run one job under its lock and record the run. Returns the run's status."""
+    release_abandoned_lock(job)
+    if not acquire_lock(job, batch):
+        return record_skip(job, batch, "Already running")
+    try:
+        return _run_locked_job(job, batch)
+    finally:
+        DailyJobLock.objects.filter(job=job.name, batch=batch).delete()
+
+
+def _run_locked_job(job, batch):
+    run = DailyJobRun.objects.create(job=job.name, batch=batch)
+    out = StringIO()
+    counter = RowCounter()
+    started = time.monotonic()
+    try:
+        with connection.execute_wrapper(counter):
+            call_command(job.name, stdout=out, stderr=out, **job.options)
+        run.status = "succeeded"
+    except Exception as e:
+        logger.error(f"Daily job {job.name} failed: {e}")
+        run.status = "failed"
+        run.error = f"{type(e).__name__}: {e}"
+        out.write(traceback.format_exc())
+    run.duration = time.monotonic() - started
+    run.finished_at = timezone.now()
+    run.rows_touched = counter.rows
+    run.output = out.getvalue()[-MAX_OUTPUT:]
+    run.save()
+    return run.status
+
+
+class InlineExecutor:
+    """Runs submitted jobs one at a time in this process, for single-worker runs."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def job_executor(workers):
+    if workers <= 1:
+        return InlineExecutor()
+    # Worker processes must open their own database connections instead of sharing ours
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+
+
+def select_jobs(names, jobs=None):
+    """The named jobs, with dependencies on jobs outside the selection dropped."""
+    jobs = jobs or DAILY_JOBS
+    unknown = set(names) - {job.name for job in jobs}
+    if unknown:
+        raise ValueError(f"Unknown daily jobs: {', '.join(sorted(unknown))}")
+    return [
+        DailyJob(job.name, tuple(name for name in job.after if name in names), job.timeout, job.options)
+        for job in jobs
+        if job.name in names
+    ]
+
+
+def run_daily_jobs(jobs=None, workers=4, on_finish=None):
+    """
+    Run ``jobs`` (all DAILY_JOBS by default) in dependency order, up to ``workers`` at once.
+
+    ``on_finish(job, status)`` is called as each job finishes or is skipped. Returns a dict of
+    job name to status.
+    """
+    jobs = list(jobs or DAILY_JOBS)
+    validate_jobs(jobs)
+
+    batch = uuid.uuid4().hex
+    statuses = {}
+    pending = list(jobs)
+    running = {}
+
+    def finish(job, status):
+        statuses[job.name] = status
+        if on_finish:
+            on_finish(job, status)
+
+    with job_executor(workers) as executor:
+        while pending or running:
+            for job in list(pending):
+                if any(name not in statuses for name in job.after):
+                    continue
+                pending.remove(job)
+                failed = [name for name in job.after if statuses[name] != "succeeded"]
+                if failed:
+                    finish(job, record_skip(job, batch, f"Did not run because {', '.join(failed)} did not succeed"))
+                else:
+                    running[executor.submit(run_job, job, batch)] = job
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                try:
+                    status = future.result()
+                except Exception as e:
+                    # The worker process itself died; the run row is released by the job timeout
+                    logger.error(f"Daily job {job.name} worker failed: {e}")
+                    status = "failed"
+                finish(job, status)
+    return statuses
+
+
+def daily_job_stats(jobs=None):
+    """Per-job latest run and recent duration statistics, plus the wall time of the latest batch."""
+    rows = []
+    for job in jobs or DAILY_JOBS:
+        recent = list(DailyJobRun.objects.filter(job=job.name).order_by("-started_at")[:HISTORY_RUNS])
+        durations = [run.duration for run in recent if run.status == "succeeded"]
+        touched = [run.rows_touched for run in recent if run.status == "succeeded"]
+        rows.append(
+            {
+                "name": job.name,
+                "after": job.after,
+                "last_run": recent[0] if recent else None,
+                "avg_duration": sum(durations) / len(durations) if durations else None,
+                "max_duration": max(durations) if durations else None,
+                "avg_rows": sum(touched) / len(touched) if touched else None,
+                "failures": sum(run.status == "failed" for run in recent),
+            }
+        )
+
+    batch = None
+    last = DailyJobRun.objects.order_by("-started_at").first()
+    if last:
+        window = DailyJobRun.objects.filter(batch=last.batch).aggregate(
+            started=Min("started_at"), finished=Max("finished_at"), failed=Count("pk", filter=Q(status="failed"))
+        )
+        batch = {
+            "started_at": window["started"],
+            "duration": (window["finished"] - window["started"]).total_seconds() if window["finished"] else None,
+            "failed": window["failed"],
+        }
+    return {"jobs": rows, "batch": batch}
@@ -0,0 +1,91 @@
+import uuid
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"{}", uri="fake://calendar")
+
+
+class FakeRequest:
+    def __init__(self, operation):
+        self.operation = operation
+
+    def execute(self):
+        return self.operation()
+
+
+class FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def insert(self, calendarId, body, **kwargs):
+        def operation():
+            event_id = body.get("id") or uuid.uuid4().hex
+            # Google keeps the ids of deleted events reserved
+            if event_id in self.service.events_by_id or event_id in self.service.deleted_ids:
+                raise http_error(409)
+            self.service.events_by_id[event_id] = dict(body, id=event_id)
+            return self.service.events_by_id[event_id]
+
+        return FakeRequest(operation)
+
+    def update(self, calendarId, eventId, body, **kwargs):
+        def operation():
+            if eventId not in self.service.events_by_id:
+                raise http_error(404)
+            self.service.events_by_id[eventId] = dict(body, id=eventId)
+            return self.service.events_by_id[eventId]
+
+        return FakeRequest(operation)
+
+    def delete(self, calendarId, eventId, **kwargs):
+        def operation():
+            if self.service.events_by_id.pop(eventId, None) is None:
+                raise http_error(410)
+            self.service.deleted_ids.add(eventId)
+            return ""
+
+        return FakeRequest(operation)
+
+    def list(self, calendarId, **kwargs):
+        return FakeRequest(lambda: {"items": list(self.service.events_by_id.values())})
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id or str(len(self.requests)), request, callback or self.callback))
+
+    def execute(self):
+        self.service.batches.append(len(self.requests))
+        for request_id, request, callback in self.requests:
+            try:
+                response, exception = request.execute(), None
+            except HttpError as e:
+                response, exception = None, e
+            callback(request_id, response, exception)
+
+
+class FakeCalendarService:
+    """
+    In-memory stand-in for the Calendar API resource used by calendar sync, for tests and local
+    development. Events live in ``events_by_id`` and deleted ids in ``deleted_ids``; ``batches``
+    records the size of each batch sent.
+    """
+
+    def __init__(self):
+        self.events_by_id = {}
+        self.deleted_ids = set()
+        self.batches = []
+
+    def events(self):
+        return FakeEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
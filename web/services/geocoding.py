@@ -0,0 +1,214 @@
+import hashlib
+import logging
+import time
+from datetime import timedelta
+
+import requests
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from web.models import GeocodeCache, GeocodeJob, Session
+from web.services.session_map import bump_map_version
+
+logger = logging.getLogger(__name__)
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_HEADERS = {"User-Agent": "AlphaOneEducation/1.0 (support@alphaonelabs.com)"}
+NOMINATIM_TIMEOUT = 10
+
+# Nominatim's usage policy allows at most one request per second across all of our workers.
+NOMINATIM_RATE_PER_SECOND = 1.0
+NOMINATIM_BURST = 1
+
+# How long a "no results" answer is trusted before the address is looked up again.
+NEGATIVE_CACHE_TTL = timedelta(days=7)
+
+MAX_JOB_ATTEMPTS = 5
+RETRY_BACKOFF = timedelta(minutes=5)
+
+
+def normalize_address(address):
+    """Collapse whitespace and case so equivalent addresses share one cache row."""
+    return " ".join((address or "").split()).lower()
+
+
+def address_key(address):
+    """Return a stable key for an address; unlike hash() it is identical across processes."""
+    return hashlib.sha256(normalize_address(address).encode("utf-8")).hexdigest()
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter whose state lives in the Django cache, so every
+    worker process sharing the cache also shares the request budget.
+    """
+
+    def __init__(self, key, rate, capacity=1, clock=time.time, sleep=time.sleep):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+
+    def try_acquire(self):
+        """Take a token if one is available. Returns 0 on success, otherwise the seconds to wait."""
+        lock_key = f"{self.key}:lock"
+        if not cache.add(lock_key, 1, timeout=5):
+            return 0.05
+        try:
+            now = self.clock()
+            tokens, updated_at = cache.get(self.key) or (self.capacity, now)
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            if tokens >= 1:
+                cache.set(self.key, (tokens - 1, now), timeout=3600)
+                return 0
+            cache.set(self.key, (tokens, now), timeout=3600)
+            return (1 - tokens) / self.rate
+        finally:
+            cache.delete(lock_key)
+
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            self.sleep(wait)
+
+
+def nominatim_limiter():
+    return TokenBucket("geocode:nominatim_bucket", NOMINATIM_RATE_PER_SECOND, NOMINATIM_BURST)
+
+
+def get_cached_coordinates(address):
+    """
+    Look up an address in the persistent geocode cache without touching the network.
+    Returns a (latitude, longitude) tuple, or None when the address is unknown or has no result.
+    """
+    if not normalize_address(address):
+        return None
+    entry = GeocodeCache.objects.filter(address_key=address_key(address), found=True).first()
+    if entry:
+        return entry.latitude, entry.longitude
+    return None
+
+
+def fetch_from_nominatim(address):
+    """
+    Query Nominatim for an address. Returns (latitude, longitude) or None when there is no match.
+    Transport errors are raised as requests.RequestException so callers can retry later.
+    """
+    params = {"q": address, "format": "json", "limit": 1}
+    response = requests.get(NOMINATIM_URL, params=params, headers=NOMINATIM_HEADERS, timeout=NOMINATIM_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    if not data:
+        return None
+    return round(float(data[0]["lat"]), 6), round(float(data[0]["lon"]), 6)
+
+
+def geocode(address, limiter=None):
+    """
+    Resolve an address through the persistent cache, falling back to a rate-limited Nominatim lookup.
+    This blocks on the network and must only be called from background workers.
+    """
+    normalized = normalize_address(address)
+    if not normalized:
+        logger.debug("Empty address provided to geocode")
+        return None
+
+    key = address_key(address)
+    entry = GeocodeCache.objects.filter(address_key=key).first()
+    if entry and (entry.found or entry.updated_at > timezone.now() - NEGATIVE_CACHE_TTL):
+        return (entry.latitude, entry.longitude) if entry.found else None
+
+    (limiter or nominatim_limiter()).acquire()
+    coordinates = fetch_from_nominatim(address)
+    if coordinates is None:
+        logger.warning(f"No geocoding results found for address: {address}")
+
+    GeocodeCache.objects.update_or_create(
+        address_key=key,
+        defaults={
+            "address": normalized[:255],
+            "latitude": coordinates[0] if coordinates else None,
+            "longitude": coordinates[1] if coordinates else None,
+            "found": coordinates is not None,
+        },
+    )
+    return coordinates
+
+
+def enqueue_session(session):
+    """Queue a session for background geocoding; no-op when there is nothing to resolve."""
+    if not session.location or (session.latitude is not None and session.longitude is not None):
+        return
+    GeocodeJob.objects.update_or_create(
+        session=session,
+        defaults={"status": "pending", "attempts": 0, "last_error": "", "run_after": timezone.now()},
+    )
+
+
+def pending_jobs():
+    return GeocodeJob.objects.filter(status="pending", run_after__lte=timezone.now()).select_related("session")
+
+
+def process_queue(limit=100, limiter=None):
+    """
+    Drain up to ``limit`` pending geocoding jobs. Coordinates are written with queryset
+    updates so Session.save() side effects (calendar sync, etc.) are not re-triggered.
+    Returns a dict of counts keyed by outcome.
+    """
+    limiter = limiter or nominatim_limiter()
+    stats = {"resolved": 0, "not_found": 0, "retried": 0, "failed": 0}
+
+    for job in pending_jobs()[:limit]:
+        session = job.session
+        if not session.location or (session.latitude is not None and session.longitude is not None):
+            job.delete()
+            continue
+
+        job.attempts += 1
+        try:
+            coordinates = geocode(session.location, limiter=limiter)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error geocoding session {session.id}: {e}")
+            job.last_error = str(e)[:500]
+            if job.attempts >= MAX_JOB_ATTEMPTS:
+                job.status = "failed"
+                stats["failed"] += 1
+            else:
+                job.run_after = timezone.now() + RETRY_BACKOFF * job.attempts
+                stats["retried"] += 1
+            job.save(update_fields=["attempts", "last_error", "status", "run_after", "updated_at"])
+            continue
+
+        if coordinates is None:
+            job.status = "failed"
+            job.last_error = "No geocoding results"
+            job.save(update_fields=["attempts", "last_error", "status", "updated_at"])
+            stats["not_found"] += 1
+            continue
+
+        latitude, longitude = coordinates
+        Session.objects.filter(
+            Q(latitude__isnull=True) | Q(longitude__isnull=True), pk=session.pk, location=session.location
+        ).update(latitude=latitude, longitude=longitude)
+        job.delete()
+        stats["resolved"] += 1
+
+    if stats["resolved"]:
+        # Queryset updates bypass post_save, so cached map tiles are invalidated here
+        bump_map_version()
+
+    return stats
+
+
+def enqueue_missing_sessions():
+    """Queue every in-person session that still has no coordinates. Returns the number queued."""
+    sessions = Session.objects.exclude(location="").filter(Q(latitude__isnull=True) | Q(longitude__isnull=True))
+    sessions = sessions.filter(geocode_job__isnull=True)
+    jobs = [GeocodeJob(session=session) for session in sessions.only("id")]
+    GeocodeJob.objects.bulk_create(jobs, ignore_conflicts=True)
+    return len(jobs)
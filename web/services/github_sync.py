@@ -0,0 +1,329 @@
+"""
+GitHub contributor data, mirrored into local tables by the sync_github command.
+
+Every call goes through one pooled requests.Session. Pull request pages are requested with
+If-None-Match, so an unchanged page costs a 304 that does not count against the rate limit,
+and pages and per-contributor searches are fetched MAX_WORKERS at a time. Responses are
+written to the database from the calling thread only. The contributor views read the tables
+and never call GitHub.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import requests
+from django.db import connection
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from requests.adapters import HTTPAdapter
+
+from web.models import GitHubContributor, GitHubETag, GitHubPullRequest
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_BASE = "https://api.github.com"
+# Pull requests are listed from PULLS_REPO; contributor activity is searched in GITHUB_REPO
+PULLS_REPO = "AlphaOneLabs/education-website"
+GITHUB_REPO = "alphaonelabs/alphaonelabs-education-website"
+MAX_WORKERS = 4
+PER_PAGE = 100
+MAX_PAGES = {"closed": 10, "open": 5}
+REQUEST_TIMEOUT = 10
+
+CONTRIBUTOR_SEARCHES = {
+    "prs_merged": "author:{login} type:pr repo:{repo} is:merged",
+    "issues_created": "author:{login} type:issue repo:{repo}",
+    "pr_reviews": "reviewer:{login} type:pr repo:{repo}",
+    "pr_comments": "commenter:{login} type:pr repo:{repo}",
+    "issue_comments": "commenter:{login} type:issue repo:{repo}",
+    "issue_assignments": "assignee:{login} type:issue repo:{repo}",
+}
+
+CONTRIBUTION_LINES_QUERY = """
+query($username: String!, $after: String) {
+  user(login: $username) {
+    pullRequests(first: 100, after: $after, states: MERGED, orderBy: { field: CREATED_AT, direction: DESC }) {
+      pageInfo {
+        endCursor
+        hasNextPage
+      }
+      nodes {
+        additions
+        deletions
+        repository {
+          nameWithOwner
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def github_session(token=None):
+    """A session whose connection pool is shared by up to MAX_WORKERS concurrent requests."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS))
+    session.headers["Accept"] = "application/vnd.github+json"
+    token = token or os.environ.get("GITHUB_TOKEN")
+    if token:
+        session.headers["Authorization"] = f"token {token}"
+    return session
+
+
+def github_get(session, url, params=None, etag=None):
+    """
+    GET a GitHub API URL, conditionally when ``etag`` is given.
+    Returns (status, JSON body or None, ETag); status is 0 when the request itself failed.
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    try:
+        response = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        logger.error(f"Request error for {url}: {e}")
+        return 0, None, ""
+    if response.status_code == 304:
+        return 304, None, etag
+    if response.status_code != 200:
+        logger.error(f"Failed API request to {url}: {response.status_code} - {response.text[:200]}")
+        return response.status_code, None, ""
+    return 200, response.json(), response.headers.get("ETag", "")
+
+
+def store_pull_requests(items):
+    pulls = [
+        GitHubPullRequest(
+            number=item["number"],
+            title=(item.get("title") or "")[:500],
+            state=item["state"],
+            author_login=item["user"]["login"],
+            author_avatar_url=item["user"].get("avatar_url") or "",
+            author_profile_url=item["user"].get("html_url") or "",
+            opened_at=parse_datetime(item["created_at"]) if item.get("created_at") else None,
+            merged_at=parse_datetime(item["merged_at"]) if item.get("merged_at") else None,
+        )
+        for item in items
+        if item.get("user")
+    ]
+    GitHubPullRequest.objects.bulk_create(
+        pulls,
+        update_conflicts=True,
+        # MySQL's ON DUPLICATE KEY UPDATE finds the unique number on its own and rejects a target
+        unique_fields=["number"] if connection.features.supports_update_conflicts_with_target else None,
+        update_fields=[
+            "title",
+            "state",
+            "author_login",
+            "author_avatar_url",
+            "author_profile_url",
+            "opened_at",
+            "merged_at",
+            "synced_at",
+        ],
+    )
+    return len(pulls)
+
+
+def sync_pull_requests(session, state, max_pages=None):
+    """
+    Mirror the ``state`` pull request listing into GitHubPullRequest.
+
+    Pages are requested MAX_WORKERS at a time with their stored ETags until a short page (or
+    the 304 of one) marks the end. Returns counts of fetched, unchanged and stored items.
+    """
+    url = f"{GITHUB_API_BASE}/repos/{PULLS_REPO}/pulls"
+    max_pages = max_pages or MAX_PAGES[state]
+    params = {page: {"state": state, "per_page": PER_PAGE, "page": page} for page in range(1, max_pages + 1)}
+    keys = {page: f"{url}?{urlencode(page_params)}" for page, page_params in params.items()}
+    etags = {row.url: row for row in GitHubETag.objects.filter(url__in=keys.values())}
+    stats = {"fetched": 0, "not_modified": 0, "pulls": 0, "errors": 0}
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for start in range(1, max_pages + 1, MAX_WORKERS):
+            wave = range(start, min(start + MAX_WORKERS, max_pages + 1))
+            futures = {
+                page: pool.submit(github_get, session, url, params[page], getattr(etags.get(keys[page]), "etag", None))
+                for page in wave
+            }
+            for page in wave:
+                status, data, etag = futures[page].result()
+                if status == 304:
+                    stats["not_modified"] += 1
+                    item_count = etags[keys[page]].item_count
+                elif status == 200:
+                    stats["fetched"] += 1
+                    stats["pulls"] += store_pull_requests(data)
+                    item_count = len(data)
+                    if etag:
+                        GitHubETag.objects.update_or_create(
+                            url=keys[page], defaults={"etag": etag, "item_count": item_count}
+                        )
+                else:
+                    stats["errors"] += 1
+                    return stats
+                if item_count < PER_PAGE:
+                    return stats
+    return stats
+
+
+def search_issues(session, query, **params):
+    """The search result, or None when the search failed (e.g. on the search rate limit)."""
+    status, data, _ = github_get(session, f"{GITHUB_API_BASE}/search/issues", params={"q": query, **params})
+    return data if status == 200 else None
+
+
+def contribution_lines(session, login):
+    """
+    Lines added and deleted across the contributor's merged pull requests to GITHUB_REPO, or
+    None when a page could not be fetched, so partial sums are never stored.
+    """
+    if "Authorization" not in session.headers:
+        # The GraphQL API does not accept anonymous requests
+        return 0, 0
+    added = deleted = 0
+    after = None
+    while True:
+        try:
+            response = session.post(
+                f"{GITHUB_API_BASE}/graphql",
+                json={"query": CONTRIBUTION_LINES_QUERY, "variables": {"username": login, "after": after}},
+                timeout=15,
+            )
+        except requests.RequestException as e:
+            logger.error(f"GraphQL request error: {e}")
+            return None
+        if response.status_code != 200:
+            logger.error(f"GraphQL error: {response.status_code} - {response.text[:200]}")
+            return None
+        body = response.json()
+        user = (body.get("data") or {}).get("user")
+        if body.get("errors") or not user:
+            logger.error(f"GraphQL error for {login}: {body.get('errors')}")
+            return None
+        pull_requests = user["pullRequests"]
+        for node in pull_requests["nodes"]:
+            if node["repository"]["nameWithOwner"].lower() == GITHUB_REPO.lower():
+                added += node.get("additions", 0)
+                deleted += node.get("deletions", 0)
+        if not pull_requests["pageInfo"]["hasNextPage"]:
+            break
+        after = pull_requests["pageInfo"]["endCursor"]
+    return added, deleted
+
+
+def fetch_contributor(session, pool, login):
+    """
+    Fetch a contributor's profile, searches and line counts concurrently on ``pool``.
+    Returns None when any of the requests failed.
+    """
+    profile = pool.submit(github_get, session, f"{GITHUB_API_BASE}/users/{login}")
+    # Sorted oldest first, the "created" search also yields the first contribution date
+    created = pool.submit(
+        search_issues,
+        session,
+        f"author:{login} type:pr repo:{GITHUB_REPO}",
+        sort="created",
+        order="asc",
+        per_page=1,
+    )
+    searches = {
+        field: pool.submit(search_issues, session, query.format(login=login, repo=GITHUB_REPO))
+        for field, query in CONTRIBUTOR_SEARCHES.items()
+    }
+    lines = pool.submit(contribution_lines, session, login)
+
+    profile_data = profile.result()[1]
+    created_data = created.result()
+    search_data = {field: future.result() for field, future in searches.items()}
+    line_counts = lines.result()
+    if not profile_data or created_data is None or None in search_data.values() or line_counts is None:
+        return None
+
+    first_item = (created_data.get("items") or [{}])[0]
+    return {
+        "profile": profile_data,
+        "prs_created": created_data.get("total_count", 0),
+        "first_contribution_at": parse_datetime(first_item["created_at"]) if first_item.get("created_at") else None,
+        "lines_added": line_counts[0],
+        "lines_deleted": line_counts[1],
+        **{field: data.get("total_count", 0) for field, data in search_data.items()},
+    }
+
+
+def sync_contributors(session, logins):
+    """Refresh GitHubContributor rows for ``logins``; returns how many were stored."""
+    synced = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for login in logins:
+            defaults = fetch_contributor(session, pool, login)
+            if defaults is None:
+                logger.error(f"GitHub details for {login} could not all be retrieved; keeping the stored data")
+                continue
+            GitHubContributor.objects.update_or_create(login=login, defaults={**defaults, "synced_at": timezone.now()})
+            synced += 1
+    return synced
+
+
+def contributor_pull_counts():
+    """Per-author pull request counts for authors with at least one merged pull request."""
+    return (
+        GitHubPullRequest.objects.exclude(
+            Q(author_login__contains="[bot]") | Q(author_login__contains="dependabot") | Q(author_login="A1L13N")
+        )
+        .values("author_login")
+        .annotate(
+            merged_pr_count=Count("id", filter=Q(state="closed", merged_at__isnull=False)),
+            closed_pr_count=Count("id", filter=Q(state="closed", merged_at__isnull=True)),
+            open_pr_count=Count("id", filter=Q(state="open")),
+            avatar_url=Max("author_avatar_url"),
+            profile_url=Max("author_profile_url"),
+        )
+        .filter(merged_pr_count__gt=0)
+        .order_by()
+    )
+
+
+def stale_contributors(max_age=timedelta(days=1), limit=20):
+    """Logins of leaderboard contributors whose details are missing or older than ``max_age``."""
+    logins = [row["author_login"] for row in contributor_pull_counts()]
+    synced_at = dict(GitHubContributor.objects.filter(login__in=logins).values_list("login", "synced_at"))
+    cutoff = timezone.now() - max_age
+    stale = [login for login in logins if not synced_at.get(login) or synced_at[login] < cutoff]
+    # Never-synced contributors first, then the longest out of date
+    stale.sort(key=lambda login: (synced_at.get(login) is not None, synced_at.get(login) or cutoff))
+    return stale[:limit]
+
+
+def contributor_leaderboard():
+    """Contributors ranked by a score that favours merged pull requests, read from local tables."""
+    contributors = []
+    for row in contributor_pull_counts():
+        username = row["author_login"]
+        stats = {
+            "username": username,
+            "avatar_url": row["avatar_url"],
+            "profile_url": row["profile_url"],
+            "merged_pr_count": row["merged_pr_count"],
+            "closed_pr_count": row["closed_pr_count"],
+            "open_pr_count": row["open_pr_count"],
+            "prs_url": f"https://github.com/AlphaOneLabs/education-website/pulls?q=is:pr+author:{username}",
+        }
+        stats["total_pr_count"] = stats["merged_pr_count"] + stats["closed_pr_count"] + stats["open_pr_count"]
+
+        # Merged pull requests score 10 each; closed ones beyond half the merged count and open
+        # ones beyond the merged count are penalised
+        smart_score = stats["merged_pr_count"] * 10
+        if stats["closed_pr_count"] > (stats["merged_pr_count"] / 2):
+            smart_score -= (stats["closed_pr_count"] - (stats["merged_pr_count"] / 2)) * 2
+        if stats["open_pr_count"] > stats["merged_pr_count"]:
+            smart_score -= stats["open_pr_count"] - stats["merged_pr_count"]
+        stats["smart_score"] = smart_score
+        stats["contribution_ratio"] = stats["merged_pr_count"] / stats["total_pr_count"]
+        contributors.append(stats)
+
+    contributors.sort(key=lambda x: (x["smart_score"], x["merged_pr_count"]), reverse=True)
+    return contributors
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from django.db.models import Count, Prefetch
+
+from web.models import Goods, ProductImage, Storefront
+
+GOODS_FACETS_CACHE_KEY = "goods_listing_facets"
+GOODS_FACETS_CACHE_TIMEOUT = 60 * 60
+
+
+def goods_listing_queryset():
+    """
+    Goods with everything a listing card shows: storefront, cart count and only the first image,
+    so rendering a page costs the page query plus one image prefetch.
+    """
+    return (
+        Goods.objects.select_related("storefront")
+        .annotate(cart_count=Count("cart_items"))
+        .prefetch_related(
+            Prefetch("goods_images", queryset=ProductImage.objects.order_by("id")[:1], to_attr="first_images")
+        )
+        .order_by("id")
+    )
+
+
+def get_goods_facets():
+    """Return the cached store names and categories offered as listing filters."""
+    facets = cache.get(GOODS_FACETS_CACHE_KEY)
+    if facets is None:
+        facets = {
+            "store_names": list(Storefront.objects.order_by("name").values_list("name", flat=True)),
+            "categories": list(
+                Goods.objects.exclude(category="").order_by("category").values_list("category", flat=True).distinct()
+            ),
+        }
+        cache.set(GOODS_FACETS_CACHE_KEY, facets, GOODS_FACETS_CACHE_TIMEOUT)
+    return facets
+
+
+def invalidate_goods_facets():
+    cache.delete(GOODS_FACETS_CACHE_KEY)
@@ -0,0 +1,55 @@
+from django.core.cache import cache
+
+from web.models import CartItem, Notification, StudyGroupInvite
+
+HEADER_SUMMARY_CACHE_TIMEOUT = 60 * 5
+EMPTY_SUMMARY = {"cart_count": 0, "pending_invites": 0, "unread_notifications": 0}
+
+
+def header_summary_cache_key(user_id=None, session_key=None):
+    if user_id:
+        return f"header_summary_user_{user_id}"
+    return f"header_summary_session_{session_key}"
+
+
+def invalidate_header_summary(user_id=None, session_key=None):
+    if user_id or session_key:
+        cache.delete(header_summary_cache_key(user_id, session_key))
+
+
+def compute_header_summary(user_id=None, session_key=None):
+    """Count the cart items, pending study group invites and unread notifications shown in the site header."""
+    if user_id:
+        return {
+            "cart_count": CartItem.objects.filter(cart__user_id=user_id).count(),
+            "pending_invites": StudyGroupInvite.objects.filter(recipient_id=user_id, status="pending").count(),
+            "unread_notifications": Notification.objects.filter(user_id=user_id, read=False).count(),
+        }
+    return dict(EMPTY_SUMMARY, cart_count=CartItem.objects.filter(cart__session_key=session_key).count())
+
+
+def get_header_summary(request):
+    """
+    Return the header summary for the current user or guest session.
+
+    The result is memoized on the request and cached per user/session, so rendering the
+    header costs at most one cache read per request.
+    """
+    summary = getattr(request, "_header_summary", None)
+    if summary is not None:
+        return summary
+
+    user_id = request.user.id if request.user.is_authenticated else None
+    session_key = None if user_id else request.session.session_key
+    if not user_id and not session_key:
+        # A guest without a session cannot have a cart yet
+        summary = EMPTY_SUMMARY
+    else:
+        key = header_summary_cache_key(user_id, session_key)
+        summary = cache.get(key)
+        if summary is None:
+            summary = compute_header_summary(user_id, session_key)
+            cache.set(key, summary, HEADER_SUMMARY_CACHE_TIMEOUT)
+
+    request._header_summary = summary
+    return summary
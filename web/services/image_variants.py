@@ -0,0 +1,184 @@
+"""
+Responsive image variants for course and badge uploads, generated off the request.
+
+Saving a course or badge with a new image only queues an ImageProcessingJob; the
+process_images command resizes the upload into a few widths in a fallback format and WebP,
+writes them next to the original under stable names (``<name>_<width>w.<ext>``) and records
+them in the object's ``image_variants``. Templates build ``src``/``srcset`` from that field
+and use the original upload until the variants exist.
+"""
+
+import logging
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from web.models import Badge, Course, ImageProcessingJob
+
+logger = logging.getLogger(__name__)
+
+# crop: centre-crop to a square first; widths: largest first; formats: fallback first, then WebP
+VARIANT_SPECS = {
+    Course: {"crop": True, "widths": (500, 300, 150), "formats": ("jpeg", "webp")},
+    Badge: {"crop": False, "widths": (200, 128, 64), "formats": ("png", "webp")},
+}
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+MAX_JOB_ATTEMPTS = 5
+RETRY_BACKOFF = timedelta(minutes=5)
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def model_for_label(label):
+    return next((model for model in VARIANT_SPECS if model_label(model) == label), None)
+
+
+def variant_name(source_name, width, fmt):
+    root, _ = os.path.splitext(source_name)
+    return f"{root}_{width}w.{FORMAT_EXTENSIONS[fmt]}"
+
+
+def variant_names(variants):
+    return [name for by_width in variants.get("formats", {}).values() for name in by_width.values()]
+
+
+def enqueue_image_processing(instance, stale_variants=()):
+    """
+    Queue variant generation for ``instance``'s current image, and removal of the variant files
+    generated for the image it replaced. One job is kept per object.
+    """
+    job, created = ImageProcessingJob.objects.get_or_create(
+        model_label=model_label(type(instance)),
+        object_id=instance.pk,
+        defaults={"source_name": instance.image.name or "", "stale_variants": list(stale_variants)},
+    )
+    if not created:
+        job.source_name = instance.image.name or ""
+        job.stale_variants = sorted(set(job.stale_variants) | set(stale_variants))
+        job.status = "pending"
+        job.attempts = 0
+        job.last_error = ""
+        job.run_after = timezone.now()
+        job.save()
+
+
+def _render(image, width, fmt, crop):
+    if crop:
+        image = ImageOps.fit(image, (width, width), Image.Resampling.LANCZOS)
+    else:
+        image = image.resize((width, width), Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    image.save(buffer, format=fmt.upper(), quality=85)
+    return buffer.getvalue()
+
+
+def generate_variants(field, spec):
+    """Write every variant of the image in ``field`` to its storage; returns the variants dict."""
+    storage = field.storage
+    with field.open("rb") as source:
+        image = Image.open(source)
+        image.load()
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    formats = {}
+    for fmt in spec["formats"]:
+        formats[fmt] = {}
+        for width in spec["widths"]:
+            name = variant_name(field.name, width, fmt)
+            if storage.exists(name):
+                storage.delete(name)
+            formats[fmt][str(width)] = storage.save(name, ContentFile(_render(image, width, fmt, spec["crop"])))
+    return {"source": field.name, "formats": formats}
+
+
+def delete_variant_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete image variant {name}: {e}")
+
+
+def process_image_job(job):
+    """Generate the variants for one job. Returns False when the object or image is gone."""
+    model = model_for_label(job.model_label)
+    instance = model.objects.filter(pk=job.object_id).first() if model else None
+    field = model._meta.get_field("image") if model else None
+    storage = field.storage if field else None
+    if storage and job.stale_variants:
+        delete_variant_files(storage, job.stale_variants)
+    if instance is None or not instance.image or instance.image.name != job.source_name:
+        # Nothing to do, or a newer upload has its own job pending
+        return False
+
+    variants = generate_variants(instance.image, VARIANT_SPECS[model])
+    updated = model.objects.filter(pk=instance.pk, image=job.source_name).update(image_variants=variants)
+    if not updated:
+        delete_variant_files(storage, variant_names(variants))
+    return bool(updated)
+
+
+def pending_jobs():
+    return ImageProcessingJob.objects.filter(status="pending", run_after__lte=timezone.now()).order_by("run_after")
+
+
+def process_image_queue(limit=50):
+    """Process up to ``limit`` pending image jobs. Returns a dict of counts keyed by outcome."""
+    stats = {"processed": 0, "skipped": 0, "retried": 0, "failed": 0}
+    for job in pending_jobs()[:limit]:
+        try:
+            processed = process_image_job(job)
+        except Exception as e:
+            logger.error(f"Image processing failed for {job.model_label} {job.object_id}: {e}")
+            job.attempts += 1
+            job.last_error = str(e)[:500]
+            if job.attempts >= MAX_JOB_ATTEMPTS:
+                job.status = "failed"
+                stats["failed"] += 1
+            else:
+                job.run_after = timezone.now() + RETRY_BACKOFF * job.attempts
+                stats["retried"] += 1
+            job.save(update_fields=["attempts", "last_error", "status", "run_after", "updated_at"])
+            continue
+        # Keep the job if the image was replaced again while this one was running
+        ImageProcessingJob.objects.filter(pk=job.pk, updated_at=job.updated_at).delete()
+        stats["processed" if processed else "skipped"] += 1
+    return stats
+
+
+def enqueue_missing_variants(model):
+    """Queue jobs for every ``model`` row with an image but no current variants; returns the count."""
+    queued = 0
+    for instance in model.objects.exclude(image="").only("pk", "image", "image_variants").iterator():
+        if (instance.image_variants or {}).get("source") != instance.image.name:
+            enqueue_image_processing(instance)
+            queued += 1
+    return queued
+
+
+def image_src(instance):
+    """URL of the largest fallback-format variant, or of the original upload until it is processed."""
+    variants = instance.image_variants or {}
+    if variants.get("source") == instance.image.name:
+        spec = VARIANT_SPECS[type(instance)]
+        name = variants["formats"].get(spec["formats"][0], {}).get(str(spec["widths"][0]))
+        if name:
+            return instance.image.storage.url(name)
+    return instance.image.url if instance.image else ""
+
+
+def image_srcset(instance, fmt="webp"):
+    """``srcset`` value listing the ``fmt`` variants, or an empty string until they exist."""
+    variants = instance.image_variants or {}
+    if not instance.image or variants.get("source") != instance.image.name:
+        return ""
+    storage = instance.image.storage
+    by_width = variants["formats"].get(fmt, {})
+    return ", ".join(f"{storage.url(name)} {width}w" for width, name in by_width.items())
@@ -0,0 +1,79 @@
+"""
+Pre-rendered HTML for markdown fields.
+
+Markdown parsing is the most expensive step of the course and blog detail templates, so each
+markdown field has a ``<field>_html`` column filled in when the object is saved. Templates
+read it through the ``rendered_markdown`` filter, which only parses on the fly for rows the
+render_markdown backfill has not reached yet.
+"""
+
+from markdownx.utils import markdownify
+
+from web.models import BlogPost, Course
+
+MARKDOWN_FIELDS = {
+    Course: ("description", "learning_objectives", "prerequisites"),
+    BlogPost: ("content",),
+}
+BATCH_SIZE = 500
+
+
+def html_field(field):
+    return f"{field}_html"
+
+
+def render_markdown(text):
+    return markdownify(text) if text else ""
+
+
+def render_markdown_fields(instance, update_fields=None):
+    """
+    Refresh the HTML columns of ``instance`` from its markdown fields.
+
+    With ``update_fields`` only the listed sources are rendered. Returns the names of the HTML
+    columns that were set, so a partial save can include them.
+    """
+    rendered = []
+    for field in MARKDOWN_FIELDS[type(instance)]:
+        if update_fields is not None and field not in update_fields:
+            continue
+        setattr(instance, html_field(field), render_markdown(getattr(instance, field)))
+        rendered.append(html_field(field))
+    return rendered
+
+
+def rendered_html(instance, field):
+    """The stored HTML for ``field``, rendering it only when the column has not been filled."""
+    html = getattr(instance, html_field(field), "")
+    text = getattr(instance, field)
+    if html or not text:
+        return html
+    return render_markdown(text)
+
+
+def backfill_rendered_markdown(model, force=False, batch_size=BATCH_SIZE):
+    """
+    Fill the HTML columns of ``model`` rows, in pk order and ``batch_size`` rows at a time.
+
+    Rows whose columns are already filled are skipped unless ``force`` is set, which
+    re-renders everything (for example after a markdown extension change). Returns the number
+    of rows written.
+    """
+    fields = MARKDOWN_FIELDS[model]
+    html_fields = [html_field(field) for field in fields]
+    queryset = model.objects.only("pk", *fields, *html_fields).order_by("pk")
+    updated = 0
+    last_pk = 0
+    while batch := list(queryset.filter(pk__gt=last_pk)[:batch_size]):
+        last_pk = batch[-1].pk
+        changed = []
+        for obj in batch:
+            current = [getattr(obj, name) for name in html_fields]
+            if not force and all(html or not getattr(obj, field) for field, html in zip(fields, current)):
+                continue
+            render_markdown_fields(obj)
+            if [getattr(obj, name) for name in html_fields] != current:
+                changed.append(obj)
+        model.objects.bulk_update(changed, html_fields)
+        updated += len(changed)
+    return updated
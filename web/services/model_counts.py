@@ -0,0 +1,114 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.contrib import admin
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import ModelDailyCount
+
+HISTORY_DAYS = 30
+DATE_FIELDS = ("created_at", "date_joined")
+
+
+def tracked_models():
+    """Yield (model, date_field) for every installed model that records when its rows were created."""
+    for app_config in apps.get_app_configs():
+        for model in app_config.get_models():
+            date_field = next((f.name for f in model._meta.fields if f.name in DATE_FIELDS), None)
+            if date_field:
+                yield model, date_field
+
+
+def snapshot_model_counts(days=2, today=None):
+    """
+    Store daily creation counts and totals for the last ``days`` days of every tracked model.
+
+    Each model costs one exact count and one grouped query over the window. Rows already
+    stored for those days are updated, so re-running (e.g. hourly for a fresh "today") is
+    safe. Totals for earlier days are derived back from today's count and ignore deletions.
+    Returns the number of rows written.
+    """
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = []
+    for model, date_field in tracked_models():
+        created = dict(
+            model._default_manager.filter(**{f"{date_field}__date__gte": start})
+            .annotate(created_day=TruncDate(date_field))
+            .order_by()
+            .values("created_day")
+            .annotate(created_count=Count("pk"))
+            .values_list("created_day", "created_count")
+        )
+        total = model._default_manager.count()
+        for offset in range(days):
+            day = today - timedelta(days=offset)
+            rows.append(
+                ModelDailyCount(model_label=model._meta.label_lower, date=day, created=created.get(day, 0), total=total)
+            )
+            total = max(total - created.get(day, 0), 0)
+    ModelDailyCount.objects.bulk_create(
+        rows,
+        batch_size=500,
+        update_conflicts=True,
+        # MySQL's ON DUPLICATE KEY UPDATE finds the (model_label, date) key on its own and rejects a target
+        unique_fields=["model_label", "date"] if connection.features.supports_update_conflicts_with_target else None,
+        update_fields=["created", "total", "recorded_at"],
+    )
+    return len(rows)
+
+
+def estimated_counts(models):
+    """Planner row estimates for tables without a snapshot yet; PostgreSQL only, {} elsewhere."""
+    if connection.vendor != "postgresql" or not models:
+        return {}
+    tables = {model._meta.db_table: model._meta.label_lower for model in models}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relname, reltuples::bigint FROM pg_class WHERE relname = ANY(%s)", [list(tables)])
+        return {tables[name]: estimate for name, estimate in cursor.fetchall() if estimate >= 0}
+
+
+def get_model_count_stats(days=HISTORY_DAYS, today=None):
+    """
+    Return the admin dashboard cards, one per tracked model, from the snapshot table.
+
+    Reads every model's history and latest total in one query, so the page cost does not
+    depend on table sizes. ``count`` is None for models that have never been snapshotted
+    and have no database estimate.
+    """
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    history = defaultdict(lambda: [0] * days)
+    totals = {}
+    for label, date, created, total in (
+        ModelDailyCount.objects.filter(date__range=(start, today))
+        .order_by("date")
+        .values_list("model_label", "date", "created", "total")
+    ):
+        history[label][(date - start).days] = created
+        totals[label] = total
+
+    models = [model for model, _ in tracked_models()]
+    totals.update(estimated_counts([model for model in models if model._meta.label_lower not in totals]))
+
+    stats = []
+    for model in models:
+        label = model._meta.label_lower
+        admin_url = None
+        if admin.site.is_registered(model):
+            admin_url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+        stats.append(
+            {
+                "title": model._meta.verbose_name_plural.title(),
+                "count": totals.get(label),
+                "history": history[label],
+                "admin_url": admin_url,
+            }
+        )
+    stats.sort(key=lambda stat: stat["count"] or 0, reverse=True)
+    return stats
@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.db.models import Avg, Count
+
+from web.models import Achievement, Course, CourseProgress, Enrollment, Review, Session
+
+
+def annotate_teacher_scorecards(profiles):
+    """Set total_courses, total_students and avg_rating on teacher profiles with grouped queries."""
+    teacher_ids = [profile.user_id for profile in profiles]
+    if not teacher_ids:
+        return
+
+    course_counts = dict(
+        Course.objects.filter(teacher_id__in=teacher_ids)
+        .values("teacher_id")
+        .annotate(total=Count("id"))
+        .values_list("teacher_id", "total")
+    )
+    student_counts = dict(
+        Enrollment.objects.filter(course__teacher_id__in=teacher_ids, status="approved")
+        .values("course__teacher_id")
+        .annotate(total=Count("id"))
+        .values_list("course__teacher_id", "total")
+    )
+    # Average of per-course ratings, matching Course.average_rating for each rated course
+    course_ratings = defaultdict(list)
+    for teacher_id, rating in (
+        Review.objects.filter(course__teacher_id__in=teacher_ids)
+        .values("course__teacher_id", "course_id")
+        .annotate(avg=Avg("rating"))
+        .values_list("course__teacher_id", "avg")
+    ):
+        if rating:
+            course_ratings[teacher_id].append(round(float(rating), 2))
+
+    for profile in profiles:
+        ratings = course_ratings.get(profile.user_id)
+        profile.total_courses = course_counts.get(profile.user_id, 0)
+        profile.total_students = student_counts.get(profile.user_id, 0)
+        profile.avg_rating = round(sum(ratings) / len(ratings), 1) if ratings else 0
+
+
+def annotate_student_scorecards(profiles):
+    """Set total_courses, total_completed, avg_progress and achievements_count on student profiles."""
+    student_ids = [profile.user_id for profile in profiles]
+    if not student_ids:
+        return
+
+    enrollments = list(
+        Enrollment.objects.filter(student_id__in=student_ids).values("id", "student_id", "course_id", "status")
+    )
+    course_ids = {enrollment["course_id"] for enrollment in enrollments}
+    session_counts = dict(
+        Session.objects.filter(course_id__in=course_ids)
+        .values("course_id")
+        .annotate(total=Count("id"))
+        .values_list("course_id", "total")
+    )
+    completed_counts = dict(
+        CourseProgress.completed_sessions.through.objects.filter(
+            courseprogress__enrollment_id__in=[enrollment["id"] for enrollment in enrollments]
+        )
+        .values("courseprogress__enrollment_id")
+        .annotate(total=Count("id"))
+        .values_list("courseprogress__enrollment_id", "total")
+    )
+    achievement_counts = dict(
+        Achievement.objects.filter(student_id__in=student_ids)
+        .values("student_id")
+        .annotate(total=Count("id"))
+        .values_list("student_id", "total")
+    )
+
+    stats = defaultdict(lambda: {"total": 0, "completed": 0, "progress": 0})
+    for enrollment in enrollments:
+        entry = stats[enrollment["student_id"]]
+        entry["total"] += 1
+        entry["completed"] += enrollment["status"] == "completed"
+        # Same formula as CourseProgress.completion_percentage; enrollments without progress count as 0%
+        total_sessions = session_counts.get(enrollment["course_id"], 0)
+        if total_sessions:
+            entry["progress"] += int(completed_counts.get(enrollment["id"], 0) / total_sessions * 100)
+
+    for profile in profiles:
+        entry = stats[profile.user_id]
+        profile.total_courses = entry["total"]
+        profile.total_completed = entry["completed"]
+        profile.avg_progress = round(entry["progress"] / entry["total"]) if entry["total"] else 0
+        profile.achievements_count = achievement_counts.get(profile.user_id, 0)
+
+
+def annotate_profile_scorecards(profiles):
+    """
+    Attach directory scorecard stats to a page of profiles in a fixed number of queries,
+    independent of how many profiles, courses or enrollments there are.
+    """
+    profiles = list(profiles)
+    annotate_teacher_scorecards([profile for profile in profiles if profile.is_teacher])
+    annotate_student_scorecards([profile for profile in profiles if not profile.is_teacher])
+    return profiles
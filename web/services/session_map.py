@@ -0,0 +1,207 @@
+import math
+import time
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from web.models import Session
+
+MAP_VERSION_KEY = "session_map:version"
+TILE_CACHE_TIMEOUT = 60 * 5  # live/future filtering depends on the clock, so tiles also expire
+
+MAX_LATITUDE = 85.05112878  # Web Mercator limit
+MAX_TILE_ZOOM = 16
+MAX_TILES_PER_REQUEST = 64
+
+# Below this zoom level sessions that share a cluster cell are returned as one cluster.
+CLUSTER_MAX_ZOOM = 10
+# Each tile is split into 2**CLUSTER_CELL_BITS cells per axis for clustering.
+CLUSTER_CELL_BITS = 2
+
+
+def get_map_version():
+    version = cache.get(MAP_VERSION_KEY)
+    if version is None:
+        # Seed with a timestamp so an evicted counter never reuses an old version number
+        cache.add(MAP_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(MAP_VERSION_KEY)
+    return version
+
+
+def bump_map_version():
+    """Invalidate every cached map tile; called whenever a session or course changes."""
+    try:
+        cache.incr(MAP_VERSION_KEY)
+    except ValueError:
+        cache.set(MAP_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def tile_for(lat, lng, zoom):
+    """Return the (x, y) slippy-map tile containing a point at the given zoom."""
+    n = 2**zoom
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = int((lng + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(x, y, zoom):
+    """Return (south, west, north, east) for a slippy-map tile."""
+    n = 2**zoom
+
+    def lat_of(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat_of(y + 1), x / n * 360.0 - 180.0, lat_of(y), (x + 1) / n * 360.0 - 180.0
+
+
+def tiles_for_bbox(south, west, north, east, zoom):
+    """
+    Return the tile zoom and the list of (x, y) tiles covering a bounding box.
+    The zoom is lowered until the box fits in MAX_TILES_PER_REQUEST tiles.
+    A box with west > east crosses the antimeridian.
+    """
+    zoom = max(0, min(zoom, MAX_TILE_ZOOM))
+    while True:
+        n = 2**zoom
+        x_min, y_min = tile_for(north, west, zoom)
+        x_max, y_max = tile_for(south, east, zoom)
+        if west > east:
+            xs = list(range(x_min, n)) + list(range(0, x_max + 1))
+        else:
+            xs = list(range(x_min, x_max + 1))
+        ys = range(y_min, y_max + 1)
+        if len(xs) * len(ys) <= MAX_TILES_PER_REQUEST or zoom == 0:
+            return zoom, [(x, y) for x in xs for y in ys]
+        zoom -= 1
+
+
+def map_sessions_queryset(course_id=None, level=None):
+    """Future or live in-person sessions that already have coordinates."""
+    now = timezone.now()
+    sessions = (
+        Session.objects.filter(Q(start_time__gte=now) | Q(start_time__lte=now, end_time__gte=now))
+        .filter(is_virtual=False, latitude__isnull=False, longitude__isnull=False)
+        .exclude(location="")
+        .select_related("course", "course__teacher")
+    )
+    if course_id:
+        sessions = sessions.filter(course__id=course_id, course__status="published")
+    if level:
+        sessions = sessions.filter(course__level=level)
+    return sessions
+
+
+def serialize_session(session):
+    course = session.course
+    return {
+        "id": session.id,
+        "title": session.title,
+        "course_title": course.title,
+        "teacher": course.teacher.get_full_name() or course.teacher.username,
+        "start_time": session.start_time.isoformat(),
+        "end_time": session.end_time.isoformat(),
+        "location": session.location,
+        "lat": float(session.latitude),
+        "lng": float(session.longitude),
+        "price": str(session.price or course.price),
+        "url": session.get_absolute_url(),
+        "course": course.title,
+        "level": course.get_level_display(),
+        "is_virtual": session.is_virtual,
+    }
+
+
+def build_tile_payload(points, zoom, cluster):
+    """Group serialized points into clusters by cell when clustering is enabled."""
+    if not cluster:
+        return {"sessions": points, "clusters": []}
+
+    cell_zoom = zoom + CLUSTER_CELL_BITS
+    cells = {}
+    for point in points:
+        cells.setdefault(tile_for(point["lat"], point["lng"], cell_zoom), []).append(point)
+
+    sessions, clusters = [], []
+    for members in cells.values():
+        if len(members) == 1:
+            sessions.append(members[0])
+            continue
+        clusters.append(
+            {
+                "lat": sum(p["lat"] for p in members) / len(members),
+                "lng": sum(p["lng"] for p in members) / len(members),
+                "count": len(members),
+                "session_ids": [p["id"] for p in members],
+            }
+        )
+    return {"sessions": sessions, "clusters": clusters}
+
+
+def _tiles_filter(tiles, zoom):
+    """
+    Build a range filter covering whole tiles, so cached tiles are complete even when the
+    requested box only overlaps part of them. Tile columns are grouped into contiguous runs,
+    which turns an antimeridian-crossing request into two longitude ranges.
+    """
+    n = 2**zoom
+    rows = [y for _, y in tiles]
+    south = -90.0 if max(rows) == n - 1 else tile_bounds(0, max(rows), zoom)[0]
+    north = 90.0 if min(rows) == 0 else tile_bounds(0, min(rows), zoom)[2]
+
+    runs = []
+    for x in sorted({x for x, _ in tiles}):
+        if runs and runs[-1][1] == x - 1:
+            runs[-1][1] = x
+        else:
+            runs.append([x, x])
+    longitude = Q()
+    for first, last in runs:
+        longitude |= Q(longitude__gte=first / n * 360.0 - 180.0, longitude__lte=(last + 1) / n * 360.0 - 180.0)
+
+    return Q(latitude__gte=south, latitude__lte=north) & longitude
+
+
+def _tile_cache_key(version, zoom, x, y, cluster, course_id, level):
+    return f"session_map:{version}:{zoom}:{x}:{y}:{int(cluster)}:{course_id or ''}:{level or ''}"
+
+
+def get_map_data(bbox=None, zoom=None, course_id=None, level=None):
+    """
+    Return the sessions (and clusters at low zoom) visible in a bounding box.
+
+    Responses are cached per tile and filter combination until the next session or course
+    change bumps the map version. Missing tiles are filled with one bounding-box query that
+    uses the (latitude, longitude) index on Session.
+    """
+    south, west, north, east = bbox or (-90.0, -180.0, 90.0, 180.0)
+    cluster = zoom is not None and zoom < CLUSTER_MAX_ZOOM
+    tile_zoom, tiles = tiles_for_bbox(south, west, north, east, zoom if zoom is not None else 0)
+
+    version = get_map_version()
+    keys = {tile: _tile_cache_key(version, tile_zoom, *tile, cluster, course_id, level) for tile in tiles}
+    cached = cache.get_many(keys.values())
+    missing = [tile for tile, key in keys.items() if key not in cached]
+
+    if missing:
+        sessions = map_sessions_queryset(course_id, level).filter(_tiles_filter(missing, tile_zoom))
+
+        wanted = set(missing)
+        points_by_tile = {tile: [] for tile in missing}
+        for session in sessions:
+            point = serialize_session(session)
+            tile = tile_for(point["lat"], point["lng"], tile_zoom)
+            if tile in wanted:
+                points_by_tile[tile].append(point)
+
+        fresh = {keys[tile]: build_tile_payload(points, tile_zoom, cluster) for tile, points in points_by_tile.items()}
+        cache.set_many(fresh, TILE_CACHE_TIMEOUT)
+        cached.update(fresh)
+
+    result = {"sessions": [], "clusters": [], "zoom": tile_zoom, "tiles": len(tiles)}
+    for key in keys.values():
+        result["sessions"].extend(cached[key]["sessions"])
+        result["clusters"].extend(cached[key]["clusters"])
+    return result
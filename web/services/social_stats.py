@@ -0,0 +1,158 @@
+"""
+Social media profile stats, collected off the request by the collect_social_stats command.
+
+Nitter instances come and go, so every eligible instance is asked for the profile at once and
+the first valid answer is stored as a SocialStatsSnapshot. Each probe's outcome is recorded in
+NitterInstanceHealth; an instance that fails is skipped for a period that doubles with each
+consecutive failure. The content dashboard reads the snapshots and never calls Nitter.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from web.models import NitterInstanceHealth, SocialStatsSnapshot
+from web.social import NitterClient
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 5
+PROBE_TIMEOUT = 5
+BASE_BACKOFF = timedelta(minutes=15)
+MAX_BACKOFF = timedelta(hours=24)
+PROFILE_FIELDS = ("name", "bio", "location", "website", "joined")
+
+
+def backoff(failures):
+    return min(BASE_BACKOFF * 2 ** (failures - 1), MAX_BACKOFF)
+
+
+def eligible_instances(instances, now=None):
+    """The instances that are not backing off after recent failures, in the given order."""
+    now = now or timezone.now()
+    waiting = set(
+        NitterInstanceHealth.objects.filter(url__in=instances, retry_after__gt=now).values_list("url", flat=True)
+    )
+    return [url for url in instances if url not in waiting]
+
+
+def record_probe(url, error=None):
+    """Store the outcome of one probe, pushing a failing instance's next attempt back."""
+    now = timezone.now()
+    health, _ = NitterInstanceHealth.objects.get_or_create(url=url)
+    health.last_checked_at = now
+    if error is None:
+        health.consecutive_failures = 0
+        health.retry_after = now
+        health.last_ok_at = now
+        health.last_error = ""
+    else:
+        health.consecutive_failures += 1
+        health.retry_after = now + backoff(health.consecutive_failures)
+        health.last_error = str(error)[:500]
+    health.save()
+
+
+def _aware(value):
+    if isinstance(value, datetime) and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+
+def store_snapshot(platform, account, stats, source):
+    profile = {field: stats.get(field) for field in PROFILE_FIELDS}
+    if profile["joined"]:
+        profile["joined"] = profile["joined"].date().isoformat()
+    return SocialStatsSnapshot.objects.create(
+        platform=platform,
+        account=account,
+        followers=stats.get("followers") or 0,
+        following=stats.get("following") or 0,
+        posts=stats.get("tweets") or 0,
+        engagement=stats.get("engagement") or 0,
+        last_post_at=_aware(stats.get("last_tweet")),
+        profile=profile,
+        source=source,
+    )
+
+
+def collect_x_stats(username, instances=None):
+    """
+    Probe every eligible Nitter instance for ``username`` concurrently and store a snapshot from
+    the fastest valid response. Returns the snapshot, or None when no instance answered.
+    """
+    client = NitterClient(username)
+    instances = eligible_instances(instances or NitterClient.NITTER_INSTANCES)
+    if not instances:
+        logger.warning("All Nitter instances are backing off after recent failures")
+        return None
+
+    stats = source = None
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(instances))) as pool:
+        futures = {pool.submit(client.fetch_profile, url, PROBE_TIMEOUT): url for url in instances}
+        # Health is written from this thread as each probe finishes
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"Nitter instance {url} failed: {e}")
+                record_probe(url, e)
+                continue
+            record_probe(url)
+            if stats is None:
+                stats, source = result, url
+
+    if stats is None:
+        logger.error("No working Nitter instance found. Tried: " + ", ".join(instances))
+        return None
+    return store_snapshot("x", username, stats, source)
+
+
+def latest_social_stats(platform, account):
+    """The newest snapshot in the shape NitterClient parses a profile into, with ``error`` set when there is none."""
+    snapshot = SocialStatsSnapshot.objects.filter(platform=platform, account=account).order_by("-collected_at").first()
+    if snapshot is None:
+        return {
+            "followers": 0,
+            "following": 0,
+            "tweets": 0,
+            "engagement": 0,
+            "last_tweet": None,
+            **{field: None for field in PROFILE_FIELDS},
+            "collected_at": None,
+            "error": "No social stats collected yet - run collect_social_stats",
+        }
+    return {
+        "followers": snapshot.followers,
+        "following": snapshot.following,
+        "tweets": snapshot.posts,
+        "engagement": snapshot.engagement,
+        "last_tweet": snapshot.last_post_at,
+        **{field: snapshot.profile.get(field) for field in PROFILE_FIELDS},
+        "collected_at": snapshot.collected_at,
+        "error": None,
+    }
+
+
+def social_history(platform, account, days=30):
+    """Followers and post counts from the last snapshot of each of the past ``days`` days, oldest first."""
+    since = timezone.now() - timedelta(days=days)
+    by_day = {}
+    rows = (
+        SocialStatsSnapshot.objects.filter(platform=platform, account=account, collected_at__gte=since)
+        .order_by("collected_at")
+        .values_list("collected_at", "followers", "posts")
+    )
+    for collected_at, followers, posts in rows:
+        by_day[timezone.localtime(collected_at).date()] = {"followers": followers, "posts": posts}
+    return [{"date": day.strftime("%Y-%m-%d"), **counts} for day, counts in by_day.items()]
+
+
+def prune_snapshots(keep_days):
+    """Delete snapshots older than ``keep_days`` days; returns how many were removed."""
+    cutoff = timezone.now() - timedelta(days=keep_days)
+    deleted, _ = SocialStatsSnapshot.objects.filter(collected_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,167 @@
+import logging
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import stripe
+from django.db import transaction
+from django.utils import timezone
+
+from web.models import StripeEvent, UserMembership
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENT_ATTEMPTS = 8
+RETRY_BACKOFF = timedelta(minutes=1)
+
+
+def sync_membership_subscription(subscription):
+    """Mirror a subscription change onto the UserMembership that owns it, if any."""
+    from web.utils import update_membership_from_subscription
+
+    membership = UserMembership.objects.select_related("user").filter(stripe_subscription_id=subscription.id).first()
+    if membership is None:
+        return
+    if not update_membership_from_subscription(membership.user, subscription):
+        raise RuntimeError(f"Could not update membership from subscription {subscription.id}")
+
+
+def event_handlers():
+    """Return {endpoint: {event type: handlers}}; each handler receives the event's data object."""
+    from web import views
+
+    return {
+        "payments": {
+            "payment_intent.succeeded": (views.handle_successful_payment,),
+            "payment_intent.payment_failed": (views.handle_failed_payment,),
+        },
+        "donations": {
+            "payment_intent.succeeded": (views.handle_successful_donation_payment,),
+            "payment_intent.payment_failed": (views.handle_failed_donation_payment,),
+            "customer.subscription.created": (views.handle_subscription_created, sync_membership_subscription),
+            "customer.subscription.updated": (views.handle_subscription_updated, sync_membership_subscription),
+            "customer.subscription.deleted": (views.handle_subscription_cancelled, sync_membership_subscription),
+            "invoice.payment_succeeded": (views.handle_invoice_paid,),
+            "invoice.payment_failed": (views.handle_invoice_failed,),
+        },
+        "connect": {
+            "account.updated": (views.handle_account_updated,),
+        },
+    }
+
+
+def endpoints_for_event(event):
+    """Work out which webhook endpoints an event fetched from the Stripe API would have reached."""
+    event_type = event["type"]
+    if event_type.startswith("account."):
+        return ["connect"]
+    if event_type.startswith("payment_intent."):
+        metadata = event["data"]["object"].get("metadata") or {}
+        return ["payments"] if metadata.get("course_id") or metadata.get("cart_id") else ["donations"]
+    if event_type.startswith(("customer.subscription.", "invoice.")):
+        return ["donations"]
+    return []
+
+
+def record_stripe_event(event, endpoint):
+    """
+    Store a verified event in the inbox with a single insert. A delivery that is already
+    stored for this endpoint is ignored, so Stripe's retries are acknowledged without new work.
+    """
+    StripeEvent.objects.bulk_create(
+        [
+            StripeEvent(
+                event_id=event["id"],
+                endpoint=endpoint,
+                event_type=event["type"],
+                object_id=event["data"]["object"].get("id") or "",
+                stripe_created=datetime.fromtimestamp(event["created"], tz=dt_timezone.utc),
+                payload=event,
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def process_stripe_event(event, handlers=None):
+    """
+    Run the handlers for one inbox event. The handlers' writes and the "processed" mark commit
+    together, and the row is locked while they run, so an event takes effect exactly once.
+    Returns True when processed, False when it failed, and None when another worker had it.
+    """
+    handlers = (handlers or event_handlers()).get(event.endpoint, {}).get(event.event_type, ())
+    data_object = stripe.Event.construct_from(event.payload, stripe.api_key).data.object
+    try:
+        with transaction.atomic():
+            locked = StripeEvent.objects.select_for_update(skip_locked=True).filter(pk=event.pk, status="pending")
+            if not locked.exists():
+                return None
+            for handler in handlers:
+                handler(data_object)
+            event.attempts += 1
+            locked.update(status="processed", attempts=event.attempts, last_error="", processed_at=timezone.now())
+        event.status = "processed"
+        return True
+    except Exception as e:
+        logger.exception("Error processing Stripe event %s (%s)", event.event_id, event.event_type)
+        event.attempts += 1
+        event.last_error = str(e)[:500]
+        if event.attempts >= MAX_EVENT_ATTEMPTS:
+            event.status = "failed"
+        else:
+            event.run_after = timezone.now() + RETRY_BACKOFF * 2 ** (event.attempts - 1)
+        event.save(update_fields=["attempts", "last_error", "status", "run_after"])
+        return False
+
+
+def process_stripe_events(limit=100):
+    """
+    Process pending inbox events oldest first. Events for the same Stripe object run in the
+    order Stripe created them: while one is waiting to be retried, later events for that object
+    are deferred. Returns a dict of counts keyed by outcome.
+    """
+    stats = {"processed": 0, "retried": 0, "failed": 0, "deferred": 0}
+    handlers = event_handlers()
+    now = timezone.now()
+    blocked = set()
+
+    for event in StripeEvent.objects.filter(status="pending").order_by("stripe_created", "id")[:limit]:
+        if event.object_id and event.object_id in blocked:
+            stats["deferred"] += 1
+            continue
+        if event.run_after > now:
+            blocked.add(event.object_id)
+            stats["deferred"] += 1
+            continue
+
+        result = process_stripe_event(event, handlers)
+        if result:
+            stats["processed"] += 1
+        elif result is False:
+            if event.status == "failed":
+                stats["failed"] += 1
+            else:
+                stats["retried"] += 1
+                blocked.add(event.object_id)
+    return stats
+
+
+def requeue_stripe_events(events):
+    """Mark the given inbox events pending again so the worker replays them. Returns the count."""
+    return events.update(status="pending", attempts=0, last_error="", run_after=timezone.now(), processed_at=None)
+
+
+def backfill_stripe_events(since, types=None):
+    """
+    Fetch events created since ``since`` from the Stripe API and add any missing ones to the
+    inbox. Returns (events seen, inbox rows added).
+    """
+    before = StripeEvent.objects.count()
+    params = {"created": {"gte": int(since.timestamp())}, "limit": 100}
+    if types:
+        params["types"] = types
+    seen = 0
+    for event in stripe.Event.list(**params).auto_paging_iter():
+        seen += 1
+        for endpoint in endpoints_for_event(event):
+            record_stripe_event(event, endpoint)
+    return seen, StripeEvent.objects.count() - before
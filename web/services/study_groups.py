@@ -0,0 +1,79 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, Exists, Max, OuterRef, Prefetch
+
+from web.models import StudyGroup
+
+OPEN_SEATS_CACHE_TIMEOUT = 60 * 60
+COURSES_PER_PAGE = 5
+
+
+def open_seats_cache_key(course_id):
+    return f"study_group_open_seats:{course_id}"
+
+
+def study_group_queryset(user=None):
+    """
+    Study groups with their course and creator selected and ``member_count`` annotated, so
+    listing cards never count members per row. With a user, ``is_member`` is annotated too.
+    """
+    groups = StudyGroup.objects.select_related("course", "creator").annotate(member_count=Count("members"))
+    if user is not None and user.is_authenticated:
+        membership = StudyGroup.members.through.objects.filter(studygroup_id=OuterRef("pk"), user_id=user.id)
+        groups = groups.annotate(is_member=Exists(membership))
+    return groups
+
+
+def study_group_detail_queryset(user=None):
+    """study_group_queryset plus the member list (with profiles) shown on the detail page."""
+    return study_group_queryset(user).prefetch_related(
+        Prefetch("members", queryset=User.objects.select_related("profile").order_by("id"))
+    )
+
+
+def get_study_group_directory(user, page_number):
+    """
+    Return (page, courses_with_groups) for the all-groups directory, paginated by course.
+
+    Courses are ordered by their newest group. Only the page's groups are loaded, in one query,
+    and grouped into an ordered {course: [groups]} dict.
+    """
+    course_ids = (
+        StudyGroup.objects.values_list("course_id", flat=True)
+        .annotate(latest=Max("created_at"))
+        .order_by("-latest", "course_id")
+    )
+    page = Paginator(course_ids, COURSES_PER_PAGE).get_page(page_number)
+    page_course_ids = list(page.object_list)
+
+    groups_by_course = {course_id: [] for course_id in page_course_ids}
+    for group in study_group_queryset(user).filter(course_id__in=page_course_ids).order_by("-created_at"):
+        groups_by_course[group.course_id].append(group)
+    courses_with_groups = {groups[0].course: groups for groups in groups_by_course.values() if groups}
+    return page, courses_with_groups
+
+
+def get_open_seats(course_ids):
+    """Return the cached {course_id: open seats across its study groups} for the given courses."""
+    keys = {open_seats_cache_key(course_id): course_id for course_id in course_ids}
+    cached = cache.get_many(keys)
+    seats = {keys[key]: value for key, value in cached.items()}
+    missing = [course_id for key, course_id in keys.items() if key not in cached]
+    if missing:
+        fresh = dict.fromkeys(missing, 0)
+        for course_id, max_members, member_count in (
+            StudyGroup.objects.filter(course_id__in=missing)
+            .annotate(member_count=Count("members"))
+            .values_list("course_id", "max_members", "member_count")
+        ):
+            fresh[course_id] += max(max_members - member_count, 0)
+        cache.set_many(
+            {open_seats_cache_key(course_id): value for course_id, value in fresh.items()}, OPEN_SEATS_CACHE_TIMEOUT
+        )
+        seats.update(fresh)
+    return seats
+
+
+def invalidate_open_seats(course_id):
+    cache.delete(open_seats_cache_key(course_id))
@@ -0,0 +1,156 @@
+import csv
+import json
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from web.models import Choice, Question, Response
+
+SURVEY_RESULTS_CACHE_TIMEOUT = 60 * 60
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = ["response_id", "question_id", "question", "choice", "text_answer", "user", "created_at"]
+
+
+def survey_results_cache_key(survey_id):
+    return f"survey_results_{survey_id}"
+
+
+def invalidate_survey_results(survey_id):
+    cache.delete(survey_results_cache_key(survey_id))
+
+
+def compute_survey_results(survey):
+    """
+    Build the results summary for a survey from one grouped (question, choice, count) query.
+
+    Questions and choices are plain dicts so the summary can be cached; templates read
+    them with the same attribute syntax as model instances.
+    """
+    questions = {
+        question["id"]: question
+        for question in Question.objects.filter(survey=survey).order_by("id").values("id", "text", "type")
+    }
+    choices_by_question = {question_id: [] for question_id in questions}
+    choice_rows = (
+        Choice.objects.filter(question__survey=survey)
+        .values("id", "question_id", "text")
+        .annotate(count=Count("response"))
+        .order_by("question_id", "id")
+    )
+    for row in choice_rows:
+        choices_by_question[row["question_id"]].append({"text": row["text"], "count": row["count"]})
+
+    results = []
+    total_participants = 0
+    most_answered_question = None
+    max_responses = 0
+    top_choice = None
+    bottom_choice = None
+    overall_top_choice_count = 0
+    overall_bottom_choice_count = float("inf")
+    total_actual_responses = 0
+
+    for question_id, question in questions.items():
+        choices_data = choices_by_question[question_id]
+        question_total = sum(choice["count"] for choice in choices_data)
+        if question_total == 0:
+            continue
+
+        total_actual_responses += question_total
+
+        if question_total > max_responses:
+            max_responses = question_total
+            most_answered_question = question
+
+        for choice in choices_data:
+            choice["percentage"] = round((choice["count"] / question_total * 100), 1)
+
+            if choice["count"] > overall_top_choice_count:
+                overall_top_choice_count = choice["count"]
+                top_choice = choice
+
+            if 0 < choice["count"] < overall_bottom_choice_count:
+                overall_bottom_choice_count = choice["count"]
+                bottom_choice = choice
+
+        results.append({"question": question, "choices": choices_data, "total": question_total})
+        total_participants = max(total_participants, question_total)
+
+    # Every participant could have answered each question; checkbox questions can exceed that, so cap at 100
+    engagement_score = 0
+    total_possible_responses = total_participants * len(results)
+    if total_possible_responses > 0:
+        engagement_score = min(total_actual_responses / total_possible_responses * 100, 100)
+
+    chart_data = [
+        {
+            "question_id": result["question"]["id"],
+            "question_text": result["question"]["text"],
+            "labels": [choice["text"] for choice in result["choices"]],
+            "data": [choice["count"] for choice in result["choices"]],
+        }
+        for result in results
+    ]
+
+    return {
+        "results": results,
+        "total_participants": total_participants,
+        "most_answered_question": most_answered_question,
+        "top_choice": top_choice,
+        "bottom_choice": bottom_choice,
+        "engagement_score": round(engagement_score, 1),
+        "chart_data_json": json.dumps(chart_data),
+    }
+
+
+def get_survey_results(survey):
+    """Return the cached results summary for a survey, computing it on a miss."""
+    key = survey_results_cache_key(survey.id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_survey_results(survey)
+        cache.set(key, summary, SURVEY_RESULTS_CACHE_TIMEOUT)
+    return summary
+
+
+def iter_survey_responses(survey):
+    """Yield one dict per response, reading the table in chunks so large surveys stream in bounded memory."""
+    responses = (
+        Response.objects.filter(question__survey=survey)
+        .select_related("question", "choice", "user")
+        .only("id", "text_answer", "created_at", "question__id", "question__text", "choice__text", "user__username")
+        .order_by("id")
+    )
+    for response in responses.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            "response_id": response.id,
+            "question_id": response.question.id,
+            "question": response.question.text,
+            "choice": response.choice.text if response.choice else "",
+            "text_answer": response.text_answer,
+            "user": response.user.username,
+            "created_at": response.created_at.isoformat(),
+        }
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def stream_survey_csv(survey):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in iter_survey_responses(survey):
+        yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+
+def stream_survey_json(survey):
+    yield '{"survey": %s, "responses": [' % json.dumps({"id": survey.id, "title": survey.title})
+    separator = ""
+    for row in iter_survey_responses(survey):
+        yield separator + json.dumps(row)
+        separator = ","
+    yield "]}"
@@ -0,0 +1,248 @@
+"""
+System and request metrics for the admin dashboard, shared by every web worker.
+
+Samples and request timings live in the default cache (Redis in production) rather than in
+process memory, so whichever uvicorn worker answers a dashboard poll reports the same data.
+Every worker runs a sampler thread, but only the first to claim each interval takes a sample.
+"""
+
+import logging
+import math
+import threading
+import time
+
+import psutil
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 10  # seconds between background samples
+HISTORY_SIZE = 360  # one hour of samples at the default interval
+REQUEST_WINDOW = 1000  # most recent requests kept for percentiles
+TOP_PROCESS_LIMIT = 15
+TOP_PROCESS_MIN_PERCENT = 0.1
+CACHE_PREFIX = "system_metrics"
+# Stored metrics expire if no worker has sampled or served a request for this long
+METRICS_CACHE_TIMEOUT = 60 * 60
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list, or None when it is empty."""
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def collect_sample():
+    """
+    Read one system metrics sample without blocking.
+
+    cpu_percent(interval=None) reports usage since the previous call instead of sleeping
+    for a second, so the first sample of a process reads 0. Processes are read in a single
+    process_iter pass with their memory attributes prefetched.
+    """
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    disk = psutil.disk_usage("/")
+    proc_memory = psutil.Process().memory_info()
+    cpu_freq = psutil.cpu_freq()
+
+    top_processes = []
+    for proc in psutil.process_iter(["pid", "name", "memory_percent", "memory_info"]):
+        info = proc.info
+        memory_percent = info.get("memory_percent") or 0
+        if memory_percent > TOP_PROCESS_MIN_PERCENT and info.get("memory_info"):
+            top_processes.append(
+                {
+                    "pid": info["pid"],
+                    "name": info.get("name") or "",
+                    "memory_percent": round(memory_percent, 2),
+                    "memory_bytes": info["memory_info"].rss,
+                }
+            )
+    top_processes.sort(key=lambda p: p["memory_percent"], reverse=True)
+
+    return {
+        "cpu": {
+            "percent": psutil.cpu_percent(interval=None),
+            "count": psutil.cpu_count(),
+            "frequency": cpu_freq.current if cpu_freq else 0,
+        },
+        "memory": {
+            "total": memory.total,
+            "available": memory.available,
+            "percent": memory.percent,
+            "used": memory.used,
+            "free": memory.free,
+        },
+        "swap": {"total": swap.total, "used": swap.used, "free": swap.free, "percent": swap.percent},
+        "disk": {"total": disk.total, "used": disk.used, "free": disk.free, "percent": disk.percent},
+        "process": {"rss": proc_memory.rss, "vms": proc_memory.vms},
+        "top_processes": top_processes[:TOP_PROCESS_LIMIT],
+        "timestamp": timezone.now(),
+    }
+
+
+class MetricsSampler:
+    """
+    Samples system metrics on a daemon thread into a fixed-size ring buffer in the cache.
+
+    Each web worker starts a thread, and in every interval the worker that claims the interval's
+    tick key takes the sample, so the shared history gets one point per interval.
+    """
+
+    def __init__(
+        self, interval=SAMPLE_INTERVAL, history_size=HISTORY_SIZE, collect=collect_sample, prefix=CACHE_PREFIX
+    ):
+        self.interval = interval
+        self.history_size = history_size
+        self.collect = collect
+        self.latest_key = f"{prefix}:latest"
+        self.history_key = f"{prefix}:history"
+        self.tick_prefix = f"{prefix}:tick"
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def sample(self):
+        """Take one sample now and record it. Returns the sample, or None if collection failed."""
+        try:
+            sample = self.collect()
+        except Exception as e:
+            logger.error(f"Error sampling system metrics: {e}")
+            return None
+        point = {
+            "timestamp": sample["timestamp"],
+            "cpu": sample["cpu"]["percent"],
+            "memory": sample["memory"]["percent"],
+            "swap": sample["swap"]["percent"],
+            "disk": sample["disk"]["percent"],
+        }
+        history = (cache.get(self.history_key) or []) + [point]
+        cache.set_many(
+            {self.latest_key: sample, self.history_key: history[-self.history_size :]}, METRICS_CACHE_TIMEOUT
+        )
+        return sample
+
+    def claim_tick(self):
+        """True for the one worker that gets to sample in the current interval."""
+        tick = int(time.time() // self.interval)
+        return cache.add(f"{self.tick_prefix}:{tick}", True, self.interval * 2)
+
+    def ensure_running(self):
+        """Start the background thread once per process."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="system-metrics-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            if self.claim_tick():
+                self.sample()
+            time.sleep(self.interval)
+
+    def snapshot(self):
+        """Return (latest sample, list of history points) without sampling."""
+        stored = cache.get_many([self.latest_key, self.history_key])
+        return stored.get(self.latest_key), stored.get(self.history_key) or []
+
+
+class RequestStats:
+    """
+    Ring buffer of recent request latencies and database query counts, kept in the cache.
+
+    Each worker buffers its requests in memory and writes them out ``flush_threshold`` at a time
+    (or after ``flush_interval`` seconds), claiming consecutive slots from an atomic counter, so
+    all workers share one window of the last ``size`` requests at two cache calls per batch.
+    """
+
+    def __init__(self, size=REQUEST_WINDOW, prefix=CACHE_PREFIX, flush_threshold=20, flush_interval=5):
+        self.size = size
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self.counter_key = f"{prefix}:requests"
+        self.slot_prefix = f"{prefix}:request"
+        self._pending = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _slot_keys(self):
+        return [f"{self.slot_prefix}:{slot}" for slot in range(self.size)]
+
+    def _claim_slots(self, count):
+        try:
+            end = cache.incr(self.counter_key, count)
+        except ValueError:
+            cache.add(self.counter_key, 0, None)
+            end = cache.incr(self.counter_key, count)
+        return [(end - count + i) % self.size for i in range(count)]
+
+    def record(self, duration_ms, query_count):
+        with self._lock:
+            self._pending.append((duration_ms, query_count))
+            due = (
+                len(self._pending) >= self.flush_threshold or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write this worker's buffered requests to the shared window. Returns how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending[-self.size :], []
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            slots = self._claim_slots(len(pending))
+            cache.set_many(
+                {f"{self.slot_prefix}:{slot}": sample for slot, sample in zip(slots, pending)}, METRICS_CACHE_TIMEOUT
+            )
+        except Exception as e:
+            logger.error(f"Error recording request stats: {e}")
+            return 0
+        return len(pending)
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+        cache.delete_many([self.counter_key, *self._slot_keys()])
+
+    def summary(self):
+        self.flush()
+        samples = list(cache.get_many(self._slot_keys()).values())
+        latencies = sorted(duration for duration, _ in samples)
+        queries = sorted(count for _, count in samples)
+        return {
+            "count": len(samples),
+            "latency_ms": {f"p{p}": _round(percentile(latencies, p)) for p in (50, 90, 99)},
+            "queries": {f"p{p}": percentile(queries, p) for p in (50, 90, 99)},
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+sampler = MetricsSampler()
+request_stats = RequestStats()
+
+
+def get_metrics_snapshot():
+    """
+    Return the latest system sample plus history and request percentiles, without blocking.
+
+    Starts this worker's sampler thread on first use; until any worker has produced a sample,
+    one is taken inline.
+    """
+    sampler.ensure_running()
+    latest, history = sampler.snapshot()
+    if latest is None:
+        latest = sampler.sample()
+        latest, history = sampler.snapshot()
+    if latest is None:
+        return None
+    return dict(latest, history=history, requests=request_stats.summary())
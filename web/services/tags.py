@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from web.models import BlogPostTag, CourseTag, Tag, WaitingRoomTopic
+
+BLOG_TAG_CLOUD_CACHE_KEY = "blog_tag_cloud"
+BLOG_TAG_CLOUD_CACHE_TIMEOUT = 60 * 60
+
+# model label -> (comma-separated source field, through model, owner field on the through model)
+TAGGED_FIELDS = {
+    "web.course": ("tags", CourseTag, "course"),
+    "web.blogpost": ("tags", BlogPostTag, "post"),
+    "web.waitingroom": ("topics", WaitingRoomTopic, "waiting_room"),
+}
+
+
+def tag_key(name):
+    """Normalize a tag name for matching: lowercase with whitespace collapsed."""
+    return " ".join(name.lower().split())[:100]
+
+
+def parse_tags(value):
+    """Split a comma-separated tag string into display names, dropping blanks and duplicates."""
+    names = {}
+    for name in (value or "").split(","):
+        name = " ".join(name.split())[:100]
+        if name:
+            names.setdefault(tag_key(name), name)
+    return list(names.values())
+
+
+def get_or_create_tags(names):
+    """Return Tag rows for the given names, creating any that are missing."""
+    keys = {tag_key(name): name for name in names}
+    if not keys:
+        return []
+    Tag.objects.bulk_create([Tag(key=key, name=name) for key, name in keys.items()], ignore_conflicts=True)
+    return list(Tag.objects.filter(key__in=keys))
+
+
+def sync_tags(instance):
+    """Mirror a course, blog post or waiting room's comma-separated tags into its through table."""
+    source_field, through, owner_field = TAGGED_FIELDS[instance._meta.label_lower]
+    tags = get_or_create_tags(parse_tags(getattr(instance, source_field)))
+    tag_ids = {tag.id for tag in tags}
+    links = through.objects.filter(**{owner_field: instance})
+    existing = set(links.values_list("tag_id", flat=True))
+    if existing - tag_ids:
+        links.filter(tag_id__in=existing - tag_ids).delete()
+    through.objects.bulk_create(
+        [through(**{owner_field: instance, "tag_id": tag_id}) for tag_id in tag_ids - existing],
+        ignore_conflicts=True,
+    )
+    return existing != tag_ids
+
+
+def tagged_course_ids(tags):
+    """Subquery of course ids carrying any of the given Tag rows or tag ids."""
+    return CourseTag.objects.filter(tag__in=tags).values("course_id")
+
+
+def courses_with_tag_keys(keys):
+    """Subquery of course ids carrying any tag whose normalized key is in ``keys``."""
+    return CourseTag.objects.filter(tag__key__in=[tag_key(key) for key in keys]).values("course_id")
+
+
+def get_blog_tag_cloud():
+    """Return the cached [{"name", "key", "count"}] list of tags on published blog posts."""
+    cloud = cache.get(BLOG_TAG_CLOUD_CACHE_KEY)
+    if cloud is None:
+        cloud = list(
+            Tag.objects.annotate(count=Count("post_tags", filter=Q(post_tags__post__status="published")))
+            .filter(count__gt=0)
+            .order_by("name")
+            .values("name", "key", "count")
+        )
+        cache.set(BLOG_TAG_CLOUD_CACHE_KEY, cloud, BLOG_TAG_CLOUD_CACHE_TIMEOUT)
+    return cloud
+
+
+def invalidate_blog_tag_cloud():
+    cache.delete(BLOG_TAG_CLOUD_CACHE_KEY)
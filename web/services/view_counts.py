@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def view_count_cache_key(instance):
+    return f"view_count:{instance._meta.label_lower}:{instance.pk}"
+
+
+class BufferedViewCounter:
+    """
+    Count page views without writing to the database on every hit.
+
+    The displayed total lives in the cache and is bumped atomically per view. Views are also
+    buffered in-process and written to the model's ``view_count`` column with one F() update
+    per object once ``flush_threshold`` views are pending or ``flush_interval`` seconds have
+    passed. A crash loses at most one buffer's worth of views.
+    """
+
+    def __init__(self, flush_threshold=50, flush_interval=60):
+        self.flush_threshold = flush_threshold
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, instance):
+        """Count one view of ``instance`` and return its current total."""
+        key = (instance._meta.label_lower, instance.pk)
+        with self._lock:
+            self._pending[key] += 1
+            due = (
+                sum(self._pending.values()) >= self.flush_threshold
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        total = self._increment_total(instance, key)
+        if due:
+            self.flush()
+        return total
+
+    def _increment_total(self, instance, key):
+        cache_key = view_count_cache_key(instance)
+        try:
+            return cache.incr(cache_key)
+        except ValueError:
+            pass
+        # Cold cache: seed from the stored column plus this process's unflushed views
+        stored = type(instance).objects.filter(pk=instance.pk).values_list("view_count", flat=True).first() or 0
+        with self._lock:
+            total = stored + self._pending[key]
+        if cache.add(cache_key, total, VIEW_COUNT_CACHE_TIMEOUT):
+            return total
+        return cache.incr(cache_key)
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def flush(self):
+        """Write buffered views to the database. Returns the number of views written."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+        written = 0
+        for (label, pk), views in pending.items():
+            try:
+                apps.get_model(label).objects.filter(pk=pk).update(view_count=F("view_count") + views)
+            except Exception as e:
+                logger.error(f"Failed to flush {views} views for {label} {pk}: {e}")
+                with self._lock:
+                    self._pending[(label, pk)] += views
+                continue
+            written += views
+        return written
+
+
+view_counter = BufferedViewCounter()
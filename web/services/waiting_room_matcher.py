@@ -0,0 +1,48 @@
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from web.models import WaitingRoom, WaitingRoomTopic
+from web.notifications import notify_waiting_rooms_fulfilled
+from web.services.tags import parse_tags, tag_key
+
+
+def find_satisfied_rooms(course):
+    """
+    Return the open new-course waiting rooms that ``course`` satisfies.
+
+    A room is satisfied when its subject matches the course subject and none of its topics is
+    missing from the course tags. This is one query on the (status, subject_key) index with an
+    anti-join on the topic table, however many rooms are open.
+    """
+    if not course.subject_id:
+        return WaitingRoom.objects.none()
+    course_keys = {tag_key(name) for name in parse_tags(course.tags)}
+    uncovered_topics = WaitingRoomTopic.objects.filter(waiting_room=OuterRef("pk")).exclude(tag__key__in=course_keys)
+    return WaitingRoom.objects.filter(
+        status="open", subject_key=tag_key(course.subject.name), course__isnull=True
+    ).exclude(Exists(uncovered_topics))
+
+
+def fulfil_waiting_rooms(course, waiting_rooms=None):
+    """
+    Mark waiting rooms fulfilled by ``course`` and notify everyone waiting in them.
+
+    Defaults to every room the course satisfies. Only rooms that are still open are claimed,
+    so calling this again for the same course does not notify anyone twice. Returns the rooms.
+    """
+    if waiting_rooms is None:
+        waiting_rooms = find_satisfied_rooms(course)
+    else:
+        waiting_rooms = WaitingRoom.objects.filter(id__in=[room.id for room in waiting_rooms], status="open")
+    rooms = list(waiting_rooms.select_related("creator").prefetch_related("participants"))
+    if not rooms:
+        return []
+
+    WaitingRoom.objects.filter(id__in=[room.id for room in rooms], status="open").update(
+        status="fulfilled", fulfilled_course=course, updated_at=timezone.now()
+    )
+    for room in rooms:
+        room.status = "fulfilled"
+        room.fulfilled_course = course
+    notify_waiting_rooms_fulfilled(rooms, course)
+    return rooms
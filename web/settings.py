@@ -153,6 +153,8 @@ if DEBUG and not TESTING:
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Latency and query count percentiles for the admin system dashboard
+    "web.middleware.RequestMetricsMiddleware",
     # Compress responses to reduce payload size
     "django.middleware.gzip.GZipMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -187,6 +189,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "web.context_processors.last_modified",
+                "web.context_processors.header_summary",
             ],
             **(
                 {}
@@ -3,7 +3,35 @@ from django.core.cache import cache
 from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
-from .models import CourseProgress, Enrollment, LearningStreak, Session, SessionAttendance
+from .models import (
+    BlogComment,
+    BlogPost,
+    Cart,
+    CartItem,
+    Course,
+    CourseProgress,
+    Enrollment,
+    Goods,
+    LearningStreak,
+    Notification,
+    Question,
+    Response,
+    Session,
+    SessionAttendance,
+    Storefront,
+    StudyGroup,
+    StudyGroupInvite,
+    SuccessStory,
+    WaitingRoom,
+)
+from .services.content_pages import invalidate_comments, invalidate_content_index
+from .services.goods_catalog import invalidate_goods_facets
+from .services.header_summary import invalidate_header_summary
+from .services.session_map import bump_map_version
+from .services.study_groups import invalidate_open_seats
+from .services.survey_results import invalidate_survey_results
+from .services.tags import TAGGED_FIELDS, invalidate_blog_tag_cloud, sync_tags
+from .services.waiting_room_matcher import fulfil_waiting_rooms
 from .utils import send_slack_message
 
 
@@ -26,6 +54,11 @@ def invalidate_progress_cache(user):
     cache.delete(cache_key)
 
 
+def invalidate_progress_caches(user_ids):
+    """Invalidate the progress caches of many students in one cache round trip."""
+    cache.delete_many([f"user_progress_{user_id}" for user_id in user_ids])
+
+
 @receiver(post_save, sender=Enrollment)
 @receiver(post_delete, sender=Enrollment)
 def invalidate_enrollment_cache(sender, instance, **kwargs):
@@ -67,3 +100,124 @@ def invalidate_session_cache(sender, instance, **kwargs):
     enrollments = Enrollment.objects.filter(course=instance.course)
     for enrollment in enrollments:
         invalidate_progress_cache(enrollment.student)
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_session_map_cache(sender, instance, **kwargs):
+    """Invalidate cached map tiles whenever a session or its course changes."""
+    bump_map_version()
+
+
+@receiver(post_save, sender=Cart)
+@receiver(post_delete, sender=Cart)
+def invalidate_cart_header_summary(sender, instance, **kwargs):
+    """Invalidate the header badges when a cart is created, claimed or removed."""
+    invalidate_header_summary(instance.user_id, instance.session_key)
+
+
+@receiver(post_save, sender=CartItem)
+@receiver(post_delete, sender=CartItem)
+def invalidate_cart_item_header_summary(sender, instance, **kwargs):
+    """Invalidate the cart badge of the cart's owner when an item is added or removed."""
+    try:
+        cart = instance.cart
+    except Cart.DoesNotExist:
+        # The cart itself is being deleted; its own receiver handles the owner
+        return
+    invalidate_header_summary(cart.user_id, cart.session_key)
+
+
+@receiver(post_save, sender=StudyGroupInvite)
+@receiver(post_delete, sender=StudyGroupInvite)
+def invalidate_invite_header_summary(sender, instance, **kwargs):
+    """Invalidate the invitation badge when an invite is sent, answered or withdrawn."""
+    invalidate_header_summary(user_id=instance.recipient_id)
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_notification_header_summary(sender, instance, **kwargs):
+    """Invalidate the unread notification count when a notification is created, read or removed."""
+    invalidate_header_summary(user_id=instance.user_id)
+
+
+@receiver(post_save, sender=Response)
+@receiver(post_delete, sender=Response)
+def invalidate_survey_results_on_response(sender, instance, **kwargs):
+    """Invalidate the cached results of the survey a response was given to or removed from."""
+    try:
+        survey_id = instance.question.survey_id
+    except Question.DoesNotExist:
+        return
+    invalidate_survey_results(survey_id)
+
+
+@receiver(post_save, sender=Goods)
+@receiver(post_delete, sender=Goods)
+@receiver(post_save, sender=Storefront)
+@receiver(post_delete, sender=Storefront)
+def invalidate_goods_listing_facets(sender, instance, **kwargs):
+    """Invalidate the cached store and category filters when the catalog changes."""
+    invalidate_goods_facets()
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=BlogPost)
+@receiver(post_save, sender=WaitingRoom)
+def sync_normalized_tags(sender, instance, update_fields=None, **kwargs):
+    """Keep the Tag through tables in step with the comma-separated tags/topics field."""
+    source_field = TAGGED_FIELDS[sender._meta.label_lower][0]
+    if update_fields is None or source_field in update_fields:
+        sync_tags(instance)
+
+
+@receiver(post_save, sender=Course)
+def fulfil_matching_waiting_rooms(sender, instance, update_fields=None, **kwargs):
+    """When a course is published (or its subject or tags change), fulfil the open waiting rooms it satisfies."""
+    if instance.status != "published":
+        return
+    if update_fields is None or {"status", "subject", "tags"} & set(update_fields):
+        fulfil_waiting_rooms(instance)
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+def invalidate_blog_tags(sender, instance, **kwargs):
+    """Invalidate the cached blog tag cloud when a post's tags or status may have changed."""
+    invalidate_blog_tag_cloud()
+
+
+@receiver(post_save, sender=BlogPost)
+@receiver(post_delete, sender=BlogPost)
+@receiver(post_save, sender=SuccessStory)
+@receiver(post_delete, sender=SuccessStory)
+def invalidate_published_content(sender, instance, **kwargs):
+    """Rebuild the cached index of published blog posts or success stories after any change."""
+    invalidate_content_index(sender)
+
+
+@receiver(post_save, sender=BlogComment)
+@receiver(post_delete, sender=BlogComment)
+def invalidate_blog_comments(sender, instance, **kwargs):
+    invalidate_comments(instance.post_id)
+
+
+@receiver(post_save, sender=StudyGroup)
+@receiver(post_delete, sender=StudyGroup)
+def invalidate_study_group_seats(sender, instance, **kwargs):
+    invalidate_open_seats(instance.course_id)
+
+
+@receiver(m2m_changed, sender=StudyGroup.members.through)
+def invalidate_study_group_seats_on_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidate the cached open seats when members join or leave a study group (from either side)."""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        return
+    if not reverse:
+        invalidate_open_seats(instance.course_id)
+    elif pk_set:
+        for course_id in set(StudyGroup.objects.filter(pk__in=pk_set).values_list("course_id", flat=True)):
+            invalidate_open_seats(course_id)
@@ -5,7 +5,6 @@ from datetime import datetime
 
 import requests
 from django.conf import settings
-from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
@@ -38,9 +37,6 @@ class NitterClient:
 
     def __init__(self, username):
         self.username = username
-        self.base_url = None
-        self.working_instances = []
-        self._find_working_instances()
 
     def _is_valid_response(self, response_text):
         """Check if the response contains valid profile data."""
@@ -51,157 +47,37 @@ class NitterClient:
         ]
         return any(element in response_text for element in required_elements)
 
-    def _find_working_instances(self):
-        """Try all Nitter instances and collect working ones."""
-        random.shuffle(self.NITTER_INSTANCES)  # Randomize the order to distribute load
-
-        for instance in self.NITTER_INSTANCES:
-            try:
-                headers = {
-                    "User-Agent": random.choice(self.USER_AGENTS),
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.5",
-                    "DNT": "1",
-                    "Connection": "keep-alive",
-                    "Upgrade-Insecure-Requests": "1",
-                }
-
-                # Try fetching the profile directly with a shorter timeout
-                response = requests.get(
-                    f"{instance}/{self.username}",
-                    headers=headers,
-                    timeout=5,  # Reduced timeout to fail faster
-                    allow_redirects=True,
-                    verify=True,  # Always verify SSL for security
-                )
-                response.raise_for_status()
-
-                if self._is_valid_response(response.text):
-                    logger.info(f"Found working Nitter instance: {instance}")
-                    self.working_instances.append(instance)
-                    if not self.base_url:
-                        self.base_url = instance
-
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Failed to connect to Nitter instance {instance}: {str(e)}")
-                continue
-            except Exception as e:
-                logger.warning(f"Unexpected error with {instance}: {str(e)}")
-                continue
-
-            # Break after finding 2 working instances to avoid unnecessary checks
-            if len(self.working_instances) >= 2:
-                break
-
-        if not self.working_instances:
-            logger.error("No working Nitter instances found")
-            logger.error("Tried instances: " + ", ".join(self.NITTER_INSTANCES))
-
-    def get_working_instance(self):
-        """Get a working instance, trying to find new ones if necessary."""
-        if not self.working_instances:
-            self._find_working_instances()
-
-        if self.working_instances:
-            self.base_url = random.choice(self.working_instances)
-            return self.base_url
-        return None
+    def _headers(self):
+        return {
+            "User-Agent": random.choice(self.USER_AGENTS),
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.5",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1",
+        }
 
-    def get_profile_stats(self):
+    def fetch_profile(self, instance, timeout=5):
         """
-        Fetch profile statistics from Nitter.
-        Returns dict with followers, following, tweets count, and last tweet info.
+        Fetch and parse the profile page from one Nitter instance.
+        Raises requests.RequestException or ValueError when the instance does not return valid stats.
         """
-        if not self.base_url:
-            self.base_url = self.get_working_instance()
-            if not self.base_url:
-                # Return cached data if available
-                cache_key = f"nitter_stats_{self.username}"
-                cached_data = cache.get(cache_key)
-                if cached_data:
-                    logger.info("Using cached data due to Nitter unavailability")
-                    return cached_data
-                return self._get_error_stats("No working Nitter instance available - using fallback data")
-
-        cache_key = f"nitter_stats_{self.username}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return cached_data
-
-        max_retries = 3
-        retry_count = 0
-        last_error = None
-
-        # Store original base_url to restore if needed
-        original_base_url = self.base_url
-
-        while retry_count < max_retries:
-            try:
-                logger.debug(f"Attempt {retry_count + 1}: Fetching stats from {self.base_url}")
-
-                headers = {
-                    "User-Agent": random.choice(self.USER_AGENTS),
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.5",
-                    "DNT": "1",
-                    "Connection": "keep-alive",
-                    "Upgrade-Insecure-Requests": "1",
-                }
-
-                response = requests.get(
-                    f"{self.base_url}/{self.username}",
-                    headers=headers,
-                    timeout=10,
-                    allow_redirects=True,
-                    verify=True,  # Always verify SSL for security
-                )
-                response.raise_for_status()
-
-                if not self._is_valid_response(response.text):
-                    raise ValueError("Invalid response format")
-
-                stats = self._parse_profile_stats(response.text)
-
-                if stats.get("error"):
-                    raise ValueError(stats["error"])
-
-                # Cache the results for 30 minutes
-                cache.set(cache_key, stats, timeout=1800)
-                return stats
-
-            except (requests.exceptions.RequestException, ValueError) as e:
-                last_error = str(e)
-                logger.warning(f"Attempt {retry_count + 1} failed: {last_error}")
-
-                # Increment retry count
-                retry_count += 1
-
-                # Try another instance if we have retries left
-                if retry_count < max_retries:
-                    # Remove the current instance from working instances if it failed
-                    if self.base_url in self.working_instances:
-                        self.working_instances.remove(self.base_url)
-
-                    # Get a new working instance
-                    new_base_url = self.get_working_instance()
-                    if new_base_url:
-                        self.base_url = new_base_url
-                        logger.debug(f"Switching to alternate instance: {self.base_url}")
-                    else:
-                        # If no new instance is available, restore the original and break
-                        self.base_url = original_base_url
-                        break
-                else:
-                    # We've exhausted our retries
-                    break
-
-        # If all retries failed, try to return cached data
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            logger.info("Using cached data after retries failed")
-            return cached_data
-
-        return self._get_error_stats("Failed to fetch stats - using fallback data")
+        response = requests.get(
+            f"{instance}/{self.username}",
+            headers=self._headers(),
+            timeout=timeout,
+            allow_redirects=True,
+            verify=True,  # Always verify SSL for security
+        )
+        response.raise_for_status()
+
+        if not self._is_valid_response(response.text):
+            raise ValueError("Invalid response format")
+
+        stats = self._parse_profile_stats(response.text)
+        if stats.get("error"):
+            raise ValueError(stats["error"])
+        return stats
 
     def _parse_profile_stats(self, html_content):
         """Parse the HTML content and extract profile stats."""
@@ -315,21 +191,21 @@ class NitterClient:
 def get_social_stats():
     """
     Get stats from all configured social media platforms.
-    Returns dict with stats for each platform.
+    Returns dict with stats for each platform, read from the snapshots stored by collect_social_stats.
     """
+    from web.services.social_stats import latest_social_stats
+
     stats = {}
 
-    # Get X/Twitter stats via Nitter
+    # Get X/Twitter stats collected via Nitter
     if hasattr(settings, "TWITTER_USERNAME"):
-        nitter = NitterClient(settings.TWITTER_USERNAME)
-        x_stats = nitter.get_profile_stats()
-        if x_stats:
-            stats["x"] = {
-                "stats": x_stats,
-                "date": x_stats.get("last_tweet"),
-                "status": "danger" if x_stats.get("error") else "success" if x_stats.get("last_tweet") else "neutral",
-                "error": x_stats.get("error"),
-            }
+        x_stats = latest_social_stats("x", settings.TWITTER_USERNAME)
+        stats["x"] = {
+            "stats": x_stats,
+            "date": x_stats.get("last_tweet"),
+            "status": "danger" if x_stats.get("error") else "success" if x_stats.get("last_tweet") else "neutral",
+            "error": x_stats.get("error"),
+        }
 
     # Add other social media platforms here as needed
 
@@ -0,0 +1,18 @@
+from django import template
+
+from web.services.image_variants import image_src as variant_src
+from web.services.image_variants import image_srcset as variant_srcset
+
+register = template.Library()
+
+
+@register.filter
+def image_src(obj):
+    """URL of the largest processed variant of ``obj.image``, or of the original upload."""
+    return variant_src(obj)
+
+
+@register.filter
+def image_srcset(obj, fmt="webp"):
+    """``srcset`` of the ``fmt`` variants of ``obj.image``; empty until they are generated."""
+    return variant_srcset(obj, fmt)
@@ -2,6 +2,8 @@ from django import template
 from django.utils.safestring import mark_safe
 from markdownx.utils import markdownify
 
+from web.services.markdown_render import rendered_html
+
 register = template.Library()
 
 
@@ -9,3 +11,9 @@ register = template.Library()
 def markdown(text):
     """Convert markdown text to HTML."""
     return mark_safe(markdownify(text))
+
+
+@register.filter
+def rendered_markdown(obj, field):
+    """HTML for a markdown field of ``obj``, read from its pre-rendered column."""
+    return mark_safe(rendered_html(obj, field))
@@ -0,0 +1,73 @@
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from web.models import Avatar
+from web.services.avatars import avatar_attributes, avatar_key, render_avatar
+
+
+class AvatarCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="learner", email="learner@example.com", password="pass")
+        self.client.force_login(self.user)
+
+    def test_identical_configurations_render_once(self):
+        with patch("web.services.avatars.PythonAvatar.render", return_value="<svg>\n  <g/>\n</svg>") as render:
+            first = Avatar.objects.create(top="long_curly", clothing_color="#FF0000")
+            second = Avatar.objects.create(top="long_curly", clothing_color="#FF0000")
+            first.save()
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first.attributes_hash, second.attributes_hash)
+        self.assertEqual(second.svg, "<svg><g/></svg>")
+
+    def test_unknown_enum_names_share_the_default_rendering(self):
+        self.assertEqual(avatar_attributes({"top": "not_a_hairstyle"}), avatar_attributes({}))
+
+    def test_preview_returns_svg_and_image_url(self):
+        payload = {"style": "circle", "top": "short_flat", "skin_color": "brown"}
+        response = self.client.post(reverse("preview_avatar"), json.dumps(payload), content_type="application/json")
+
+        result = response.json()
+        key = avatar_key(avatar_attributes(payload))
+        self.assertTrue(result["avatar_svg"].startswith("<svg"))
+        self.assertEqual(result["avatar_url"], reverse("avatar_image", args=[key]))
+
+        image = self.client.get(result["avatar_url"])
+        self.assertEqual(image.status_code, 200)
+        self.assertEqual(image["Content-Type"], "image/svg+xml")
+        self.assertEqual(image["Cache-Control"], "public, max-age=31536000, immutable")
+        self.assertEqual(image.content.decode(), result["avatar_svg"])
+
+    def test_image_endpoint_falls_back_to_saved_avatar(self):
+        avatar = Avatar.objects.create(skin_color="brown")
+        cache.clear()
+
+        response = self.client.get(avatar.image_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.decode(), avatar.svg)
+        self.assertEqual(self.client.get(reverse("avatar_image", args=["0" * 32])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("avatar_image", args=["not-a-key"])).status_code, 404)
+
+    def test_set_as_profile_picture_reuses_stored_file(self):
+        profile = self.user.profile
+        profile.custom_avatar = Avatar.objects.create()
+        profile.save()
+
+        self.client.post(reverse("set_avatar_as_profile_pic"))
+        profile.refresh_from_db()
+        stored = profile.avatar.name
+        with patch("django.core.files.storage.FileSystemStorage.save") as storage_save:
+            self.client.post(reverse("set_avatar_as_profile_pic"))
+        profile.refresh_from_db()
+
+        self.assertIn(render_avatar(avatar_attributes(profile.custom_avatar))[0], stored)
+        self.assertEqual(profile.avatar.name, stored)
+        storage_save.assert_not_called()
+        profile.avatar.delete(save=False)
@@ -0,0 +1,127 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from web.models import (
+    Achievement,
+    Badge,
+    Challenge,
+    ChallengeSubmission,
+    Course,
+    Enrollment,
+    LearningStreak,
+    Notification,
+    Subject,
+    UserBadge,
+)
+from web.services.badge_rules import CourseBadgeRule, backfill
+
+
+class BadgeRulesTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        subject = Subject.objects.create(name="Math", slug="math")
+        self.course = Course.objects.create(
+            title="Algebra",
+            description="Equations",
+            teacher=self.teacher,
+            learning_objectives="Solve",
+            price=Decimal("0.00"),
+            max_students=50,
+            subject=subject,
+            level="beginner",
+        )
+        self.badge = Badge.objects.create(
+            name="Algebra Graduate",
+            description="Finished algebra",
+            badge_type="course",
+            course=self.course,
+            created_by=self.teacher,
+        )
+        Badge.objects.create(
+            name="Retired",
+            description="No longer awarded",
+            badge_type="course",
+            course=self.course,
+            created_by=self.teacher,
+            is_active=False,
+        )
+
+    def make_students(self, count):
+        return [
+            User.objects.create_user(username=f"student{i}", email=f"student{i}@example.com", password="pass")
+            for i in range(count)
+        ]
+
+    def test_completing_an_enrollment_awards_active_course_badges(self):
+        student = self.make_students(1)[0]
+        enrollment = Enrollment.objects.create(student=student, course=self.course, status="approved")
+
+        enrollment.status = "completed"
+        enrollment.save()
+
+        self.assertEqual(list(UserBadge.objects.filter(user=student).values_list("badge", flat=True)), [self.badge.id])
+        self.assertEqual(UserBadge.objects.get(user=student).course_enrollment, enrollment)
+        self.assertTrue(Notification.objects.filter(user=student, title="New Badge: Algebra Graduate").exists())
+
+    def test_resaving_a_completed_enrollment_skips_the_rules(self):
+        student = self.make_students(1)[0]
+        enrollment = Enrollment.objects.create(student=student, course=self.course, status="completed")
+        enrollment = Enrollment.objects.get(pk=enrollment.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            enrollment.save()
+
+        self.assertFalse([q for q in queries.captured_queries if "web_badge" in q["sql"]])
+        self.assertEqual(UserBadge.objects.filter(user=student).count(), 1)
+
+    def test_challenge_submission_awards_challenge_badges(self):
+        student = self.make_students(1)[0]
+        challenge = Challenge.objects.create(
+            title="Week 1", description="Solve it", week_number=1, start_date="2024-01-01", end_date="2024-01-07"
+        )
+        Badge.objects.create(
+            name="Week 1 Solver",
+            description="Solved week 1",
+            badge_type="challenge",
+            challenge=challenge,
+            created_by=self.teacher,
+        )
+
+        submission = ChallengeSubmission.objects.create(user=student, challenge=challenge, submission_text="42")
+
+        self.assertEqual(UserBadge.objects.get(user=student).challenge_submission, submission)
+
+    def test_backfill_awards_retroactively_in_batches(self):
+        students = self.make_students(5)
+        Enrollment.objects.bulk_create(
+            [Enrollment(student=student, course=self.course, status="completed") for student in students]
+        )
+        LearningStreak.objects.bulk_create(
+            [
+                LearningStreak(user=students[0], current_streak=40),
+                LearningStreak(user=students[1], current_streak=8),
+                LearningStreak(user=students[2], current_streak=3),
+            ]
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            results = backfill([CourseBadgeRule()], batch_size=2)
+        self.assertEqual(results["CourseBadgeRule"], (5, 0))
+        # Per batch of two: ids, enrollments, badges, existing awards, and three bulk inserts
+        self.assertLessEqual(len(queries.captured_queries), 3 * 7 + 1)
+
+        out = StringIO()
+        call_command("backfill_badges", stdout=out)
+        self.assertIn("Awarded 0 badges and 2 achievements", out.getvalue())
+        self.assertEqual(UserBadge.objects.filter(badge=self.badge).count(), 5)
+        self.assertEqual(Notification.objects.filter(title="New Badge: Algebra Graduate").count(), 5)
+        self.assertEqual(
+            set(Achievement.objects.filter(achievement_type="streak").values_list("student__username", "title")),
+            {("student0", "30-Day Learning Streak"), ("student1", "7-Day Learning Streak")},
+        )
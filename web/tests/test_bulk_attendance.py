@@ -0,0 +1,113 @@
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from web.models import Course, Enrollment, Session, SessionAttendance, Subject, VirtualClassroom
+from web.services.attendance import bulk_mark_attendance, todays_session
+
+
+class BulkAttendanceTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        subject = Subject.objects.create(name="Math", slug="math")
+        self.course = Course.objects.create(
+            title="Algebra",
+            description="Equations",
+            teacher=self.teacher,
+            learning_objectives="Solve",
+            price=Decimal("0.00"),
+            max_students=50,
+            subject=subject,
+            level="beginner",
+        )
+        self.classroom = VirtualClassroom.objects.create(name="Room", teacher=self.teacher, course=self.course)
+        self.students = [
+            User.objects.create_user(username=f"student{i}", email=f"student{i}@example.com", password="pass")
+            for i in range(5)
+        ]
+        Enrollment.objects.bulk_create(
+            [Enrollment(student=student, course=self.course, status="approved") for student in self.students]
+        )
+        self.url = reverse("bulk_update_attendance", args=[self.classroom.id])
+        self.client.force_login(self.teacher)
+
+    def post_json(self, payload):
+        return self.client.post(self.url, data=json.dumps(payload), content_type="application/json")
+
+    def test_marks_whole_roster_with_constant_attendance_queries(self):
+        payload = {"attendance": [{"student_id": s.id, "status": "present"} for s in self.students]}
+        for student in self.students:
+            cache.set(f"user_progress_{student.id}", {"stale": True})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_json(payload)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 5)
+        attendance_queries = [q for q in queries.captured_queries if "web_sessionattendance" in q["sql"]]
+        self.assertEqual(len(attendance_queries), 1)
+        session = Session.objects.get(course=self.course)
+        self.assertEqual(SessionAttendance.objects.filter(session=session, status="present").count(), 5)
+        self.assertIsNone(cache.get(f"user_progress_{self.students[0].id}"))
+
+    def test_resubmitting_updates_rows_and_keeps_notes(self):
+        first = self.students[0]
+        self.post_json({"attendance": [{"student_id": first.id, "status": "late", "notes": "Bus delay"}]})
+        response = self.post_json({"attendance": [{"student_id": first.id, "status": "present"}]})
+
+        self.assertEqual(response.status_code, 200)
+        record = SessionAttendance.objects.get(student=first)
+        self.assertEqual((record.status, record.notes), ("present", "Bus delay"))
+
+    def test_rejects_students_not_enrolled(self):
+        outsider = User.objects.create_user(username="outsider", email="outsider@example.com", password="pass")
+        response = self.post_json(
+            {
+                "attendance": [
+                    {"student_id": self.students[0].id, "status": "present"},
+                    {"student_id": outsider.id, "status": "present"},
+                ]
+            }
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["not_enrolled"], [outsider.id])
+        self.assertFalse(SessionAttendance.objects.exists())
+
+    def test_rejects_invalid_status(self):
+        response = self.post_json({"attendance": [{"student_id": self.students[0].id, "status": "asleep"}]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_only_the_teacher_can_take_roll(self):
+        self.client.force_login(self.students[0])
+        response = self.post_json({"attendance": [{"student_id": self.students[0].id, "status": "present"}]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_form_submission_from_attendance_page(self):
+        data = {f"status_{student.id}": "absent" for student in self.students}
+        data[f"status_{self.students[1].id}"] = "present"
+
+        response = self.client.post(self.url, data)
+
+        self.assertRedirects(response, reverse("classroom_attendance", args=[self.classroom.id]))
+        self.assertEqual(SessionAttendance.objects.get(student=self.students[1]).status, "present")
+        page = self.client.get(reverse("classroom_attendance", args=[self.classroom.id]))
+        self.assertContains(page, "Save Attendance")
+
+    def test_upsert_omits_conflict_target_on_backends_without_one(self):
+        entries = {self.students[0].id: ("present", None)}
+        session = todays_session(self.classroom)
+
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False):
+            with patch.object(SessionAttendance.objects, "bulk_create") as bulk_create:
+                bulk_mark_attendance(session, entries)
+
+        self.assertIsNone(bulk_create.call_args.kwargs["unique_fields"])
+        self.assertTrue(bulk_create.call_args.kwargs["update_conflicts"])
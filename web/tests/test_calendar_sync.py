@@ -0,0 +1,127 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from web.calendar_sync import calendar_event_id
+from web.models import CalendarSyncJob, Course, Session, Subject
+from web.services.calendar_outbox import BATCH_SIZE, MAX_JOB_ATTEMPTS, process_calendar_queue
+from web.services.fake_calendar import FakeCalendarService
+
+
+@patch("web.services.calendar_outbox.google_calendar_api")
+class CalendarSyncQueueTests(TestCase):
+    def setUp(self):
+        self.service = FakeCalendarService()
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Math", slug="math")
+        self.course = Course.objects.create(
+            title="Algebra",
+            description="Equations",
+            teacher=self.teacher,
+            learning_objectives="Solve",
+            price=Decimal("10.00"),
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+        )
+
+    def create_session(self, title="Lesson"):
+        now = timezone.now()
+        return Session.objects.create(
+            course=self.course,
+            title=title,
+            description="Online",
+            start_time=now + timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1, hours=1),
+            is_virtual=True,
+        )
+
+    def test_save_queues_instead_of_calling_the_api(self, mock_api):
+        session = self.create_session()
+
+        mock_api.assert_not_called()
+        job = CalendarSyncJob.objects.get(session_id=session.id)
+        self.assertEqual((job.action, job.status), ("create", "pending"))
+
+    def test_worker_batches_creates_and_stores_event_ids(self, mock_api):
+        sessions = [self.create_session(f"Lesson {i}") for i in range(BATCH_SIZE + 2)]
+
+        stats = process_calendar_queue(service=self.service)
+
+        self.assertEqual(stats["synced"], BATCH_SIZE + 2)
+        self.assertEqual(self.service.batches, [BATCH_SIZE, 2])
+        self.assertFalse(CalendarSyncJob.objects.exists())
+        session = Session.objects.get(pk=sessions[0].pk)
+        self.assertEqual(session.meeting_id, calendar_event_id(session.pk))
+        self.assertIn(session.meeting_id, self.service.events_by_id)
+
+    def test_update_while_create_pending_stays_a_single_create(self, mock_api):
+        session = self.create_session()
+        session.title = "Renamed"
+        session.save()
+
+        self.assertEqual(list(CalendarSyncJob.objects.values_list("action", flat=True)), ["create"])
+        process_calendar_queue(service=self.service)
+        event = self.service.events_by_id[calendar_event_id(session.pk)]
+        self.assertEqual(event["summary"], "Algebra - Renamed")
+
+    def test_retried_insert_is_idempotent(self, mock_api):
+        session = self.create_session()
+        # An earlier attempt reached Google but its response was lost
+        self.service.events().insert(calendarId="primary", body={"id": calendar_event_id(session.pk)}).execute()
+
+        process_calendar_queue(service=self.service)
+        self.assertEqual(CalendarSyncJob.objects.get(session_id=session.pk).action, "update")
+        process_calendar_queue(service=self.service)
+
+        self.assertEqual(len(self.service.events_by_id), 1)
+        self.assertEqual(self.service.events_by_id[calendar_event_id(session.pk)]["summary"], "Algebra - Lesson")
+        self.assertFalse(CalendarSyncJob.objects.exists())
+
+    def test_update_and_delete_after_sync(self, mock_api):
+        session = self.create_session()
+        process_calendar_queue(service=self.service)
+        session.refresh_from_db()
+
+        session.title = "Moved"
+        session.save()
+        process_calendar_queue(service=self.service)
+        self.assertEqual(self.service.events_by_id[session.meeting_id]["summary"], "Algebra - Moved")
+
+        session.delete()
+        job = CalendarSyncJob.objects.get()
+        self.assertEqual((job.action, job.event_id), ("delete", calendar_event_id(job.session_id)))
+        process_calendar_queue(service=self.service)
+        self.assertEqual(self.service.events_by_id, {})
+        self.assertFalse(CalendarSyncJob.objects.exists())
+
+    def test_event_deleted_on_the_calendar_fails_instead_of_looping(self, mock_api):
+        session = self.create_session()
+        process_calendar_queue(service=self.service)
+        session.refresh_from_db()
+        # Google keeps a deleted event's id, so recreating it conflicts and updating it is a 404
+        self.service.events().delete(calendarId="primary", eventId=session.meeting_id).execute()
+
+        session.title = "Moved"
+        session.save()
+        for _ in range(MAX_JOB_ATTEMPTS + 1):
+            process_calendar_queue(service=self.service)
+
+        job = CalendarSyncJob.objects.get(session_id=session.pk)
+        self.assertEqual((job.status, job.attempts), ("failed", MAX_JOB_ATTEMPTS))
+        self.assertEqual(self.service.events_by_id, {})
+
+    def test_jobs_wait_when_calendar_is_not_configured(self, mock_api):
+        mock_api.return_value = None
+        self.create_session()
+
+        out = StringIO()
+        call_command("process_calendar_sync", stdout=out)
+
+        self.assertIn("1 waiting for credentials", out.getvalue())
+        self.assertEqual(CalendarSyncJob.objects.get().attempts, 0)
@@ -0,0 +1,115 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import Cart, CartItem, Course, Goods, Session, Storefront, Subject
+from web.services.cart_pricing import price_cart
+
+
+class CartPricingTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.buyer = User.objects.create_user(username="buyer", email="buyer@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Art", slug="art")
+        self.storefront = Storefront.objects.create(teacher=self.teacher, name="Art Store")
+        self.cart = Cart.objects.create(user=self.buyer)
+
+    def add_course(self, price):
+        count = Course.objects.count()
+        course = Course.objects.create(
+            title=f"Course {count}",
+            slug=f"course-{count}",
+            teacher=self.teacher,
+            description="Description",
+            learning_objectives="Objectives",
+            price=Decimal(price),
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+        )
+        return CartItem.objects.create(cart=self.cart, course=course)
+
+    def add_session(self, price):
+        course = self.add_course("0").course
+        now = timezone.now()
+        session = Session.objects.create(
+            course=course,
+            title="Workshop",
+            description="Workshop",
+            start_time=now + timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1, hours=1),
+            price=Decimal(price),
+        )
+        return CartItem.objects.create(cart=self.cart, session=session)
+
+    def add_goods(self, price, discount_price=None):
+        count = Goods.objects.count()
+        goods = Goods.objects.create(
+            name=f"Print {count}",
+            description="Print",
+            price=Decimal(price),
+            discount_price=Decimal(discount_price) if discount_price else None,
+            stock=10,
+            storefront=self.storefront,
+        )
+        return CartItem.objects.create(cart=self.cart, goods=goods)
+
+    def test_snapshot_prices_every_item_type(self):
+        self.add_course("50.00")
+        self.add_session("15.00")
+        self.add_goods("20.00", discount_price="12.50")
+
+        pricing = price_cart(self.cart)
+
+        self.assertEqual(pricing.subtotal, Decimal("85.00"))
+        self.assertEqual(pricing.discount_total, Decimal("7.50"))
+        self.assertEqual(pricing.total, Decimal("77.50"))
+        self.assertEqual(pricing.amount_cents, 7750)
+        self.assertTrue(pricing.has_goods)
+        self.assertEqual([line.kind for line in pricing.lines], ["course", "course", "session", "goods"])
+        self.assertEqual(self.cart.total, pricing.total)
+
+    def test_snapshot_uses_one_query_regardless_of_cart_size(self):
+        for _ in range(10):
+            self.add_course("10.00")
+            self.add_goods("5.00", discount_price="4.00")
+
+        with self.assertNumQueries(1):
+            pricing = price_cart(self.cart)
+            for item in pricing.items:
+                item.course.teacher.username if item.course_id else item.goods.storefront.name
+
+        self.assertEqual(pricing.item_count, 20)
+        self.assertEqual(pricing.total, Decimal("140.00"))
+
+    def test_empty_cart(self):
+        pricing = price_cart(self.cart)
+        self.assertTrue(pricing.is_empty)
+        self.assertEqual(pricing.total, Decimal("0.00"))
+        self.assertFalse(pricing.has_goods)
+
+    @override_settings(STRIPE_SECRET_KEY="dummy_key")
+    @patch("web.views.stripe.PaymentIntent.create")
+    def test_payment_intent_charges_snapshot_total(self, mock_create):
+        mock_create.return_value.client_secret = "secret"
+        self.add_course("50.00")
+        self.add_goods("20.00", discount_price="12.50")
+        self.client.force_login(self.buyer)
+
+        response = self.client.post(reverse("create_cart_payment_intent"))
+
+        self.assertEqual(response.json(), {"clientSecret": "secret"})
+        self.assertEqual(mock_create.call_args.kwargs["amount"], 6250)
+
+    def test_cart_view_renders_snapshot(self):
+        self.add_goods("20.00", discount_price="12.50")
+        self.client.force_login(self.buyer)
+
+        response = self.client.get(reverse("cart_view"))
+
+        self.assertContains(response, "$12.50")
+        self.assertContains(response, "Shipping Address")
@@ -0,0 +1,213 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import (
+    Cart,
+    CartItem,
+    Course,
+    CourseProgress,
+    EmailJob,
+    Enrollment,
+    Goods,
+    Order,
+    Payment,
+    Session,
+    SessionEnrollment,
+    Storefront,
+    Subject,
+)
+from web.notifications import EMAIL_JOB_SENDERS, send_enrollment_confirmation, send_queued_emails
+from web.services.checkout import InsufficientStockError, fulfil_cart
+from web.views import handle_successful_payment
+
+
+@override_settings(STRIPE_SECRET_KEY="dummy_key")
+class CheckoutFulfilmentTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.buyer = User.objects.create_user(username="buyer", email="buyer@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Music", slug="music")
+        self.storefront = Storefront.objects.create(teacher=self.teacher, name="Music Store")
+        self.cart = Cart.objects.create(user=self.buyer)
+
+    def create_course(self, price="30.00"):
+        count = Course.objects.count()
+        return Course.objects.create(
+            title=f"Course {count}",
+            slug=f"course-{count}",
+            teacher=self.teacher,
+            description="Description",
+            learning_objectives="Objectives",
+            price=Decimal(price),
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+        )
+
+    def create_goods(self, stock=5):
+        count = Goods.objects.count()
+        return Goods.objects.create(
+            name=f"Songbook {count}",
+            description="Songbook",
+            price=Decimal("20.00"),
+            discount_price=Decimal("15.00"),
+            stock=stock,
+            storefront=self.storefront,
+        )
+
+    def fill_cart(self, cart, courses=2, goods=1):
+        for _ in range(courses):
+            CartItem.objects.create(cart=cart, course=self.create_course())
+        for _ in range(goods):
+            CartItem.objects.create(cart=cart, goods=self.create_goods())
+
+    def test_fulfils_every_item_type_in_bulk(self):
+        self.fill_cart(self.cart)
+        now = timezone.now()
+        session = Session.objects.create(
+            course=self.create_course("0"),
+            title="Masterclass",
+            description="Masterclass",
+            start_time=now + timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1, hours=1),
+            price=Decimal("10.00"),
+        )
+        CartItem.objects.create(cart=self.cart, session=session)
+
+        fulfilment = fulfil_cart(self.cart, self.buyer, "pi_bulk")
+
+        self.assertTrue(fulfilment.created)
+        self.assertEqual(fulfilment.total, Decimal("85.00"))
+        self.assertEqual(Enrollment.objects.filter(student=self.buyer, status="approved").count(), 2)
+        self.assertEqual(CourseProgress.objects.filter(enrollment__student=self.buyer).count(), 2)
+        self.assertEqual(Payment.objects.filter(stripe_payment_intent_id="pi_bulk").count(), 2)
+        self.assertEqual(SessionEnrollment.objects.get(student=self.buyer).session, session)
+        self.assertEqual(fulfilment.order.items.count(), 1)
+        self.assertEqual(Goods.objects.get().stock, 4)
+        self.assertEqual(EmailJob.objects.count(), 4)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(self.cart.items.exists())
+
+    def test_fulfilment_is_idempotent_per_payment_intent(self):
+        self.fill_cart(self.cart)
+        first = fulfil_cart(self.cart, self.buyer, "pi_once")
+        self.fill_cart(self.cart)
+
+        second = fulfil_cart(self.cart, self.buyer, "pi_once")
+
+        self.assertFalse(second.created)
+        self.assertEqual(second.order, first.order)
+        self.assertEqual(len(second.enrollments), 2)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(self.cart.items.count(), 3)
+
+    def test_query_count_does_not_grow_with_cart_size(self):
+        self.fill_cart(self.cart, courses=1, goods=1)
+        with CaptureQueriesContext(connection) as small:
+            fulfil_cart(self.cart, self.buyer, "pi_small")
+
+        other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+        cart = Cart.objects.create(user=other)
+        self.fill_cart(cart, courses=8, goods=8)
+        with CaptureQueriesContext(connection) as large:
+            fulfil_cart(cart, other, "pi_large")
+
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_out_of_stock_goods_abort_fulfilment(self):
+        CartItem.objects.create(cart=self.cart, course=self.create_course())
+        CartItem.objects.create(cart=self.cart, goods=self.create_goods(stock=0))
+
+        with self.assertRaises(InsufficientStockError):
+            fulfil_cart(self.cart, self.buyer, "pi_sold_out")
+
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Enrollment.objects.exists())
+        self.assertEqual(self.cart.items.count(), 2)
+
+    def test_queued_emails_are_sent_by_worker(self):
+        self.fill_cart(self.cart, courses=1, goods=0)
+        fulfil_cart(self.cart, self.buyer, "pi_mail")
+
+        stats = send_queued_emails()
+
+        self.assertEqual(stats, {"sent": 2, "retried": 0, "failed": 0})
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ["buyer@example.com", "teacher@example.com"])
+        self.assertFalse(EmailJob.objects.exists())
+
+    def test_queued_email_claimed_by_another_runner_is_not_sent_again(self):
+        self.fill_cart(self.cart, courses=1, goods=0)
+        fulfil_cart(self.cart, self.buyer, "pi_mail")
+
+        def send_while_another_runner_claims(job):
+            EmailJob.objects.filter(kind="teacher_new_enrollment").update(status="sending")
+            send_enrollment_confirmation(job.enrollment)
+
+        with patch.dict(EMAIL_JOB_SENDERS, {"enrollment_confirmation": send_while_another_runner_claims}):
+            stats = send_queued_emails()
+
+        self.assertEqual(stats, {"sent": 1, "retried": 0, "failed": 0})
+        self.assertEqual([m.to[0] for m in mail.outbox], ["buyer@example.com"])
+        self.assertEqual(EmailJob.objects.get().status, "sending")
+
+    @patch("web.views.stripe.PaymentIntent.retrieve")
+    def test_webhook_then_redirect_share_one_fulfilment(self, mock_retrieve):
+        self.fill_cart(self.cart)
+        intent = SimpleNamespace(id="pi_shared", metadata={"cart_id": str(self.cart.id)})
+
+        handle_successful_payment(intent)
+        self.client.force_login(self.buyer)
+        response = self.client.get(reverse("checkout_success"), {"payment_intent": "pi_shared"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "cart/receipt.html")
+        self.assertEqual(len(response.context["enrollments"]), 2)
+        mock_retrieve.assert_not_called()
+        self.assertEqual(Order.objects.filter(payment_intent_id="pi_shared").count(), 1)
+
+    def test_webhook_stores_the_shipping_address(self):
+        self.fill_cart(self.cart, courses=0, goods=1)
+        address = SimpleNamespace(
+            line1="1 Main St", line2=None, city="Springfield", state="IL", postal_code="62701", country="US"
+        )
+        intent = SimpleNamespace(
+            id="pi_ship", metadata={"cart_id": str(self.cart.id)}, shipping=SimpleNamespace(address=address)
+        )
+
+        handle_successful_payment(intent)
+
+        order = Order.objects.get(payment_intent_id="pi_ship")
+        self.assertEqual(order.shipping_address["city"], "Springfield")
+        self.assertEqual(order.shipping_address["line2"], "")
+
+    @patch("web.views.stripe.PaymentIntent.retrieve")
+    def test_redirect_shows_receipt_when_webhook_empties_cart_first(self, mock_retrieve):
+        self.fill_cart(self.cart)
+        mock_retrieve.return_value = SimpleNamespace(id="pi_race", status="succeeded", shipping=None)
+
+        def webhook_wins(cart, user, payment_intent_id, shipping_address=None):
+            fulfil_cart(cart, user, payment_intent_id)
+            return fulfil_cart(cart, user, "")
+
+        self.client.force_login(self.buyer)
+        with patch("web.views.fulfil_cart", side_effect=webhook_wins):
+            response = self.client.get(reverse("checkout_success"), {"payment_intent": "pi_race"})
+
+        self.assertTemplateUsed(response, "cart/receipt.html")
+        self.assertEqual(response.context["order"].payment_intent_id, "pi_race")
+
+    def test_free_checkouts_store_no_payment_intent(self):
+        for _ in range(2):
+            CartItem.objects.create(cart=self.cart, course=self.create_course("0"))
+            fulfil_cart(self.cart, self.buyer)
+
+        self.assertEqual(Order.objects.filter(payment_intent_id__isnull=True).count(), 2)
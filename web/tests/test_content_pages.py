@@ -0,0 +1,165 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from web.models import BlogComment, BlogPost, SuccessStory
+from web.services.view_counts import BufferedViewCounter, view_counter
+
+CONTENT_TABLES = ("web_blogpost", "web_blogcomment", "web_successstory", "web_tag")
+
+
+class ContentPagesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        view_counter.flush()
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="pass")
+
+    def create_post(self, title, tags="", status="published"):
+        return BlogPost.objects.create(title=title, author=self.author, content="Content", status=status, tags=tags)
+
+    def content_queries(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, headers=headers)
+        return response, [q for q in ctx.captured_queries if any(t in q["sql"] for t in CONTENT_TABLES)]
+
+    def test_blog_list_is_paginated_and_cached(self):
+        posts = [self.create_post(f"Post {i}") for i in range(11)]
+
+        response, first = self.content_queries(reverse("blog_list"))
+        self.assertEqual(len(response.context["blog_posts"]), 9)
+        self.assertTrue(response.context["page_obj"].has_next())
+        self.assertTrue(first)
+
+        response, repeat = self.content_queries(reverse("blog_list"))
+        self.assertEqual(repeat, [])
+
+        response = self.client.get(reverse("blog_list"), {"page": 2})
+        self.assertEqual(list(response.context["blog_posts"]), posts[:2][::-1])
+
+    def test_anonymous_revalidation_gets_not_modified(self):
+        post = self.create_post("Hello")
+        url = reverse("blog_detail", args=[post.slug])
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        self.client.cookies.clear()
+        response, queries = self.content_queries(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(queries, [])
+
+        BlogComment.objects.create(post=post, author=self.author, content="Nice", is_approved=True)
+        self.client.cookies.clear()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Nice")
+
+    def test_logged_in_users_get_no_validators(self):
+        post = self.create_post("Hello")
+        self.client.force_login(self.author)
+
+        response = self.client.get(reverse("blog_detail", args=[post.slug]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    def test_visitors_with_a_session_or_csrf_cookie_get_no_validators(self):
+        post = self.create_post("Hello")
+        url = reverse("blog_detail", args=[post.slug])
+
+        session = self.client.session
+        session["cart"] = "anonymous"
+        session.save()
+        self.assertNotIn("ETag", self.client.get(url))
+
+        self.client.cookies.clear()
+        self.client.cookies[settings.CSRF_COOKIE_NAME] = "token"
+        self.assertNotIn("ETag", self.client.get(url))
+
+    def test_not_modified_responses_still_count_views(self):
+        post = self.create_post("Counted")
+        url = reverse("blog_detail", args=[post.slug])
+        etag = self.client.get(url)["ETag"]
+
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+
+        self.assertEqual(view_counter.flush(), 2)
+
+    def test_edits_and_unpublishing_refresh_cached_pages(self):
+        post = self.create_post("Original")
+        url = reverse("blog_detail", args=[post.slug])
+        self.client.get(url)
+
+        post.title = "Edited"
+        post.save()
+        self.assertContains(self.client.get(url), "Edited")
+
+        post.status = "draft"
+        post.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_tag_pages_filter_the_cached_index(self):
+        python = self.create_post("Python", tags="Python")
+        self.create_post("Rust", tags="Rust")
+
+        response = self.client.get(reverse("blog_tag", args=["python"]))
+
+        self.assertEqual(list(response.context["blog_posts"]), [python])
+
+    def test_views_are_counted_from_the_buffer(self):
+        post = self.create_post("Counted")
+        url = reverse("blog_detail", args=[post.slug])
+
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.context["view_count"], 2)
+        self.assertEqual(view_counter.flush(), 2)
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 2)
+
+    def test_success_stories_list_and_related(self):
+        stories = [
+            SuccessStory.objects.create(title=f"Story {i}", author=self.author, content="Content") for i in range(4)
+        ]
+
+        listing = self.client.get(reverse("success_story_list"))
+        self.client.cookies.clear()
+        detail = self.client.get(reverse("success_story_detail", args=[stories[0].slug]))
+
+        self.assertContains(listing, "Story 3")
+        self.assertEqual(detail.context["success_story"], stories[0])
+        self.assertEqual(detail.context["related_stories"], stories[1:][::-1])
+        self.assertIn("ETag", detail)
+
+
+class BufferedViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="pass")
+        self.post = BlogPost.objects.create(title="Post", author=self.author, content="Content", status="published")
+
+    def test_flushes_once_threshold_is_reached(self):
+        counter = BufferedViewCounter(flush_threshold=3, flush_interval=3600)
+
+        counter.record(self.post)
+        counter.record(self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 0)
+
+        self.assertEqual(counter.record(self.post), 3)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 3)
+        self.assertEqual(counter.pending(), {})
+
+    def test_cold_cache_seeds_from_stored_count(self):
+        BlogPost.objects.filter(pk=self.post.pk).update(view_count=40)
+        counter = BufferedViewCounter(flush_threshold=100, flush_interval=3600)
+
+        self.assertEqual(counter.record(self.post), 41)
+        self.assertEqual(counter.record(self.post), 42)
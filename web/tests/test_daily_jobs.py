@@ -0,0 +1,110 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import DailyJobLock, DailyJobRun, ModelDailyCount
+from web.services.daily_jobs import DAILY_JOBS, DailyJob, run_daily_jobs, select_jobs, validate_jobs
+
+
+def fake_command(name, stdout=None, stderr=None, **options):
+    if name == "broken":
+        raise RuntimeError("boom")
+    if name == "writer":
+        for day in range(3):
+            ModelDailyCount.objects.create(model_label="web.course", date=timezone.localdate() - timedelta(days=day))
+    stdout.write(f"ran {name}")
+
+
+@patch("web.services.daily_jobs.call_command", side_effect=fake_command)
+class DailyJobSchedulerTests(TestCase):
+    def test_failure_only_skips_dependent_jobs(self, command):
+        jobs = [
+            DailyJob("broken"),
+            DailyJob("after_broken", after=("broken",)),
+            DailyJob("writer"),
+            DailyJob("after_writer", after=("writer",)),
+        ]
+
+        statuses = run_daily_jobs(jobs, workers=1)
+
+        self.assertEqual(
+            statuses,
+            {"broken": "failed", "after_broken": "skipped", "writer": "succeeded", "after_writer": "succeeded"},
+        )
+        self.assertLess(
+            [call.args[0] for call in command.call_args_list].index("writer"),
+            [call.args[0] for call in command.call_args_list].index("after_writer"),
+        )
+        self.assertEqual(DailyJobRun.objects.values("batch").distinct().count(), 1)
+
+        writer = DailyJobRun.objects.get(job="writer")
+        self.assertEqual((writer.rows_touched, writer.output), (3, "ran writer"))
+        self.assertIsNotNone(writer.duration)
+        broken = DailyJobRun.objects.get(job="broken")
+        self.assertEqual(broken.error, "RuntimeError: boom")
+        self.assertIn("Traceback", broken.output)
+        self.assertIn("broken did not succeed", DailyJobRun.objects.get(job="after_broken").error)
+
+    def test_running_job_is_locked_until_its_timeout(self, command):
+        DailyJobRun.objects.create(job="writer", batch="earlier")
+        DailyJobLock.objects.create(job="writer", batch="earlier")
+
+        self.assertEqual(run_daily_jobs([DailyJob("writer")], workers=1), {"writer": "skipped"})
+        command.assert_not_called()
+
+        two_hours_ago = timezone.now() - timedelta(hours=2)
+        DailyJobRun.objects.filter(batch="earlier").update(started_at=two_hours_ago)
+        DailyJobLock.objects.filter(batch="earlier").update(acquired_at=two_hours_ago)
+        self.assertEqual(run_daily_jobs([DailyJob("writer")], workers=1), {"writer": "succeeded"})
+        self.assertEqual(DailyJobRun.objects.get(batch="earlier").status, "failed")
+        self.assertFalse(DailyJobLock.objects.exists())
+
+    def test_command_runs_selected_jobs_and_fails_loudly(self, command):
+        out = StringIO()
+        call_command("run_daily", "--workers=1", "--job=collect_social_stats", "--job=sync_github", stdout=out)
+
+        self.assertEqual(
+            sorted(call.args[0] for call in command.call_args_list), ["collect_social_stats", "sync_github"]
+        )
+        self.assertIn("Successfully completed sync_github", out.getvalue())
+
+        command.side_effect = RuntimeError("down")
+        with self.assertRaisesMessage(CommandError, "collect_social_stats"):
+            call_command("run_daily", "--workers=1", "--job=collect_social_stats", stdout=StringIO())
+
+
+class DailyJobDeclarationTests(TestCase):
+    def test_declared_jobs_are_valid(self):
+        validate_jobs(DAILY_JOBS)
+
+    def test_cycles_and_unknown_jobs_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, "cycle"):
+            validate_jobs([DailyJob("a", after=("b",)), DailyJob("b", after=("a",))])
+        with self.assertRaisesMessage(ValueError, "Unknown daily jobs"):
+            select_jobs(["not_a_job"])
+        self.assertEqual(select_jobs(["send_session_reminders"])[0].after, ())
+
+    def test_system_dashboard_shows_run_history(self):
+        DailyJobRun.objects.create(
+            job="sync_github",
+            batch="b1",
+            status="succeeded",
+            duration=12.5,
+            rows_touched=40,
+            finished_at=timezone.now(),
+        )
+        admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse("system_dashboard"))
+
+        row = next(job for job in response.context["daily_jobs"]["jobs"] if job["name"] == "sync_github")
+        self.assertEqual((row["avg_duration"], row["last_run"].rows_touched), (12.5, 40))
+        self.assertContains(response, "Daily Jobs")
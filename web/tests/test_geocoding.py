@@ -0,0 +1,129 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import Course, GeocodeCache, GeocodeJob, Session, Subject
+from web.services.geocoding import TokenBucket, address_key, process_queue
+
+
+class NoWaitLimiter:
+    def acquire(self):
+        pass
+
+
+class GeocodingQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Geography", slug="geography")
+        self.course = Course.objects.create(
+            title="Field Trip",
+            description="Outdoors",
+            teacher=self.teacher,
+            learning_objectives="Explore",
+            price=Decimal("10.00"),
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+        )
+
+    def create_session(self, location="10 Main Street, Springfield"):
+        now = timezone.now()
+        return Session.objects.create(
+            course=self.course,
+            title="In person",
+            description="Meet up",
+            start_time=now + timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1, hours=1),
+            is_virtual=False,
+            location=location,
+        )
+
+    def test_address_key_is_normalized_and_stable(self):
+        self.assertEqual(address_key("  10 Main   Street "), address_key("10 main street"))
+        self.assertEqual(len(address_key("10 Main Street")), 64)
+
+    @patch("web.services.geocoding.requests.get")
+    def test_save_enqueues_instead_of_fetching(self, mock_get):
+        session = self.create_session()
+
+        mock_get.assert_not_called()
+        self.assertIsNone(session.latitude)
+        self.assertTrue(GeocodeJob.objects.filter(session=session, status="pending").exists())
+
+    @patch("web.services.geocoding.requests.get")
+    def test_save_uses_persistent_cache(self, mock_get):
+        GeocodeCache.objects.create(
+            address_key=address_key("10 Main Street, Springfield"),
+            address="10 main street, springfield",
+            latitude=Decimal("40.1"),
+            longitude=Decimal("-75.2"),
+        )
+        session = self.create_session(location="10 main street,  Springfield")
+
+        mock_get.assert_not_called()
+        self.assertEqual(session.latitude, Decimal("40.1"))
+        self.assertFalse(GeocodeJob.objects.filter(session=session).exists())
+
+    @patch("web.services.geocoding.fetch_from_nominatim", return_value=(51.5, -0.12))
+    def test_process_queue_resolves_and_caches(self, mock_fetch):
+        first = self.create_session()
+        second = self.create_session()
+
+        stats = process_queue(limiter=NoWaitLimiter())
+
+        self.assertEqual(stats["resolved"], 2)
+        self.assertEqual(mock_fetch.call_count, 1)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.latitude, Decimal("51.500000"))
+        self.assertEqual(second.longitude, Decimal("-0.120000"))
+        self.assertFalse(GeocodeJob.objects.exists())
+        self.assertTrue(GeocodeCache.objects.filter(address_key=address_key(first.location), found=True).exists())
+
+    @patch("web.services.geocoding.fetch_from_nominatim", side_effect=requests.exceptions.ConnectionError("down"))
+    def test_process_queue_retries_transport_errors(self, mock_fetch):
+        session = self.create_session()
+
+        stats = process_queue(limiter=NoWaitLimiter())
+
+        self.assertEqual(stats["retried"], 1)
+        job = GeocodeJob.objects.get(session=session)
+        self.assertEqual(job.status, "pending")
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertFalse(GeocodeCache.objects.exists())
+
+    @patch("web.services.geocoding.requests.get")
+    def test_map_api_does_not_geocode(self, mock_get):
+        session = self.create_session()
+        self.client.force_login(self.teacher)
+
+        response = self.client.get(reverse("map_data_api"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["sessions"], [])
+        mock_get.assert_not_called()
+        self.assertTrue(GeocodeJob.objects.filter(session=session).exists())
+
+
+class TokenBucketTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bucket_refills_at_rate(self):
+        now = [1000.0]
+        bucket = TokenBucket("test:bucket", rate=1.0, capacity=1, clock=lambda: now[0])
+
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertAlmostEqual(bucket.try_acquire(), 1.0)
+        now[0] += 0.5
+        self.assertAlmostEqual(bucket.try_acquire(), 0.5)
+        now[0] += 0.5
+        self.assertEqual(bucket.try_acquire(), 0)
@@ -0,0 +1,171 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from web.models import GitHubContributor, GitHubETag, GitHubPullRequest
+from web.services.github_sync import PER_PAGE, store_pull_requests, sync_contributors, sync_pull_requests
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, etag=""):
+        self.status_code = status_code
+        self._data = data
+        self.headers = {"ETag": etag} if etag else {}
+        self.text = ""
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Answers GitHub API calls from ``routes``: a function of (url, params, headers)."""
+
+    def __init__(self, routes, token=True):
+        self.routes = routes
+        self.headers = {"Authorization": "token test"} if token else {}
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append((url, params or {}, headers or {}))
+        return self.routes(url, params or {}, headers or {})
+
+    def post(self, url, json=None, timeout=None):
+        return FakeResponse(
+            200,
+            {
+                "data": {
+                    "user": {
+                        "pullRequests": {
+                            "pageInfo": {"endCursor": None, "hasNextPage": False},
+                            "nodes": [
+                                {
+                                    "additions": 30,
+                                    "deletions": 5,
+                                    "repository": {"nameWithOwner": "alphaonelabs/alphaonelabs-education-website"},
+                                },
+                                {"additions": 99, "deletions": 99, "repository": {"nameWithOwner": "someone/else"}},
+                            ],
+                        }
+                    }
+                }
+            },
+        )
+
+
+def pull(number, login, merged=True, state="closed"):
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "state": state,
+        "user": {"login": login, "avatar_url": f"https://avatars/{login}", "html_url": f"https://github.com/{login}"},
+        "created_at": "2024-01-01T00:00:00Z",
+        "merged_at": "2024-01-02T00:00:00Z" if merged else None,
+    }
+
+
+class PullRequestSyncTests(TestCase):
+    def test_pages_are_stored_and_revalidated_with_etags(self):
+        first_page = [pull(n, "alice") for n in range(1, PER_PAGE + 1)]
+        second_page = [pull(500, "bob", merged=False)]
+
+        def routes(url, params, headers):
+            if headers.get("If-None-Match"):
+                return FakeResponse(304)
+            page = params["page"]
+            data = {1: first_page, 2: second_page}.get(page, [])
+            return FakeResponse(200, data, etag=f'W/"page{page}"')
+
+        session = FakeSession(routes)
+        stats = sync_pull_requests(session, "closed")
+
+        self.assertEqual((stats["fetched"], stats["pulls"]), (2, PER_PAGE + 1))
+        self.assertEqual(GitHubPullRequest.objects.count(), PER_PAGE + 1)
+        self.assertEqual(GitHubETag.objects.count(), 2)
+
+        session = FakeSession(routes)
+        stats = sync_pull_requests(session, "closed")
+        self.assertEqual((stats["fetched"], stats["not_modified"]), (0, 2))
+        self.assertEqual(session.calls[0][2]["If-None-Match"], 'W/"page1"')
+
+    def test_contributor_details_are_fetched_into_the_table(self):
+        def routes(url, params, headers):
+            if url.endswith("/users/alice"):
+                return FakeResponse(200, {"login": "alice", "name": "Alice", "followers": 3})
+            query = params["q"]
+            if "is:merged" in query:
+                return FakeResponse(200, {"total_count": 4})
+            if query.startswith("author:alice type:pr"):
+                return FakeResponse(200, {"total_count": 6, "items": [{"created_at": "2023-05-01T10:00:00Z"}]})
+            return FakeResponse(200, {"total_count": 1})
+
+        self.assertEqual(sync_contributors(FakeSession(routes), ["alice"]), 1)
+
+        contributor = GitHubContributor.objects.get(login="alice")
+        self.assertEqual((contributor.prs_created, contributor.prs_merged, contributor.pr_reviews), (6, 4, 1))
+        self.assertEqual((contributor.lines_added, contributor.lines_deleted), (30, 5))
+        self.assertEqual(contributor.first_contribution_at.year, 2023)
+        self.assertEqual(contributor.profile["name"], "Alice")
+
+    def test_failed_search_keeps_stored_contributor(self):
+        GitHubContributor.objects.create(login="alice", profile={"login": "alice"}, prs_created=6, prs_merged=4)
+
+        def routes(url, params, headers):
+            if url.endswith("/users/alice"):
+                return FakeResponse(200, {"login": "alice"})
+            if "reviewer:" in params["q"]:
+                return FakeResponse(403, {"message": "API rate limit exceeded"})
+            return FakeResponse(200, {"total_count": 0})
+
+        self.assertEqual(sync_contributors(FakeSession(routes), ["alice"]), 0)
+
+        contributor = GitHubContributor.objects.get(login="alice")
+        self.assertEqual((contributor.prs_created, contributor.prs_merged), (6, 4))
+
+    def test_pull_requests_upsert_without_conflict_target_on_mysql(self):
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False):
+            with patch.object(GitHubPullRequest.objects, "bulk_create") as bulk_create:
+                store_pull_requests([pull(1, "alice")])
+
+        self.assertIsNone(bulk_create.call_args.kwargs["unique_fields"])
+
+
+@patch("requests.Session.request", side_effect=AssertionError("views must not call GitHub"))
+class ContributorViewTests(TestCase):
+    def setUp(self):
+        rows = [pull(1, "alice"), pull(2, "alice"), pull(3, "bob"), pull(4, "bob", merged=False)]
+        rows += [pull(5, "bob", merged=False, state="open"), pull(6, "dependabot[bot]"), pull(7, "carol", merged=False)]
+        for row in rows:
+            GitHubPullRequest.objects.create(
+                number=row["number"],
+                state=row["state"],
+                author_login=row["user"]["login"],
+                author_avatar_url=row["user"]["avatar_url"],
+                author_profile_url=row["user"]["html_url"],
+                merged_at="2024-01-02T00:00:00Z" if row["merged_at"] else None,
+            )
+
+    def test_list_is_ranked_from_local_pull_requests(self, _request):
+        response = self.client.get(reverse("contributors_list_view"))
+
+        contributors = response.context["contributors"]
+        self.assertEqual([c["username"] for c in contributors], ["alice", "bob"])
+        self.assertEqual(
+            (contributors[1]["merged_pr_count"], contributors[1]["closed_pr_count"], contributors[1]["open_pr_count"]),
+            (1, 1, 1),
+        )
+        self.assertEqual(contributors[0]["smart_score"], 20)
+
+    def test_detail_reads_stored_contributor(self, _request):
+        GitHubContributor.objects.create(
+            login="alice", profile={"login": "alice", "name": "Alice"}, prs_created=6, prs_merged=4, lines_added=30
+        )
+
+        response = self.client.get(reverse("contributor_detail", args=["alice"]))
+        self.assertContains(response, "Alice")
+        self.assertEqual(response.context["chart_data"]["prs_merged"], 4)
+
+        response = self.client.get(reverse("contributor_detail", args=["nobody"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["prs_created"], 0)
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from web.models import Cart, CartItem, Goods, ProductImage, Storefront
+from web.services.goods_catalog import get_goods_facets
+
+CATALOG_TABLES = ("web_goods", "web_productimage", "web_storefront", "web_cartitem")
+
+
+class GoodsListingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.storefront = Storefront.objects.create(teacher=self.teacher, name="Book Nook")
+
+    def create_products(self, count, category="Books"):
+        start = Goods.objects.count()
+        products = []
+        for i in range(start, start + count):
+            product = Goods.objects.create(
+                name=f"Book {i}",
+                description="A book",
+                price=Decimal("10.00"),
+                stock=5,
+                category=category,
+                storefront=self.storefront,
+            )
+            ProductImage.objects.create(goods=product, image=f"goods_images/book-{i}-a.jpg")
+            ProductImage.objects.create(goods=product, image=f"goods_images/book-{i}-b.jpg")
+            products.append(product)
+        return products
+
+    def catalog_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("goods_listing"))
+        return response, [q for q in ctx.captured_queries if any(t in q["sql"] for t in CATALOG_TABLES)]
+
+    def test_listing_shows_first_image_and_cart_count(self):
+        product = self.create_products(1)[0]
+        for i in range(2):
+            buyer = User.objects.create_user(username=f"buyer{i}", email=f"b{i}@example.com", password="pass")
+            CartItem.objects.create(cart=Cart.objects.create(user=buyer), goods=product)
+
+        response = self.client.get(reverse("goods_listing"))
+
+        listed = response.context["products"][0]
+        self.assertEqual(listed.cart_count, 2)
+        self.assertTrue(listed.image_url.endswith("book-0-a.jpg"))
+        self.assertContains(response, "2 in carts")
+
+    def test_query_count_does_not_grow_with_catalog(self):
+        self.create_products(2)
+        _, small = self.catalog_queries()
+
+        self.create_products(13)
+        response, large = self.catalog_queries()
+
+        self.assertEqual(len(response.context["products"]), 15)
+        self.assertEqual(len(large), len(small))
+
+    def test_facets_are_cached_and_invalidated(self):
+        self.create_products(1, category="Books")
+        self.create_products(1, category="")
+        self.assertEqual(get_goods_facets(), {"store_names": ["Book Nook"], "categories": ["Books"]})
+
+        with self.assertNumQueries(0):
+            get_goods_facets()
+
+        self.create_products(1, category="Art")
+        self.assertEqual(get_goods_facets()["categories"], ["Art", "Books"])
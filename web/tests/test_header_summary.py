@@ -0,0 +1,101 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from web.models import Cart, CartItem, Course, Notification, StudyGroup, StudyGroupInvite, Subject
+from web.notifications import get_user_notifications
+from web.services.header_summary import get_header_summary
+
+HEADER_TABLES = ("web_cartitem", "web_studygroupinvite", "web_notification")
+
+
+class HeaderSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="learner", email="learner@example.com", password="pass")
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        subject = Subject.objects.create(name="Programming", slug="programming")
+        self.courses = [
+            Course.objects.create(
+                title=f"Course {i}",
+                slug=f"course-{i}",
+                teacher=self.teacher,
+                description="Description",
+                learning_objectives="Objectives",
+                price=10,
+                max_students=10,
+                subject=subject,
+                level="beginner",
+            )
+            for i in range(3)
+        ]
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=self.cart, course=self.courses[0])
+        group = StudyGroup.objects.create(
+            name="Group", description="Group", course=self.courses[0], creator=self.teacher
+        )
+        self.invite = StudyGroupInvite.objects.create(group=group, sender=self.teacher, recipient=self.user)
+        Notification.objects.create(user=self.user, title="Hello", message="Welcome")
+
+    def header_queries(self, path="/"):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(path)
+        return response, [q for q in ctx.captured_queries if any(table in q["sql"] for table in HEADER_TABLES)]
+
+    def request_for(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def test_summary_counts(self):
+        summary = get_header_summary(self.request_for(self.user))
+        self.assertEqual(summary, {"cart_count": 1, "pending_invites": 1, "unread_notifications": 1})
+
+    def test_summary_is_memoized_per_request(self):
+        request = self.request_for(self.user)
+        get_header_summary(request)
+        with self.assertNumQueries(0):
+            get_header_summary(request)
+
+    def test_header_is_served_from_cache(self):
+        self.client.force_login(self.user)
+        response, queries = self.header_queries()
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(response.context["header_summary"]["cart_count"], 1)
+
+        _, queries = self.header_queries()
+        self.assertEqual(queries, [])
+
+    def test_cart_changes_invalidate_summary(self):
+        request = self.request_for(self.user)
+        get_header_summary(request)
+
+        CartItem.objects.create(cart=self.cart, course=self.courses[1])
+        self.assertEqual(get_header_summary(self.request_for(self.user))["cart_count"], 2)
+
+        self.cart.items.all().delete()
+        self.assertEqual(get_header_summary(self.request_for(self.user))["cart_count"], 0)
+
+    def test_invite_and_notification_changes_invalidate_summary(self):
+        get_header_summary(self.request_for(self.user))
+
+        self.invite.accept()
+        get_user_notifications(self.user, mark_as_read=True)
+
+        summary = get_header_summary(self.request_for(self.user))
+        self.assertEqual(summary["pending_invites"], 0)
+        self.assertEqual(summary["unread_notifications"], 0)
+
+    def test_guest_cart_count(self):
+        session = self.client.session
+        session.save()
+        guest_cart = Cart.objects.create(session_key=session.session_key)
+        CartItem.objects.create(cart=guest_cart, course=self.courses[2])
+
+        response = self.client.get(reverse("index"))
+
+        self.assertEqual(response.context["header_summary"]["cart_count"], 1)
+        self.assertEqual(response.context["header_summary"]["pending_invites"], 0)
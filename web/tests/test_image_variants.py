@@ -0,0 +1,106 @@
+import shutil
+import tempfile
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from web.models import Badge, Course, ImageProcessingJob, Subject
+from web.services.image_variants import process_image_queue
+
+TEMP_MEDIA = tempfile.mkdtemp()
+
+
+def upload(name="cover.png", size=(800, 600)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "orange").save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA)
+class ImageVariantTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA, ignore_errors=True)
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.course = Course.objects.create(
+            title="Algebra",
+            description="Equations",
+            teacher=self.teacher,
+            learning_objectives="Solve",
+            price=Decimal("0.00"),
+            max_students=50,
+            subject=Subject.objects.create(name="Math", slug="math"),
+            level="beginner",
+            image=upload(),
+        )
+
+    def test_upload_is_queued_instead_of_processed_in_the_request(self):
+        job = ImageProcessingJob.objects.get()
+        self.assertEqual(
+            (job.model_label, job.object_id, job.source_name), ("web.course", self.course.pk, self.course.image.name)
+        )
+        with Image.open(self.course.image.path) as original:
+            self.assertEqual(original.size, (800, 600))
+        self.assertEqual(Course.objects.get(pk=self.course.pk).image_variants, {})
+
+    def test_saves_without_a_new_image_do_not_queue_work(self):
+        ImageProcessingJob.objects.all().delete()
+        course = Course.objects.get(pk=self.course.pk)
+        course.title = "Algebra I"
+        course.save()
+        self.assertFalse(ImageProcessingJob.objects.exists())
+
+    def test_worker_writes_stable_variants(self):
+        self.assertEqual(process_image_queue()["processed"], 1)
+        course = Course.objects.get(pk=self.course.pk)
+        root = course.image.name.rsplit(".", 1)[0]
+
+        self.assertEqual(course.image_variants["source"], course.image.name)
+        self.assertEqual(course.image_variants["formats"]["webp"]["300"], f"{root}_300w.webp")
+        with Image.open(course.image.storage.path(f"{root}_500w.jpg")) as variant:
+            self.assertEqual(variant.size, (500, 500))
+        self.assertFalse(ImageProcessingJob.objects.exists())
+
+        html = Template("{% load image_tags %}{{ course|image_src }}|{{ course|image_srcset }}").render(
+            Context({"course": course})
+        )
+        src, srcset = html.split("|")
+        self.assertTrue(src.endswith(f"{root}_500w.jpg"))
+        self.assertIn(f"{root}_150w.webp 150w", srcset)
+
+    def test_new_upload_replaces_variants(self):
+        process_image_queue()
+        course = Course.objects.get(pk=self.course.pk)
+        old_variant = course.image_variants["formats"]["jpeg"]["500"]
+
+        course.image = upload("second.png")
+        course.save()
+        self.assertEqual(course.image_variants, {})
+        process_image_queue()
+
+        course.refresh_from_db()
+        self.assertTrue(course.image_variants["formats"]["jpeg"]["500"].startswith("course_images/second"))
+        self.assertFalse(course.image.storage.exists(old_variant))
+
+    def test_badge_variants_and_backfill_command(self):
+        badge = Badge.objects.create(
+            name="Graduate", description="Done", badge_type="course", created_by=self.teacher, image=upload("b.png")
+        )
+        ImageProcessingJob.objects.all().delete()
+
+        out = StringIO()
+        call_command("process_images", "--backfill", stdout=out)
+
+        self.assertIn("Images: 2 processed", out.getvalue())
+        badge.refresh_from_db()
+        with Image.open(badge.image.storage.path(badge.image_variants["formats"]["png"]["200"])) as variant:
+            self.assertEqual(variant.size, (200, 200))
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase
+
+from web.models import BlogPost, Course, Subject
+
+
+class PrerenderedMarkdownTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.course = Course.objects.create(
+            title="Algebra",
+            description="# Schedule\n\nEvery **Monday**",
+            teacher=self.teacher,
+            learning_objectives="- Solve equations",
+            price=Decimal("0.00"),
+            max_students=50,
+            subject=Subject.objects.create(name="Math", slug="math"),
+            level="beginner",
+        )
+
+    def render(self, obj, field):
+        template = Template("{% load markdown_filters %}{{ obj|rendered_markdown:field }}")
+        return template.render(Context({"obj": obj, "field": field}))
+
+    def test_save_renders_html_columns(self):
+        course = Course.objects.get(pk=self.course.pk)
+        self.assertIn("<strong>Monday</strong>", course.description_html)
+        self.assertIn("<li>Solve equations</li>", course.learning_objectives_html)
+        self.assertEqual(course.prerequisites_html, "")
+
+        course.description = "Every *Tuesday*"
+        course.save(update_fields=["description"])
+        course.refresh_from_db()
+        self.assertIn("<em>Tuesday</em>", course.description_html)
+
+    def test_filter_uses_stored_html_without_parsing(self):
+        course = Course.objects.get(pk=self.course.pk)
+        with patch("web.services.markdown_render.markdownify") as markdownify:
+            html = self.render(course, "description")
+        markdownify.assert_not_called()
+        self.assertIn("<strong>Monday</strong>", html)
+
+    def test_filter_falls_back_for_rows_not_backfilled(self):
+        Course.objects.filter(pk=self.course.pk).update(description_html="")
+        course = Course.objects.get(pk=self.course.pk)
+        self.assertIn("<strong>Monday</strong>", self.render(course, "description"))
+
+    def test_backfill_command_fills_missing_columns(self):
+        post = BlogPost.objects.create(title="Hello", slug="hello", author=self.teacher, content="Some _text_")
+        Course.objects.filter(pk=self.course.pk).update(description_html="", learning_objectives_html="")
+        BlogPost.objects.filter(pk=post.pk).update(content_html="")
+
+        out = StringIO()
+        call_command("render_markdown", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Rendered markdown for 2 rows", out.getvalue())
+        self.assertIn("<strong>Monday</strong>", Course.objects.get(pk=self.course.pk).description_html)
+        self.assertIn("<em>text</em>", BlogPost.objects.get(pk=post.pk).content_html)
+
+        out = StringIO()
+        call_command("render_markdown", stdout=out)
+        self.assertIn("Rendered markdown for 0 rows", out.getvalue())
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import ModelDailyCount, Notification
+from web.services.model_counts import HISTORY_DAYS, get_model_count_stats, snapshot_model_counts
+
+
+class ModelDailyCountTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.today = timezone.localdate()
+
+    def notify(self, count, days_ago=0):
+        notifications = Notification.objects.bulk_create(
+            [Notification(user=self.admin, title="Hi", message="Hello") for _ in range(count)]
+        )
+        Notification.objects.filter(id__in=[n.id for n in notifications]).update(
+            created_at=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def stat(self, title):
+        return next(stat for stat in get_model_count_stats() if stat["title"] == title)
+
+    def test_snapshot_upserts_without_conflict_target_on_mysql(self):
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False):
+            with patch.object(ModelDailyCount.objects, "bulk_create") as bulk_create:
+                snapshot_model_counts(days=1)
+
+        self.assertIsNone(bulk_create.call_args.kwargs["unique_fields"])
+        self.assertTrue(bulk_create.call_args.kwargs["update_conflicts"])
+
+    def test_snapshot_records_daily_counts_and_totals(self):
+        self.notify(2, days_ago=1)
+        self.notify(3)
+
+        snapshot_model_counts(days=3)
+
+        rows = {
+            row.date: (row.created, row.total) for row in ModelDailyCount.objects.filter(model_label="web.notification")
+        }
+        self.assertEqual(
+            rows,
+            {
+                self.today: (3, 5),
+                self.today - timedelta(days=1): (2, 2),
+                self.today - timedelta(days=2): (0, 0),
+            },
+        )
+
+    def test_rerunning_updates_rows_in_place(self):
+        self.notify(1)
+        snapshot_model_counts(days=1)
+        self.notify(1)
+        snapshot_model_counts(days=1)
+
+        row = ModelDailyCount.objects.get(model_label="web.notification", date=self.today)
+        self.assertEqual((row.created, row.total), (2, 2))
+
+    def test_dashboard_stats_come_from_one_snapshot_query(self):
+        self.notify(4)
+        call_command("snapshot_model_counts", "--backfill", stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            stats = get_model_count_stats()
+
+        notifications = next(stat for stat in stats if stat["title"] == "Notifications")
+        self.assertEqual(notifications["count"], 4)
+        self.assertEqual(len(notifications["history"]), HISTORY_DAYS)
+        self.assertEqual(notifications["history"][-1], 4)
+
+    def test_models_without_snapshot_show_no_count(self):
+        self.assertIsNone(self.stat("Notifications")["count"])
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin_dashboard"))
+        self.assertEqual(response.status_code, 200)
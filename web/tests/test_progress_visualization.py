@@ -143,12 +143,14 @@ class ProgressVisualizationTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, "courses/progress_visualization.html")
 
-        # Verify that cache was set
-        self.assertTrue(mock_cache_set.called)
-        mock_cache_set.assert_called_once()
+        # Verify that the progress cache was set once (the site header caches its badge counts separately)
+        progress_calls = [
+            call for call in mock_cache_set.call_args_list if call.args[0] == f"user_progress_{self.user.id}"
+        ]
+        self.assertEqual(len(progress_calls), 1)
 
         # Get call arguments (args and kwargs)
-        call_args, call_kwargs = mock_cache_set.call_args
+        call_args, call_kwargs = progress_calls[0]
         self.assertEqual(call_args[0], f"user_progress_{self.user.id}")  # Cache key
         self.assertIsInstance(call_args[1], dict)  # Context is a dictionary
         self.assertIsNone(call_kwargs.get("timeout"))  # Timeout should be None in kwargs
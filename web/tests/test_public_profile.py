@@ -3,8 +3,10 @@ from unittest.mock import patch
 from django.contrib.auth.models import User
 from django.test import Client, TestCase
 from django.urls import reverse
+from django.utils import timezone
 
-from web.models import Course, Subject
+from web.models import Achievement, Course, CourseProgress, Enrollment, Profile, Review, Session, Subject
+from web.services.profile_stats import annotate_profile_scorecards
 
 
 class PublicProfileViewTest(TestCase):
@@ -112,3 +114,87 @@ class PublicProfileViewTest(TestCase):
         # Regex that does not assume attribute order.
         pattern = r'<input[^>]+name="is_profile_public"[^>]+value="True"[^>]+checked'
         self.assertRegex(content, pattern)
+
+
+class UsersListScorecardTest(TestCase):
+    def setUp(self):
+        self.subject = Subject.objects.create(name="Mathematics", slug="mathematics")
+        self.teacher = self.create_public_user("teacher", is_teacher=True)
+        self.course = Course.objects.create(
+            title="Sample Course",
+            slug="sample-course",
+            teacher=self.teacher,
+            description="A sample course",
+            learning_objectives="Learn testing",
+            prerequisites="None",
+            price=10,
+            max_students=30,
+            subject=self.subject,
+            level="beginner",
+        )
+        now = timezone.now()
+        self.sessions = [
+            Session.objects.create(
+                course=self.course,
+                title=f"Session {i}",
+                description="Session",
+                start_time=now + timezone.timedelta(days=i),
+                end_time=now + timezone.timedelta(days=i, hours=1),
+            )
+            for i in range(4)
+        ]
+
+    def create_public_user(self, username, is_teacher=False):
+        user = User.objects.create_user(username=username, password="password", email=f"{username}@example.com")
+        user.profile.is_teacher = is_teacher
+        user.profile.is_profile_public = True
+        user.profile.save()
+        return user
+
+    def enroll_student(self, username, completed_sessions=0, status="approved"):
+        student = self.create_public_user(username)
+        enrollment = Enrollment.objects.create(student=student, course=self.course, status=status)
+        progress = CourseProgress.objects.create(enrollment=enrollment)
+        progress.completed_sessions.add(*self.sessions[:completed_sessions])
+        return student
+
+    def get_profile(self, response, user):
+        return next(p for p in response.context["page_obj"] if p.user_id == user.id)
+
+    def test_scorecard_stats(self):
+        student = self.enroll_student("student", completed_sessions=2)
+        self.enroll_student("graduate", completed_sessions=4, status="completed")
+        Review.objects.create(student=student, course=self.course, rating=4, comment="Good")
+        Achievement.objects.create(student=student, title="Star", description="Star", achievement_type="completion")
+
+        response = self.client.get(reverse("users_list"))
+
+        teacher_profile = self.get_profile(response, self.teacher)
+        self.assertEqual(teacher_profile.total_courses, 1)
+        self.assertEqual(teacher_profile.total_students, 1)
+        self.assertEqual(teacher_profile.avg_rating, 4.0)
+        student_profile = self.get_profile(response, student)
+        self.assertEqual(student_profile.total_courses, 1)
+        self.assertEqual(student_profile.total_completed, 0)
+        self.assertEqual(student_profile.avg_progress, 50)
+        self.assertEqual(student_profile.achievements_count, 1)
+
+    def test_query_count_does_not_grow_with_profiles(self):
+        for i in range(15):
+            self.enroll_student(f"student{i}", completed_sessions=i % 4)
+        profiles = list(Profile.objects.filter(is_profile_public=True))
+
+        # Three grouped queries for teachers and four for students, however many profiles there are
+        with self.assertNumQueries(7):
+            annotated = annotate_profile_scorecards(profiles)
+        self.assertEqual(len(annotated), 16)
+        self.assertFalse(CourseProgress.objects.filter(enrollment__isnull=True).exists())
+
+    def test_users_list_is_paginated(self):
+        for i in range(15):
+            self.enroll_student(f"student{i}")
+
+        response = self.client.get(reverse("users_list"))
+
+        self.assertEqual(len(response.context["page_obj"]), 12)
+        self.assertTrue(all(hasattr(profile, "total_courses") for profile in response.context["page_obj"]))
@@ -1,19 +1,27 @@
 # web/tests/test_securemessaging.py
 
 import datetime
+from io import StringIO
+from unittest.mock import patch
 
 from cryptography.fernet import InvalidToken
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
 from web.models import PeerMessage
 from web.secure_messaging import (
+    INBOX_PAGE_SIZE,
     decrypt_message,
     decrypt_message_with_random_key,
     encrypt_message,
     encrypt_message_with_random_key,
+    master_fernet,
+    purge_expired_messages,
 )
 
 User = get_user_model()
@@ -120,3 +128,79 @@ class SecureMessagingViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         # Check that the original plaintext appears in the rendered HTML
         self.assertContains(response, original_message)
+
+
+class InboxPaginationTestCase(TestCase):
+    def setUp(self):
+        self.sender = User.objects.create_user(username="sender", email="sender@example.com", password="password")
+        self.receiver = User.objects.create_user(username="receiver", email="receiver@example.com", password="pw")
+        self.client.force_login(self.receiver)
+
+    def create_messages(self, count, text="Benchmark message"):
+        # Every row shares one envelope, so the inbox unwraps its data key only once per request
+        encrypted_message, encrypted_key = encrypt_message_with_random_key(text)
+        PeerMessage.objects.bulk_create(
+            PeerMessage(
+                sender=self.sender, receiver=self.receiver, content=encrypted_message, encrypted_key=encrypted_key
+            )
+            for _ in range(count)
+        )
+
+    def test_inbox_is_paginated_with_cursor(self):
+        self.create_messages(INBOX_PAGE_SIZE + 5)
+
+        first = self.client.get(reverse("inbox"))
+        self.assertEqual(len(first.context["messages"]), INBOX_PAGE_SIZE)
+        self.assertIsNotNone(first.context["next_cursor"])
+
+        second = self.client.get(reverse("inbox"), {"before": first.context["next_cursor"]})
+        self.assertEqual(len(second.context["messages"]), 5)
+        self.assertIsNone(second.context["next_cursor"])
+        self.assertContains(second, "Benchmark message")
+
+    def test_only_visible_page_is_marked_read(self):
+        self.create_messages(INBOX_PAGE_SIZE + 5)
+
+        self.client.get(reverse("inbox"))
+
+        self.assertEqual(PeerMessage.objects.filter(is_read=True).count(), INBOX_PAGE_SIZE)
+        self.assertFalse(PeerMessage.objects.filter(is_read=True, read_at__isnull=True).exists())
+
+    def test_expired_messages_are_hidden_and_purged(self):
+        self.create_messages(2)
+        old = timezone.now() - datetime.timedelta(days=8)
+        PeerMessage.objects.update(created_at=old)
+        PeerMessage.objects.filter(id=PeerMessage.objects.first().id).update(starred=True)
+
+        response = self.client.get(reverse("inbox"))
+        self.assertEqual(len(response.context["messages"]), 1)
+
+        self.assertEqual(purge_expired_messages(), 1)
+        self.assertEqual(PeerMessage.objects.count(), 1)
+
+    def test_purge_command_fails_loudly(self):
+        with patch("web.management.commands.purge_expired_messages.purge_expired_messages", side_effect=OSError("db")):
+            with self.assertRaisesMessage(OSError, "db"):
+                call_command("purge_expired_messages", stdout=StringIO())
+
+    def test_inbox_decrypts_only_the_visible_page(self):
+        """The inbox runs a fixed number of queries and unwraps only the keys of the page it shows."""
+        for i in range(INBOX_PAGE_SIZE + 5):
+            # A fresh envelope per message, so every row has its own data key
+            encrypted_message, encrypted_key = encrypt_message_with_random_key(f"Message {i}")
+            PeerMessage.objects.create(
+                sender=self.sender, receiver=self.receiver, content=encrypted_message, encrypted_key=encrypted_key
+            )
+
+        with patch("web.secure_messaging.master_fernet.decrypt", wraps=master_fernet.decrypt) as unwrap:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("inbox"))
+
+        self.assertEqual(response.status_code, 200)
+        message_queries = [q["sql"] for q in queries.captured_queries if "web_peermessage" in q["sql"]]
+        self.assertEqual(len(message_queries), 2)  # page select and bulk read-receipt update
+        self.assertEqual(unwrap.call_count, INBOX_PAGE_SIZE)
+        self.assertEqual(
+            [message.content for message in response.context["messages"]],
+            [f"Message {i}" for i in range(INBOX_PAGE_SIZE + 4, 4, -1)],
+        )
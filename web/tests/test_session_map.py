@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import Course, Session, Subject
+from web.services.session_map import get_map_data, tile_bounds, tile_for, tiles_for_bbox
+
+
+class SessionMapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Geography", slug="geography")
+        self.course = Course.objects.create(
+            title="Field Trip",
+            description="Outdoors",
+            teacher=self.teacher,
+            learning_objectives="Explore",
+            price=Decimal("10.00"),
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+            status="published",
+        )
+        self.client.force_login(self.teacher)
+
+    def create_session(self, lat, lng, title="In person"):
+        now = timezone.now()
+        return Session.objects.create(
+            course=self.course,
+            title=title,
+            description="Meet up",
+            start_time=now + timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1, hours=1),
+            is_virtual=False,
+            location="Somewhere",
+            latitude=Decimal(str(lat)),
+            longitude=Decimal(str(lng)),
+        )
+
+    def test_tiles_for_bbox_caps_tile_count(self):
+        zoom, tiles = tiles_for_bbox(-80, -170, 80, 170, 12)
+        self.assertLess(zoom, 12)
+        self.assertLessEqual(len(tiles), 64)
+
+    def test_tiles_for_bbox_crossing_antimeridian(self):
+        zoom, tiles = tiles_for_bbox(-10, 170, 10, -170, 3)
+        xs = {x for x, _ in tiles}
+        self.assertEqual(xs, {0, 2**zoom - 1})
+
+    def test_bbox_returns_only_visible_sessions(self):
+        new_york = self.create_session(40.7128, -74.0060, "New York")
+        self.create_session(51.5074, -0.1278, "London")
+
+        response = self.client.get(reverse("map_data_api"), {"bbox": "-75,40,-73,41", "zoom": 12})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s["id"] for s in response.json()["sessions"]], [new_york.id])
+
+    def test_low_zoom_clusters_nearby_sessions(self):
+        self.create_session(40.71, -74.00)
+        self.create_session(40.72, -74.01)
+        self.create_session(51.50, -0.12)
+
+        data = get_map_data(zoom=2)
+
+        self.assertEqual(len(data["clusters"]), 1)
+        self.assertEqual(data["clusters"][0]["count"], 2)
+        self.assertEqual(len(data["sessions"]), 1)
+
+    def test_tiles_are_cached_until_session_change(self):
+        self.create_session(40.7128, -74.0060)
+        get_map_data(bbox=(40, -75, 41, -73), zoom=12)
+
+        with self.assertNumQueries(0):
+            cached = get_map_data(bbox=(40, -75, 41, -73), zoom=12)
+        self.assertEqual(len(cached["sessions"]), 1)
+
+        self.create_session(40.7130, -74.0050, "Second")
+        refreshed = get_map_data(bbox=(40, -75, 41, -73), zoom=12)
+        self.assertEqual(len(refreshed["sessions"]), 2)
+
+    def test_cached_tiles_are_complete_for_other_bboxes(self):
+        self.create_session(40.7128, -74.0060)
+        south, west, _, _ = tile_bounds(*tile_for(40.7128, -74.0060, 4), 4)
+        # A box in the corner of the same tile, away from the session, still fills the whole tile
+        corner = (south + 0.1, west + 0.1, south + 0.2, west + 0.2)
+        self.assertEqual(len(get_map_data(bbox=corner, zoom=4)["sessions"]), 1)
+
+        with self.assertNumQueries(0):
+            data = get_map_data(bbox=(40.5, -75, 40.9, -73), zoom=4)
+
+        self.assertEqual(len(data["sessions"]), 1)
+
+    def test_course_filter(self):
+        session = self.create_session(40.7128, -74.0060)
+
+        response = self.client.get(reverse("map_data_api"), {"course": self.course.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([s["id"] for s in response.json()["sessions"]], [session.id])
+
+    def test_invalid_bbox(self):
+        response = self.client.get(reverse("map_data_api"), {"bbox": "1,2,3"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import requests
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import NitterInstanceHealth, SocialStatsSnapshot
+from web.services.social_stats import BASE_BACKOFF, collect_x_stats, social_history
+
+GOOD = "https://good.example"
+BAD = "https://bad.example"
+
+
+def fake_fetch(instance, timeout=5):
+    if instance == BAD:
+        raise requests.ConnectionError("refused")
+    return {
+        "followers": 1200,
+        "following": 80,
+        "tweets": 450,
+        "engagement": 0,
+        "last_tweet": datetime(2024, 3, 1),
+        "name": "Alpha One Labs",
+        "bio": "Education",
+        "location": None,
+        "website": None,
+        "joined": datetime(2020, 1, 1),
+        "error": None,
+    }
+
+
+@patch("web.social.NitterClient.fetch_profile", side_effect=fake_fetch)
+class CollectSocialStatsTests(TestCase):
+    def test_fastest_valid_profile_is_stored_and_failures_back_off(self, fetch):
+        snapshot = collect_x_stats("alphaonelabs", [BAD, GOOD])
+
+        self.assertEqual((snapshot.followers, snapshot.posts, snapshot.source), (1200, 450, GOOD))
+        self.assertEqual(snapshot.profile["joined"], "2020-01-01")
+        self.assertTrue(timezone.is_aware(snapshot.last_post_at))
+
+        bad = NitterInstanceHealth.objects.get(url=BAD)
+        self.assertEqual(bad.consecutive_failures, 1)
+        self.assertAlmostEqual(bad.retry_after - bad.last_checked_at, BASE_BACKOFF, delta=timedelta(seconds=1))
+        self.assertIsNotNone(NitterInstanceHealth.objects.get(url=GOOD).last_ok_at)
+
+        fetch.reset_mock()
+        collect_x_stats("alphaonelabs", [BAD, GOOD])
+        self.assertEqual([call.args[0] for call in fetch.call_args_list], [GOOD])
+
+    def test_backoff_doubles_and_nothing_is_stored_without_an_answer(self, fetch):
+        NitterInstanceHealth.objects.create(url=BAD, consecutive_failures=2)
+
+        self.assertIsNone(collect_x_stats("alphaonelabs", [BAD]))
+
+        bad = NitterInstanceHealth.objects.get(url=BAD)
+        self.assertEqual(bad.consecutive_failures, 3)
+        self.assertAlmostEqual(bad.retry_after - bad.last_checked_at, BASE_BACKOFF * 4, delta=timedelta(seconds=1))
+        self.assertFalse(SocialStatsSnapshot.objects.exists())
+
+    @override_settings(TWITTER_USERNAME="alphaonelabs")
+    def test_command_collects_and_prunes(self, fetch):
+        old = SocialStatsSnapshot.objects.create(platform="x", account="alphaonelabs", followers=1)
+        SocialStatsSnapshot.objects.filter(pk=old.pk).update(collected_at=timezone.now() - timedelta(days=400))
+
+        with patch("web.social.NitterClient.NITTER_INSTANCES", [GOOD]):
+            out = StringIO()
+            call_command("collect_social_stats", "--keep-days=365", stdout=out)
+
+        self.assertIn("1200 followers", out.getvalue())
+        self.assertEqual(list(SocialStatsSnapshot.objects.values_list("followers", flat=True)), [1200])
+
+
+@override_settings(TWITTER_USERNAME="alphaonelabs")
+@patch("requests.get", side_effect=AssertionError("the dashboard must not call Nitter"))
+class ContentDashboardSocialTests(TestCase):
+    def test_dashboard_reads_latest_snapshot_and_history(self, _get):
+        now = timezone.now()
+        for days_ago, followers in [(3, 900), (1, 1000), (0, 1100)]:
+            snapshot = SocialStatsSnapshot.objects.create(platform="x", account="alphaonelabs", followers=followers)
+            SocialStatsSnapshot.objects.filter(pk=snapshot.pk).update(collected_at=now - timedelta(days=days_ago))
+
+        response = self.client.get(reverse("content_dashboard"))
+
+        self.assertEqual(response.context["content_data"]["x"]["stats"]["followers"], 1100)
+        self.assertIsNone(response.context["content_data"]["x"]["error"])
+        self.assertEqual([row["followers"] for row in social_history("x", "alphaonelabs")], [900, 1000, 1100])
+
+    def test_dashboard_without_snapshots_reports_it(self, _get):
+        response = self.client.get(reverse("content_dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("No social stats collected yet", response.context["content_data"]["x"]["error"])
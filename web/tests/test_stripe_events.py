@@ -0,0 +1,136 @@
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+import stripe
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from web.models import Course, EmailJob, Enrollment, Payment, StripeEvent, Subject
+from web.services.stripe_events import process_stripe_events, record_stripe_event, requeue_stripe_events
+
+
+def make_event(event_id, event_type, obj, created=1700000000):
+    return stripe.Event.construct_from(
+        {"id": event_id, "object": "event", "type": event_type, "created": created, "data": {"object": obj}},
+        "sk_test",
+    )
+
+
+class StripeEventInboxTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.student = User.objects.create_user(username="student", email="student@example.com", password="pass")
+        subject = Subject.objects.create(name="Math", slug="math")
+        self.course = Course.objects.create(
+            title="Algebra",
+            description="Equations",
+            teacher=self.teacher,
+            learning_objectives="Solve",
+            price=Decimal("25.00"),
+            max_students=10,
+            subject=subject,
+            level="beginner",
+        )
+
+    def payment_intent(self, intent_id="pi_1", course_id=None):
+        return {
+            "id": intent_id,
+            "object": "payment_intent",
+            "amount": 2500,
+            "currency": "usd",
+            "metadata": {"course_id": str(course_id or self.course.id), "user_id": str(self.student.id)},
+        }
+
+    @patch("web.views.stripe.Webhook.construct_event")
+    def test_webhook_stores_event_once_and_defers_work(self, mock_construct):
+        mock_construct.return_value = make_event("evt_1", "payment_intent.succeeded", self.payment_intent())
+
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse("stripe_webhook"), data="{}", content_type="application/json", HTTP_STRIPE_SIGNATURE="sig"
+                )
+            self.assertEqual(response.status_code, 200)
+
+        event = StripeEvent.objects.get()
+        self.assertEqual((event.endpoint, event.object_id, event.status), ("payments", "pi_1", "pending"))
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_worker_processes_each_event_exactly_once(self):
+        record_stripe_event(make_event("evt_1", "payment_intent.succeeded", self.payment_intent()), "payments")
+
+        self.assertEqual(process_stripe_events()["processed"], 1)
+        self.assertEqual(process_stripe_events()["processed"], 0)
+
+        self.assertEqual(Enrollment.objects.get(student=self.student).status, "approved")
+        self.assertEqual(Payment.objects.filter(stripe_payment_intent_id="pi_1").count(), 1)
+        self.assertEqual(StripeEvent.objects.get().status, "processed")
+
+    def test_replayed_payment_keeps_one_payment_and_queues_emails_once(self):
+        record_stripe_event(make_event("evt_1", "payment_intent.succeeded", self.payment_intent()), "payments")
+        process_stripe_events()
+        requeue_stripe_events(StripeEvent.objects.all())
+
+        self.assertEqual(process_stripe_events()["processed"], 1)
+
+        self.assertEqual(Payment.objects.filter(stripe_payment_intent_id="pi_1").count(), 1)
+        self.assertEqual(EmailJob.objects.count(), 2)
+
+    def test_failed_event_defers_later_events_for_the_same_object(self):
+        missing_course = self.payment_intent("pi_bad", course_id=999999)
+        record_stripe_event(make_event("evt_1", "payment_intent.succeeded", missing_course, created=100), "payments")
+        record_stripe_event(
+            make_event("evt_2", "payment_intent.payment_failed", missing_course, created=200), "payments"
+        )
+        record_stripe_event(
+            make_event("evt_3", "payment_intent.succeeded", self.payment_intent(), created=300), "payments"
+        )
+
+        stats = process_stripe_events()
+
+        self.assertEqual(stats, {"processed": 1, "retried": 1, "failed": 0, "deferred": 1})
+        first = StripeEvent.objects.get(event_id="evt_1")
+        self.assertEqual(first.attempts, 1)
+        self.assertGreater(first.run_after, timezone.now())
+        self.assertEqual(StripeEvent.objects.get(event_id="evt_2").status, "pending")
+        self.assertEqual(StripeEvent.objects.get(event_id="evt_3").status, "processed")
+
+    def test_connect_account_update_is_processed_by_the_worker(self):
+        profile = self.teacher.profile
+        profile.stripe_account_id = "acct_1"
+        profile.save()
+        account = {"id": "acct_1", "object": "account", "charges_enabled": True, "payouts_enabled": True}
+        record_stripe_event(make_event("evt_acct", "account.updated", account), "connect")
+
+        process_stripe_events()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.stripe_account_status, "verified")
+
+    def test_replay_command_requeues_failed_events(self):
+        record_stripe_event(make_event("evt_1", "payment_intent.succeeded", self.payment_intent()), "payments")
+        StripeEvent.objects.update(status="failed", attempts=8, last_error="boom")
+
+        out = StringIO()
+        call_command("replay_stripe_events", "--failed", "--process", stdout=out)
+
+        self.assertIn("Requeued 1 failed events", out.getvalue())
+        self.assertEqual(StripeEvent.objects.get().status, "processed")
+        self.assertEqual(Enrollment.objects.get(student=self.student).status, "approved")
+
+    @patch("web.services.stripe_events.stripe.Event.list")
+    def test_backfill_adds_only_missing_events(self, mock_list):
+        stored = make_event("evt_1", "payment_intent.succeeded", self.payment_intent())
+        record_stripe_event(stored, "payments")
+        missing = make_event("evt_2", "customer.subscription.updated", {"id": "sub_1", "object": "subscription"})
+        mock_list.return_value.auto_paging_iter.return_value = [stored, missing]
+
+        out = StringIO()
+        call_command("replay_stripe_events", "--since", "2024-01-01", stdout=out)
+
+        self.assertIn("Fetched 2 events from Stripe, 1 were missing", out.getvalue())
+        self.assertEqual(StripeEvent.objects.get(event_id="evt_2").endpoint, "donations")
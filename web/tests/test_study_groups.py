@@ -1,10 +1,14 @@
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from web.models import Course, StudyGroup, Subject
+from web.services.study_groups import COURSES_PER_PAGE, get_open_seats
 
 
 class StudyGroupInviteTests(TestCase):
@@ -55,3 +59,93 @@ class StudyGroupInviteTests(TestCase):
             reverse("invite_to_study_group", args=[self.group.id]), {"email_or_username": "user2"}, follow=True
         )
         self.assertContains(response, "is already a member of this group.")
+
+
+class StudyGroupDirectoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.student = User.objects.create_user(username="student", email="student@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Test Subject", slug="test-subject")
+        self.client.force_login(self.student)
+
+    def create_course_with_groups(self, groups=2, max_members=3):
+        count = Course.objects.count()
+        course = Course.objects.create(
+            title=f"Course {count}",
+            slug=f"course-{count}",
+            teacher=self.teacher,
+            description="Description",
+            learning_objectives="Objectives",
+            price=10,
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+        )
+        for i in range(groups):
+            group = StudyGroup.objects.create(
+                name=f"Group {count}-{i}",
+                description="Group",
+                course=course,
+                creator=self.teacher,
+                max_members=max_members,
+            )
+            group.members.add(self.teacher)
+        return course
+
+    def directory_queries(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("all_study_groups"), params)
+        return response, [q for q in ctx.captured_queries if "web_studygroup" in q["sql"]]
+
+    def test_directory_is_grouped_annotated_and_paginated_by_course(self):
+        courses = [self.create_course_with_groups() for _ in range(COURSES_PER_PAGE + 1)]
+        StudyGroup.objects.filter(course=courses[-1]).first().members.add(self.student)
+
+        response = self.client.get(reverse("all_study_groups"))
+
+        grouped = response.context["courses_with_groups"]
+        self.assertEqual(len(grouped), COURSES_PER_PAGE)
+        self.assertEqual(next(iter(grouped)), courses[-1])
+        groups = grouped[courses[-1]]
+        self.assertEqual(sorted(group.member_count for group in groups), [1, 2])
+        self.assertEqual(sorted(group.is_member for group in groups), [False, True])
+        self.assertEqual(response.context["open_seats"][courses[-1].id], 3)
+        self.assertTrue(response.context["page_obj"].has_next())
+
+        second = self.client.get(reverse("all_study_groups"), {"page": 2})
+        self.assertEqual(list(second.context["courses_with_groups"]), [courses[0]])
+
+    def test_directory_query_count_does_not_grow_with_groups(self):
+        self.create_course_with_groups(groups=1)
+        self.directory_queries()
+        _, small = self.directory_queries()
+
+        for _ in range(3):
+            self.create_course_with_groups(groups=4)
+        self.directory_queries()
+        _, large = self.directory_queries()
+
+        self.assertEqual(len(large), len(small))
+
+    def test_open_seats_are_cached_and_follow_membership(self):
+        course = self.create_course_with_groups(groups=1)
+        self.assertEqual(get_open_seats([course.id]), {course.id: 2})
+
+        with self.assertNumQueries(0):
+            get_open_seats([course.id])
+
+        self.client.post(reverse("study_group_detail", args=[course.study_groups.get().id]), {"action": "join"})
+        self.assertEqual(get_open_seats([course.id]), {course.id: 1})
+
+    def test_join_redirects_and_full_groups_reject(self):
+        course = self.create_course_with_groups(groups=1)
+        group = course.study_groups.get()
+        group.members.add(User.objects.create_user(username="other", email="other@example.com", password="pass"))
+        group.members.add(User.objects.create_user(username="third", email="third@example.com", password="pass"))
+
+        response = self.client.post(reverse("study_group_detail", args=[group.id]), {"action": "join"}, follow=True)
+
+        self.assertContains(response, "This group is full!")
+        self.assertFalse(group.members.filter(id=self.student.id).exists())
+        self.assertEqual(response.context["group"].member_count, 3)
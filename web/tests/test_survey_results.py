@@ -0,0 +1,94 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from web.models import Choice, Question, Response, Survey
+from web.services.survey_results import compute_survey_results, get_survey_results
+
+
+class SurveyResultsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="pass")
+        self.survey = Survey.objects.create(title="Feedback", author=self.author)
+        self.questions = []
+        for q in range(3):
+            question = Question.objects.create(survey=self.survey, text=f"Question {q}", type="mcq")
+            choices = [Choice.objects.create(question=question, text=f"Q{q} choice {c}") for c in range(4)]
+            self.questions.append((question, choices))
+
+        for u in range(5):
+            user = User.objects.create_user(username=f"respondent{u}", email=f"r{u}@example.com", password="pass")
+            for question, choices in self.questions:
+                # Choice 0 gets three votes, choice 1 two, the others none
+                Response.objects.create(user=user, question=question, choice=choices[0 if u < 3 else 1])
+
+    def test_results_use_a_constant_number_of_queries(self):
+        with self.assertNumQueries(2):
+            summary = compute_survey_results(self.survey)
+
+        self.assertEqual(len(summary["results"]), 3)
+        first = summary["results"][0]
+        self.assertEqual(first["total"], 5)
+        self.assertEqual([c["count"] for c in first["choices"]], [3, 2, 0, 0])
+        self.assertEqual([c["percentage"] for c in first["choices"]], [60.0, 40.0, 0.0, 0.0])
+        self.assertEqual(summary["total_participants"], 5)
+        self.assertEqual(summary["top_choice"]["text"], "Q0 choice 0")
+        self.assertEqual(summary["bottom_choice"]["text"], "Q0 choice 1")
+        self.assertEqual(summary["engagement_score"], 100.0)
+        chart = json.loads(summary["chart_data_json"])
+        self.assertEqual(chart[0]["question_text"], "Question 0")
+
+    def test_results_are_cached_and_invalidated_on_submit(self):
+        get_survey_results(self.survey)
+        with self.assertNumQueries(0):
+            get_survey_results(self.survey)
+
+        newcomer = User.objects.create_user(username="newcomer", email="new@example.com", password="pass")
+        self.client.force_login(newcomer)
+        data = {f"question_{question.id}": choices[2].id for question, choices in self.questions}
+        self.client.post(reverse("submit-survey", args=[self.survey.id]), data)
+
+        summary = get_survey_results(self.survey)
+        self.assertEqual(summary["results"][0]["total"], 6)
+
+    def test_removing_a_response_invalidates_the_results(self):
+        get_survey_results(self.survey)
+
+        Response.objects.filter(question=self.questions[0][0]).first().delete()
+
+        self.assertEqual(get_survey_results(self.survey)["results"][0]["total"], 4)
+
+    def test_results_view_renders(self):
+        self.client.force_login(self.author)
+        response = self.client.get(reverse("survey-results", args=[self.survey.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Question 0")
+        self.assertContains(response, reverse("survey-export", args=[self.survey.id]))
+
+    def test_streaming_csv_export(self):
+        self.client.force_login(self.author)
+        response = self.client.get(reverse("survey-export", args=[self.survey.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().strip().splitlines()
+        self.assertEqual(lines[0].split(",")[0], "response_id")
+        self.assertEqual(len(lines), 1 + 15)
+
+    def test_streaming_json_export(self):
+        self.client.force_login(self.author)
+        response = self.client.get(reverse("survey-export", args=[self.survey.id]), {"format": "json"})
+
+        payload = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(payload["survey"]["title"], "Feedback")
+        self.assertEqual(len(payload["responses"]), 15)
+
+    def test_export_is_limited_to_creator(self):
+        other = User.objects.create_user(username="other", email="other@example.com", password="pass")
+        self.client.force_login(other)
+        response = self.client.get(reverse("survey-export", args=[self.survey.id]))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from web.services import system_metrics
+from web.services.system_metrics import MetricsSampler, RequestStats, percentile
+
+
+def fake_sample(cpu=12.5):
+    return {
+        "cpu": {"percent": cpu, "count": 4, "frequency": 0},
+        "memory": {"total": 100, "available": 60, "percent": 40.0, "used": 40, "free": 60},
+        "swap": {"total": 10, "used": 1, "free": 9, "percent": 10.0},
+        "disk": {"total": 100, "used": 50, "free": 50, "percent": 50.0},
+        "process": {"rss": 1, "vms": 2},
+        "top_processes": [],
+        "timestamp": timezone.now(),
+    }
+
+
+class PercentileTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 90), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_request_stats_summary_uses_recent_window(self):
+        stats = RequestStats(size=3)
+        for duration, queries in [(1000, 100), (10, 1), (20, 2), (30, 3)]:
+            stats.record(duration, queries)
+
+        summary = stats.summary()
+        self.assertEqual(summary["count"], 3)
+        self.assertEqual(summary["latency_ms"]["p50"], 20)
+        self.assertEqual(summary["queries"]["p99"], 3)
+
+
+class MetricsSamplerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_history_is_a_bounded_ring_buffer(self):
+        cpu_values = iter([1.0, 2.0, 3.0])
+        sampler = MetricsSampler(history_size=2, collect=lambda: fake_sample(next(cpu_values)))
+        for _ in range(3):
+            sampler.sample()
+
+        latest, history = sampler.snapshot()
+        self.assertEqual(latest["cpu"]["percent"], 3.0)
+        self.assertEqual([point["cpu"] for point in history], [2.0, 3.0])
+
+    def test_failed_collection_keeps_previous_sample(self):
+        sampler = MetricsSampler(collect=fake_sample)
+        sampler.sample()
+        sampler.collect = mock.Mock(side_effect=OSError("boom"))
+
+        self.assertIsNone(sampler.sample())
+        self.assertEqual(len(sampler.snapshot()[1]), 1)
+
+    def test_workers_share_samples_and_one_samples_per_interval(self):
+        workers = [MetricsSampler(collect=fake_sample) for _ in range(3)]
+
+        claims = [worker.claim_tick() for worker in workers]
+        workers[claims.index(True)].sample()
+
+        self.assertEqual(claims.count(True), 1)
+        self.assertEqual([len(worker.snapshot()[1]) for worker in workers], [1, 1, 1])
+
+    def test_request_stats_are_shared_between_workers(self):
+        first, second = RequestStats(size=10), RequestStats(size=10, flush_threshold=1)
+        first.record(10, 1)
+        second.record(30, 3)
+
+        self.assertEqual(first.summary()["count"], 2)
+        self.assertEqual(second.summary()["latency_ms"]["p99"], 30)
+
+
+class SystemMetricsApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="pass")
+        self.client.force_login(self.admin)
+        self.sampler = MetricsSampler(collect=fake_sample)
+        self.stats = RequestStats()
+        patches = [
+            mock.patch.object(system_metrics, "sampler", self.sampler),
+            mock.patch.object(system_metrics, "request_stats", self.stats),
+            mock.patch("web.middleware.request_stats", self.stats),
+            mock.patch.object(MetricsSampler, "ensure_running"),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_api_returns_latest_sample_history_and_request_percentiles(self):
+        self.sampler.sample()
+        self.sampler.sample()
+
+        response = self.client.get(reverse("system_metrics_api"))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["cpu"]["percent"], 12.5)
+        self.assertEqual(len(data["history"]), 2)
+        self.assertEqual(set(data["requests"]["latency_ms"]), {"p50", "p90", "p99"})
+
+    def test_first_request_samples_inline(self):
+        response = self.client.get(reverse("system_metrics_api"))
+        self.assertEqual(response.json()["memory"]["percent"], 40.0)
+
+    def test_middleware_records_latency_and_query_count(self):
+        self.client.get(reverse("system_dashboard"))
+
+        summary = self.stats.summary()
+        self.assertEqual(summary["count"], 1)
+        self.assertGreater(summary["queries"]["p50"], 0)
+        self.assertGreaterEqual(summary["latency_ms"]["p50"], 0)
+
+    def test_dashboard_shows_request_performance(self):
+        self.stats.record(12.3, 4)
+        response = self.client.get(reverse("system_dashboard"))
+        self.assertContains(response, "Request Performance")
+        self.assertContains(response, "12.3 ms")
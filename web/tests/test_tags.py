@@ -0,0 +1,96 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from web.models import BlogPost, BlogPostTag, Course, CourseTag, Subject, Tag, WaitingRoom
+from web.recommendations import get_similar_courses
+from web.services.tags import get_blog_tag_cloud, parse_tags
+
+
+class TagNormalizationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="author", email="author@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Programming", slug="programming")
+
+    def create_course(self, title, tags, subject=None):
+        return Course.objects.create(
+            title=title,
+            description="Description",
+            teacher=self.user,
+            learning_objectives="Objectives",
+            price=10,
+            max_students=10,
+            subject=subject or self.subject,
+            level="beginner",
+            status="published",
+            tags=tags,
+        )
+
+    def create_post(self, title, tags, status="published"):
+        return BlogPost.objects.create(title=title, author=self.user, content="Content", status=status, tags=tags)
+
+    def test_parse_tags_normalizes_and_deduplicates(self):
+        self.assertEqual(parse_tags(" Python,  web   dev ,python,, "), ["Python", "web dev"])
+
+    def test_saving_syncs_through_tables(self):
+        course = self.create_course("Django", "Python, Django")
+        self.assertEqual(set(course.tag_set.values_list("key", flat=True)), {"python", "django"})
+
+        course.tags = "python, testing"
+        course.save()
+
+        self.assertEqual(set(course.tag_set.values_list("key", flat=True)), {"python", "testing"})
+        self.assertEqual(Tag.objects.filter(key="python").count(), 1)
+
+        room = WaitingRoom.objects.create(title="Room", subject="Programming", topics="Testing", creator=self.user)
+        self.assertEqual(list(room.topic_set.values_list("key", flat=True)), ["testing"])
+
+    def test_blog_tag_matches_whole_tags_only(self):
+        java = self.create_post("Java", "Java")
+        self.create_post("JavaScript", "JavaScript")
+
+        response = self.client.get(reverse("blog_tag", args=["java"]))
+
+        self.assertEqual(list(response.context["blog_posts"]), [java])
+
+    def test_tag_cloud_counts_published_posts_and_is_cached(self):
+        self.create_post("One", "python, django")
+        self.create_post("Two", "Python")
+        self.create_post("Draft", "secret", status="draft")
+
+        cloud = get_blog_tag_cloud()
+        self.assertEqual(
+            [(tag["name"], tag["count"]) for tag in cloud],
+            [("django", 1), ("python", 2)],
+        )
+        with self.assertNumQueries(0):
+            get_blog_tag_cloud()
+
+        self.create_post("Three", "django")
+        self.assertEqual(next(tag for tag in get_blog_tag_cloud() if tag["key"] == "django")["count"], 2)
+
+    def test_similar_courses_share_tags(self):
+        course = self.create_course("Django", "python, web")
+        other_subject = Subject.objects.create(name="Data", slug="data")
+        similar = self.create_course("Pandas", "Python", subject=other_subject)
+        self.create_course("Excel", "spreadsheets", subject=other_subject)
+
+        self.assertEqual(list(get_similar_courses(course)), [similar])
+
+    def test_backfill_migration_links_existing_strings(self):
+        course = self.create_course("Legacy", "Python, SQL")
+        post = self.create_post("Legacy post", "SQL")
+        CourseTag.objects.all().delete()
+        BlogPostTag.objects.all().delete()
+        Tag.objects.all().delete()
+
+        import_module("web.migrations.0069_backfill_tags").backfill_tags(apps, None)
+
+        self.assertEqual(set(course.tag_set.values_list("key", flat=True)), {"python", "sql"})
+        self.assertEqual(list(post.tag_set.values_list("key", flat=True)), ["sql"])
+        self.assertEqual(Tag.objects.count(), 2)
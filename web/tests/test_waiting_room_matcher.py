@@ -0,0 +1,88 @@
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import TestCase
+
+from web.models import Course, Notification, Subject, WaitingRoom
+from web.notifications import send_queued_emails
+from web.services.waiting_room_matcher import find_satisfied_rooms, fulfil_waiting_rooms
+
+
+class WaitingRoomMatcherTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(username="teacher", email="teacher@example.com", password="pass")
+        self.creator = User.objects.create_user(username="creator", email="creator@example.com", password="pass")
+        self.student = User.objects.create_user(username="student", email="student@example.com", password="pass")
+        self.subject = Subject.objects.create(name="Data Science", slug="data-science")
+
+    def create_room(self, title, subject="data  science", topics="Pandas, SQL", participants=()):
+        room = WaitingRoom.objects.create(title=title, subject=subject, topics=topics, creator=self.creator)
+        room.participants.add(*participants)
+        return room
+
+    def create_course(self, tags, status="published"):
+        return Course.objects.create(
+            title=f"Course {Course.objects.count()}",
+            description="Description",
+            teacher=self.teacher,
+            learning_objectives="Objectives",
+            price=10,
+            max_students=10,
+            subject=self.subject,
+            level="beginner",
+            status=status,
+            tags=tags,
+        )
+
+    def test_satisfied_rooms_need_subject_and_every_topic(self):
+        covered = self.create_room("Covered")
+        no_topics = self.create_room("Anything", topics="")
+        self.create_room("Missing topic", topics="Pandas, Spark")
+        self.create_room("Other subject", subject="Music", topics="Pandas")
+        course = self.create_course("python, pandas, sql", status="draft")
+
+        with self.assertNumQueries(1):
+            rooms = set(find_satisfied_rooms(course))
+
+        self.assertEqual(rooms, {covered, no_topics})
+
+    def test_publishing_fulfils_rooms_and_notifies_once_per_user(self):
+        first = self.create_room("First", participants=[self.student])
+        second = self.create_room("Second", topics="sql", participants=[self.student, self.creator])
+        untouched = self.create_room("Untouched", topics="Spark")
+
+        course = self.create_course("Pandas, SQL")
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertEqual((first.status, first.fulfilled_course), ("fulfilled", course))
+        self.assertEqual((second.status, second.fulfilled_course), ("fulfilled", course))
+        self.assertEqual(untouched.status, "open")
+        self.assertEqual(sorted(Notification.objects.values_list("user__username", flat=True)), ["creator", "student"])
+        # Emails are queued rather than sent while the course is saved
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(send_queued_emails()["sent"], 2)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ["creator@example.com", "student@example.com"])
+
+        course.save()
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_draft_courses_do_not_fulfil_rooms(self):
+        room = self.create_room("Room", topics="")
+        course = self.create_course("pandas", status="draft")
+
+        room.refresh_from_db()
+        self.assertEqual(room.status, "open")
+
+        course.status = "published"
+        course.save(update_fields=["status"])
+        room.refresh_from_db()
+        self.assertEqual(room.status, "fulfilled")
+
+    def test_explicit_room_is_fulfilled_even_without_topic_match(self):
+        room = self.create_room("Room", topics="Spark", participants=[self.student])
+        course = self.create_course("pandas")
+
+        self.assertEqual(fulfil_waiting_rooms(course, [room]), [room])
+        self.assertEqual(fulfil_waiting_rooms(course, [room]), [])
+        self.assertEqual(Notification.objects.filter(user=self.student).count(), 1)
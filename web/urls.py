@@ -143,6 +143,7 @@ urlpatterns += i18n_patterns(
     path("surveys/<int:pk>/delete/", SurveyDeleteView.as_view(), name="survey-delete"),
     path("surveys/<int:pk>/submit/", submit_survey, name="submit-survey"),
     path("surveys/<int:pk>/results/", SurveyResultsView.as_view(), name="survey-results"),
+    path("surveys/<int:pk>/export/", views.export_survey_responses, name="survey-export"),
     # Payment URLs
     path(
         "courses/<slug:slug>/create-payment-intent/",
@@ -156,6 +157,7 @@ urlpatterns += i18n_patterns(
     path("avatar/customize/", views_avatar.customize_avatar, name="customize_avatar"),
     path("avatar/set-as-profile/", views_avatar.set_avatar_as_profile_pic, name="set_avatar_as_profile_pic"),
     path("avatar/preview/", views_avatar.preview_avatar, name="preview_avatar"),
+    path("avatar/image/<str:key>/", views_avatar.avatar_image, name="avatar_image"),
     # Admin and Utilities
     path(f"{settings.ADMIN_URL}/dashboard/", admin_views.admin_dashboard, name="admin_dashboard"),
     path(f"{settings.ADMIN_URL}/system/", admin_views.system_dashboard, name="system_dashboard"),
@@ -578,6 +580,11 @@ urlpatterns += i18n_patterns(
         login_required(update_student_attendance),
         name="update_student_attendance",
     ),
+    path(
+        "attendance/<int:classroom_id>/bulk/",
+        views.bulk_update_attendance,
+        name="bulk_update_attendance",
+    ),
     path(
         "virtual-classroom/<int:classroom_id>/reset-attendance/",
         login_required(views.reset_attendance),
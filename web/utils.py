@@ -888,65 +888,13 @@ def geocode_address(address):
     """
     Convert a text address to latitude and longitude coordinates using Nominatim API.
     Returns a tuple of (latitude, longitude) or None if geocoding fails.
-    Follows OpenStreetMap's Nominatim usage policy with built-in rate limiting.
+    Results are stored in the GeocodeCache table and requests share the Nominatim
+    token bucket, so this may block; web requests should enqueue sessions instead.
     """
-    # Rate limiting - ensure we don't exceed 1 request per second
-    rate_limit_key = "nominatim_last_request"
-    last_request_time = cache.get(rate_limit_key)
-
-    if last_request_time:
-        import time
-
-        current_time = time.time()
-        time_since_last_request = current_time - last_request_time
-
-        if time_since_last_request < 1.0:
-            # Sleep to maintain 1 request per second rate limit
-            time.sleep(1.0 - time_since_last_request)
-
-    if not address:
-        logger.debug("Empty address provided to geocode_address")
-        return None
-
-    # Check cache first
-    normalized_address = address.strip().lower()
-    cache_key = f"geocode:{hash(normalized_address)}"
-    cached_result = cache.get(cache_key)
-    if cached_result:
-        logger.debug(f"Using cached geocoding result for: {address}")
-        return cached_result
-
-    # Nominatim API URL with custom User-Agent as recommended
-    url = "https://nominatim.openstreetmap.org/search"
-    params = {"q": address, "format": "json", "limit": 1}
-
-    # Headers to comply with Nominatim usage policy
-    headers = {"User-Agent": "AlphaOneEducation/1.0 (support@alphaonelabs.com)"}
+    from web.services.geocoding import geocode
 
     try:
-        # Update last request timestamp
-        import time
-
-        cache.set(rate_limit_key, time.time(), 60 * 5)  # Keep for 5 minutes
-        # Use requests with custom headers and params
-        response = requests.get(url, params=params, headers=headers)
-        response.raise_for_status()
-
-        data = response.json()
-
-        if data:
-            # Get the first result
-            first_result = data[0]
-            result = (float(first_result["lat"]), float(first_result["lon"]))
-
-            # Cache the result for 24 hours
-            cache.set(cache_key, result, 60 * 60 * 24)
-
-            return result
-
-        logger.warning(f"No geocoding results found for address: {address}")
-        return None
-
+        return geocode(address)
     except requests.exceptions.RequestException as e:
         logger.error(f"Request error during geocoding: {e}")
         return None
@@ -44,6 +44,7 @@ from django.http import (
     HttpResponseBadRequest,
     HttpResponseForbidden,
     JsonResponse,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
@@ -56,7 +57,7 @@ from django.utils.translation import gettext as _
 from django.views import generic
 from django.views.decorators.clickjacking import xframe_options_exempt
 from django.views.decorators.csrf import csrf_exempt, csrf_protect
-from django.views.decorators.http import require_GET, require_POST
+from django.views.decorators.http import condition, require_GET, require_POST
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -116,6 +117,7 @@ from .models import (
     Badge,
     BlogComment,
     BlogPost,
+    Cart,
     CartItem,
     Certificate,
     Challenge,
@@ -134,6 +136,7 @@ from .models import (
     ForumReply,
     ForumTopic,
     ForumVote,
+    GitHubContributor,
     Goods,
     GradeableLink,
     LearningStreak,
@@ -159,7 +162,6 @@ from .models import (
     SearchLog,
     Session,
     SessionAttendance,
-    SessionEnrollment,
     Storefront,
     StudyGroup,
     StudyGroupInvite,
@@ -187,16 +189,51 @@ from .notifications import (
     notify_team_goal_completion,
     notify_team_invite,
     notify_team_invite_response,
+    queue_enrollment_emails,
     send_enrollment_confirmation,
 )
 from .referrals import send_referral_reward_email
+from .services.attendance import ATTENDANCE_STATUSES, bulk_mark_attendance, enrolled_student_ids, todays_session
+from .services.cart_pricing import price_cart
+from .services.checkout import InsufficientStockError, fulfil_cart, get_fulfilment, shipping_address_from_intent
+from .services.content_pages import (
+    content_detail_etag,
+    content_detail_last_modified,
+    content_list_etag,
+    content_list_last_modified,
+    count_not_modified_views,
+    get_approved_comments,
+    get_content_index,
+    get_content_object,
+    get_content_objects,
+    get_content_page,
+)
+from .services.github_sync import contributor_leaderboard
+from .services.goods_catalog import get_goods_facets, goods_listing_queryset
+from .services.profile_stats import annotate_profile_scorecards
+from .services.session_map import get_map_data
+from .services.social_stats import social_history
+from .services.stripe_events import record_stripe_event
+from .services.study_groups import (
+    get_open_seats,
+    get_study_group_directory,
+    study_group_detail_queryset,
+    study_group_queryset,
+)
+from .services.survey_results import (
+    get_survey_results,
+    stream_survey_csv,
+    stream_survey_json,
+)
+from .services.tags import get_blog_tag_cloud, tag_key
+from .services.view_counts import view_counter
+from .services.waiting_room_matcher import fulfil_waiting_rooms
 from .social import get_social_stats
 from .utils import (
     can_access_classroom,
     cancel_subscription,
     create_leaderboard_context,
     create_subscription,
-    geocode_address,
     get_cached_challenge_entries,
     get_cached_leaderboard_data,
     get_leaderboard,
@@ -627,22 +664,16 @@ def create_course(request):
             course.save()
             form.save_m2m()  # Save many-to-many relationships
 
-            # Handle waiting room if course was created from one
+            # Handle waiting room if course was created from one. Publishing already fulfilled every
+            # open room the course satisfies; the originating room is fulfilled even if topics differ.
             if "waiting_room_data" in request.session:
                 waiting_room = get_object_or_404(WaitingRoom, id=request.session["waiting_room_data"]["id"])
-
-                # Update waiting room status and link to course
-                waiting_room.status = "fulfilled"
-                waiting_room.fulfilled_course = course
-                waiting_room.save(update_fields=["status", "fulfilled_course"])
-
-                # Send notifications to all participants
-                for participant in waiting_room.participants.all():
-                    messages.success(
-                        request,
-                        f"A new course matching your request has been created: {course.title}",
-                        extra_tags=f"course_{course.slug}",
-                    )
+                fulfil_waiting_rooms(course, [waiting_room])
+                messages.success(
+                    request,
+                    f"Participants of this waiting room have been notified about your course: {course.title}",
+                    extra_tags=f"course_{course.slug}",
+                )
 
                 # Clear waiting room data from session
                 del request.session["waiting_room_data"]
@@ -1664,18 +1695,17 @@ def stripe_webhook(request):
         # Invalid signature
         return HttpResponse(status=400)
 
-    if event.type == "payment_intent.succeeded":
-        payment_intent = event.data.object
-        handle_successful_payment(payment_intent)
-    elif event.type == "payment_intent.payment_failed":
-        payment_intent = event.data.object
-        handle_failed_payment(payment_intent)
-
+    # Acknowledge straight away; process_stripe_events runs the handlers once per event
+    record_stripe_event(event, "payments")
     return HttpResponse(status=200)
 
 
 def handle_successful_payment(payment_intent):
     """Handle successful payment by enrolling the user in the course."""
+    if payment_intent.metadata.get("cart_id"):
+        handle_successful_cart_payment(payment_intent)
+        return
+
     # Get metadata from the payment intent
     course_id = payment_intent.metadata.get("course_id")
     user_id = payment_intent.metadata.get("user_id")
@@ -1694,17 +1724,29 @@ def handle_successful_payment(payment_intent):
     # Create a payment record for tracking teacher earnings
     # Convert amount from cents to dollars
     amount = Decimal(str(payment_intent.amount)) / 100
-    Payment.objects.create(
+    _, created = Payment.objects.get_or_create(
         enrollment=enrollment,
-        amount=amount,
-        currency=payment_intent.currency.upper(),
         stripe_payment_intent_id=payment_intent.id,
-        status="completed",
+        defaults={"amount": amount, "currency": payment_intent.currency.upper(), "status": "completed"},
     )
 
-    # Send notifications
-    send_enrollment_confirmation(enrollment)
-    notify_teacher_new_enrollment(enrollment)
+    # Queue notifications so a replayed event or a rolled back handler sends nothing twice
+    if created:
+        queue_enrollment_emails([enrollment])
+
+
+def handle_successful_cart_payment(payment_intent):
+    """
+    Fulfil a cart checkout from the webhook, sharing the idempotent fulfilment used by
+    checkout_success. Guest carts are left for the redirect, which creates the account.
+    """
+    cart = Cart.objects.filter(id=payment_intent.metadata.get("cart_id")).select_related("user").first()
+    if cart is None or cart.user is None:
+        return
+    try:
+        fulfil_cart(cart, cart.user, payment_intent.id, shipping_address_from_intent(payment_intent))
+    except InsufficientStockError as e:
+        send_slack_message(f"Paid checkout {payment_intent.id} needs a refund: {e}")
 
 
 def handle_failed_payment(payment_intent):
@@ -2232,7 +2274,7 @@ def peer_messages(request, user_id):
 def study_groups(request, course_id):
     """Display study groups for a course."""
     course = get_object_or_404(Course, id=course_id)
-    groups = course.study_groups.all()
+    groups = study_group_queryset(request.user).filter(course=course).order_by("-created_at")
 
     if request.method == "POST":
         name = request.POST.get("name")
@@ -2253,19 +2295,19 @@ def study_groups(request, course_id):
             messages.success(request, "Study group created successfully!")
             return redirect("study_group_detail", group_id=group.id)
 
-    return render(request, "web/study/groups.html", {"course": course, "groups": groups})
+    return render(request, "web/study/groups.html", {"course": course, "groups": groups, "study_groups": groups})
 
 
 @login_required
 def study_group_detail(request, group_id):
     """Display study group details and handle join/leave requests."""
-    group = get_object_or_404(StudyGroup, id=group_id)
+    group = get_object_or_404(study_group_detail_queryset(request.user), id=group_id)
 
     if request.method == "POST":
         action = request.POST.get("action")
 
         if action == "join":
-            if group.members.count() >= group.max_members:
+            if group.is_full():
                 messages.error(request, "This group is full!")
             else:
                 group.members.add(request.user)
@@ -2278,6 +2320,9 @@ def study_group_detail(request, group_id):
                 group.members.remove(request.user)
                 messages.info(request, f"You have left {group.name}.")
 
+        # Reload so the annotated member count and member list reflect the change
+        return redirect("study_group_detail", group_id=group.id)
+
     return render(request, "web/study/group_detail.html", {"group": group})
 
 
@@ -2524,23 +2569,25 @@ def session_detail(request, session_id):
         return redirect("index")
 
 
+@condition(etag_func=content_list_etag(BlogPost), last_modified_func=content_list_last_modified(BlogPost))
 def blog_list(request):
-    blog_posts = BlogPost.objects.filter(status="published").order_by("-published_at")
-    tags = BlogPost.objects.values_list("tags", flat=True).distinct()
-    # Split comma-separated tags and get unique values
-    unique_tags = sorted(set(tag.strip() for tags_str in tags if tags_str for tag in tags_str.split(",")))
-
-    return render(request, "blog/list.html", {"blog_posts": blog_posts, "tags": unique_tags})
+    blog_posts = get_content_page(BlogPost, request.GET.get("page", 1))
+    return render(
+        request,
+        "blog/list.html",
+        {"blog_posts": blog_posts, "page_obj": blog_posts, "tags": get_blog_tag_cloud()},
+    )
 
 
+@condition(etag_func=content_list_etag(BlogPost), last_modified_func=content_list_last_modified(BlogPost))
 def blog_tag(request, tag):
     """View for filtering blog posts by tag."""
-    blog_posts = BlogPost.objects.filter(status="published", tags__icontains=tag).order_by("-published_at")
-    tags = BlogPost.objects.values_list("tags", flat=True).distinct()
-    # Split comma-separated tags and get unique values
-    unique_tags = sorted(set(tag.strip() for tags_str in tags if tags_str for tag in tags_str.split(",")))
-
-    return render(request, "blog/list.html", {"blog_posts": blog_posts, "tags": unique_tags, "current_tag": tag})
+    blog_posts = get_content_page(BlogPost, request.GET.get("page", 1), tag=tag_key(tag))
+    return render(
+        request,
+        "blog/list.html",
+        {"blog_posts": blog_posts, "page_obj": blog_posts, "tags": get_blog_tag_cloud(), "current_tag": tag_key(tag)},
+    )
 
 
 @login_required
@@ -2559,10 +2606,11 @@ def create_blog_post(request):
     return render(request, "blog/create.html", {"form": form})
 
 
+@count_not_modified_views(BlogPost)
+@condition(etag_func=content_detail_etag(BlogPost), last_modified_func=content_detail_last_modified(BlogPost))
 def blog_detail(request, slug):
     """Display a blog post and its comments."""
-    post = get_object_or_404(BlogPost, slug=slug, status="published")
-    comments = post.comments.filter(is_approved=True).order_by("created_at")
+    post = get_content_object(BlogPost, slug)
 
     if request.method == "POST":
         if not request.user.is_authenticated:
@@ -2577,13 +2625,10 @@ def blog_detail(request, slug):
             messages.success(request, f"Comment #{comment.id} added successfully!")
             return redirect("blog_detail", slug=slug)
 
-    # Get view count from WebRequest
-    view_count = WebRequest.objects.filter(path=request.path).aggregate(total_views=Sum("count"))["total_views"] or 0
-
     context = {
         "post": post,
-        "comments": comments,
-        "view_count": view_count,
+        "comments": get_approved_comments(post.id).comments,
+        "view_count": view_counter.record(post),
     }
     return render(request, "blog/detail.html", context)
 
@@ -2713,7 +2758,8 @@ def custom_429(request, exception=None):
 def cart_view(request):
     """View the shopping cart."""
     cart = get_or_create_cart(request)
-    return render(request, "cart/cart.html", {"cart": cart, "stripe_public_key": settings.STRIPE_PUBLISHABLE_KEY})
+    context = {"cart": cart, "pricing": price_cart(cart), "stripe_public_key": settings.STRIPE_PUBLISHABLE_KEY}
+    return render(request, "cart/cart.html", context)
 
 
 def add_course_to_cart(request, course_id):
@@ -2760,18 +2806,19 @@ def remove_from_cart(request, item_id):
 def create_cart_payment_intent(request):
     """Create a payment intent for the entire cart."""
     cart = get_or_create_cart(request)
+    pricing = price_cart(cart)
 
-    if not cart.items.exists():
+    if pricing.is_empty:
         return JsonResponse({"error": "Cart is empty"}, status=400)
 
     # Handle free cart (all items are free courses)
-    if cart.total == 0:
+    if pricing.total == 0:
         return JsonResponse({"free_cart": True, "message": "Cart contains only free items"})
 
     try:
         # Create a PaymentIntent with the cart total
         intent = stripe.PaymentIntent.create(
-            amount=int(cart.total * 100),  # Convert to cents
+            amount=pricing.amount_cents,
             currency="usd",
             metadata={
                 "cart_id": cart.id,
@@ -2792,59 +2839,22 @@ def free_cart_checkout(request):
         return redirect("cart_view")
 
     cart = get_or_create_cart(request)
+    pricing = price_cart(cart)
 
-    if not cart.items.exists():
+    if pricing.is_empty:
         messages.error(request, "Cart is empty.")
         return redirect("cart_view")
 
     # Verify that cart total is 0 (all items are free)
-    if cart.total != 0:
+    if pricing.total != 0:
         messages.error(request, "Cart contains paid items. Please use regular checkout.")
         return redirect("cart_view")
 
-    user = request.user
-    enrollments = []
-    session_enrollments = []
-    goods_items = []
-
-    # Create the Order
-    order = Order.objects.create(
-        user=user,
-        total_price=0,
-        status="completed",
-        shipping_address=None,
-        terms_accepted=True,
-    )
-
-    # Process enrollments
-    for item in cart.items.all():
-        if item.course:
-            # Create enrollment for free course
-            enrollment = Enrollment.objects.create(student=user, course=item.course, status="approved")
-            enrollments.append(enrollment)
-
-            # Send notifications
-            send_enrollment_confirmation(enrollment)
-            notify_teacher_new_enrollment(enrollment)
-
-        elif item.session:
-            # Process individual session enrollments
-            session_enrollment = SessionEnrollment.objects.create(student=user, session=item.session, status="approved")
-            session_enrollments.append(session_enrollment)
-
-        elif item.goods:
-            # Free goods (price = 0)
-            goods_items.append(item)
-            OrderItem.objects.create(
-                order=order,
-                goods=item.goods,
-                quantity=1,
-                price_at_purchase=0,
-                discounted_price_at_purchase=0,
-            )
-
-    # Clear the cart
-    cart.items.all().delete()
+    try:
+        fulfilment = fulfil_cart(cart, request.user)
+    except InsufficientStockError as e:
+        messages.error(request, str(e))
+        return redirect("cart_view")
 
     # Render the receipt page
     return render(
@@ -2853,17 +2863,45 @@ def free_cart_checkout(request):
         {
             "payment_intent_id": None,
             "order_date": timezone.now(),
-            "user": user,
-            "enrollments": enrollments,
-            "session_enrollments": session_enrollments,
-            "goods_items": goods_items,
+            "user": request.user,
+            "enrollments": fulfilment.enrollments,
+            "session_enrollments": fulfilment.session_enrollments,
+            "goods_items": fulfilment.goods_items,
             "total": 0,
-            "order": order,
+            "order": fulfilment.order,
             "shipping_address": None,
         },
     )
 
 
+def render_fulfilment_receipt(request, fulfilment, payment_intent_id):
+    """Render the receipt page for a fulfilled cart checkout."""
+    return render(
+        request,
+        "cart/receipt.html",
+        {
+            "payment_intent_id": payment_intent_id,
+            "order_date": fulfilment.order.created_at,
+            "user": fulfilment.order.user,
+            "enrollments": fulfilment.enrollments,
+            "session_enrollments": fulfilment.session_enrollments,
+            "goods_items": fulfilment.goods_items,
+            "total": fulfilment.total,
+            "order": fulfilment.order,
+            "shipping_address": fulfilment.order.shipping_address,
+        },
+    )
+
+
+def render_fulfilment_or_error(request, payment_intent_id, error):
+    """Show the receipt if the payment was fulfilled concurrently (e.g. by the webhook), else ``error``."""
+    fulfilment = get_fulfilment(payment_intent_id)
+    if fulfilment is None or fulfilment.order.user_id != request.user.id:
+        messages.error(request, error)
+        return redirect("cart_view")
+    return render_fulfilment_receipt(request, fulfilment, payment_intent_id)
+
+
 def checkout_success(request):
     """Handle successful checkout and payment confirmation."""
     payment_intent_id = request.GET.get("payment_intent")
@@ -2873,6 +2911,14 @@ def checkout_success(request):
         return redirect("cart_view")
 
     try:
+        # The Stripe webhook or an earlier visit may already have fulfilled this payment
+        fulfilment = get_fulfilment(payment_intent_id)
+        if fulfilment is not None:
+            if fulfilment.order.user_id != request.user.id:
+                messages.error(request, "This payment has already been processed.")
+                return redirect("cart_view")
+            return render_fulfilment_receipt(request, fulfilment, payment_intent_id)
+
         # Verify the payment intent
         payment_intent = stripe.PaymentIntent.retrieve(payment_intent_id)
 
@@ -2881,10 +2927,10 @@ def checkout_success(request):
             return redirect("cart_view")
 
         cart = get_or_create_cart(request)
+        pricing = price_cart(cart)
 
-        if not cart.items.exists():
-            messages.error(request, "Cart is empty.")
-            return redirect("cart_view")
+        if pricing.is_empty:
+            return render_fulfilment_or_error(request, payment_intent_id, "Cart is empty.")
 
         # Handle guest checkout
         if not request.user.is_authenticated:
@@ -2923,130 +2969,20 @@ def checkout_success(request):
         else:
             user = request.user
 
-        # Lists to track enrollments for the receipt
-        enrollments = []
-        session_enrollments = []
-        goods_items = []
-        total_amount = 0
-
-        # Define shipping_address
-        shipping_address = request.POST.get("address") if cart.has_goods else None
-
-        # Check if the cart contains goods requiring shipping
-        has_goods = any(item.goods for item in cart.items.all())
-
         # Extract shipping address from Stripe PaymentIntent
-        shipping_address = None
-        if has_goods:
-            shipping_data = getattr(payment_intent, "shipping", None)
-            if shipping_data:
-                # Construct structured shipping address
-                shipping_address = {
-                    "line1": shipping_data.address.line1,
-                    "line2": shipping_data.address.line2 or "",
-                    "city": shipping_data.address.city,
-                    "state": shipping_data.address.state,
-                    "postal_code": shipping_data.address.postal_code,
-                    "country": shipping_data.address.country,
-                }
-
-        # Create the Order with shipping address
-        order = Order.objects.create(
-            user=user,  # User is defined earlier in guest/auth logic
-            total_price=0,  # Updated later
-            status="completed",
-            shipping_address=shipping_address,
-            terms_accepted=True,
-        )
-
-        storefront = None
-        # Process enrollments
-        for item in cart.items.all():
-            if item.course:
-                # Check for an active discount coupon for this course
-                discount = Discount.objects.filter(
-                    user=user, course=item.course, used=False, valid_until__gte=timezone.now()
-                ).first()
-                if discount:
-                    # Calculate the discounted price
-                    discount_amount = (discount.discount_percentage / 100) * item.course.price
-                    effective_price = item.course.price - discount_amount
-                    # Mark the coupon as used
-                    discount.used = True
-                    discount.save()
-                else:
-                    effective_price = item.course.price
-
-                # Create enrollment for the course
-                enrollment = Enrollment.objects.create(
-                    student=user, course=item.course, status="approved", payment_intent_id=payment_intent_id
-                )
-                enrollments.append(enrollment)
-                total_amount += effective_price
-
-                # Create payment record for teacher earnings calculation
-                Payment.objects.create(
-                    enrollment=enrollment,
-                    amount=effective_price,
-                    currency="USD",
-                    stripe_payment_intent_id=payment_intent_id,
-                    status="completed",
-                )
-
-                # Optionally, you can send confirmation emails with discount details
-                send_enrollment_confirmation(enrollment)
-                notify_teacher_new_enrollment(enrollment)
-
-            elif item.session:
-                # Process individual session enrollments (no discount logic here)
-                session_enrollment = SessionEnrollment.objects.create(
-                    student=user, session=item.session, status="approved", payment_intent_id=payment_intent_id
-                )
-                session_enrollments.append(session_enrollment)
-                total_amount += item.session.price
-
-            elif item.goods:
-                goods_items.append(item)
-                total_amount += item.final_price
-                OrderItem.objects.create(
-                    order=order,
-                    goods=item.goods,
-                    quantity=1,
-                    price_at_purchase=item.goods.price,
-                    discounted_price_at_purchase=item.goods.discount_price,
-                )
-                if not storefront:
-                    storefront = item.goods.storefront
-
-        # Update order details
-        order.total_price = total_amount
-        if storefront:
-            order.storefront = goods_items[0].goods.storefront
-        order.save()
+        shipping_address = shipping_address_from_intent(payment_intent) if pricing.has_goods else None
 
-        # Clear the cart
-        cart.items.all().delete()
+        try:
+            fulfilment = fulfil_cart(cart, user, payment_intent_id, shipping_address)
+        except InsufficientStockError as e:
+            send_slack_message(f"Paid checkout {payment_intent_id} needs a refund: {e}")
+            messages.error(request, f"{e}. Your payment will be refunded.")
+            return redirect("cart_view")
 
-        if storefront:
-            order.storefront = storefront
-            order.save(update_fields=["storefront"])
-
-        # Render the receipt page
-        return render(
-            request,
-            "cart/receipt.html",
-            {
-                "payment_intent_id": payment_intent_id,
-                "order_date": timezone.now(),
-                "user": user,
-                "enrollments": enrollments,
-                "session_enrollments": session_enrollments,
-                "goods_items": goods_items,
-                "total": total_amount,
-                "order": order,
-                "shipping_address": shipping_address,
-            },
-        )
+        if fulfilment is None:
+            # The webhook emptied the cart after the first lookup
+            return render_fulfilment_or_error(request, payment_intent_id, "Cart is empty.")
+        return render_fulfilment_receipt(request, fulfilment, payment_intent_id)
 
     except stripe.error.StripeError as e:
         # send slack message
@@ -3226,21 +3162,24 @@ def stripe_connect_webhook(request):
     except stripe.error.SignatureVerificationError:
         return HttpResponse(status=400)
 
-    if event.type == "account.updated":
-        account = event.data.object
-        try:
-            profile = Profile.objects.get(stripe_account_id=account.id)
-            if account.charges_enabled and account.payouts_enabled:
-                profile.stripe_account_status = "verified"
-            else:
-                profile.stripe_account_status = "pending"
-            profile.save()
-        except Profile.DoesNotExist:
-            return HttpResponse(status=404)
-
+    record_stripe_event(event, "connect")
     return HttpResponse(status=200)
 
 
+def handle_account_updated(account):
+    """Update the teacher's Stripe account status from a Connect account.updated event."""
+    try:
+        profile = Profile.objects.get(stripe_account_id=account.id)
+    except Profile.DoesNotExist:
+        logger.warning("No profile found for Stripe account %s", account.id)
+        return
+    if account.charges_enabled and account.payouts_enabled:
+        profile.stripe_account_status = "verified"
+    else:
+        profile.stripe_account_status = "pending"
+    profile.save()
+
+
 @login_required
 def create_forum_category(request):
     """Create a new forum category."""
@@ -3790,8 +3729,9 @@ def content_dashboard(request):
 
     overall_score = int((healthy_platforms / max(connected_platforms, 1)) * 100)
 
-    # Get social media stats
+    # Get social media stats, collected in the background by collect_social_stats
     social_stats = get_social_stats()
+    x_history = social_history("x", settings.TWITTER_USERNAME) if hasattr(settings, "TWITTER_USERNAME") else []
     content_data = {
         "blog": {
             "stats": blog_stats,
@@ -3826,6 +3766,7 @@ def content_dashboard(request):
             "overall_score": overall_score,
             "web_stats": web_stats,
             "traffic_data": json.dumps(traffic_data),
+            "x_history": json.dumps(x_history),
             "blog_stats": blog_stats,
             "forum_stats": forum_stats,
             "course_stats": course_stats,
@@ -4157,7 +4098,7 @@ class GoodsListingView(ListView):
     paginate_by = 15
 
     def get_queryset(self):
-        queryset = Goods.objects.all()
+        queryset = goods_listing_queryset()
         store_name = self.request.GET.get("store_name")
         product_type = self.request.GET.get("product_type")
         category = self.request.GET.get("category")
@@ -4179,17 +4120,7 @@ class GoodsListingView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["store_names"] = Storefront.objects.values_list("name", flat=True).distinct()
-        context["categories"] = Goods.objects.values_list("category", flat=True).distinct()
-
-        # Add cart count for each product
-        products_with_cart_count = []
-        for product in context["products"]:
-            product.cart_count = product.cart_items.count()
-            products_with_cart_count.append(product)
-
-        context["products"] = products_with_cart_count
-
+        context.update(get_goods_facets())
         return context
 
 
@@ -4404,35 +4335,34 @@ class StorefrontDetailView(LoginRequiredMixin, generic.DetailView):
         return get_object_or_404(Storefront, store_slug=self.kwargs["store_slug"])
 
 
+@condition(etag_func=content_list_etag(SuccessStory), last_modified_func=content_list_last_modified(SuccessStory))
 def success_story_list(request):
     """View for listing published success stories."""
-    success_stories = SuccessStory.objects.filter(status="published").order_by("-published_at")
-
-    # Paginate results
-    paginator = Paginator(success_stories, 9)  # 9 stories per page
-    page_number = request.GET.get("page", 1)
-    page_obj = paginator.get_page(page_number)
+    page_obj = get_content_page(SuccessStory, request.GET.get("page", 1))
 
     context = {
+        "stories": page_obj,
         "success_stories": page_obj,
-        "is_paginated": paginator.num_pages > 1,
+        "is_paginated": page_obj.has_other_pages(),
         "page_obj": page_obj,
     }
     return render(request, "success_stories/list.html", context)
 
 
+@count_not_modified_views(SuccessStory)
+@condition(etag_func=content_detail_etag(SuccessStory), last_modified_func=content_detail_last_modified(SuccessStory))
 def success_story_detail(request, slug):
     """View for displaying a single success story."""
-    success_story = get_object_or_404(SuccessStory, slug=slug, status="published")
+    success_story = get_content_object(SuccessStory, slug)
 
-    # Get related success stories (same author or similar content)
-    related_stories = (
-        SuccessStory.objects.filter(status="published").exclude(id=success_story.id).order_by("-published_at")[:3]
-    )
+    # Related stories are the newest other published ones
+    related = [entry for entry in get_content_index(SuccessStory).entries if entry.id != success_story.id][:3]
+    related_stories = get_content_objects(SuccessStory, related)
 
     context = {
         "success_story": success_story,
         "related_stories": related_stories,
+        "view_count": view_counter.record(success_story),
     }
     return render(request, "success_stories/detail.html", context)
 
@@ -5218,18 +5148,8 @@ def classroom_attendance(request, classroom_id):
         messages.error(request, "You do not have access to this virtual classroom.")
         return redirect("virtual_classroom_list")
 
-    # Get today's attendance records
-    today = timezone.now().date()
-    today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-    today_end = timezone.make_aware(datetime.combine(today, datetime.max.time()))
-
     # Get today's session
-    if classroom.course:
-        session = Session.objects.filter(course=classroom.course, start_time__range=(today_start, today_end)).first()
-    else:
-        session = Session.objects.filter(
-            title=f"Class on {today.strftime('%Y-%m-%d')}", start_time__range=(today_start, today_end)
-        ).first()
+    session = todays_session(classroom, create=False)
 
     # Get attendance records for today's session
     attendance_records = (
@@ -5238,12 +5158,19 @@ def classroom_attendance(request, classroom_id):
 
     present_students = [record.student for record in attendance_records]
 
+    # Current statuses pre-fill the teacher's roll form
+    roll = {}
+    if is_teacher and session:
+        roll = dict(SessionAttendance.objects.filter(session=session).values_list("student_id", "status"))
+
     context = {
         "classroom": classroom,
         "is_teacher": is_teacher,
         "is_enrolled": is_enrolled,
         "enrolled_students": enrolled_students,
         "present_students": present_students,
+        "roll": roll,
+        "status_choices": SessionAttendance.STATUS_CHOICES,
         "teacher": classroom.teacher,
     }
 
@@ -5309,36 +5236,8 @@ def update_student_attendance(request, classroom_id):
                         status=400,
                     )
 
-            # Get today's session
-            today = timezone.now().date()
-            today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-            today_end = timezone.make_aware(datetime.combine(today, datetime.max.time()))
-
-            if classroom.course:
-                session = Session.objects.filter(
-                    course=classroom.course, start_time__range=(today_start, today_end)
-                ).first()
-            else:
-                session = Session.objects.filter(
-                    title=f"Class on {today.strftime('%Y-%m-%d')}", start_time__range=(today_start, today_end)
-                ).first()
-
-            if not session:
-                # Automatically create today's session if it doesn't exist
-                if classroom.course:
-                    session = Session.objects.create(
-                        course=classroom.course,
-                        title=f"Class on {today.strftime('%Y-%m-%d')}",
-                        start_time=today_start,
-                        end_time=today_end,
-                    )
-                else:
-                    session = Session.objects.create(
-                        title=f"Class on {today.strftime('%Y-%m-%d')}",
-                        start_time=today_start,
-                        end_time=today_end,
-                        course=None,
-                    )
+            # Get today's session, creating it if it doesn't exist
+            session = todays_session(classroom)
 
             # Update or create attendance record
             attendance, created = SessionAttendance.objects.get_or_create(
@@ -5365,6 +5264,75 @@ def update_student_attendance(request, classroom_id):
     return JsonResponse({"status": "error", "message": "Invalid request method"}, status=400)
 
 
+@login_required
+@require_POST
+def bulk_update_attendance(request, classroom_id):
+    """
+    Take roll for a whole classroom in one request.
+
+    Accepts JSON ``{"attendance": [{"student_id": 1, "status": "present", "notes": ""}, ...]}``
+    with an optional ``session_id``, or a form with one ``status_<student_id>`` field per student.
+    Attendance goes to today's session unless a session of the classroom's course is given.
+    """
+    classroom = get_object_or_404(VirtualClassroom.objects.select_related("course"), id=classroom_id)
+    if request.user != classroom.teacher:
+        return JsonResponse({"success": False, "message": "Only the teacher can take attendance"}, status=403)
+
+    is_json = request.content_type == "application/json"
+    if is_json:
+        try:
+            data = json.loads(request.body.decode("utf-8") or "{}")
+            rows = data.get("attendance") or []
+            session_id = data.get("session_id")
+        except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+            return JsonResponse({"success": False, "message": "Invalid JSON data"}, status=400)
+    else:
+        rows = [
+            {"student_id": key.removeprefix("status_"), "status": value}
+            for key, value in request.POST.items()
+            if key.startswith("status_")
+        ]
+        session_id = request.POST.get("session_id")
+
+    entries = {}
+    try:
+        for row in rows:
+            if row.get("status") not in ATTENDANCE_STATUSES:
+                raise ValueError(row.get("status"))
+            notes = row.get("notes")
+            entries[int(row["student_id"])] = (row["status"], None if notes is None else str(notes))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return JsonResponse(
+            {"success": False, "message": "Each entry needs a student_id and a valid status"}, status=400
+        )
+    if not entries:
+        return JsonResponse({"success": False, "message": "No attendance submitted"}, status=400)
+
+    not_enrolled = sorted(set(entries) - enrolled_student_ids(classroom, list(entries)))
+    if not_enrolled:
+        return JsonResponse(
+            {
+                "success": False,
+                "message": "Some students are not enrolled in this classroom",
+                "not_enrolled": not_enrolled,
+            },
+            status=400,
+        )
+
+    if session_id:
+        session = Session.objects.filter(id=session_id, course=classroom.course).first()
+        if session is None:
+            return JsonResponse({"success": False, "message": "Session not found"}, status=404)
+    else:
+        session = todays_session(classroom)
+
+    updated = bulk_mark_attendance(session, entries)
+    if is_json:
+        return JsonResponse({"success": True, "updated": updated, "session_id": session.id})
+    messages.success(request, f"Attendance saved for {updated} students.")
+    return redirect("classroom_attendance", classroom_id=classroom.id)
+
+
 @login_required
 def get_student_attendance(request):
     """Get a student's attendance data for a specific course."""
@@ -5699,43 +5667,8 @@ def donation_webhook(request):
         logger.exception("Invalid signature: %s", str(e))
         return HttpResponse(status=400)
 
-    try:
-        # Handle payment intent events
-        if event.type == "payment_intent.succeeded":
-            payment_intent = event.data.object
-            logger.info("Processing successful payment: %s", payment_intent.id)
-            handle_successful_donation_payment(payment_intent)
-        elif event.type == "payment_intent.payment_failed":
-            payment_intent = event.data.object
-            logger.info("Processing failed payment: %s", payment_intent.id)
-            handle_failed_donation_payment(payment_intent)
-
-        # Handle subscription events
-        elif event.type == "customer.subscription.created":
-            subscription = event.data.object
-            logger.info("Processing new subscription: %s", subscription.id)
-            handle_subscription_created(subscription)
-        elif event.type == "customer.subscription.updated":
-            subscription = event.data.object
-            logger.info("Processing subscription update: %s", subscription.id)
-            handle_subscription_updated(subscription)
-        elif event.type == "customer.subscription.deleted":
-            subscription = event.data.object
-            logger.info("Processing subscription cancellation: %s", subscription.id)
-            handle_subscription_cancelled(subscription)
-        elif event.type == "invoice.payment_succeeded":
-            invoice = event.data.object
-            logger.info("Processing successful invoice payment: %s", invoice.id)
-            handle_invoice_paid(invoice)
-        elif event.type == "invoice.payment_failed":
-            invoice = event.data.object
-            logger.info("Processing failed invoice payment: %s", invoice.id)
-            handle_invoice_failed(invoice)
-
-        return HttpResponse(status=200)
-    except Exception:
-        logger.exception("Error processing webhook %s", event.type)
-        return HttpResponse(status=500)
+    record_stripe_event(event, "donations")
+    return HttpResponse(status=200)
 
 
 def handle_successful_donation_payment(payment_intent: stripe.PaymentIntent) -> None:
@@ -6240,24 +6173,6 @@ def waiting_room_list(request):
     return render(request, "waiting_room/list.html", context)
 
 
-def find_matching_courses(waiting_room):
-    """Find courses that match the waiting room's subject and topics."""
-    # Get courses with matching subject name (case-insensitive)
-    matching_courses = Course.objects.filter(subject__iexact=waiting_room.subject, status="published")
-
-    # Filter courses that have all required topics
-    required_topics = {t.strip().lower() for t in waiting_room.topics.split(",") if t.strip()}
-
-    # Further filter courses by checking if their topics contain all required topics
-    final_matches = []
-    for course in matching_courses:
-        course_topics = {t.strip().lower() for t in course.topics.split(",") if t.strip()}
-        if course_topics.issuperset(required_topics):
-            final_matches.append(course)
-
-    return final_matches
-
-
 def waiting_room_detail(request, waiting_room_id):
     """View for displaying details of a waiting room."""
     waiting_room = get_object_or_404(WaitingRoom, id=waiting_room_id)
@@ -6648,35 +6563,7 @@ def teacher_update_student_attendance(request, classroom_id):
             return JsonResponse({"success": False, "message": "You are not enrolled in this class"}, status=403)
 
         # Get or create today's session
-        today = timezone.now().date()
-        today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-        today_end = timezone.make_aware(datetime.combine(today, datetime.max.time()))
-
-        if classroom.course:
-            session = Session.objects.filter(
-                course=classroom.course,
-                start_time__range=(today_start, today_end),
-            ).first()
-            if not session:
-                session = Session.objects.create(
-                    course=classroom.course,
-                    title=f"Class on {today.strftime('%Y-%m-%d')}",
-                    start_time=today_start,
-                    end_time=today_end,
-                )
-        else:
-            session = Session.objects.filter(
-                title=f"Class on {today.strftime('%Y-%m-%d')}",
-                start_time__range=(today_start, today_end),
-                course__isnull=True,
-            ).first()
-            if not session:
-                session = Session.objects.create(
-                    title=f"Class on {today.strftime('%Y-%m-%d')}",
-                    start_time=today_start,
-                    end_time=today_end,
-                    course=None,
-                )
+        session = todays_session(classroom)
 
         # Mark attendance
         attendance, created = SessionAttendance.objects.get_or_create(
@@ -7425,7 +7312,7 @@ def classes_map(request):
     teaching_style = request.GET.get("teaching_style")
     # Apply filters
     if course_id:
-        sessions = sessions.filter(course_id=course_id, status="published")
+        sessions = sessions.filter(course_id=course_id, course__status="published")
     if teaching_style:
         sessions = sessions.filter(teaching_style=teaching_style)
     # Fetch only necessary course fields
@@ -7438,351 +7325,86 @@ def classes_map(request):
 
 @login_required
 def map_data_api(request):
-    """API to return all live and ongoing class data in JSON format."""
-    now = timezone.now()
-    sessions = (
-        Session.objects.filter(
-            Q(start_time__gte=now) | Q(start_time__lte=now, end_time__gte=now)  # Future or Live classes
-        )
-        .filter(Q(is_virtual=False) & ~Q(location=""))
-        .select_related("course", "course__teacher")
-    )
+    """
+    API to return live and upcoming in-person class data in JSON format.
 
+    Accepts an optional ``bbox`` (west,south,east,north, as produced by Leaflet's
+    ``toBBoxString()``) and ``zoom`` to return only visible sessions, clustered at low zoom.
+    Responses are cached per map tile until the next session change.
+    """
     course_id = request.GET.get("course")
     age_group = request.GET.get("age_group")
 
-    if course_id:
-        sessions = sessions.filter(course__id=course_id, status="published")
-    if age_group:
-        sessions = sessions.filter(course__level=age_group)
-
-    logger.debug(f"API call with filters: course={course_id}, age={age_group}")
-
-    map_data = []
-    sessions_to_update = []
-    # Limit geocoding to a reasonable number per request
-    MAX_GEOCODING_PER_REQUEST = 5
-    geocoding_count = 0
-    geocoding_errors = 0
-    coordinate_errors = 0
-    for session in sessions:
-        if not session.latitude or not session.longitude:
-            if geocoding_count >= MAX_GEOCODING_PER_REQUEST:
-                logger.warning(f"Geocoding limit reached ({MAX_GEOCODING_PER_REQUEST}). Skipping session {session.id}")
-                continue
-            geocoding_count += 1
-            logger.info(f"Geocoding session {session.id} with location: {session.location}")
-            lat, lng = geocode_address(session.location)
-            if lat is not None and lng is not None:
-                session.latitude = lat
-                session.longitude = lng
-                sessions_to_update.append(session)
-            else:
-                geocoding_errors += 1
-                logger.warning(f"Skipping session {session.id} due to failed geocoding")
-                continue
-
-        try:
-            lat = float(session.latitude)
-            lng = float(session.longitude)
-            map_data.append(
-                {
-                    "id": session.id,
-                    "title": session.title,
-                    "course_title": session.course.title,
-                    "teacher": session.course.teacher.get_full_name() or session.course.teacher.username,
-                    "start_time": session.start_time.isoformat(),
-                    "end_time": session.end_time.isoformat(),
-                    "location": session.location,
-                    "lat": lat,
-                    "lng": lng,
-                    "price": str(session.price or session.course.price),
-                    "url": session.get_absolute_url(),
-                    "course": session.course.title,
-                    "level": session.course.get_level_display(),
-                    "is_virtual": session.is_virtual,
-                }
-            )
-        except (ValueError, TypeError):
-            coordinate_errors += 1
-            logger.warning(
-                f"Skipping session {session.id} due to invalid coordinates: "
-                f"lat={session.latitude}, lng={session.longitude}"
-            )
-            continue
-
-    if sessions_to_update:
-        logger.info(f"Batch updating coordinates for {len(sessions_to_update)} sessions")
-        Session.objects.bulk_update(sessions_to_update, ["latitude", "longitude"])  # Batch update
-
-    # Log summary of issues
-    if geocoding_errors > 0 or coordinate_errors > 0:
-        logger.warning(f"Map data issues: {geocoding_errors} geocoding errors, {coordinate_errors} coordinate errors")
-
-    logger.info(f"Found {len(map_data)} sessions with valid coordinates")
-    return JsonResponse({"sessions": map_data})
-
-
-GITHUB_REPO = "alphaonelabs/alphaonelabs-education-website"
-GITHUB_API_BASE = "https://api.github.com"
-
-logger = logging.getLogger(__name__)
-
-
-def github_api_request(endpoint, params=None, headers=None):
-    """
-    Make a GitHub API request with consistent error handling and timeout.
-    Returns JSON response on success, empty dict on failure.
-    """
+    bbox = None
+    zoom = None
     try:
-        response = requests.get(endpoint, params=params, headers=headers, timeout=10)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            logger.error(f"Failed API request to {endpoint}: {response.status_code} - {response.text}")
-            return {}
-    except requests.RequestException as e:
-        logger.error(f"Request error for {endpoint}: {e}")
-        return {}
-
+        if request.GET.get("bbox"):
+            west, south, east, north = (float(value) for value in request.GET["bbox"].split(","))
+            if not (-90 <= south <= north <= 90 and -180 <= west <= 180 and -180 <= east <= 180):
+                raise ValueError("bbox out of range")
+            bbox = (south, west, north, east)
+        if request.GET.get("zoom"):
+            zoom = int(request.GET["zoom"])
+    except ValueError:
+        return JsonResponse({"error": "Invalid bbox or zoom parameter"}, status=400)
 
-def get_user_contribution_metrics(username, token):
-    """
-    Use the GitHub GraphQL API to fetch all of the user's merged PRs (across all repos),
-    then filter by the target repo, implementing pagination to ensure complete data.
-    """
-    graphql_endpoint = "https://api.github.com/graphql"
-    headers = {"Authorization": f"Bearer {token}"}
-
-    query = """
-    query($username: String!, $after: String) {
-      user(login: $username) {
-        pullRequests(
-          first: 100
-          after: $after
-          states: MERGED
-          orderBy: { field: CREATED_AT, direction: DESC }
-        ) {
-          totalCount
-          pageInfo {
-            endCursor
-            hasNextPage
-          }
-          nodes {
-            additions
-            deletions
-            createdAt
-            repository {
-              nameWithOwner
-            }
-          }
-        }
-      }
-    }
-    """
+    logger.debug(f"API call with filters: course={course_id}, age={age_group}, bbox={bbox}, zoom={zoom}")
 
-    all_filtered_prs = []
-    after_cursor = None
+    return JsonResponse(get_map_data(bbox=bbox, zoom=zoom, course_id=course_id, level=age_group))
 
-    while True:
-        variables = {"username": username, "after": after_cursor}
-        try:
-            response = requests.post(
-                graphql_endpoint, json={"query": query, "variables": variables}, headers=headers, timeout=15
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("data") and data["data"].get("user"):
-                    pr_data = data["data"]["user"]["pullRequests"]
-                    prs = pr_data["nodes"]
-
-                    # Filter PRs to the target repository (case insensitive)
-                    target_repo = GITHUB_REPO.lower()
-                    filtered_prs = [pr for pr in prs if pr["repository"]["nameWithOwner"].lower() == target_repo]
-                    all_filtered_prs.extend(filtered_prs)
-
-                    # Check if there are more pages
-                    if pr_data["pageInfo"]["hasNextPage"]:
-                        after_cursor = pr_data["pageInfo"]["endCursor"]
-                    else:
-                        break
-                else:
-                    logger.error("No user or PR data found in GraphQL response.")
-                    break
-            else:
-                logger.error(f"GraphQL error: {response.status_code} - {response.text}")
-                break
-        except Exception as e:
-            logger.error(f"GraphQL request error: {e}")
-            break
 
-    # Prepare final result structure
-    final_result = {
-        "data": {"user": {"pullRequests": {"totalCount": len(all_filtered_prs), "nodes": all_filtered_prs}}}
-    }
-    return final_result
+logger = logging.getLogger(__name__)
 
 
 def contributor_detail_view(request, username):
     """
     View to display detailed information about a specific GitHub contributor.
-    Only accessible to staff members.
+    Reads the details stored by the sync_github command; nothing is fetched from GitHub here.
     """
-    cache_key = f"github_contributor_{username}"
-    cached_data = cache.get(cache_key)
-    if cached_data:
-        return render(request, "web/contributor_detail.html", cached_data)
-
-    token = os.environ.get("GITHUB_TOKEN")
-    headers = {"Authorization": f"token {token}"} if token else {}
-
-    # Initialize variables to store contributor data
-    user_data = {}
-    prs_created = 0
-    prs_merged = 0
-    issues_created = 0
-    pr_reviews = 0
-    pr_comments = 0
-    issue_comments = 0
-    lines_added = 0
-    lines_deleted = 0
-    first_contribution_date = "N/A"
-    issue_assignments = 0
-
-    user_endpoint = f"{GITHUB_API_BASE}/users/{username}"
-    user_data = github_api_request(user_endpoint, headers=headers)
-    if not user_data:
-        logger.error("User profile data could not be retrieved.")
-
-    # Pull requests created
-    prs_created_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"author:{username} type:pr repo:{GITHUB_REPO}"},
-        headers=headers,
-    )
-    prs_created = prs_created_json.get("total_count", 0)
-
-    # Pull requests merged
-    prs_merged_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"author:{username} type:pr repo:{GITHUB_REPO} is:merged"},
-        headers=headers,
-    )
-    prs_merged = prs_merged_json.get("total_count", 0)
-
-    # Issues created
-    issues_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"author:{username} type:issue repo:{GITHUB_REPO}"},
-        headers=headers,
-    )
-    issues_created = issues_json.get("total_count", 0)
+    contributor = GitHubContributor.objects.filter(login__iexact=username).first()
+    if contributor is None:
+        contributor = GitHubContributor(login=username, profile={"login": username})
 
-    # Pull request reviews
-    reviews_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"reviewer:{username} type:pr repo:{GITHUB_REPO}"},
-        headers=headers,
-    )
-    pr_reviews = reviews_json.get("total_count", 0)
-
-    # Pull requests with comments
-    pr_comments_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"commenter:{username} type:pr repo:{GITHUB_REPO}"},
-        headers=headers,
-    )
-    pr_comments = pr_comments_json.get("total_count", 0)
-
-    # Issues with comments
-    issue_comments_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"commenter:{username} type:issue repo:{GITHUB_REPO}"},
-        headers=headers,
-    )
-    issue_comments = issue_comments_json.get("total_count", 0)
-
-    # Oldest PR creation date
-    prs_oldest = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={
-            "q": f"author:{username} type:pr repo:{GITHUB_REPO}",
-            "sort": "created",
-            "order": "asc",
-            "per_page": 1,
-        },
-        headers=headers,
-    )
-    if prs_oldest.get("total_count", 0) > 0:
-        first_contribution_date = prs_oldest["items"][0].get("created_at", "N/A")
-
-    # Issue assignments
-    issue_assignments_json = github_api_request(
-        f"{GITHUB_API_BASE}/search/issues",
-        params={"q": f"assignee:{username} type:issue repo:{GITHUB_REPO}"},
-        headers=headers,
-    )
-    issue_assignments = issue_assignments_json.get("total_count", 0)
-    metrics = get_user_contribution_metrics(username, token)
-    pr_data = metrics.get("data", {}).get("user", {}).get("pullRequests", {}).get("nodes", [])
-    for pr in pr_data:
-        lines_added += pr.get("additions", 0)
-        lines_deleted += pr.get("deletions", 0)
-
-    # Update user_data with additional metrics
+    user_data = dict(contributor.profile)
     user_data.update(
         {
             "reactions_received": user_data.get("reactions_received", 0),
             "mentorship_score": user_data.get("mentorship_score", 0),
             "collaboration_score": user_data.get("collaboration_score", 0),
-            "issue_assignments": issue_assignments,
+            "issue_assignments": contributor.issue_assignments,
         }
     )
-
-    # Prepare context for the template
+    first_contribution_date = (
+        contributor.first_contribution_at.isoformat().replace("+00:00", "Z")
+        if contributor.first_contribution_at
+        else "N/A"
+    )
+    counts = {
+        "prs_created": contributor.prs_created,
+        "prs_merged": contributor.prs_merged,
+        "pr_reviews": contributor.pr_reviews,
+        "issues_created": contributor.issues_created,
+        "issue_comments": contributor.issue_comments,
+        "pr_comments": contributor.pr_comments,
+        "lines_added": contributor.lines_added,
+        "lines_deleted": contributor.lines_deleted,
+    }
     context = {
         "user": user_data,
-        "prs_created": prs_created,
-        "prs_merged": prs_merged,
-        "pr_reviews": pr_reviews,
-        "issues_created": issues_created,
-        "issue_comments": issue_comments,
-        "pr_comments": pr_comments,
-        "lines_added": lines_added,
-        "lines_deleted": lines_deleted,
+        **counts,
         "first_contribution_date": first_contribution_date,
         "chart_data": {
-            "prs_created": prs_created,
-            "prs_merged": prs_merged,
-            "pr_reviews": pr_reviews,
-            "issues_created": issues_created,
-            "issue_assignments": issue_assignments,
-            "pr_comments": pr_comments,
-            "issue_comments": issue_comments,
-            "lines_added": lines_added,
-            "lines_deleted": lines_deleted,
-            "first_contribution_date": (first_contribution_date if first_contribution_date != "N/A" else "N/A"),
+            **counts,
+            "issue_assignments": contributor.issue_assignments,
+            "first_contribution_date": first_contribution_date,
         },
     }
-
-    # Cache for 1 hour
-    cache.set(cache_key, context, 3600)
     return render(request, "web/contributor_detail.html", context)
 
 
 @login_required
 def all_study_groups(request):
     """Display all study groups across courses."""
-    # Get all study groups
-    groups = StudyGroup.objects.all().order_by("-created_at")
-
-    # Group study groups by course
-    courses_with_groups = {}
-    for group in groups:
-        if group.course not in courses_with_groups:
-            courses_with_groups[group.course] = []
-        courses_with_groups[group.course].append(group)
-
     # Handle creating a new study group
     if request.method == "POST":
         course_id = request.POST.get("course")
@@ -7821,6 +7443,9 @@ def all_study_groups(request):
         except Exception as e:
             messages.error(request, f"Error creating study group: {str(e)}")
 
+    # Study groups grouped by course, one page of courses at a time
+    page_obj, courses_with_groups = get_study_group_directory(request.user, request.GET.get("page", 1))
+
     # Get user's enrollments for the create group form
     enrollments = request.user.enrollments.filter(status="approved").select_related("course")
     enrolled_courses = [enrollment.course for enrollment in enrollments]
@@ -7830,6 +7455,8 @@ def all_study_groups(request):
         "web/study/all_groups.html",
         {
             "courses_with_groups": courses_with_groups,
+            "open_seats": get_open_seats([course.id for course in courses_with_groups]),
+            "page_obj": page_obj,
             "enrolled_courses": enrolled_courses,
         },
     )
@@ -8198,49 +7825,21 @@ def users_list(request: HttpRequest) -> HttpResponse:
     Display a list of users who have their profile set to public,
     ordered by most recent updates.
     """
-    profiles = Profile.objects.filter(is_profile_public=True).select_related("user").order_by("-updated_at")
-
-    # Add statistics for each user to create fun scorecards
-    for profile in profiles:
-        if profile.is_teacher:
-            # Teacher stats
-            courses = Course.objects.filter(teacher=profile.user).prefetch_related("enrollments", "reviews")
-            profile.total_courses = courses.count()
-            profile.total_students = sum(course.enrollments.filter(status="approved").count() for course in courses)
-            # Get average rating across all courses
-            course_ratings = [course.average_rating for course in courses if course.average_rating > 0]
-            profile.avg_rating = round(sum(course_ratings) / len(course_ratings), 1) if course_ratings else 0
-        else:
-            # Student stats
-            enrollments = Enrollment.objects.filter(student=profile.user).select_related("course")
-            profile.total_courses = enrollments.count()
-            completed_enrollments = enrollments.filter(status="completed")
-            profile.total_completed = completed_enrollments.count()
-
-            # Calculate average progress across all courses
-            total_progress = 0
-            progress_count = 0
-            enrollment_ids = [e.id for e in enrollments]
-            existing_progresses = {
-                p.enrollment_id: p for p in CourseProgress.objects.filter(enrollment_id__in=enrollment_ids)
-            }
-
-            for enrollment in enrollments:
-                progress = existing_progresses.get(enrollment.id)
-                if not progress:
-                    progress = CourseProgress.objects.create(enrollment=enrollment)
-                total_progress += progress.completion_percentage
-                progress_count += 1
-            profile.avg_progress = round(total_progress / progress_count) if progress_count > 0 else 0
-
-            # Add achievements count
-            profile.achievements_count = Achievement.objects.filter(student=profile.user).count()
+    profiles = (
+        Profile.objects.filter(is_profile_public=True)
+        .select_related("user")
+        .prefetch_related("user__groups")
+        .order_by("-updated_at")
+    )
 
     # Pagination: 12 profiles per page
     paginator = Paginator(profiles, 12)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
 
+    # Add statistics for the visible profiles only to create fun scorecards
+    page_obj.object_list = annotate_profile_scorecards(page_obj.object_list)
+
     context = {
         "page_obj": page_obj,
     }
@@ -8355,139 +7954,8 @@ def topic_detail(request, pk):
 
 
 def contributors_list_view(request):
-    # Check if cached data is available
-    cached_context = cache.get("contributors_context")
-    if cached_context:
-        return render(request, "web/contributors_list.html", cached_context)
-
-    # Initialize a dictionary to track contributor stats
-    contributor_stats = {}
-
-    # Function to add a contributor to our stats dictionary
-    def add_contributor(username, avatar_url, profile_url):
-        if username not in contributor_stats:
-            contributor_stats[username] = {
-                "username": username,
-                "avatar_url": avatar_url,
-                "profile_url": profile_url,
-                "merged_pr_count": 0,
-                "closed_pr_count": 0,
-                "open_pr_count": 0,
-                "total_pr_count": 0,
-                "prs_url": f"https://github.com/AlphaOneLabs/education-website/pulls?q=is:pr+author:{username}",
-            }
-
-    try:
-        # Fetch closed PRs first (includes both merged and non-merged closed PRs)
-        closed_prs = []
-        for page in range(1, 11):  # Limit to 10 pages to prevent hitting API rate limits
-            response = github_api_request(
-                f"{GITHUB_API_BASE}/repos/AlphaOneLabs/education-website/pulls",
-                params={"state": "closed", "per_page": 100, "page": page},
-            )
-            if not response or len(response) == 0:
-                break
-
-            closed_prs.extend(response)
-            time.sleep(0.5)  # Add delay to avoid hitting rate limits
-
-        # Process closed PRs
-        for pr in closed_prs:
-            username = pr["user"]["login"]
-
-            # Skip bots and specific users
-            if "[bot]" in username or "dependabot" in username or username == "A1L13N":
-                continue
-
-            avatar_url = pr["user"]["avatar_url"]
-            profile_url = pr["user"]["html_url"]
-
-            # Add to our tracking
-            add_contributor(username, avatar_url, profile_url)
-
-            # Update the appropriate count based on whether it was merged
-            if pr["merged_at"]:
-                contributor_stats[username]["merged_pr_count"] += 1
-            else:
-                contributor_stats[username]["closed_pr_count"] += 1
-
-        # Now fetch open PRs
-        open_prs = []
-        for page in range(1, 6):  # Limit to 5 pages for open PRs
-            response = github_api_request(
-                f"{GITHUB_API_BASE}/repos/AlphaOneLabs/education-website/pulls",
-                params={"state": "open", "per_page": 100, "page": page},
-            )
-            if not response or len(response) == 0:
-                break
-
-            open_prs.extend(response)
-            time.sleep(0.5)  # Add delay to avoid hitting rate limits
-
-        # Process open PRs
-        for pr in open_prs:
-            username = pr["user"]["login"]
-
-            # Skip bots and specific users
-            if "[bot]" in username or "dependabot" in username or username == "A1L13N":
-                continue
-
-            avatar_url = pr["user"]["avatar_url"]
-            profile_url = pr["user"]["html_url"]
-
-            # Add to our tracking
-            add_contributor(username, avatar_url, profile_url)
-
-            # Update open PR count
-            contributor_stats[username]["open_pr_count"] += 1
-
-        # Calculate total PR count and filter out users with no merged PRs
-        contributors = []
-        for username, stats in contributor_stats.items():
-            # Skip contributors with no merged PRs
-            if stats["merged_pr_count"] == 0:
-                continue
-
-            # Calculate total PR count
-            stats["total_pr_count"] = stats["merged_pr_count"] + stats["closed_pr_count"] + stats["open_pr_count"]
-
-            # Calculate a smart score that prioritizes merged PRs but penalizes imbalances
-            # Formula: (merged_pr_count * 10) - penalties for imbalanced contributions
-            smart_score = stats["merged_pr_count"] * 10
-
-            # Penalize if closed PRs are more than half of merged PRs (could indicate issues with code quality)
-            if stats["closed_pr_count"] > (stats["merged_pr_count"] / 2):
-                smart_score -= (stats["closed_pr_count"] - (stats["merged_pr_count"] / 2)) * 2
-
-            # Penalize if open PRs are more than merged PRs (could indicate abandonment issues)
-            if stats["open_pr_count"] > stats["merged_pr_count"]:
-                smart_score -= stats["open_pr_count"] - stats["merged_pr_count"]
-
-            # Calculate a contribution ratio: merged/(total) - higher is better
-            if stats["total_pr_count"] > 0:
-                stats["contribution_ratio"] = stats["merged_pr_count"] / stats["total_pr_count"]
-            else:
-                stats["contribution_ratio"] = 0
-
-            # Store the smart score
-            stats["smart_score"] = smart_score
-
-            contributors.append(stats)
-
-        # Sort by smart score (primary) and then by merged PR count (secondary)
-        contributors.sort(key=lambda x: (x["smart_score"], x["merged_pr_count"]), reverse=True)
-
-        # Store the context in cache for 12 hours
-        context = {"contributors": contributors}
-        cache.set("contributors_context", context, 12 * 60 * 60)
-
-        return render(request, "web/contributors_list.html", context)
-
-    except Exception as e:
-        # Log the error
-        print(f"Error fetching contributors: {e}")
-        # Return an empty list in case of error
-        return render(request, "web/contributors_list.html", {"contributors": []})
+    # Pull request counts come from the local mirror kept current by the sync_github command
+    return render(request, "web/contributors_list.html", {"contributors": contributor_leaderboard()})
 
 
 @login_required
@@ -8682,87 +8150,33 @@ class SurveyResultsView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Process survey results
-        results = []
-        total_participants = 0
-        most_answered_question = None
-        max_responses = 0
-        top_choice = None
-        bottom_choice = None
-        overall_top_choice_count = 0
-        overall_bottom_choice_count = float("inf")
-        total_possible_responses = 0
-        total_actual_responses = 0
-        avg_completion_time = None
-        context["avg_completion_time"] = avg_completion_time
-
-        for question in self.object.question_set.all():
-            choices_data = []
-            question_total = 0
-
-            # Process each choice for this question
-            for choice in question.choice_set.all():
-                count = choice.response_set.count() if hasattr(choice, "response_set") else 0
-
-                question_total += count
-                choices_data.append({"text": choice.text, "count": count})
-
-            if question_total == 0:
-                continue
-            if question_total > 0:
-                total_possible_responses += total_participants * 1  # Each participant could answer this question
-                total_actual_responses += question_total
-
-            if question_total > max_responses:
-                max_responses = question_total
-                most_answered_question = question
-
-            for choice in choices_data:
-                choice["percentage"] = round((choice["count"] / question_total * 100), 1) if question_total > 0 else 0
-
-                if choice["count"] > overall_top_choice_count:
-                    overall_top_choice_count = choice["count"]
-                    top_choice = choice
-
-                if choice["count"] > 0 and choice["count"] < overall_bottom_choice_count:
-                    overall_bottom_choice_count = choice["count"]
-                    bottom_choice = choice
-
-            results.append({"question": question, "choices": choices_data, "total": question_total})
-
-            total_participants = max(total_participants, question_total)
-        engagement_score = 0
-        if total_possible_responses > 0:
-            engagement_score = (total_actual_responses / total_possible_responses) * 100
-
-        context["engagement_score"] = round(engagement_score, 1)
+        # Aggregates come from one grouped query and are cached until the next submission
+        context.update(get_survey_results(self.object))
+        context["avg_completion_time"] = None
+
         target_participants = getattr(self.object, "target_participants", 100)  # default to 100 if not set
+        total_participants = context["total_participants"]
         response_rate = (total_participants / target_participants * 100) if target_participants > 0 else 0
+        context["response_rate"] = min(response_rate, 100)  # Cap at 100%
+        context["is_creator"] = self.object.author == self.request.user
+        return context
 
-        context.update(
-            {
-                "results": results,
-                "total_participants": total_participants,
-                "response_rate": min(response_rate, 100),  # Cap at 100%
-                "most_answered_question": most_answered_question,
-                "top_choice": top_choice,
-                "bottom_choice": bottom_choice,
-                "is_creator": self.object.author == self.request.user if hasattr(self.object, "author") else False,
-            }
-        )
 
-        chart_data = []
-        for result in results:
-            chart_data.append(
-                {
-                    "question_id": result["question"].id,
-                    "labels": [choice["text"] for choice in result["choices"]],
-                    "data": [choice["count"] for choice in result["choices"]],
-                }
-            )
-        context["chart_data_json"] = json.dumps(chart_data)
+@login_required
+def export_survey_responses(request, pk):
+    """Stream every response of a survey as CSV or JSON (``?format=json``); creator or staff only."""
+    survey = get_object_or_404(Survey, pk=pk)
+    if survey.author != request.user and not request.user.is_staff:
+        return HttpResponseForbidden("You can only export surveys that you created.")
 
-        return context
+    if request.GET.get("format") == "json":
+        response = StreamingHttpResponse(stream_survey_json(survey), content_type="application/json")
+        extension = "json"
+    else:
+        response = StreamingHttpResponse(stream_survey_csv(survey), content_type="text/csv")
+        extension = "csv"
+    response["Content-Disposition"] = f'attachment; filename="survey_{survey.id}_responses.{extension}"'
+    return response
 
 
 class SurveyDeleteView(LoginRequiredMixin, DeleteView):
@@ -1,11 +1,13 @@
 import json
 import logging
+import os
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.files.base import ContentFile
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
+from django.views.decorators.http import require_GET
 from python_avatars import (
     AccessoryType,
     Avatar,
@@ -21,6 +23,14 @@ from python_avatars import (
 )
 
 from .forms import AvatarForm
+from .services.avatars import (
+    AVATAR_KEY_RE,
+    avatar_attributes,
+    avatar_image_url,
+    cached_avatar_png,
+    cached_avatar_svg,
+    render_avatar,
+)
 
 # Add logger configuration
 logger = logging.getLogger(__name__)
@@ -33,18 +43,19 @@ def set_avatar_as_profile_pic(request):
         profile = request.user.profile
         if profile.custom_avatar and profile.custom_avatar.svg:
             try:
-                # Create a unique filename for the SVG
-                import uuid
-
-                filename = f"avatar_{uuid.uuid4().hex[:8]}.svg"
+                if not profile.custom_avatar.attributes_hash:
+                    profile.custom_avatar.save()
+                # Name the file after the avatar's attribute hash so an unchanged avatar is not stored again
+                filename = f"avatar_{profile.custom_avatar.attributes_hash}.svg"
 
-                # Delete old profile picture if it exists
-                if profile.avatar:
-                    profile.avatar.delete(save=False)
+                if not profile.avatar or os.path.basename(profile.avatar.name) != filename:
+                    # Delete old profile picture if it exists
+                    if profile.avatar:
+                        profile.avatar.delete(save=False)
 
-                # Save the SVG directly
-                svg_file = ContentFile(profile.custom_avatar.svg.encode("utf-8"), name=filename)
-                profile.avatar.save(filename, svg_file, save=True)
+                    # Save the SVG directly
+                    svg_file = ContentFile(profile.custom_avatar.svg.encode("utf-8"), name=filename)
+                    profile.avatar.save(filename, svg_file, save=True)
 
                 messages.success(request, "Avatar set as profile picture successfully!")
             except Exception as e:
@@ -144,24 +155,27 @@ def preview_avatar(request):
     if request.method == "POST":
         try:
             data = json.loads(request.body)
-            avatar = Avatar(
-                style=getattr(AvatarStyle, data.get("style", "CIRCLE").upper(), AvatarStyle.CIRCLE),
-                background_color=data.get("background_color", "#FFFFFF"),
-                top=getattr(HairType, data.get("top", "SHORT_FLAT").upper(), HairType.SHORT_FLAT),
-                eyebrows=getattr(EyebrowType, data.get("eyebrows", "DEFAULT").upper(), EyebrowType.DEFAULT),
-                eyes=getattr(EyeType, data.get("eyes", "DEFAULT").upper(), EyeType.DEFAULT),
-                nose=getattr(NoseType, data.get("nose", "DEFAULT").upper(), NoseType.DEFAULT),
-                mouth=getattr(MouthType, data.get("mouth", "DEFAULT").upper(), MouthType.DEFAULT),
-                facial_hair=getattr(FacialHairType, data.get("facial_hair", "NONE").upper(), FacialHairType.NONE),
-                skin_color=getattr(SkinColor, data.get("skin_color", "LIGHT").upper(), SkinColor.LIGHT),
-                hair_color=data.get("hair_color", "#000000"),
-                accessory=getattr(AccessoryType, data.get("accessory", "NONE").upper(), AccessoryType.NONE),
-                clothing=getattr(ClothingType, data.get("clothing", "HOODIE").upper(), ClothingType.HOODIE),
-                clothing_color=data.get("clothing_color", "#0000FF"),
-            )
-            return JsonResponse({"success": True, "avatar_svg": avatar.render()})
+            key, svg = render_avatar(avatar_attributes(data))
+            return JsonResponse({"success": True, "avatar_svg": svg, "avatar_url": avatar_image_url(key)})
         except Exception as e:
             # Log the detailed exception for debugging
             logger.exception("Error in preview_avatar: %s", str(e))
             return JsonResponse({"success": False, "error": "An internal error occurred"}, status=400)
     return JsonResponse({"success": False, "error": "Invalid request method"}, status=405)
+
+
+@require_GET
+def avatar_image(request, key):
+    """Serve a rendered avatar by attribute hash; the content never changes for a given hash."""
+    if not AVATAR_KEY_RE.match(key):
+        raise Http404("Avatar not found")
+    if request.GET.get("format") == "png":
+        content, content_type = cached_avatar_png(key), "image/png"
+    else:
+        content, content_type = cached_avatar_svg(key), "image/svg+xml"
+    if content is None:
+        raise Http404("Avatar not found")
+    response = HttpResponse(content, content_type=content_type)
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    response["ETag"] = f'"{key}"'
+    return response